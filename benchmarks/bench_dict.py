@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+"""
+Compare counting and group-by loops using dicts in the interpreter and
+in nopython mode.
+"""
+from __future__ import absolute_import, print_function, division
+
+import random
+
+from numba import njit
+from numba.utils import benchmark
+
+
+def count(values):
+    counts = {}
+    for v in values:
+        counts[v] = counts.get(v, 0) + 1
+    return len(counts)
+
+
+def group_sum(keys, values):
+    sums = {}
+    for i in range(len(keys)):
+        k = keys[i]
+        sums[k] = sums.get(k, 0.0) + values[i]
+    total = 0.0
+    for v in sums.values():
+        total += v
+    return total
+
+
+def dedup(values):
+    seen = {}
+    n = 0
+    for v in values:
+        if v not in seen:
+            seen[v] = True
+            n += 1
+    return n
+
+
+FUNCTIONS = [
+    ('count', count, 1),
+    ('group_sum', group_sum, 2),
+    ('dedup', dedup, 1),
+]
+
+SIZES = [1000, 100000]
+
+
+def main():
+    random.seed(42)
+    for size in SIZES:
+        keys = [random.randrange(size // 10) for i in range(size)]
+        values = [random.random() for i in range(size)]
+        print("%d items" % size)
+        for name, func, nargs in FUNCTIONS:
+            args = (keys, values)[:nargs]
+            cfunc = njit(func)
+            cfunc(*args)
+            print('\t%s' % name)
+            for kind, f in [('python', func), ('nopython', cfunc)]:
+                bmr = benchmark(lambda: f(*args))
+                print('\t\t%-10s %.3g s' % (kind, bmr.best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+"""
+Compare a particle simulation step using a Python class in the
+interpreter and a jitclass in nopython mode.
+"""
+from __future__ import absolute_import, print_function, division
+
+import numpy as np
+
+from numba import jitclass, njit, float64
+from numba.utils import benchmark
+
+
+class Particles(object):
+
+    def __init__(self, n):
+        self.pos = np.linspace(0.0, 1.0, n)
+        self.vel = np.ones(n)
+        self.steps = 0.0
+
+    def step(self, dt):
+        for i in range(len(self.pos)):
+            self.pos[i] += self.vel[i] * dt
+            if self.pos[i] > 1.0:
+                self.vel[i] = -self.vel[i]
+        self.steps += 1.0
+
+
+JitParticles = jitclass([('pos', float64[:]),
+                         ('vel', float64[:]),
+                         ('steps', float64)])(Particles)
+
+
+def make_simulate(cls):
+    def simulate(n, nsteps):
+        p = cls(n)
+        for i in range(nsteps):
+            p.step(0.01)
+        return p.steps
+    return simulate
+
+
+FUNCTIONS = [
+    ('python', make_simulate(Particles)),
+    ('jitclass', njit(make_simulate(JitParticles))),
+]
+
+SIZES = [10, 1000]
+
+NSTEPS = 100
+
+
+def main():
+    for size in SIZES:
+        print("%d particles" % size)
+        for kind, func in FUNCTIONS:
+            func(size, NSTEPS)
+            bmr = benchmark(lambda: func(size, NSTEPS))
+            print('\t%-8s %.3g s' % (kind, bmr.best))
+
+
+if __name__ == '__main__':
+    main()
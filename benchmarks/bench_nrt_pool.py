@@ -0,0 +1,79 @@
+#! /usr/bin/env python
+"""
+Compare the NRT pool allocator with the system allocator on functions
+creating many small arrays.
+"""
+from __future__ import absolute_import, print_function, division
+
+import numpy as np
+
+from numba import njit
+from numba.runtime import rtsys
+from numba.utils import benchmark
+
+
+@njit
+def row_temporaries(a):
+    # One temporary array per row
+    acc = 0.0
+    for i in range(a.shape[0]):
+        acc += (a[i] * 2.0 + 1.0).sum()
+    return acc
+
+
+@njit
+def small_arrays(n):
+    acc = 0.0
+    for i in range(n):
+        a = np.empty(i % 64 + 1)
+        a[:] = i
+        acc += a[0]
+    return acc
+
+
+@njit
+def array_pairs(n):
+    acc = 0
+    for i in range(n):
+        a = np.arange(i % 16)
+        b = np.ones(i % 32, dtype=np.int64)
+        acc += a.size + b.size
+    return acc
+
+
+FUNCTIONS = [
+    ('row_temporaries', row_temporaries, (np.ones((100000, 8)),)),
+    ('small_arrays', small_arrays, (100000,)),
+    ('array_pairs', array_pairs, (100000,)),
+]
+
+ALLOCATORS = [
+    ('system', rtsys.use_system_allocator),
+    ('pool', lambda: rtsys.use_pool_allocator(1 << 20)),
+]
+
+
+def main():
+    # Compile the functions
+    for name, func, args in FUNCTIONS:
+        func(*args)
+
+    for name, func, args in FUNCTIONS:
+        print(name)
+        for alloc_name, use_allocator in ALLOCATORS:
+            use_allocator()
+            before = rtsys.get_pool_stats()
+            bmr = benchmark(lambda: func(*args))
+            after = rtsys.get_pool_stats()
+            hits = after.hits - before.hits
+            misses = after.misses - before.misses
+            print('\t%-8s %.3g s' % (alloc_name, bmr.best), end='')
+            if hits or misses:
+                print('  (%.1f%% of small allocations reused)'
+                      % (100.0 * hits / (hits + misses)), end='')
+            print()
+    rtsys.use_system_allocator()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+"""
+Compare the per-block refcount pruning pass (numba.runtime.atomicops)
+with the cross-block pass (numba.runtime.nrtopt), for compilation time,
+number of removed operations and execution time of the compiled code.
+"""
+from __future__ import absolute_import, print_function, division
+
+import timeit
+
+import numpy as np
+
+from numba import njit
+from numba.runtime import atomicops, nrtopt
+from numba.targets import codegen
+from numba.utils import benchmark
+
+
+PASSES = [
+    ('per-block', atomicops.remove_redundant_nrt_refct),
+    ('cross-block', nrtopt.remove_redundant_nrt_refct),
+]
+
+
+def branchy(a, flag):
+    b = a
+    if flag:
+        c = b[:a.size // 2]
+    else:
+        c = b[a.size // 2:]
+    return c.sum() + b.sum()
+
+
+def loopy(a, n):
+    acc = 0.0
+    for i in range(n):
+        b = a[i % a.size:]
+        if i % 2:
+            acc += b[0]
+        else:
+            acc -= b[0]
+    return acc
+
+
+def slicing(a):
+    acc = 0.0
+    for i in range(a.shape[0]):
+        row = a[i]
+        acc += row.sum()
+    return acc
+
+
+CASES = [
+    (branchy, lambda: (np.arange(10.0), True)),
+    (loopy, lambda: (np.arange(10.0), 100000)),
+    (slicing, lambda: (np.ones((1000, 10)),)),
+]
+
+
+def count_refct_ops(asm):
+    return (asm.count('@NRT_incref(') + asm.count('@NRT_decref(')
+            - asm.count('declare void @NRT_'))
+
+
+def run_pass(name, prune):
+    pass_time = [0.0]
+
+    def timed_prune(ll_module):
+        t = timeit.default_timer()
+        try:
+            return prune(ll_module)
+        finally:
+            pass_time[0] += timeit.default_timer() - t
+
+    codegen.remove_redundant_nrt_refct = timed_prune
+    print(name)
+    for pyfunc, make_args in CASES:
+        pass_time[0] = 0.0
+        args = make_args()
+        cfunc = njit(pyfunc)
+        t = timeit.default_timer()
+        cfunc.compile(tuple(map(cfunc.typeof_pyval, args)))
+        compile_time = timeit.default_timer() - t
+        nops = count_refct_ops(cfunc.inspect_llvm(cfunc.signatures[0]))
+        bmr = benchmark(lambda: cfunc(*args))
+        print('\t%-10s compile %.4fs (pass %.4fs), %3d refct ops, '
+              'run %.3g s' % (pyfunc.__name__, compile_time, pass_time[0],
+                              nops, bmr.best))
+
+
+def main():
+    orig = codegen.remove_redundant_nrt_refct
+    try:
+        for name, prune in PASSES:
+            run_pass(name, prune)
+    finally:
+        codegen.remove_redundant_nrt_refct = orig
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#! /usr/bin/env python
+"""
+Compare the scheduling policies of the parallel ufunc target on
+workloads whose per-element cost is skewed.
+"""
+from __future__ import absolute_import, print_function, division
+
+import numpy as np
+
+from numba import vectorize
+from numba.utils import benchmark
+
+
+SCHEDULES = [
+    ('static', 0),
+    ('dynamic', 0),
+    ('dynamic', 64),
+    ('guided', 0),
+]
+
+
+def iterate(x):
+    # An iterative computation running int(x) steps
+    acc = 0.0
+    for i in range(int(x)):
+        acc = acc * 0.5 + i
+    return acc
+
+
+N = 200000
+
+WORKLOADS = [
+    # Cost uniform over the array
+    ('uniform', lambda: np.full(N, 500.0)),
+    # Cost increasing along the array: the last slices are the heaviest
+    ('linear', lambda: np.linspace(0.0, 1000.0, N)),
+    # Most elements are cheap, a few at the end are very expensive
+    ('tail', lambda: np.where(np.arange(N) > N * 0.95, 10000.0, 1.0)),
+    # Random early exits
+    ('random', lambda: np.random.RandomState(42).exponential(500.0, N)),
+]
+
+
+def make_ufunc(schedule, chunksize):
+    return vectorize(['float64(float64)'], target='parallel',
+                     schedule=schedule, chunksize=chunksize)(iterate)
+
+
+def main():
+    ufuncs = [(schedule, chunksize, make_ufunc(schedule, chunksize))
+              for schedule, chunksize in SCHEDULES]
+    for name, make_data in WORKLOADS:
+        data = make_data()
+        print(name)
+        expected = None
+        for schedule, chunksize, ufunc in ufuncs:
+            result = ufunc(data)
+            if expected is None:
+                expected = result
+            else:
+                np.testing.assert_allclose(result, expected)
+            bmr = benchmark(lambda: ufunc(data))
+            label = schedule if not chunksize else '%s(%d)' % (schedule,
+                                                               chunksize)
+            print('\t%-12s %.3g s' % (label, bmr.best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+"""
+Compare membership tests against lists (linear scans) and native sets
+(hash lookups) in nopython mode.
+"""
+from __future__ import absolute_import, print_function, division
+
+import random
+
+from numba import njit
+from numba.utils import benchmark
+
+
+@njit
+def dedup_list(values):
+    seen = [values[0]]
+    for v in values:
+        if v not in seen:
+            seen.append(v)
+    return len(seen)
+
+
+@njit
+def dedup_set(values):
+    seen = set()
+    for v in values:
+        seen.add(v)
+    return len(seen)
+
+
+@njit
+def join_list(left, right):
+    n = 0
+    for v in left:
+        if v in right:
+            n += 1
+    return n
+
+
+@njit
+def join_set(left, right):
+    keys = set(right)
+    n = 0
+    for v in left:
+        if v in keys:
+            n += 1
+    return n
+
+
+FUNCTIONS = [
+    ('dedup', dedup_list, dedup_set),
+    ('join', join_list, join_set),
+]
+
+SIZES = [100, 10000]
+
+
+def main():
+    random.seed(42)
+    for size in SIZES:
+        left = [random.randrange(size) for i in range(size)]
+        right = [random.randrange(size) for i in range(size)]
+        print("%d items" % size)
+        for name, list_func, set_func in FUNCTIONS:
+            args = (left, right)[:list_func.py_func.__code__.co_argcount]
+            print('\t%s' % name)
+            for kind, func in [('list', list_func), ('set', set_func)]:
+                func(*args)
+                bmr = benchmark(lambda: func(*args))
+                print('\t\t%-6s %.3g s' % (kind, bmr.best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#! /usr/bin/env python
+"""
+Compare passing Python lists (unboxed and reflected on each call) and
+typed lists (passed without copying) to compiled functions.
+"""
+from __future__ import absolute_import, print_function, division
+
+from numba import njit
+from numba.typed import List
+from numba.utils import benchmark
+
+
+@njit
+def first(lst):
+    return lst[0]
+
+
+@njit
+def total(lst):
+    acc = 0.0
+    for x in lst:
+        acc += x
+    return acc
+
+
+@njit
+def scale(lst):
+    for i in range(len(lst)):
+        lst[i] *= 1.0001
+
+
+FUNCTIONS = [
+    ('first', first),
+    ('total', total),
+    ('scale', scale),
+]
+
+SIZES = [10, 1000, 1000000]
+
+
+def main():
+    for size in SIZES:
+        items = [float(i) for i in range(size)]
+        containers = [('list', items), ('typed list', List(items))]
+        print("%d items" % size)
+        for name, func in FUNCTIONS:
+            print('\t%s' % name)
+            for kind, lst in containers:
+                func(lst)
+                bmr = benchmark(lambda: func(lst))
+                print('\t\t%-12s %.3g s' % (kind, bmr.best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#! /usr/bin/env python
+"""
+Compare string processing in the interpreter and with native unicode
+strings in nopython mode.
+"""
+from __future__ import absolute_import, print_function, division
+
+import random
+
+from numba import njit
+from numba.utils import benchmark
+
+
+def count_word(text, word):
+    n = 0
+    for w in text.split():
+        if w == word:
+            n += 1
+    return n
+
+
+def count_char(text, char):
+    n = 0
+    for c in text:
+        if c == char:
+            n += 1
+    return n
+
+
+def find_all(text, sub):
+    n = 0
+    pos = text.find(sub)
+    while pos >= 0:
+        n += 1
+        pos = text.find(sub, pos + 1)
+    return n
+
+
+FUNCTIONS = [
+    ('count_word', count_word, 'lorem'),
+    ('count_char', count_char, 'e'),
+    ('find_all', find_all, 'ipsum'),
+]
+
+WORDS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'caf\xe9', '\u20ac']
+
+SIZES = [1000, 100000]
+
+
+def main():
+    random.seed(42)
+    for size in SIZES:
+        text = ' '.join(random.choice(WORDS) for i in range(size))
+        print("%d words" % size)
+        for name, pyfunc, arg in FUNCTIONS:
+            cfunc = njit(pyfunc)
+            print('\t%s' % name)
+            for kind, func in [('python', pyfunc), ('numba', cfunc)]:
+                func(text, arg)
+                bmr = benchmark(lambda: func(text, arg))
+                print('\t\t%-6s %.3g s' % (kind, bmr.best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+"""
+Measure the overhead of the parallel workqueue: the latency of parallel
+ufunc calls on small arrays, after various idle periods, and the CPU
+time used by the process while the worker threads are idle.
+"""
+from __future__ import absolute_import, print_function, division
+
+import os
+import time
+import timeit
+
+import numpy as np
+
+from numba import vectorize
+
+
+IDLE_PERIODS = [0.0, 0.001, 0.01, 0.1]
+SIZES = [1, 100, 10000]
+NCALLS = 50
+
+
+@vectorize(['float64(float64, float64)'], target='parallel')
+def add(a, b):
+    return a + b
+
+
+def call_latency(size, idle):
+    """
+    Return the median duration of a call after *idle* seconds without
+    any parallel work.
+    """
+    a = np.arange(size, dtype=np.float64)
+    times = []
+    for _ in range(NCALLS):
+        if idle:
+            time.sleep(idle)
+        t = timeit.default_timer()
+        add(a, a)
+        times.append(timeit.default_timer() - t)
+    return np.median(times)
+
+
+def idle_cpu_usage(duration=1.0):
+    """
+    Return the CPU time used by the process while sleeping *duration*
+    seconds, as a fraction of the wall-clock time.
+    """
+    before = os.times()
+    time.sleep(duration)
+    after = os.times()
+    cpu = (after[0] - before[0]) + (after[1] - before[1])
+    return cpu / duration
+
+
+def main():
+    # Start the worker threads
+    a = np.arange(10.0)
+    add(a, a)
+
+    print("call latency (median over %d calls)" % (NCALLS,))
+    for size in SIZES:
+        for idle in IDLE_PERIODS:
+            print("\tsize %-6d after %5.1f ms idle: %8.1f us"
+                  % (size, idle * 1e3, call_latency(size, idle) * 1e6))
+
+    print("idle CPU usage: %.1f%% of a core" % (idle_cpu_usage() * 100,))
+
+
+if __name__ == '__main__':
+    main()
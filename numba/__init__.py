@@ -21,10 +21,17 @@ autojit = decorators.autojit
 njit = decorators.njit
 
 # Re export vectorize decorators
-from .npyufunc import vectorize, guvectorize
+from .npyufunc import (vectorize, guvectorize, get_num_threads,
+                       set_num_threads, get_thread_affinity,
+                       set_thread_affinity)
 
-# Re export from_dtype
-from .numpy_support import from_dtype
+# Re export from_dtype, pointer wrapping and memory-mapping functions
+from .numpy_support import (from_dtype, carray, farray, madvise,
+                            MADV_NORMAL, MADV_RANDOM, MADV_SEQUENTIAL,
+                            MADV_WILLNEED, MADV_DONTNEED)
+
+# Re export jitclass
+from .jitclass import jitclass
 
 # Re-export test entrypoint
 test = testing.test
@@ -39,10 +46,23 @@ autojit
 njit
 vectorize
 guvectorize
+get_num_threads
+set_num_threads
+get_thread_affinity
+set_thread_affinity
 export
 exportmany
 cuda
 from_dtype
+carray
+farray
+madvise
+MADV_NORMAL
+MADV_RANDOM
+MADV_SEQUENTIAL
+MADV_WILLNEED
+MADV_DONTNEED
+jitclass
 """.split() + types.__all__ + special.__all__ + errors.__all__
 
 
@@ -14,6 +14,12 @@
 
 #include "_arraystruct.h"
 
+#ifdef _WIN32
+    #include <windows.h>
+#else
+    #include <sys/mman.h>
+#endif
+
 /* For Numpy 1.6 */
 #ifndef NPY_ARRAY_BEHAVED
     #define NPY_ARRAY_BEHAVED NPY_BEHAVED
@@ -1391,6 +1397,83 @@ Numba_reset_list_private_data(PyListObject *listobj)
         listobj->allocated = PyList_GET_SIZE(listobj);
 }
 
+/* Access the PEP 393 representation of a str object: return a pointer
+ * to its character data, and fill its length (in characters), kind
+ * (the character width in bytes) and cached hash value (-1 if not
+ * computed yet).  NULL is returned with an exception set on error.
+ */
+
+#if PY_VERSION_HEX >= 0x03030000
+static void *
+Numba_extract_unicode(PyObject *obj, Py_ssize_t *length, int *kind,
+                      Py_hash_t *hash)
+{
+    if (!PyUnicode_Check(obj)) {
+        PyErr_Format(PyExc_TypeError,
+                     "expected a str object, got '%s'",
+                     Py_TYPE(obj)->tp_name);
+        return NULL;
+    }
+    if (PyUnicode_READY(obj) == -1)
+        return NULL;
+    *length = PyUnicode_GET_LENGTH(obj);
+    *kind = PyUnicode_KIND(obj);
+    *hash = ((PyASCIIObject *) obj)->hash;
+    return PyUnicode_DATA(obj);
+}
+
+/* Hash the character data of a str the same way Python does.  *data*
+ * holds *length* characters of *kind* bytes each, and must use the
+ * narrowest kind able to represent the string.
+ */
+#if PY_VERSION_HEX >= 0x03040000
+static Py_hash_t
+Numba_hash_unicode(void *data, Py_ssize_t length, int kind)
+{
+    /* Since PEP 456, str is hashed as its raw character data */
+    return _Py_HashBytes(data, length * kind);
+}
+#else
+/* Python 3.3 hashes the code points one after the other */
+#define HASH_CODE_POINTS(TYPE)                                  \
+    do {                                                        \
+        const TYPE *p = (const TYPE *) data;                    \
+        x ^= (Py_uhash_t) *p << 7;                              \
+        for (i = 0; i < length; i++)                            \
+            x = (1000003UL * x) ^ (Py_uhash_t) p[i];            \
+    } while (0)
+
+static Py_hash_t
+Numba_hash_unicode(void *data, Py_ssize_t length, int kind)
+{
+    Py_ssize_t i;
+    Py_uhash_t x;
+
+    if (length == 0)
+        return 0;
+    x = (Py_uhash_t) _Py_HashSecret.prefix;
+    switch (kind) {
+    case PyUnicode_1BYTE_KIND:
+        HASH_CODE_POINTS(Py_UCS1);
+        break;
+    case PyUnicode_2BYTE_KIND:
+        HASH_CODE_POINTS(Py_UCS2);
+        break;
+    default:
+        HASH_CODE_POINTS(Py_UCS4);
+        break;
+    }
+    x ^= (Py_uhash_t) length;
+    x ^= (Py_uhash_t) _Py_HashSecret.suffix;
+    if (x == (Py_uhash_t) -1)
+        x = (Py_uhash_t) -2;
+    return (Py_hash_t) x;
+}
+
+#undef HASH_CODE_POINTS
+#endif  /* PY_VERSION_HEX >= 0x03040000 */
+#endif
+
 static int
 Numba_unpack_slice(PyObject *obj,
                    Py_ssize_t *start, Py_ssize_t *stop, Py_ssize_t *step)
@@ -1418,6 +1501,90 @@ Numba_unpack_slice(PyObject *obj,
 #undef FETCH_MEMBER
 }
 
+/*
+ * Memory-mapped array support.  The given memory area is extended to
+ * page boundaries, as required by the OS functions.
+ */
+
+/* Portable access advice values, see numba.numpy_support.MADV_* */
+#define NUMBA_MADV_NORMAL      0
+#define NUMBA_MADV_RANDOM      1
+#define NUMBA_MADV_SEQUENTIAL  2
+#define NUMBA_MADV_WILLNEED    3
+#define NUMBA_MADV_DONTNEED    4
+
+#ifndef _WIN32
+static void
+page_align(char **addr, Py_ssize_t *size)
+{
+    Py_uintptr_t pagesize = (Py_uintptr_t) sysconf(_SC_PAGESIZE);
+    Py_uintptr_t offset = (Py_uintptr_t) *addr % pagesize;
+    *addr -= offset;
+    *size += offset;
+}
+#endif
+
+/* Write back the modified pages of the given mapped memory area to
+ * the underlying file.  Returns 0 on success, an errno value otherwise.
+ */
+static int
+Numba_memmap_sync(char *addr, Py_ssize_t size)
+{
+    if (size <= 0)
+        return 0;
+#ifdef _WIN32
+    if (!FlushViewOfFile(addr, (SIZE_T) size))
+        return (int) GetLastError();
+    return 0;
+#else
+    page_align(&addr, &size);
+    if (msync(addr, (size_t) size, MS_SYNC))
+        return errno;
+    return 0;
+#endif
+}
+
+/* Advise the OS about the expected access pattern to the given mapped
+ * memory area.  Returns 0 on success, an errno value otherwise.
+ * The advice is ignored on platforms not supporting it.
+ */
+static int
+Numba_memmap_advise(char *addr, Py_ssize_t size, int advice)
+{
+#if !defined(_WIN32) && defined(POSIX_MADV_NORMAL)
+    int posix_advice;
+
+    if (size <= 0)
+        return 0;
+    switch (advice) {
+    case NUMBA_MADV_NORMAL:
+        posix_advice = POSIX_MADV_NORMAL;
+        break;
+    case NUMBA_MADV_RANDOM:
+        posix_advice = POSIX_MADV_RANDOM;
+        break;
+    case NUMBA_MADV_SEQUENTIAL:
+        posix_advice = POSIX_MADV_SEQUENTIAL;
+        break;
+    case NUMBA_MADV_WILLNEED:
+        posix_advice = POSIX_MADV_WILLNEED;
+        break;
+    case NUMBA_MADV_DONTNEED:
+        posix_advice = POSIX_MADV_DONTNEED;
+        break;
+    default:
+        return EINVAL;
+    }
+    page_align(&addr, &size);
+    /* posix_madvise() returns the error number rather than setting errno */
+    return posix_madvise(addr, (size_t) size, posix_advice);
+#else
+    if (advice < NUMBA_MADV_NORMAL || advice > NUMBA_MADV_DONTNEED)
+        return EINVAL;
+    return 0;
+#endif
+}
+
 /* Logic for raising an arbitrary object.  Adapted from CPython's ceval.c.
    This *consumes* a reference count to its argument. */
 static int
@@ -1608,12 +1775,18 @@ build_c_helpers_dict(void)
     declmethod(set_list_private_data);
     declmethod(reset_list_private_data);
     declmethod(unpack_slice);
+#if PY_VERSION_HEX >= 0x03030000
+    declmethod(extract_unicode);
+    declmethod(hash_unicode);
+#endif
     declmethod(do_raise);
     declmethod(unpickle);
     declmethod(rnd_shuffle);
     declmethod(rnd_init);
     declmethod(poisson_ptrs);
     declmethod(attempt_nocopy_reshape);
+    declmethod(memmap_sync);
+    declmethod(memmap_advise);
 
     declpointer(py_random_state);
     declpointer(np_random_state);
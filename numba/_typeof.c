@@ -34,6 +34,9 @@ static PyObject *structured_dtypes;
 
 static PyObject *str_typeof_pyval = NULL;
 
+/* numpy.memmap, whose instances are typed differently from other arrays */
+static PyTypeObject *memmap_type = NULL;
+
 
 /*
  * Type fingerprint computation.
@@ -268,6 +271,9 @@ compute_fingerprint(string_writer_t *w, PyObject *val)
         PyArrayObject *ary = (PyArrayObject *) val;
         int ndim = PyArray_NDIM(ary);
 
+        if (memmap_type != NULL && PyObject_TypeCheck(val, memmap_type))
+            goto _unrecognized;
+
         TRY(string_writer_put_char, w, OP_NP_ARRAY);
         TRY(string_writer_put_int32, w, ndim);
         if (PyArray_IS_C_CONTIGUOUS(ary))
@@ -716,6 +722,10 @@ typeof_typecode(PyObject *dispatcher, PyObject *val)
     }
     /* Array handling */
     else if (PyType_IsSubtype(tyobj, &PyArray_Type)) {
+        /* The array typecode caches don't distinguish memory-mapped
+           arrays */
+        if (memmap_type != NULL && PyType_IsSubtype(tyobj, memmap_type))
+            return typecode_using_fingerprint(dispatcher, val);
         return typecode_ndarray(dispatcher, (PyArrayObject*)val);
     }
 
@@ -819,5 +829,18 @@ typeof_init(PyObject *self, PyObject *args)
     if (str_typeof_pyval == NULL)
         return NULL;
 
+    tmpobj = PyImport_ImportModule("numpy");
+    if (tmpobj == NULL)
+        return NULL;
+    memmap_type = (PyTypeObject *) PyObject_GetAttrString(tmpobj, "memmap");
+    Py_DECREF(tmpobj);
+    if (memmap_type == NULL)
+        return NULL;
+    if (!PyType_Check(memmap_type)) {
+        PyErr_SetString(PyExc_TypeError, "numpy.memmap is not a type");
+        Py_CLEAR(memmap_type);
+        return NULL;
+    }
+
     Py_RETURN_NONE;
 }
@@ -37,6 +37,15 @@ class Flags(utils.ConfigOptions):
         'nrt': False,
         'no_rewrites': False,
         'error_model': 'python',
+        # Tuple of (argument index, value) pairs for arguments whose
+        # value is frozen as a compile-time constant
+        'static_args': (),
+        # Run array expressions on the worker threads
+        # (see numba.npyufunc.parallel)
+        'auto_parallel': False,
+        # Alignment in bytes of the data of new arrays
+        # (0 = use NUMBA_ARRAY_ALIGNMENT)
+        'array_alignment': 0,
     }
 
 
@@ -276,8 +285,12 @@ class Pipeline(object):
             subtargetoptions['enable_boundcheck'] = True
         if flags.nrt:
             subtargetoptions['enable_nrt'] = True
+            if config.NRT_TRACE:
+                subtargetoptions['enable_nrt_trace'] = True
         error_model = callconv.error_models[flags.error_model](targetctx.call_conv)
         subtargetoptions['error_model'] = error_model
+        subtargetoptions['array_alignment'] = (flags.array_alignment or
+                                               config.ARRAY_ALIGNMENT)
 
         self.targetctx = targetctx.subtarget(**subtargetoptions)
         self.library = library
@@ -405,6 +418,8 @@ class Pipeline(object):
         # Do not recursively loop lift
         outer_flags.unset('enable_looplift')
         loop_flags.unset('enable_looplift')
+        # Argument indices don't carry over to the lifted loops
+        loop_flags.set('static_args', ())
         if not self.flags.enable_pyobject_looplift:
             loop_flags.unset('enable_pyobject')
 
@@ -427,6 +442,12 @@ class Pipeline(object):
                                     func_attr=self.func_attr)
             return cres
 
+    def stage_fold_static_args(self):
+        """
+        Replace static arguments with their frozen constant value
+        """
+        fold_static_args(self.interp, dict(self.flags.static_args))
+
     def stage_objectmode_frontend(self):
         """
         Front-end: Analyze bytecode, generate Numba IR, infer types
@@ -610,6 +631,9 @@ class Pipeline(object):
         if not self.flags.force_pyobject:
             pm.create_pipeline("nopython")
             pm.add_stage(self.stage_analyze_bytecode, "analyzing bytecode")
+            if self.flags.static_args:
+                pm.add_stage(self.stage_fold_static_args,
+                             "folding static arguments")
             pm.add_stage(self.stage_nopython_frontend, "nopython frontend")
             pm.add_stage(self.stage_annotate_type, "annotate type")
             if not self.flags.no_rewrites:
@@ -737,6 +761,20 @@ def translate_stage(bytecode):
     return interp
 
 
+def fold_static_args(interp, static_args):
+    """
+    Rewrite the argument assignments of *interp* for the arguments
+    in *static_args* (a mapping of argument index to value) as
+    constant assignments, so that type inference and LLVM see the value.
+    """
+    for blk in interp.blocks.values():
+        for inst in blk.body:
+            if (isinstance(inst, ir.Assign) and isinstance(inst.value, ir.Arg)
+                    and inst.value.index in static_args):
+                value = static_args[inst.value.index]
+                inst.value = ir.Const(value, loc=inst.value.loc)
+
+
 def type_inference_stage(typingctx, interp, args, return_type, locals={}):
     if len(args) != interp.arg_count:
         raise TypeError("Mismatch number of argument types")
@@ -1,5 +1,6 @@
 from __future__ import print_function, division, absolute_import
 
+import multiprocessing
 import struct
 import sys
 import os
@@ -38,6 +39,17 @@ def _parse_cc(text):
         return int(grp[0]), int(grp[1])
 
 
+def _parse_alignment(text):
+    """
+    Parse an array alignment in bytes, which must be a power of two.
+    """
+    align = int(text)
+    if align <= 0 or align & (align - 1):
+        raise ValueError("array alignment must be a power of two, got %r"
+                         % (text,))
+    return align
+
+
 class _EnvReloader(object):
 
     def __init__(self):
@@ -78,7 +90,7 @@ class _EnvReloader(object):
                 return ctor(value)
             except Exception:
                 warnings.warn("environ %s defined but failed to parse '%s'" %
-                              (name, res), RuntimeWarning)
+                              (name, value), RuntimeWarning)
                 return default
 
         # Print warnings to screen about function compilation
@@ -155,6 +167,43 @@ class _EnvReloader(object):
         ENABLE_AVX = _readenv("NUMBA_ENABLE_AVX", int,
                               _cpu_name not in ('corei7-avx', 'core-avx-i'))
 
+        # Maximum number of value specializations compiled for a function
+        # with static arguments, before falling back to runtime arguments
+        MAX_STATIC_SPECIALIZATIONS = _readenv(
+            "NUMBA_MAX_STATIC_SPECIALIZATIONS", int, 16)
+
+        # Number of worker threads of the parallel targets
+        NUM_THREADS = _readenv("NUMBA_NUM_THREADS", int,
+                               multiprocessing.cpu_count())
+
+        # Scheduling policy of the parallel ufunc target: "static",
+        # "dynamic" or "guided"
+        PARALLEL_SCHEDULE = _readenv("NUMBA_PARALLEL_SCHEDULE", str, "static")
+
+        # Chunk size for the "dynamic" and "guided" schedules (0 = default)
+        PARALLEL_CHUNKSIZE = _readenv("NUMBA_PARALLEL_CHUNKSIZE", int, 0)
+
+        # Number of elements below which parallel ufuncs run serially
+        PARALLEL_THRESHOLD = _readenv("NUMBA_PARALLEL_THRESHOLD", int, 1000)
+
+        # Placement of the worker threads on the CPUs: "none", "compact"
+        # or "scatter"
+        THREAD_AFFINITY = _readenv("NUMBA_THREAD_AFFINITY", str, "none")
+
+        # Maximum number of bytes of freed small blocks kept for reuse by
+        # each thread, with the NRT pool allocator (0 = use the system
+        # allocator)
+        NRT_POOL = _readenv("NUMBA_NRT_POOL", int, 0)
+
+        # Attribute the NRT allocations of compiled functions to their
+        # source lines (see numba.runtime.nrt)
+        NRT_TRACE = _readenv("NUMBA_NRT_TRACE", int, 0)
+
+        # Alignment in bytes of the data of arrays allocated in nopython
+        # mode (32 suits AVX, 64 suits AVX-512)
+        ARRAY_ALIGNMENT = _readenv("NUMBA_ARRAY_ALIGNMENT", _parse_alignment,
+                                   32)
+
         # Disable jit for debugging
         DISABLE_JIT = _readenv("NUMBA_DISABLE_JIT", int, 0)
 
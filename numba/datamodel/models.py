@@ -212,6 +212,8 @@ class PrimitiveModel(DataModel):
 @register_default(types.Macro)
 @register_default(types.NumberClass)
 @register_default(types.NamedTupleClass)
+@register_default(types.TypedListClass)
+@register_default(types.ClassType)
 @register_default(types.DType)
 @register_default(types.ArrayFlags)
 class OpaqueModel(PrimitiveModel):
@@ -627,8 +629,14 @@ class ListPayloadModel(StructModel):
         ]
         super(ListPayloadModel, self).__init__(dmm, fe_type, members)
 
+    def inner_types(self):
+        # The payload holds its own references to the list items (see
+        # listobj.py), so NRT-managed items don't need to be traversed.
+        return []
+
 
 @register_default(types.List)
+@register_default(types.TypedList)
 class ListModel(StructModel):
     def __init__(self, dmm, fe_type):
         payload_type = types.ListPayload(fe_type)
@@ -654,7 +662,165 @@ class ListIterModel(StructModel):
         super(ListIterModel, self).__init__(dmm, fe_type, members)
 
 
+@register_default(types.DictPayload)
+class DictPayloadModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        dict_type = fe_type.dict_type
+        # The entries are (hash, key, value) triples; the hash is negative
+        # for empty and deleted entries.
+        entry_type = types.BaseTuple.from_types((types.intp,
+                                                 dict_type.key_type,
+                                                 dict_type.value_type))
+        members = [
+            # Number of live entries
+            ('used', types.intp),
+            # Number of live and deleted entries
+            ('fill', types.intp),
+            # Number of entries - 1 (a power of two - 1)
+            ('mask', types.intp),
+            # This member is only used only for reflected dicts
+            ('dirty', types.boolean),
+            # Actually an inlined var-sized array
+            ('entries', entry_type),
+        ]
+        super(DictPayloadModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.Dict)
+class DictModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        payload_type = types.DictPayload(fe_type)
+        members = [
+            # The meminfo data points to a DictPayload
+            ('meminfo', types.MemInfoPointer(payload_type)),
+            # This member is only used only for reflected dicts
+            ('parent', types.pyobject),
+        ]
+        super(DictModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.DictIter)
+class DictIterModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        payload_type = types.DictPayload(fe_type.dict_type)
+        members = [
+            # The meminfo data points to a DictPayload (shared with the
+            # original dict object)
+            ('meminfo', types.MemInfoPointer(payload_type)),
+            ('index', types.EphemeralPointer(types.intp)),
+            ]
+        super(DictIterModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.DictView)
+class DictViewModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [('dict', fe_type.dict_type)]
+        super(DictViewModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.SetPayload)
+class SetPayloadModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        set_type = fe_type.set_type
+        # The entries are (hash, key) pairs; the layout is otherwise the
+        # same as a dict payload's, plus the search finger of set.pop().
+        entry_type = types.BaseTuple.from_types((types.intp, set_type.dtype))
+        members = [
+            ('used', types.intp),
+            ('fill', types.intp),
+            ('mask', types.intp),
+            ('dirty', types.boolean),
+            # The index where set.pop() resumes searching for a live entry
+            ('finger', types.intp),
+            ('entries', entry_type),
+        ]
+        super(SetPayloadModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.Set)
+class SetModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        payload_type = types.SetPayload(fe_type)
+        members = [
+            # The meminfo data points to a SetPayload
+            ('meminfo', types.MemInfoPointer(payload_type)),
+            # This member is only used only for reflected sets
+            ('parent', types.pyobject),
+        ]
+        super(SetModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.SetIter)
+class SetIterModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        payload_type = types.SetPayload(fe_type.set_type)
+        members = [
+            # The meminfo data points to a SetPayload (shared with the
+            # original set object)
+            ('meminfo', types.MemInfoPointer(payload_type)),
+            ('index', types.EphemeralPointer(types.intp)),
+            ]
+        super(SetIterModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.UnicodeType)
+class UnicodeModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [
+            # The character data, in the PEP 393 representation
+            ('data', types.voidptr),
+            # Number of characters
+            ('length', types.intp),
+            # Character width in bytes (1, 2 or 4)
+            ('kind', types.int32),
+            # Cached hash value, or -1
+            ('hash', types.intp),
+            # The meminfo owns the data (it is NULL for constants)
+            ('meminfo', types.MemInfoPointer(types.voidptr)),
+            # The original str object, if the string was unboxed
+            ('parent', types.pyobject),
+        ]
+        super(UnicodeModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.UnicodeIteratorType)
+class UnicodeIteratorModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [('index', types.EphemeralPointer(types.intp)),
+                   ('data', fe_type.yield_type)]
+        super(UnicodeIteratorModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.ClassInstanceType)
+class InstanceModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        data_type = fe_type.get_data_type()
+        members = [
+            # The meminfo data points to the instance's fields
+            ('meminfo', types.MemInfoPointer(data_type)),
+            # Cached pointer to the fields
+            ('data', types.CPointer(data_type)),
+        ]
+        super(InstanceModel, self).__init__(dmm, fe_type, members)
+
+
+@register_default(types.ClassDataType)
+class InstanceDataModel(StructModel):
+    def __init__(self, dmm, fe_type):
+        # The fields are laid out in declaration order
+        struct = fe_type.instance_type.struct
+        members = list(struct.items())
+        super(InstanceDataModel, self).__init__(dmm, fe_type, members)
+
+    def inner_types(self):
+        # The fields' references are released by the instance's destructor
+        # (see classobj.py), so NRT-managed fields don't need to be traversed.
+        return []
+
+
 @register_default(types.Array)
+@register_default(types.MemMapArray)
 @register_default(types.Buffer)
 @register_default(types.ByteArray)
 @register_default(types.Bytes)
@@ -7,6 +7,7 @@ import warnings
 from . import config, sigutils
 from .errors import DeprecationError
 from .targets import registry
+from .dispatcher import StaticArgsDispatcher
 from . import cuda
 
 # -----------------------------------------------------------------------------
@@ -34,7 +35,8 @@ _msg_deprecated_signature_arg = ("Deprecated keyword argument `{0}`. "
                                  "Signatures should be passed as the first "
                                  "positional argument.")
 
-def jit(signature_or_function=None, locals={}, target='cpu', cache=False, **options):
+def jit(signature_or_function=None, locals={}, target='cpu', cache=False,
+        static_args=(), **options):
     """
     This decorator is used to compile a Python function into native code.
     
@@ -55,6 +57,12 @@ def jit(signature_or_function=None, locals={}, target='cpu', cache=False, **opti
         Specifies the target platform to compile for. Valid targets are cpu,
         gpu, npyufunc, and cuda. Defaults to cpu.
 
+    static_args: tuple
+        Names or positions of arguments to specialize on their value
+        rather than their type.  Each distinct combination of values gets
+        its own compiled version where those arguments are constants.
+        Supported values are scalars, strings, None and tuples of those.
+
     targetoptions: 
         For a cpu target, valid options are:
             nopython: bool
@@ -147,15 +155,19 @@ def jit(signature_or_function=None, locals={}, target='cpu', cache=False, **opti
         pyfunc = signature_or_function
         sigs = None
 
+    if static_args and sigs is not None:
+        raise TypeError("static_args cannot be combined with explicit "
+                        "signatures")
+
     wrapper = _jit(sigs, locals=locals, target=target, cache=cache,
-                   targetoptions=options)
+                   targetoptions=options, static_args=static_args)
     if pyfunc is not None:
         return wrapper(pyfunc)
     else:
         return wrapper
 
 
-def _jit(sigs, locals, target, cache, targetoptions):
+def _jit(sigs, locals, target, cache, targetoptions, static_args=()):
     dispatcher = registry.target_registry[target]
 
     def wrapper(func):
@@ -163,8 +175,13 @@ def _jit(sigs, locals, target, cache, targetoptions):
             return cuda.jit(func)
         if config.DISABLE_JIT and not target == 'npyufunc':
             return DisableJitWrapper(func)
-        disp = dispatcher(py_func=func, locals=locals,
-                          targetoptions=targetoptions)
+        if static_args:
+            disp = StaticArgsDispatcher(dispatcher, func, static_args,
+                                        locals=locals,
+                                        targetoptions=targetoptions)
+        else:
+            disp = dispatcher(py_func=func, locals=locals,
+                              targetoptions=targetoptions)
         if cache:
             disp.enable_caching()
         if sigs is not None:
@@ -12,16 +12,17 @@ import os
 from .six.moves import cPickle as pickle
 import struct
 import sys
+import threading
 import warnings
 
 import numba
-from numba import _dispatcher, compiler, utils, types
+from numba import _dispatcher, compiler, config, utils, types
 from numba.typeconv.rules import default_type_manager
 from numba import sigutils, serialize, types, typing
 from numba.typing.templates import fold_arguments
 from numba.typing.typeof import typeof
 from numba.bytecode import get_code_object
-from numba.six import create_bound_method, next
+from numba.six import create_bound_method, next, string_types
 from .config import NumbaWarning
 
 
@@ -285,10 +286,17 @@ class Overloaded(_OverloadedBase):
         self.locals = locals
         self._cache = NullCache()
 
+        if targetoptions.get('parallel'):
+            # Parallel code calls into the workqueue, whose symbols are
+            # only registered once the backend is imported
+            from .npyufunc import parallel
+
         self.typingctx.insert_overloaded(self)
 
     def enable_caching(self):
-        self._cache = FunctionCache(self.py_func)
+        self._cache = FunctionCache(
+            self.py_func, self.targetoptions.get('_static_args', ()),
+            self.targetoptions.get('array_alignment'))
 
     def __get__(self, obj, objtype=None):
         '''Allow a JIT function to be bound as a method to an object'''
@@ -432,6 +440,185 @@ class LiftedLoop(_OverloadedBase):
             return cres.entry_point
 
 
+# Python types whose values can be frozen as static arguments
+_static_scalar_types = utils.INT_TYPES + (bool, float, complex, type(None),
+                                         string_types)
+
+
+def _static_key(val):
+    """
+    Compute the specialization key for the static argument value *val*.
+    The value's type is part of the key, since e.g. 1, 1.0 and True
+    compare (and hash) equal but need distinct specializations.
+    Floats are keyed by their exact representation, so that NaNs (which
+    never compare equal) share a specialization while 0.0 and -0.0 don't.
+    """
+    if isinstance(val, tuple):
+        return (type(val), tuple(_static_key(v) for v in val))
+    if isinstance(val, float):
+        return (type(val), val.hex())
+    if isinstance(val, complex):
+        return (type(val), val.real.hex(), val.imag.hex())
+    if isinstance(val, _static_scalar_types):
+        return (type(val), val)
+    raise TypeError("unsupported value for a static argument: %r" % (val,))
+
+
+class StaticArgsDispatcher(object):
+    """
+    Implementation of the user-facing dispatcher objects created using
+    the @jit decorator with *static_args*.
+
+    A separate dispatcher (of class *dispatcher_class*) is created for each
+    distinct combination of static argument values, and those values are
+    frozen as constants in its compiled code.  Once
+    config.MAX_STATIC_SPECIALIZATIONS combinations have been seen, other
+    values are handled by a generic dispatcher which receives the static
+    arguments at runtime.
+    """
+
+    def __init__(self, dispatcher_class, py_func, static_args, locals={},
+                 targetoptions={}):
+        self._dispatcher_class = dispatcher_class
+        self.py_func = py_func
+        self.locals = locals
+        self.targetoptions = targetoptions
+        self._pysig = utils.pysignature(py_func)
+        self.static_args = self._normalize_static_args(static_args)
+        self._caching = False
+        # A mapping of specialization keys to (values, dispatcher) pairs
+        self._specializations = utils.OrderedDict()
+        self._generic = None
+        self._lock = threading.Lock()
+
+        functools.update_wrapper(self, py_func)
+
+    def _normalize_static_args(self, static_args):
+        """
+        Turn *static_args* (argument names or positions) into a sorted
+        tuple of (index, name) pairs.
+        """
+        if isinstance(static_args, string_types + utils.INT_TYPES):
+            static_args = (static_args,)
+        params = list(self._pysig.parameters.values())
+        names = [p.name for p in params]
+        indices = set()
+        for arg in static_args:
+            if isinstance(arg, utils.INT_TYPES):
+                if not 0 <= arg < len(params):
+                    raise ValueError("static argument index out of range: %d"
+                                     % (arg,))
+                index = arg
+            elif arg in names:
+                index = names.index(arg)
+            else:
+                raise ValueError("%r is not an argument of %s"
+                                 % (arg, self.py_func.__name__))
+            param = params[index]
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                raise ValueError("%r cannot be a static argument"
+                                 % (param.name,))
+            indices.add(index)
+        if not indices:
+            raise ValueError("no static argument given")
+        return tuple((i, names[i]) for i in sorted(indices))
+
+    @property
+    def specializations(self):
+        """
+        A list of (static values, dispatcher) pairs, in creation order.
+        """
+        return list(self._specializations.values())
+
+    def enable_caching(self):
+        self._caching = True
+        for _, disp in self.specializations:
+            disp.enable_caching()
+        if self._generic is not None:
+            self._generic.enable_caching()
+
+    def _make_dispatcher(self, static):
+        targetoptions = dict(self.targetoptions)
+        if static:
+            targetoptions['_static_args'] = static
+        disp = self._dispatcher_class(py_func=self.py_func,
+                                      locals=self.locals,
+                                      targetoptions=targetoptions)
+        if self._caching:
+            disp.enable_caching()
+        return disp
+
+    def _get_generic(self):
+        if self._generic is None:
+            self._generic = self._make_dispatcher(())
+        return self._generic
+
+    def get_dispatcher(self, values):
+        """
+        Get the dispatcher compiling the function for the given tuple
+        of static argument *values*, creating it if necessary.
+        """
+        key = _static_key(values)
+        try:
+            return self._specializations[key][1]
+        except KeyError:
+            pass
+        with self._lock:
+            if key in self._specializations:
+                return self._specializations[key][1]
+            if (len(self._specializations)
+                    >= config.MAX_STATIC_SPECIALIZATIONS):
+                return self._get_generic()
+            static = tuple((index, value) for (index, _), value
+                           in zip(self.static_args, values))
+            disp = self._make_dispatcher(static)
+            self._specializations[key] = values, disp
+            return disp
+
+    def __call__(self, *args, **kws):
+        bound = self._pysig.bind(*args, **kws)
+        values = []
+        for _, name in self.static_args:
+            try:
+                values.append(bound.arguments[name])
+            except KeyError:
+                values.append(self._pysig.parameters[name].default)
+        return self.get_dispatcher(tuple(values))(*args, **kws)
+
+    def __get__(self, obj, objtype=None):
+        '''Allow a JIT function to be bound as a method to an object'''
+        if obj is None:  # Unbound method
+            return self
+        else:  # Bound method
+            return create_bound_method(self, obj)
+
+    def __repr__(self):
+        return "%s(%s, static_args=%s)" % (
+            type(self).__name__, self.py_func,
+            tuple(name for _, name in self.static_args))
+
+    def __reduce__(self):
+        """
+        Reduce the instance for pickling.  Specializations are not
+        serialized and will be recompiled on demand.
+        """
+        return (serialize._rebuild_reduction,
+                (self.__class__, self._dispatcher_class,
+                 serialize._reduce_function(self.py_func),
+                 tuple(index for index, _ in self.static_args),
+                 self.locals, self.targetoptions))
+
+    @classmethod
+    def _rebuild(cls, dispatcher_class, func_reduced, static_args, locals,
+                 targetoptions):
+        """
+        Rebuild a StaticArgsDispatcher instance after it was __reduce__'d.
+        """
+        py_func = serialize._rebuild_function(*func_reduced)
+        return cls(dispatcher_class, py_func, static_args, locals,
+                   targetoptions)
+
+
 # Initialize typeof machinery
 _dispatcher.typeof_init(dict((str(t), t._code) for t in types.number_domain))
 
@@ -569,7 +756,7 @@ class FunctionCache(object):
     _source_stamp = None
     _locator_classes = [_SourceCacheLocator, _IPythonCacheLocator]
 
-    def __init__(self, py_func):
+    def __init__(self, py_func, static_args=(), array_alignment=None):
         try:
             qualname = py_func.__qualname__
         except AttributeError:
@@ -581,6 +768,8 @@ class FunctionCache(object):
         self._fullname = "%s.%s" % (modname, qualname)
         self._is_closure = bool(py_func.__closure__)
         self._lineno = py_func.__code__.co_firstlineno
+        self._static_args = static_args
+        self._array_alignment = array_alignment
         abiflags = getattr(sys, 'abiflags', '')
 
         # Find a locator
@@ -693,9 +882,15 @@ class FunctionCache(object):
     def _index_key(self, sig, codegen):
         """
         Compute index key for the given signature and codegen.
-        It includes a description of the OS and target architecture.
-        """
-        return (sig, codegen.magic_tuple())
+        It includes a description of the OS and target architecture,
+        the alignment of allocated arrays, and the frozen values of
+        static arguments if any.
+        """
+        alignment = int(self._array_alignment or config.ARRAY_ALIGNMENT)
+        key = (sig, codegen.magic_tuple(), alignment)
+        if self._static_args:
+            key += (self._static_args,)
+        return key
 
     def _data_name(self, number):
         return self._data_name_pattern.format(number=number)
@@ -0,0 +1,7 @@
+"""
+Classes whose instances are native structures, usable from nopython
+mode functions.
+"""
+from __future__ import print_function, division, absolute_import
+
+from .decorators import jitclass
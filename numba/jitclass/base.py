@@ -0,0 +1,201 @@
+"""
+Implementation of jitclasses.  A jitclass is a Python class wrapping
+a reference to a native instance (see numba.targets.classobj); its
+methods and field accessors are nopython mode functions.
+"""
+from __future__ import print_function, division, absolute_import
+
+from collections import OrderedDict
+import inspect
+
+from numba import njit, six, types, utils
+from numba.runtime.nrt import MemInfo
+from numba.targets import classobj
+from numba.targets.registry import CPUTarget
+
+
+class JitClassType(type):
+    """
+    The metaclass of jitclasses.
+    """
+
+    @property
+    def _numba_type_(cls):
+        return cls.class_type
+
+    def __call__(cls, *args, **kwargs):
+        # Instances are created and initialized in compiled code
+        return cls._ctor(*args, **kwargs)
+
+
+class _Box(object):
+    """
+    Base class of jitclasses: a Python object holding a reference to
+    a native instance.
+    """
+    __slots__ = ('_meminfo', '_meminfo_ptr')
+
+    @property
+    def _numba_type_(self):
+        return type(self).class_type.instance_type
+
+    @classmethod
+    def _from_meminfo(cls, ptr):
+        """
+        Wrap the instance at meminfo *ptr*, stealing a reference to
+        the meminfo.  Used when boxing instances.
+        """
+        self = object.__new__(cls)
+        self._meminfo = MemInfo(ptr)
+        self._meminfo_ptr = ptr
+        return self
+
+
+def _validate_spec(spec):
+    """
+    Return *spec* as an ordered mapping of field names to Numba types.
+    """
+    if isinstance(spec, dict):
+        spec = list(spec.items())
+    struct = OrderedDict()
+    for item in spec:
+        try:
+            name, typ = item
+        except (TypeError, ValueError):
+            raise TypeError("spec entries should be (name, type) tuples, "
+                            "got %r" % (item,))
+        if not isinstance(name, six.string_types):
+            raise TypeError("spec keys should be strings, got %r" % (name,))
+        if not isinstance(typ, types.Type):
+            raise TypeError("spec values should be Numba types, got %r"
+                            % (typ,))
+        if name in struct:
+            raise TypeError("duplicate field %r in spec" % (name,))
+        struct[name] = typ
+    return struct
+
+
+# Class attributes which don't need compiling
+_ignored_members = frozenset(['__module__', '__doc__', '__dict__',
+                              '__weakref__', '__qualname__', '__slots__',
+                              '__firstlineno__', '__static_attributes__'])
+
+def _get_members(cls, struct):
+    """
+    Return the (methods, props) mappings of Python functions for the
+    members of *cls*.
+    """
+    if cls.__bases__ != (object,):
+        raise TypeError("jitclass %r cannot have base classes" % (cls,))
+    methods = {}
+    props = {}
+    for name, value in cls.__dict__.items():
+        if name in _ignored_members:
+            continue
+        if name in struct:
+            raise TypeError("name %r is used by both a field and a class "
+                            "member" % (name,))
+        if isinstance(value, property):
+            if value.fget is None:
+                raise TypeError("property %r has no getter" % (name,))
+            if value.fdel is not None:
+                raise TypeError("deleter of property %r is not supported"
+                                % (name,))
+            props[name] = {'get': value.fget, 'set': value.fset}
+        elif inspect.isfunction(value):
+            methods[name] = value
+        else:
+            raise TypeError("unsupported class member %r in jitclass: %r"
+                            % (name, value))
+    return methods, props
+
+
+_field_accessors_template = """
+def getter(inst):
+    return inst.{name}
+
+def setter(inst, value):
+    inst.{name} = value
+"""
+
+def _make_field_property(name):
+    ns = {}
+    six.exec_(_field_accessors_template.format(name=name), ns)
+    getter = njit(ns['getter'])
+    setter = njit(ns['setter'])
+    return property(getter, setter)
+
+
+def _make_method(name, method):
+    def wrapper(self, *args, **kwargs):
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.py_func.__doc__
+    return wrapper
+
+
+def _make_property(prop):
+    getter = prop['get']
+    return property(getter, prop['set'], doc=getter.py_func.__doc__)
+
+
+_constructor_template = """
+def ctor({args}):
+    return cls({args})
+"""
+
+def _make_constructor(jitcls, init):
+    """
+    Return a jitted function creating instances of *jitcls*, taking the
+    same arguments as the *init* Python function.
+    """
+    if init is None:
+        argnames = []
+    else:
+        pysig = utils.pysignature(init)
+        params = list(pysig.parameters.values())[1:]
+        for param in params:
+            if param.kind != param.POSITIONAL_OR_KEYWORD:
+                raise TypeError("unsupported parameter %r in __init__"
+                                % (param.name,))
+        argnames = [param.name for param in params]
+    ns = {'cls': jitcls}
+    six.exec_(_constructor_template.format(args=', '.join(argnames)), ns)
+    ctor = ns['ctor']
+    if init is not None:
+        ctor.__defaults__ = init.__defaults__
+    return njit(ctor)
+
+
+def register_class_type(cls, spec):
+    """
+    Create the jitclass for Python class *cls* with the given field *spec*.
+    """
+    struct = _validate_spec(spec)
+    methods, props = _get_members(cls, struct)
+
+    jitmethods = dict((name, njit(func)) for name, func in methods.items())
+    jitprops = {}
+    for name, prop in props.items():
+        jitprops[name] = dict(
+            (k, None if func is None else njit(func))
+            for k, func in prop.items())
+
+    dct = {'__slots__': (),
+           '__module__': cls.__module__,
+           '__doc__': cls.__doc__}
+    for name in struct:
+        dct[name] = _make_field_property(name)
+    for name, method in jitmethods.items():
+        if name != '__init__':
+            dct[name] = _make_method(name, method)
+    for name, prop in jitprops.items():
+        dct[name] = _make_property(prop)
+
+    jitcls = JitClassType(cls.__name__, (_Box,), dct)
+    class_type = types.ClassType(jitcls, struct, jitmethods, jitprops)
+    jitcls.class_type = class_type
+    classobj.install_methods(CPUTarget.target_context, class_type)
+    jitcls._ctor = _make_constructor(jitcls, methods.get('__init__'))
+    return jitcls
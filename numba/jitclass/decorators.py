@@ -0,0 +1,26 @@
+from __future__ import print_function, division, absolute_import
+
+from numba import config
+from .base import register_class_type
+
+
+def jitclass(spec):
+    """
+    A decorator compiling a Python class into a jitclass, whose instances
+    are native structures that can be passed to and created by nopython
+    mode functions without boxing.
+
+    *spec* gives the names and Numba types of the instance fields, as a
+    list of (name, type) tuples or an ordered mapping.  The fields are
+    laid out in this order in the native structure.
+
+    Methods and properties are compiled in nopython mode.  Instances are
+    reference-counted: the references held by their fields are released
+    when the last reference to the instance goes away.
+    """
+    def wrap(cls):
+        if config.DISABLE_JIT:
+            return cls
+        return register_class_type(cls, spec)
+
+    return wrap
@@ -231,8 +231,29 @@ class BaseLower(object):
 class Lower(BaseLower):
     GeneratorLower = generators.GeneratorLower
 
+    def pre_block(self, block):
+        super(Lower, self).pre_block(block)
+        # Line of the last allocation site declared in the block
+        self._trace_line = None
+
+    def declare_allocation_site(self, inst):
+        """
+        Declare the line of *inst* as the site of the next NRT allocations,
+        for tracing them.
+        """
+        if inst.loc.line != self._trace_line:
+            self.context.nrt_trace_site(self.builder, self.fndesc.qualname,
+                                        inst.loc)
+            self._trace_line = inst.loc.line
+        if (isinstance(inst, ir.Assign) and isinstance(inst.value, ir.Expr)
+                and inst.value.op == 'call'):
+            # The callee may declare its own sites
+            self._trace_line = None
+
     def lower_inst(self, inst):
         self.debug_print(str(inst))
+        if self.context.enable_nrt_trace and self.context.nrt_trace_sites:
+            self.declare_allocation_site(inst)
         if isinstance(inst, ir.Assign):
             ty = self.typeof(inst.target.name)
             val = self.lower_assign(ty, inst)
@@ -270,31 +291,14 @@ class Lower(BaseLower):
             self.call_conv.return_value(self.builder, retval)
 
         elif isinstance(inst, ir.SetItem):
-            target = self.loadvar(inst.target.name)
-            value = self.loadvar(inst.value.name)
-            index = self.loadvar(inst.index.name)
-
-            targetty = self.typeof(inst.target.name)
-            valuety = self.typeof(inst.value.name)
-            indexty = self.typeof(inst.index.name)
-
             signature = self.fndesc.calltypes[inst]
-            assert signature is not None
-            impl = self.context.get_function('setitem', signature)
-
-            # Convert argument to match
-            if isinstance(targetty, types.Optional):
-                target = self.context.cast(self.builder, target, targetty,
-                                           targetty.type)
-            else:
-                assert targetty == signature.args[0]
-
-            index = self.context.cast(self.builder, index, indexty,
-                                      signature.args[1])
-            value = self.context.cast(self.builder, value, valuety,
-                                      signature.args[2])
+            return self.lower_setitem(inst.target, inst.index, inst.value,
+                                      signature)
 
-            return impl(self.builder, (target, index, value))
+        elif isinstance(inst, ir.StoreMap):
+            signature = self.fndesc.calltypes[inst]
+            return self.lower_setitem(inst.dct, inst.key, inst.value,
+                                      signature)
 
         elif isinstance(inst, ir.DelItem):
             target = self.loadvar(inst.target.name)
@@ -346,6 +350,32 @@ class Lower(BaseLower):
         else:
             raise NotImplementedError(type(inst))
 
+    def lower_setitem(self, target_var, index_var, value_var, signature):
+        target = self.loadvar(target_var.name)
+        value = self.loadvar(value_var.name)
+        index = self.loadvar(index_var.name)
+
+        targetty = self.typeof(target_var.name)
+        valuety = self.typeof(value_var.name)
+        indexty = self.typeof(index_var.name)
+
+        assert signature is not None
+        impl = self.context.get_function('setitem', signature)
+
+        # Convert argument to match
+        if isinstance(targetty, types.Optional):
+            target = self.context.cast(self.builder, target, targetty,
+                                       targetty.type)
+        else:
+            assert targetty == signature.args[0]
+
+        index = self.context.cast(self.builder, index, indexty,
+                                  signature.args[1])
+        value = self.context.cast(self.builder, value, valuety,
+                                  signature.args[2])
+
+        return impl(self.builder, (target, index, value))
+
     def lower_raise(self, inst):
         if inst.exception is None:
             # Reraise
@@ -751,6 +781,24 @@ class Lower(BaseLower):
                         for val, fromty in zip(itemvals, itemtys)]
             return self.context.build_list(self.builder, resty, castvals)
 
+        elif expr.op == "build_map":
+            items = []
+            for k, v in expr.items:
+                key = self.context.cast(self.builder, self.loadvar(k.name),
+                                        self.typeof(k.name), resty.key_type)
+                value = self.context.cast(self.builder, self.loadvar(v.name),
+                                          self.typeof(v.name),
+                                          resty.value_type)
+                items.append((key, value))
+            return self.context.build_map(self.builder, resty, items)
+
+        elif expr.op == "build_set":
+            itemvals = [self.loadvar(i.name) for i in expr.items]
+            itemtys = [self.typeof(i.name) for i in expr.items]
+            castvals = [self.context.cast(self.builder, val, fromty, resty.dtype)
+                        for val, fromty in zip(itemvals, itemtys)]
+            return self.context.build_set(self.builder, resty, castvals)
+
         elif expr.op == "cast":
             val = self.loadvar(expr.value.name)
             ty = self.typeof(expr.value.name)
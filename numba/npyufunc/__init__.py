@@ -2,10 +2,45 @@
 from __future__ import print_function, division, absolute_import
 from .decorators import Vectorize, GUVectorize, vectorize, guvectorize
 from ._internal import PyUFunc_None, PyUFunc_Zero, PyUFunc_One
-from . import _internal, array_exprs
+from . import _internal, array_exprs, parfor
 if hasattr(_internal, 'PyUFunc_ReorderableNone'):
     PyUFunc_ReorderableNone = _internal.PyUFunc_ReorderableNone
-del _internal, array_exprs
+del _internal, array_exprs, parfor
+
+
+# The parallel backend starts its worker threads when imported, so it is
+# only loaded when first needed.
+
+def get_num_threads():
+    """
+    Return the number of worker threads used by the parallel code.
+    """
+    from . import parallel
+    return parallel.get_num_threads()
+
+
+def set_num_threads(n):
+    """
+    Set the number of worker threads used by the parallel code.
+    """
+    from . import parallel
+    parallel.set_num_threads(n)
+
+
+def get_thread_affinity():
+    """
+    Return the placement policy of the worker threads of the parallel code.
+    """
+    from . import parallel
+    return parallel.get_thread_affinity()
+
+
+def set_thread_affinity(policy):
+    """
+    Set the placement policy of the worker threads of the parallel code.
+    """
+    from . import parallel
+    parallel.set_thread_affinity(policy)
 
 
 def _init():
@@ -18,8 +53,19 @@ def _init():
         from numba.cuda.vectorizers import CUDAGUFuncVectorize
         return CUDAGUFuncVectorize
 
+    def init_parallel_vectorize():
+        from .parallel import ParallelUFuncBuilder
+        return ParallelUFuncBuilder
+
+    def init_parallel_guvectorize():
+        from .parallel import ParallelGUFuncBuilder
+        return ParallelGUFuncBuilder
+
     Vectorize.target_registry.ondemand['cuda'] = init_vectorize
     GUVectorize.target_registry.ondemand['cuda'] = init_guvectorize
+    Vectorize.target_registry.ondemand['parallel'] = init_parallel_vectorize
+    GUVectorize.target_registry.ondemand['parallel'] = \
+        init_parallel_guvectorize
 
 _init()
 del _init
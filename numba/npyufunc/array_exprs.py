@@ -4,6 +4,7 @@ import ast
 from collections import defaultdict
 import sys
 
+import numpy
 from numpy import ufunc
 
 from .. import ir, types, rewrites, six
@@ -21,10 +22,16 @@ class RewriteArrayExprs(rewrites.Rewrite):
     '''
     def __init__(self, pipeline, *args, **kws):
         super(RewriteArrayExprs, self).__init__(pipeline, *args, **kws)
+        # Computed lazily by _get_use_counts()
+        self._use_counts = None
+        # Whether the array expressions are run on the worker threads
+        self.parallel = self.pipeline.flags.auto_parallel
         # Install a lowering hook if we are using this rewrite.
         special_ops = self.pipeline.targetctx.special_ops
         if 'arrayexpr' not in special_ops:
             special_ops['arrayexpr'] = _lower_array_expr
+        if 'arrayreduce' not in special_ops:
+            special_ops['arrayreduce'] = _lower_array_reduce
 
     def match(self, block, typemap, calltypes):
         '''Using typing and a basic block, search the basic block for array
@@ -35,7 +42,7 @@ class RewriteArrayExprs(rewrites.Rewrite):
         # We can trivially reject everything if there are fewer than 2
         # calls in the type results since we'll only rewrite when
         # there are two or more calls.
-        if len(calltypes) > 1:
+        if len(calltypes) > 1 or (self.parallel and calltypes):
             self.crnt_block = block
             self.typemap = typemap
             self.matches = matches
@@ -43,10 +50,32 @@ class RewriteArrayExprs(rewrites.Rewrite):
             self.array_assigns = array_assigns
             const_assigns = {}
             self.const_assigns = const_assigns
-            assignments = (instr
-                           for instr in block.body
-                           if isinstance(instr, ir.Assign))
-            for instr in assignments:
+            # Names of the array operations which can be fused into
+            # their consumer.
+            fusable = set()
+            self.fusable = fusable
+            # A map from the names of reduction results to the
+            # assignment calling the reduction, the reduction name, the
+            # reduced array variable and the assignment of the bound
+            # method, if any.
+            reductions = {}
+            self.reductions = reductions
+            getattr_assigns = {}
+            # For each array operation, the names of the variables its
+            # (possibly fused) expression tree reads.
+            leaves = {}
+            # Position of each array operation, of the last assignment
+            # to each variable, and of the last statement which may have
+            # side effects.
+            positions = {}
+            last_assigned = {}
+            last_barrier = -1
+            for pos, instr in enumerate(block.body):
+                if isinstance(instr, ir.Del):
+                    continue
+                if not isinstance(instr, ir.Assign):
+                    last_barrier = pos
+                    continue
                 target_name = instr.target.name
                 expr = instr.value
                 if isinstance(expr, ir.Expr) and isinstance(
@@ -66,26 +95,137 @@ class RewriteArrayExprs(rewrites.Rewrite):
                         #       doesn't have the `.template` attribute.
                         if hasattr(func_type, 'template'):
                             func_key = getattr(func_type.template, 'key', None)
-                            if isinstance(func_key, (ufunc, DUFunc)):
+                            if (isinstance(func_key, (ufunc, DUFunc)) and
+                                len(expr.args) == func_key.nin):
                                 # If so, match it as a potential subexpression.
                                 array_assigns[target_name] = instr
                     # Now check to see if we matched anything of
                     # interest; if so, check to see if one of the
                     # expression's dependencies isn't also a matching
-                    # expression.
+                    # expression which can be fused into this one.
                     if target_name in array_assigns:
-                        operands = set(var.name
-                                       for var in expr.list_vars())
-                        if operands.intersection(array_assigns.keys()):
+                        positions[target_name] = pos
+                        leaves[target_name] = expr_leaves = set()
+                        nested = False
+                        for operand in self._get_operands(expr):
+                            operand_name = operand.name
+                            if (operand_name in array_assigns and
+                                self._is_fusable(operand_name,
+                                                 positions[operand_name],
+                                                 leaves[operand_name],
+                                                 last_assigned,
+                                                 last_barrier)):
+                                fusable.add(operand_name)
+                                expr_leaves.update(leaves[operand_name])
+                                nested = True
+                            else:
+                                expr_leaves.add(operand_name)
+                        if nested or self.parallel:
                             # We've identified a nested array
-                            # expression.  Rewrite it.
+                            # expression (or, when running array
+                            # expressions in parallel, a single array
+                            # operation).  Rewrite it.
                             matches.append(target_name)
+                    elif not _is_pure_expr(expr):
+                        last_barrier = pos
                 elif isinstance(expr, ir.Const):
                     # Track constants since we might need them for an
                     # array expression.
                     const_assigns[target_name] = expr
+                elif isinstance(expr, ir.Expr) and expr.op == 'getattr':
+                    # Track attributes since they may be reduction methods.
+                    getattr_assigns[target_name] = instr
+                elif isinstance(expr, ir.Expr) and expr.op == 'call':
+                    # Could be a reduction over an array expression.
+                    reduction = self._match_reduction(expr, getattr_assigns)
+                    if reduction is not None:
+                        operand_name = reduction[1].name
+                        if (operand_name in array_assigns and
+                            self._is_fusable(operand_name,
+                                             positions[operand_name],
+                                             leaves[operand_name],
+                                             last_assigned, last_barrier)):
+                            fusable.add(operand_name)
+                            reductions[target_name] = (instr,) + reduction
+                            matches.append(target_name)
+                    else:
+                        last_barrier = pos
+                elif isinstance(expr, ir.Expr) and not _is_pure_expr(expr):
+                    last_barrier = pos
+                last_assigned[target_name] = pos
         return len(matches) > 0
 
+    def _match_reduction(self, expr, getattr_assigns):
+        '''If the call expression *expr* is a reduction supported by
+        _lower_array_reduce() over a single array of numbers, return
+        the reduction name, the reduced array variable and the
+        assignment of the bound method (or None if a Numpy function is
+        called).  Otherwise, return None.
+        '''
+        if expr.kws or expr.vararg:
+            return None
+        func_type = self.typemap.get(expr.func.name, None)
+        if isinstance(func_type, types.BoundFunction):
+            reducer = _array_method_reducers.get(func_type.template.key)
+            method_assign = getattr_assigns.get(expr.func.name)
+            if reducer is None or method_assign is None or expr.args:
+                return None
+            operand = method_assign.value.value
+        elif isinstance(func_type, types.Function):
+            reducer = _numpy_reducers.get(func_type.template.key)
+            if reducer is None or len(expr.args) != 1:
+                return None
+            operand, = expr.args
+            method_assign = None
+        else:
+            return None
+        arr_ty = self.typemap[operand.name]
+        if not isinstance(arr_ty, types.Array):
+            return None
+        domain = (types.real_domain if reducer in ('min', 'max')
+                  else types.number_domain)
+        if arr_ty.dtype not in domain:
+            return None
+        return reducer, operand, method_assign
+
+    def _get_use_counts(self):
+        '''Return the number of definitions and the number of uses of
+        each variable in the function being rewritten.
+        '''
+        if self._use_counts is None:
+            def_counts = defaultdict(int)
+            use_counts = defaultdict(int)
+            for block in self.pipeline.interp.blocks.values():
+                for instr in block.body:
+                    for var in instr.list_vars():
+                        use_counts[var.name] += 1
+                    if isinstance(instr, ir.Assign):
+                        # The target was counted as a use above.
+                        use_counts[instr.target.name] -= 1
+                        def_counts[instr.target.name] += 1
+            self._use_counts = def_counts, use_counts
+        return self._use_counts
+
+    def _is_fusable(self, name, def_pos, def_leaves, last_assigned,
+                    last_barrier):
+        '''Whether the array operation defining *name* at position
+        *def_pos* of the current block can be fused into the operation
+        using it.  Temporaries always can, since they only live within a
+        single statement.  User variables can if they are defined and
+        used exactly once, and if neither a statement with side effects
+        nor an assignment to one of the variables read by the operation
+        (*def_leaves*) happens between the definition and the use.
+        '''
+        if name.startswith('$'):
+            return True
+        def_counts, use_counts = self._get_use_counts()
+        if def_counts[name] != 1 or use_counts[name] != 1:
+            return False
+        if last_barrier > def_pos:
+            return False
+        return all(last_assigned.get(leaf, -1) <= def_pos
+                   for leaf in def_leaves)
+
     def _get_array_operator(self, ir_expr):
         ir_op = ir_expr.op
         if ir_op in ('unary', 'binop'):
@@ -130,6 +270,10 @@ class RewriteArrayExprs(rewrites.Rewrite):
         dead_vars = set()
         used_vars = defaultdict(int)
         for match in self.matches:
+            if match in self.reductions:
+                self._handle_reduction(match, replace_map, dead_vars,
+                                       used_vars)
+                continue
             instr = self.array_assigns[match]
             expr = instr.value
             arr_inps = []
@@ -137,22 +281,16 @@ class RewriteArrayExprs(rewrites.Rewrite):
             new_expr = ir.Expr(op='arrayexpr',
                                loc=expr.loc,
                                expr=arr_expr,
-                               ty=self.typemap[instr.target.name])
+                               ty=self.typemap[instr.target.name],
+                               parallel=self.parallel)
             new_instr = ir.Assign(new_expr, instr.target, instr.loc)
             replace_map[instr] = new_instr
             self.array_assigns[instr.target.name] = new_instr
             for operand in self._get_operands(expr):
                 operand_name = operand.name
-                if operand_name in self.array_assigns:
-                    child_assign = self.array_assigns[operand_name]
-                    child_expr = child_assign.value
-                    child_operands = child_expr.list_vars()
-                    for operand in child_operands:
-                        used_vars[operand.name] += 1
-                    arr_inps.append(self._translate_expr(child_expr))
-                    if child_assign.target.is_temp:
-                        dead_vars.add(child_assign.target.name)
-                        replace_map[child_assign] = None
+                if operand_name in self.fusable:
+                    arr_inps.append(self._fuse_operand(
+                        operand_name, replace_map, dead_vars, used_vars))
                 elif operand_name in self.const_assigns:
                     arr_inps.append(self.const_assigns[operand_name])
                 else:
@@ -160,6 +298,38 @@ class RewriteArrayExprs(rewrites.Rewrite):
                     arr_inps.append(operand)
         return replace_map, dead_vars, used_vars
 
+    def _fuse_operand(self, operand_name, replace_map, dead_vars, used_vars):
+        '''Remove the array operation defining *operand_name*, and return
+        its translation as an array expression tree.
+        '''
+        child_assign = self.array_assigns[operand_name]
+        child_expr = child_assign.value
+        child_operands = child_expr.list_vars()
+        for operand in child_operands:
+            used_vars[operand.name] += 1
+        dead_vars.add(child_assign.target.name)
+        replace_map[child_assign] = None
+        return self._translate_expr(child_expr)
+
+    def _handle_reduction(self, match, replace_map, dead_vars, used_vars):
+        '''Replace the reduction call defining *match* with an
+        "arrayreduce" expression over the array expression it reduces.
+        '''
+        instr, reducer, operand, method_assign = self.reductions[match]
+        expr = instr.value
+        new_expr = ir.Expr(op='arrayreduce',
+                           loc=expr.loc,
+                           reducer=reducer,
+                           expr=self._fuse_operand(operand.name, replace_map,
+                                                   dead_vars, used_vars),
+                           ty=self.typemap[operand.name],
+                           return_type=self.typemap[match],
+                           parallel=self.parallel)
+        replace_map[instr] = ir.Assign(new_expr, instr.target, instr.loc)
+        if method_assign is not None:
+            dead_vars.add(method_assign.target.name)
+            replace_map[method_assign] = None
+
     def _get_final_replacement(self, replacement_map, instr):
         '''Find the final replacement instruction for a given initial
         instruction by chasing instructions in a map from instructions
@@ -212,6 +382,29 @@ class RewriteArrayExprs(rewrites.Rewrite):
         return result
 
 
+# IR expressions which don't have side effects on arrays: array
+# operations can be moved across them.
+_pure_expr_ops = frozenset(['binop', 'unary', 'getattr', 'getitem',
+                            'static_getitem', 'build_tuple', 'cast',
+                            'arrayexpr'])
+
+
+def _is_pure_expr(expr):
+    return expr.op in _pure_expr_ops
+
+# Reductions which can be fused with the array expression they reduce.
+_numpy_reducers = {
+    numpy.sum: 'sum',
+    numpy.prod: 'prod',
+    numpy.min: 'min',
+    numpy.max: 'max',
+    numpy.mean: 'mean',
+}
+
+_array_method_reducers = dict(('array.' + name, name)
+                              for name in _numpy_reducers.values())
+
+
 _unaryops = {
     '+' : ast.UAdd,
     '-' : ast.USub,
@@ -287,8 +480,11 @@ def _arr_expr_to_ast(expr):
         "Don't know how to translate array expression '%r'" % (expr,))
 
 
-def _lower_array_expr(lowerer, expr):
-    '''Lower an array expression built by RewriteArrayExprs.
+def _compile_array_expr_kernel(lowerer, expr):
+    '''Compile the scalar function computing an element of the array
+    expression *expr*, and return the outer signature of the array
+    expression, the values of its arguments and a kernel class
+    calling the function.
     '''
     expr_name = "__numba_array_expr_%s" % (hex(hash(expr)).replace("-", "_"))
     expr_var_list = expr.list_vars()
@@ -346,10 +542,28 @@ def _lower_array_expr(lowerer, expr):
             cast_args = [self.cast(val, inty, outty)
                          for val, inty, outty in arg_zip]
             result = self.context.call_internal(
-                builder, cres.fndesc, inner_sig, cast_args)
+                self.builder, cres.fndesc, inner_sig, cast_args)
             return self.cast(result, inner_sig.return_type,
                              self.outer_sig.return_type)
 
     args = [lowerer.loadvar(name) for name in expr_args]
+    return outer_sig, args, ExprKernel
+
+
+def _lower_array_expr(lowerer, expr):
+    '''Lower an array expression built by RewriteArrayExprs.
+    '''
+    outer_sig, args, kernel_class = _compile_array_expr_kernel(lowerer, expr)
     return npyimpl.numpy_ufunc_kernel(
-        context, builder, outer_sig, args, ExprKernel, explicit_output=False)
+        lowerer.context, lowerer.builder, outer_sig, args, kernel_class,
+        explicit_output=False, parallel=expr.parallel)
+
+
+def _lower_array_reduce(lowerer, expr):
+    '''Lower a reduction of an array expression built by
+    RewriteArrayExprs, in a single loop without a temporary array.
+    '''
+    outer_sig, args, kernel_class = _compile_array_expr_kernel(lowerer, expr)
+    return npyimpl.numpy_reduce_kernel(
+        lowerer.context, lowerer.builder, outer_sig, args, kernel_class,
+        expr.reducer, expr.return_type, parallel=expr.parallel)
@@ -3,7 +3,6 @@ import inspect
 
 from . import _internal, dufunc
 from .ufuncbuilder import UFuncBuilder, GUFuncBuilder
-from .parallel import ParallelUFuncBuilder
 
 from numba.cuda.vectorizers import CUDAVectorize, CUDAGUFuncVectorize 
 from numba.targets.registry import TargetRegistry
@@ -25,8 +24,7 @@ class _BaseVectorize(object):
 
 
 class Vectorize(_BaseVectorize):
-    target_registry = TargetRegistry({'cpu': UFuncBuilder,
-                                      'parallel': ParallelUFuncBuilder})
+    target_registry = TargetRegistry({'cpu': UFuncBuilder})
 
     def __new__(cls, func, **kws):
         identity = cls.get_identity(kws)
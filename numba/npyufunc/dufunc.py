@@ -82,6 +82,7 @@ class DUFunc(_internal._DUFunc):
         self._install_type()
         self._lower_me = DUFuncLowerer(self)
         self._install_cg()
+        self._reducer = None
 
     @property
     def nin(self):
@@ -107,6 +108,62 @@ class DUFunc(_internal._DUFunc):
     def identity(self):
         return self.ufunc.identity
 
+    def _get_reducer(self, array):
+        """Return the ParallelReducer computing reductions of *array*
+        with the compiled kernels, or None if NumPy's implementation
+        should be used.
+        """
+        if (self.ufunc.nin != 2 or self.ufunc.nout != 1 or
+                self.identity is None or self.targetoptions.get('forceobj')):
+            return None
+        if self._reducer is None:
+            from .reduction import ParallelReducer
+            self._reducer = ParallelReducer(self._dispatcher.py_func,
+                                            self.identity)
+        if not self._reducer.can_run(array):
+            return None
+        # The element-wise function must map the array's type to itself
+        ty = numpy_support.from_dtype(array.dtype)
+        sig, cres = self.find_ewise_function((ty, ty))
+        if sig is None and not self._frozen:
+            self._compile_for_argtys((ty, ty))
+            sig, cres = self.find_ewise_function((ty, ty))
+        if sig is None or cres.objectmode or sig.return_type != ty:
+            return None
+        return self._reducer
+
+    def reduce(self, array, axis=0, dtype=None, out=None, keepdims=False):
+        """Reduce *array* along *axis*, as numpy.ufunc.reduce() does.
+        Large arrays are reduced in parallel, using the worker threads of
+        the parallel targets, if the DUFunc has an identity.
+        """
+        arr = numpy.asarray(array, dtype=dtype)
+        reducer = self._get_reducer(arr)
+        if reducer is None:
+            return super(DUFunc, self).reduce(array, axis=axis, dtype=dtype,
+                                              out=out, keepdims=keepdims)
+        result = reducer.reduce(arr, axis, keepdims)
+        if out is not None:
+            out[...] = result
+            return out
+        return result[()] if result.ndim == 0 else result
+
+    def accumulate(self, array, axis=0, dtype=None, out=None):
+        """Accumulate *array* along *axis*, as numpy.ufunc.accumulate()
+        does.  Large arrays are processed in parallel, using the worker
+        threads of the parallel targets, if the DUFunc has an identity.
+        """
+        arr = numpy.asarray(array, dtype=dtype)
+        reducer = self._get_reducer(arr)
+        if reducer is None:
+            return super(DUFunc, self).accumulate(array, axis=axis,
+                                                  dtype=dtype, out=out)
+        result = reducer.accumulate(arr, axis)
+        if out is not None:
+            out[...] = result
+            return out
+        return result
+
     def _compile_for_args(self, *args, **kws):
         nin = self.ufunc.nin
         args_len = len(args)
@@ -12,19 +12,72 @@ to steal works from other threads.
 from __future__ import print_function, absolute_import
 import sys
 import os
+import glob
 import multiprocessing
+import re
+import warnings
 
 import numpy as np
 import llvmlite.llvmpy.core as lc
 import llvmlite.binding as ll
-from numba.npyufunc import ufuncbuilder
-from numba import types, utils
+from numba.npyufunc import ufuncbuilder, wrappers
+from numba.numpy_support import as_dtype
+from numba import cgutils, config, types, utils
+from numba.targets.callconv import excinfo_ptr_t
 
 
 NUM_CPU = max(1, multiprocessing.cpu_count())
 
+# The number of worker threads launched, which is the maximum number
+# of active threads
+NUM_THREADS = max(1, config.NUM_THREADS)
+
+# Scheduling policies of the parallel ufunc kernels
+SCHEDULES = ('static', 'dynamic', 'guided')
+
+# Placement policies of the worker threads on the CPUs
+AFFINITIES = ('none', 'compact', 'scatter')
+
+
+def _pop_schedule_options(targetoptions):
+    """
+    Remove the *schedule* and *chunksize* options from *targetoptions*
+    and return them, validated, defaulting to the NUMBA_PARALLEL_SCHEDULE
+    and NUMBA_PARALLEL_CHUNKSIZE configuration.
+    """
+    schedule = targetoptions.pop('schedule', config.PARALLEL_SCHEDULE)
+    chunksize = targetoptions.pop('chunksize', config.PARALLEL_CHUNKSIZE)
+    if schedule not in SCHEDULES:
+        raise ValueError("Unsupported schedule: %r (expected one of %s)"
+                         % (schedule, ', '.join(SCHEDULES)))
+    if not isinstance(chunksize, utils.INT_TYPES) or chunksize < 0:
+        raise ValueError("chunksize must be a non-negative integer, got %r"
+                         % (chunksize,))
+    return schedule, chunksize
+
+
+def _pop_threshold_option(targetoptions, default):
+    """
+    Remove the *threshold* option from *targetoptions* and return it,
+    validated: below this number of outer loop iterations, the kernel runs
+    on the calling thread.
+    """
+    threshold = targetoptions.pop('threshold', default)
+    if not isinstance(threshold, utils.INT_TYPES) or threshold < 0:
+        raise ValueError("threshold must be a non-negative integer, got %r"
+                         % (threshold,))
+    return threshold
+
 
 class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
+    def __init__(self, py_func, identity=None, targetoptions={}):
+        targetoptions = dict(targetoptions)
+        self.schedule, self.chunksize = _pop_schedule_options(targetoptions)
+        self.threshold = _pop_threshold_option(targetoptions,
+                                               config.PARALLEL_THRESHOLD)
+        super(ParallelUFuncBuilder, self).__init__(
+            py_func=py_func, identity=identity, targetoptions=targetoptions)
+
     def build(self, cres, sig):
         _launch_threads()
 
@@ -33,7 +86,9 @@ class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
         signature = cres.signature
         library = cres.library
         llvm_func = library.get_function(cres.fndesc.llvm_func_name)
-        wrapper = build_ufunc_wrapper(library, ctx, llvm_func, signature)
+        wrapper = build_ufunc_wrapper(library, ctx, llvm_func, signature,
+                                      self.schedule, self.chunksize,
+                                      self.threshold)
         ptr = library.get_pointer_to_function(wrapper.name)
         # Get dtypes
         dtypenums = [np.dtype(a.name).num for a in signature.args]
@@ -42,16 +97,76 @@ class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
         return dtypenums, ptr, keepalive
 
 
-def build_ufunc_wrapper(library, ctx, lfunc, signature):
+class ParallelGUFuncBuilder(ufuncbuilder.GUFuncBuilder):
+    def __init__(self, py_func, signature, identity=None, targetoptions={}):
+        # The kernel runs on the worker threads, without the GIL
+        targetoptions = dict(targetoptions, nopython=True)
+        self.schedule, self.chunksize = _pop_schedule_options(targetoptions)
+        # The cost of the core computation is unknown: always run in
+        # parallel by default
+        self.threshold = _pop_threshold_option(targetoptions, 0)
+        super(ParallelGUFuncBuilder, self).__init__(
+            py_func=py_func, signature=signature, identity=identity,
+            targetoptions=targetoptions)
+
+    def build(self, cres):
+        """
+        Returns (dtype numbers, function ptr, EnvironmentObject)
+        """
+        _launch_threads()
+
+        # Build wrapper for ufunc entry point
+        ctx = cres.target_context
+        library = cres.library
+        signature = cres.signature
+        llvm_func = library.get_function(cres.fndesc.llvm_func_name)
+        wrapper, env = build_gufunc_wrapper(library, ctx, llvm_func,
+                                            signature, self.sin, self.sout,
+                                            fndesc=cres.fndesc,
+                                            env=cres.environment,
+                                            schedule=self.schedule,
+                                            chunksize=self.chunksize,
+                                            threshold=self.threshold)
+        ptr = library.get_pointer_to_function(wrapper.name)
+
+        # Get dtypes
+        dtypenums = []
+        for a in signature.args:
+            if isinstance(a, types.Array):
+                ty = a.dtype
+            else:
+                ty = a
+            dtypenums.append(as_dtype(ty).num)
+        return dtypenums, ptr, env
+
+
+def build_gufunc_wrapper(library, ctx, llvm_func, signature, sin, sout,
+                         fndesc, env, schedule='static', chunksize=0,
+                         threshold=0):
+    innerfunc, env = wrappers.build_gufunc_wrapper(library, ctx, llvm_func,
+                                                   signature, sin, sout,
+                                                   fndesc=fndesc, env=env)
+    # NumPy passes the size of each distinct core dimension
+    core_ndim = len(set(sym for syms in sin + sout for sym in syms))
+    lfunc = build_gufunc_kernel(library, ctx, innerfunc, signature,
+                                core_ndim, schedule, chunksize, threshold)
+    library.add_ir_module(lfunc.module)
+    return lfunc, env
+
+
+def build_ufunc_wrapper(library, ctx, lfunc, signature, schedule='static',
+                        chunksize=0, threshold=0):
     innerfunc = ufuncbuilder.build_ufunc_wrapper(library, ctx, lfunc, signature,
                                                  objmode=False, env=None,
                                                  envptr=None)
-    lfunc = build_ufunc_kernel(library, ctx, innerfunc, signature)
+    lfunc = build_ufunc_kernel(library, ctx, innerfunc, signature,
+                               schedule, chunksize, threshold)
     library.add_ir_module(lfunc.module)
     return lfunc
 
 
-def build_ufunc_kernel(library, ctx, innerfunc, sig):
+def build_ufunc_kernel(library, ctx, innerfunc, sig, schedule='static',
+                       chunksize=0, threshold=0):
     """Wrap the original CPU ufunc with a parallel dispatcher.
 
     Args
@@ -65,6 +180,19 @@ def build_ufunc_kernel(library, ctx, innerfunc, sig):
     sig
         type signature of the ufunc
 
+    schedule
+        "static", "dynamic" or "guided" (see below)
+
+    chunksize
+        the number of elements of the chunks for the "dynamic" schedule,
+        or their minimum number for the "guided" schedule (0 for the
+        default)
+
+    threshold
+        the number of elements below which the original CPU ufunc is
+        called directly on the calling thread, as handing the work over to
+        the worker threads would cost more than it saves
+
     Details
     -------
 
@@ -73,11 +201,40 @@ def build_ufunc_kernel(library, ctx, innerfunc, sig):
     void ufunc_kernel(char **args, npy_intp *dimensions, npy_intp* steps,
                       void* data)
 
-    Divide the work equally across all threads and let the last thread take all
-    the left over.
+    With the "static" schedule, divide the work equally across all threads
+    and let the last thread take all the left over.
+
+    With the "dynamic" and "guided" schedules, each thread repeatedly
+    takes the next chunk of elements from a shared atomic counter, until
+    all are processed, so that threads finishing their work early help
+    the others.  "dynamic" chunks all have the same size, by default
+    a 16th of each thread's share; "guided" chunks start large (half of
+    each thread's share of the remaining elements) and decrease.
+    """
+    # Array count is input signature plus 1 (due to output array)
+    array_count = len(sig.args) + 1
+    return _build_parallel_kernel(library, ctx, innerfunc, array_count, 0,
+                                  'parallel.ufunc.wrapper', schedule,
+                                  chunksize, threshold)
+
 
+def build_gufunc_kernel(library, ctx, innerfunc, sig, core_ndim,
+                        schedule='static', chunksize=0, threshold=0):
+    """Wrap the original CPU gufunc with a parallel dispatcher, splitting
+    the outer loop across all threads as build_ufunc_kernel() does.
 
+    *core_ndim* is the number of core dimensions of the gufunc, which
+    follow the outer loop count in the *dimensions* argument.
     """
+    array_count = len(sig.args)
+    return _build_parallel_kernel(library, ctx, innerfunc, array_count,
+                                  core_ndim, 'parallel.gufunc.wrapper',
+                                  schedule, chunksize, threshold)
+
+
+def _build_parallel_kernel(library, ctx, innerfunc, array_count, core_ndim,
+                           module_name, schedule='static', chunksize=0,
+                           threshold=0):
     # Declare types and function
     byte_t = lc.Type.int(8)
     byte_ptr_t = lc.Type.pointer(byte_t)
@@ -89,7 +246,7 @@ def build_ufunc_kernel(library, ctx, innerfunc, sig):
                                              lc.Type.pointer(intp_t),
                                              byte_ptr_t])
 
-    mod = library.create_ir_module('parallel.ufunc.wrapper')
+    mod = library.create_ir_module(module_name)
     lfunc = mod.add_function(fnty, name=".kernel")
     innerfunc = mod.add_function(fnty, name=innerfunc.name)
 
@@ -100,28 +257,30 @@ def build_ufunc_kernel(library, ctx, innerfunc, sig):
 
     args, dimensions, steps, data = lfunc.args
 
-    # Distribute work
-    total = builder.load(dimensions)
-    ncpu = lc.Constant.int(total.type, NUM_CPU)
+    if threshold > 0:
+        # Small inputs are processed serially by the calling thread
+        is_small = builder.icmp_signed('<', builder.load(dimensions),
+                                       lc.Constant.int(intp_t, threshold))
+        with cgutils.if_unlikely(builder, is_small):
+            builder.call(innerfunc, lfunc.args)
+            builder.ret_void()
 
-    count = builder.udiv(total, ncpu)
+    if schedule != 'static':
+        _build_dynamic_dispatch(builder, innerfunc, array_count, core_ndim,
+                                schedule, chunksize)
+        return lfunc
 
-    count_list = []
-    remain = total
-
-    for i in range(NUM_CPU):
-        space = builder.alloca(intp_t)
-        count_list.append(space)
+    # Distribute work
+    total = builder.load(dimensions)
+    nthreads = _get_num_threads(builder, intp_t)
 
-        if i == NUM_CPU - 1:
-            # Last thread takes all leftover
-            builder.store(remain, space)
-        else:
-            builder.store(count, space)
-            remain = builder.sub(remain, count)
+    count = builder.udiv(total, nthreads)
 
-    # Array count is input signature plus 1 (due to output array)
-    array_count = len(sig.args) + 1
+    # The core dimensions are the same for all threads
+    core_dims = [builder.load(builder.gep(dimensions,
+                                          [lc.Constant.int(lc.Type.int(),
+                                                           i + 1)]))
+                 for i in range(core_ndim)]
 
     # Get the increment step for each array
     steps_list = []
@@ -130,122 +289,512 @@ def build_ufunc_kernel(library, ctx, innerfunc, sig):
         step = builder.load(ptr)
         steps_list.append(step)
 
-    # Get the array argument set for each thread
-    args_list = []
-    for i in range(NUM_CPU):
-        space = builder.alloca(byte_ptr_t,
-                               size=lc.Constant.int(lc.Type.int(), array_count))
-        args_list.append(space)
+    # The dimensions and array argument set of each thread, allocated for
+    # the maximum number of threads
+    all_dims = builder.alloca(intp_t,
+                              size=lc.Constant.int(lc.Type.int(),
+                                                   NUM_THREADS *
+                                                   (core_ndim + 1)))
+    all_args = builder.alloca(byte_ptr_t,
+                              size=lc.Constant.int(lc.Type.int(),
+                                                   NUM_THREADS * array_count))
 
+    # Declare external functions
+    add_task, ready, synchronize = _declare_workqueue_functions(mod)
+
+    # Add tasks for queue; one per thread
+    as_void_ptr = lambda arg: builder.bitcast(arg, byte_ptr_t)
+
+    with cgutils.for_range(builder, nthreads, intp=intp_t) as loop:
+        i = loop.index
+        start = builder.mul(count, i)
+        # Last thread takes all leftover
+        is_last = builder.icmp_unsigned('==', i, builder.sub(
+            nthreads, lc.Constant.int(intp_t, 1)))
+        each_count = builder.select(is_last, builder.sub(total, start),
+                                    count)
+
+        each_dims = builder.gep(all_dims, [builder.mul(
+            i, lc.Constant.int(intp_t, core_ndim + 1))])
+        builder.store(each_count, each_dims)
+        for j, dim in enumerate(core_dims):
+            builder.store(dim, builder.gep(each_dims,
+                                           [lc.Constant.int(lc.Type.int(),
+                                                            j + 1)]))
+
+        each_args = builder.gep(all_args, [builder.mul(
+            i, lc.Constant.int(intp_t, array_count))])
         for j in range(array_count):
             # For each array, compute subarray pointer
-            dst = builder.gep(space, [lc.Constant.int(lc.Type.int(), j)])
+            dst = builder.gep(each_args, [lc.Constant.int(lc.Type.int(), j)])
             src = builder.gep(args, [lc.Constant.int(lc.Type.int(), j)])
 
             baseptr = builder.load(src)
             base = builder.ptrtoint(baseptr, intp_t)
-            multiplier = lc.Constant.int(count.type, i)
-            offset = builder.mul(steps_list[j], builder.mul(count, multiplier))
+            offset = builder.mul(steps_list[j], start)
             addr = builder.inttoptr(builder.add(base, offset), baseptr.type)
 
             builder.store(addr, dst)
 
-    # Declare external functions
+        innerargs = [as_void_ptr(x) for x
+                     in [innerfunc, each_args, each_dims, steps, data]]
+
+        builder.call(add_task, innerargs)
+
+    # Signal worker that we are ready
+    builder.call(ready, ())
+    # Wait for workers
+    builder.call(synchronize, ())
+    builder.ret_void()
+
+    return lfunc
+
+
+def _build_dynamic_dispatch(builder, innerfunc, array_count, core_ndim,
+                            schedule, chunksize):
+    """
+    Emit the body of a parallel kernel (see _build_parallel_kernel())
+    using the "dynamic" or "guided" *schedule*: one task per thread
+    runs a scheduling loop taking chunks of the outer loop from a shared
+    counter.
+    """
+    lfunc = builder.function
+    mod = builder.module
+    args, dimensions, steps, data = lfunc.args
+    fnty = lfunc.type.pointee
+    byte_ptr_t = lc.Type.pointer(lc.Type.int(8))
+    intp_t = dimensions.type.pointee
+    const = lambda v: lc.Constant.int(intp_t, v)
+
+    # The shared scheduling state: the index of the next element, the
+    # total number of elements, the (minimum) chunk size, the number of
+    # threads, followed by the core dimensions of the gufunc.
+    total = builder.load(dimensions)
+    nthreads = _get_num_threads(builder, intp_t)
+    if schedule == 'dynamic' and chunksize == 0:
+        # Default to 16 chunks per thread
+        chunk = builder.udiv(total, builder.mul(nthreads, const(16)))
+        chunk = builder.select(builder.icmp_unsigned('>', chunk, const(1)),
+                               chunk, const(1))
+    else:
+        chunk = const(max(chunksize, 1))
+    state = builder.alloca(intp_t, size=lc.Constant.int(lc.Type.int(),
+                                                        core_ndim + 4))
+    for i, val in enumerate([const(0), total, chunk, nthreads]):
+        builder.store(val, builder.gep(state, [const(i)]))
+    for i in range(core_ndim):
+        dim = builder.load(builder.gep(dimensions, [const(i + 1)]))
+        builder.store(dim, builder.gep(state, [const(i + 4)]))
+
+    # The scheduling loop, run by each task
+    sched = mod.add_function(fnty, name=".kernel.%s" % (schedule,))
+    sched.linkage = lc.LINKAGE_INTERNAL
+    sched_args, sched_state, sched_steps, sched_data = sched.args
+    sb = lc.Builder.new(sched.append_basic_block('entry'))
+    next_ptr = sb.gep(sched_state, [const(0)])
+    total = sb.load(sb.gep(sched_state, [const(1)]))
+    chunk = sb.load(sb.gep(sched_state, [const(2)]))
+    nthreads = sb.load(sb.gep(sched_state, [const(3)]))
+    chunk_args = sb.alloca(byte_ptr_t, size=lc.Constant.int(lc.Type.int(),
+                                                            array_count))
+    chunk_dims = sb.alloca(intp_t, size=lc.Constant.int(lc.Type.int(),
+                                                        core_ndim + 1))
+    for i in range(core_ndim):
+        dim = sb.load(sb.gep(sched_state, [const(i + 4)]))
+        sb.store(dim, sb.gep(chunk_dims, [const(i + 1)]))
+    bb_grab = sched.append_basic_block('grab')
+    bb_run = sched.append_basic_block('run')
+    bb_exit = sched.append_basic_block('exit')
+    sb.branch(bb_grab)
+
+    # Take the next chunk
+    sb.position_at_end(bb_grab)
+    if schedule == 'dynamic':
+        start = sb.atomic_rmw('add', next_ptr, chunk, 'monotonic')
+        sb.cbranch(sb.icmp_signed('<', start, total), bb_run, bb_exit)
+        sb.position_at_end(bb_run)
+        size = sb.sub(total, start)
+        size = sb.select(sb.icmp_signed('<', size, chunk), size, chunk)
+    else:
+        bb_cas = sched.append_basic_block('cas')
+        cur = sb.atomic_rmw('add', next_ptr, const(0), 'monotonic')
+        bb_entry = sb.basic_block
+        sb.branch(bb_cas)
+        sb.position_at_end(bb_cas)
+        start = sb.phi(intp_t)
+        start.add_incoming(cur, bb_entry)
+        bb_try = sched.append_basic_block('try')
+        sb.cbranch(sb.icmp_signed('<', start, total), bb_try, bb_exit)
+        sb.position_at_end(bb_try)
+        remaining = sb.sub(total, start)
+        size = sb.sdiv(remaining, sb.mul(nthreads, const(2)))
+        size = sb.select(sb.icmp_signed('<', size, chunk), chunk, size)
+        size = sb.select(sb.icmp_signed('<', remaining, size),
+                         remaining, size)
+        outpack = sb.cmpxchg(next_ptr, start, sb.add(start, size),
+                             'monotonic')
+        start.add_incoming(sb.extract_value(outpack, 0), bb_try)
+        sb.cbranch(sb.extract_value(outpack, 1), bb_run, bb_cas)
+        sb.position_at_end(bb_run)
+        start = sb.extract_value(outpack, 0)
+
+    # Process the chunk
+    for j in range(array_count):
+        baseptr = sb.load(sb.gep(sched_args, [const(j)]))
+        step = sb.load(sb.gep(sched_steps, [const(j)]))
+        addr = sb.inttoptr(sb.add(sb.ptrtoint(baseptr, intp_t),
+                                  sb.mul(step, start)),
+                           baseptr.type)
+        sb.store(addr, sb.gep(chunk_args, [const(j)]))
+    sb.store(size, chunk_dims)
+    sb.call(innerfunc, [chunk_args, chunk_dims, sched_steps, sched_data])
+    sb.branch(bb_grab)
+
+    sb.position_at_end(bb_exit)
+    sb.ret_void()
+
+    # Add one task per thread
+    add_task, ready, synchronize = _declare_workqueue_functions(mod)
+    as_void_ptr = lambda arg: builder.bitcast(arg, byte_ptr_t)
+    with cgutils.for_range(builder, nthreads, intp=intp_t):
+        builder.call(add_task, [as_void_ptr(x) for x
+                                in [sched, args, state, steps, data]])
+
+    # Signal worker that we are ready
+    builder.call(ready, ())
+    # Wait for workers
+    builder.call(synchronize, ())
+    builder.ret_void()
+
+
+def _declare_workqueue_functions(mod):
+    """
+    Declare the workqueue functions (see workqueue.h) in the LLVM module
+    *mod*, and return them.
+    """
+    byte_ptr_t = lc.Type.pointer(lc.Type.int(8))
     add_task_ty = lc.Type.function(lc.Type.void(), [byte_ptr_t] * 5)
     empty_fnty = lc.Type.function(lc.Type.void(), ())
     add_task = mod.get_or_insert_function(add_task_ty, name='numba_add_task')
     synchronize = mod.get_or_insert_function(empty_fnty,
                                              name='numba_synchronize')
     ready = mod.get_or_insert_function(empty_fnty, name='numba_ready')
+    return add_task, ready, synchronize
 
-    # Add tasks for queue; one per thread
-    as_void_ptr = lambda arg: builder.bitcast(arg, byte_ptr_t)
 
-    for each_args, each_dims in zip(args_list, count_list):
-        innerargs = [as_void_ptr(x) for x
-                     in [innerfunc, each_args, each_dims, steps, data]]
+def _get_num_threads(builder, intp_t):
+    """
+    Emit a call returning the number of active worker threads (see
+    set_num_threads()), as a *intp_t* value.
 
-        builder.call(add_task, innerargs)
+    The result is at most the NUM_THREADS of the compiling process, which
+    sizes the per-thread buffers of the generated code: code loaded from
+    the cache may run in a process with more worker threads.
+    """
+    fnty = lc.Type.function(lc.Type.int(), ())
+    fn = builder.module.get_or_insert_function(fnty,
+                                               name='numba_get_num_threads')
+    res = builder.call(fn, ())
+    if intp_t.width > res.type.width:
+        res = builder.sext(res, intp_t)
+    maxthreads = lc.Constant.int(intp_t, NUM_THREADS)
+    return builder.select(builder.icmp_signed('<', res, maxthreads),
+                          res, maxthreads)
+
+
+def define_parallel_body(context, module, argtys, name):
+    """
+    Define a function computing a chunk of a parallel loop, to be passed
+    to parallel_for().  The function has the Numba calling convention
+    and the signature none(intp start, intp stop, intp chunk, *argtys):
+    it should process iterations [start, stop) of the loop, *chunk*
+    being the index of the chunk, and return with
+    `context.call_conv.return_native_none()`.
+
+    Return the LLVM function, a builder positioned in its entry block,
+    and the values of all its arguments.
+    """
+    fe_argtys = [types.intp] * 3 + list(argtys)
+    fnty = context.call_conv.get_function_type(types.none, fe_argtys)
+    fn = module.get_or_insert_function(fnty, name=module.get_unique_name(name))
+    fn.linkage = lc.LINKAGE_INTERNAL
+    context.call_conv.decorate_function(
+        fn, ['start', 'stop', 'chunk'] +
+            ['arg%d' % i for i in range(len(argtys))],
+        fe_argtys)
+    builder = lc.Builder.new(fn.append_basic_block('entry'))
+    arginfo = context.get_arg_packer(fe_argtys)
+    args = arginfo.from_arguments(builder,
+                                  context.call_conv.get_arguments(fn))
+    return fn, builder, args
+
+
+def parallel_for(context, builder, body, argtys, args, total):
+    """
+    Emit code running the function *body* (see define_parallel_body())
+    over the iterations [0, *total*) of a loop, split into contiguous
+    chunks executed by the worker threads, and waiting for their
+    completion.  *args* are the values of the extra arguments, of
+    Numba types *argtys*, passed to each call of *body*.
+
+    Return the maximum number of chunks (as a Python int: the chunk
+    indices are below it, but only as many chunks as active threads are
+    run, see get_num_threads()) and the status (see
+    numba.targets.callconv.Status) of the first call of *body* which
+    returned an error, if any.  The caller should propagate the error
+    with `context.call_conv.return_status_propagate()`.
+    """
+    _launch_threads()
+
+    mod = builder.module
+    byte_ptr_t = lc.Type.pointer(lc.Type.int(8))
+    intp_t = context.get_value_type(types.intp)
+    int32_t = lc.Type.int(32)
+    fe_argtys = [types.intp] * 3 + list(argtys)
+
+    # The data shared by all chunks: the return code and exception info
+    # of the first error, and the arguments
+    data_t = lc.Type.struct([int32_t, excinfo_ptr_t] +
+                            [context.get_value_type(ty) for ty in argtys])
+    data = cgutils.alloca_once(builder, data_t)
+    builder.store(lc.Constant.int(int32_t, 0),
+                  cgutils.gep_inbounds(builder, data, 0, 0))
+    for i, val in enumerate(args):
+        builder.store(val, cgutils.gep_inbounds(builder, data, 0, i + 2))
+
+    # The task function called by the workers, unpacking the data and
+    # the chunk's bounds, then calling *body*
+    task_ty = lc.Type.function(lc.Type.void(), [byte_ptr_t,
+                                                lc.Type.pointer(intp_t),
+                                                byte_ptr_t, byte_ptr_t])
+    task = mod.get_or_insert_function(task_ty, name=body.name + '.task')
+    task.linkage = lc.LINKAGE_INTERNAL
+    task_builder = lc.Builder.new(task.append_basic_block(''))
+    _, bounds, _, task_data = task.args
+    task_data = task_builder.bitcast(task_data, data.type)
+    body_args = [task_builder.load(cgutils.gep_inbounds(task_builder,
+                                                        bounds, i))
+                 for i in range(3)]
+    body_args += [task_builder.load(cgutils.gep_inbounds(task_builder,
+                                                         task_data, 0, i + 2))
+                  for i in range(len(argtys))]
+    status, _ = context.call_conv.call_function(task_builder, body,
+                                                types.none, fe_argtys,
+                                                body_args)
+    with cgutils.if_unlikely(task_builder, status.is_error):
+        # Only the first error is recorded
+        outpack = task_builder.cmpxchg(
+            cgutils.gep_inbounds(task_builder, task_data, 0, 0),
+            lc.Constant.int(int32_t, 0), status.code, ordering='monotonic')
+        with task_builder.if_then(task_builder.extract_value(outpack, 1)):
+            task_builder.store(status.excinfoptr,
+                               cgutils.gep_inbounds(task_builder, task_data,
+                                                    0, 1))
+    task_builder.ret_void()
+
+    # Divide the iterations equally across the active threads and let the
+    # last thread take all the left over.
+    nchunks = NUM_THREADS
+    nthreads = _get_num_threads(builder, intp_t)
+    one = lc.Constant.int(intp_t, 1)
+    count = builder.udiv(total, nthreads)
+    all_bounds = cgutils.alloca_once(builder, intp_t, size=nchunks * 3)
+    add_task, ready, synchronize = _declare_workqueue_functions(mod)
+    null = lc.Constant.null(byte_ptr_t)
+    with cgutils.for_range(builder, nthreads, intp=intp_t) as loop:
+        i = loop.index
+        start = builder.mul(count, i)
+        is_last = builder.icmp_unsigned('==', i, builder.sub(nthreads, one))
+        stop = builder.select(is_last, total, builder.add(start, count))
+        chunk_bounds = cgutils.gep_inbounds(
+            builder, all_bounds, builder.mul(i, lc.Constant.int(intp_t, 3)))
+        for j, val in enumerate([start, stop, i]):
+            builder.store(val, cgutils.gep_inbounds(builder,
+                                                    chunk_bounds, j))
+        builder.call(add_task, [builder.bitcast(task, byte_ptr_t), null,
+                                builder.bitcast(chunk_bounds, byte_ptr_t),
+                                null, builder.bitcast(data, byte_ptr_t)])
 
     # Signal worker that we are ready
     builder.call(ready, ())
     # Wait for workers
     builder.call(synchronize, ())
-    builder.ret_void()
 
-    return lfunc
+    code = builder.load(cgutils.gep_inbounds(builder, data, 0, 0))
+    excinfoptr = builder.load(cgutils.gep_inbounds(builder, data, 0, 1))
+    status = context.call_conv._get_return_status(builder, code, excinfoptr)
+    return nchunks, status
 
 
-class _ProtectEngineDestroy(object):
-    def __init__(self, set_cas, engine):
-        self.set_cas = set_cas
-        self.engine = engine
+def _launch_threads():
+    """
+    Initialize work queues and workers
+    """
+    from . import workqueue as lib
+    from ctypes import CFUNCTYPE, c_int
+
+    launch_threads = CFUNCTYPE(c_int)(lib.launch_threads)
+    if launch_threads() and _thread_affinity != 'none':
+        # The placement was applied when launching the threads; pin them
+        # again to find out whether it is supported
+        if not _pin_threads(_thread_affinity):
+            warnings.warn("Thread affinity %r is not supported on this "
+                          "platform" % (_thread_affinity,),
+                          config.NumbaWarning)
 
-    def __del__(self):
-        """
-        We need to set the CAS function to NULL to prevent the worker threads to
-        execute this function as LLVM is releasing the memory of the function.
-        """
-        self.set_cas(0)
 
+def _parse_cpu_list(text):
+    """
+    Parse a Linux CPU list, e.g. "0-3,8,10-11".
+    """
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
 
-_keepalive = []
 
+def _get_numa_nodes():
+    """
+    Return a list of the CPU numbers usable by the process, for each NUMA
+    node.  Without NUMA information, all CPUs are in a single node.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        allowed = set(os.sched_getaffinity(0))
+    else:
+        allowed = set(range(NUM_CPU))
+    nodes = []
+    paths = glob.glob('/sys/devices/system/node/node[0-9]*')
+    for path in sorted(paths, key=lambda p: int(re.findall(r'\d+$', p)[0])):
+        try:
+            with open(os.path.join(path, 'cpulist')) as f:
+                cpus = _parse_cpu_list(f.read())
+        except (IOError, OSError, ValueError):
+            continue
+        cpus = [cpu for cpu in cpus if cpu in allowed]
+        if cpus:
+            nodes.append(cpus)
+    if not nodes:
+        nodes = [sorted(allowed)]
+    return nodes
+
+
+def _get_affinity_cpus(policy, nodes, nthreads):
+    """
+    Return the CPU of each of the *nthreads* worker threads for the
+    placement *policy*, given the CPUs of each NUMA node.
+    """
+    if policy == 'compact':
+        # Fill the nodes one after the other
+        cpus = [cpu for node in nodes for cpu in node]
+    else:
+        # Spread over the nodes in round-robin
+        cpus = [node[i] for i in range(max(len(node) for node in nodes))
+                for node in nodes if i < len(node)]
+    return [cpus[i % len(cpus)] for i in range(nthreads)]
 
-def _make_cas_function():
+
+def _pin_threads(policy):
     """
-    Generate a compare-and-swap function for portability sake.
+    Pin the worker threads according to *policy*.  Return whether it
+    succeeded.
     """
-    # Generate IR
-    mod = lc.Module.new('generate-cas')
-    llint = lc.Type.int()
-    llintp = lc.Type.pointer(llint)
-    fnty = lc.Type.function(llint, [llintp, llint, llint])
-    fn = mod.add_function(fnty, name='.numba.parallel.ufunc.cas')
-    ptr, old, repl = fn.args
-    bb = fn.append_basic_block('')
-    builder = lc.Builder.new(bb)
-    outpack = builder.cmpxchg(ptr, old, repl, ordering='monotonic')
-    out = builder.extract_value(outpack, 0)
-    failed = builder.extract_value(outpack, 1)
-    builder.ret(builder.select(failed, old, out))
+    from . import workqueue as lib
+    from ctypes import CFUNCTYPE, c_int
 
-    # Build & Link
-    llmod = ll.parse_assembly(str(mod))
-    llfn = llmod.get_function(fn.name)
+    pin_thread = CFUNCTYPE(c_int, c_int, c_int)(lib.pin_thread)
+    if policy == 'none':
+        cpus = [-1] * NUM_THREADS
+    else:
+        cpus = _get_affinity_cpus(policy, _get_numa_nodes(), NUM_THREADS)
+    return all(pin_thread(i, cpu) == 0 for i, cpu in enumerate(cpus))
 
-    target = ll.Target.from_default_triple()
-    tm = target.create_target_machine()
-    engine = ll.create_mcjit_compiler(llmod, tm)
-    ptr = engine.get_pointer_to_function(llfn)
-    return engine, ptr
 
+def get_thread_affinity():
+    """
+    Return the placement policy of the worker threads of the parallel code.
+    """
+    return _thread_affinity
 
-def _launch_threads():
+
+def set_thread_affinity(policy):
     """
-    Initialize work queues and workers
+    Set the placement policy of the worker threads of the parallel code:
+
+    - "none" lets the operating system schedule the threads on any CPU;
+    - "compact" pins the threads to consecutive CPUs, filling a NUMA node
+      before using the next one;
+    - "scatter" pins the threads to CPUs spread over the NUMA nodes in
+      round-robin.
+
+    The default is set by the NUMBA_THREAD_AFFINITY environment variable.
+    """
+    global _thread_affinity
+
+    if policy not in AFFINITIES:
+        raise ValueError("Unsupported thread affinity: %r (expected one "
+                         "of %s)" % (policy, ', '.join(AFFINITIES)))
+    _launch_threads()
+    if not _pin_threads(policy):
+        raise RuntimeError("Thread affinity %r is not supported on this "
+                           "platform" % (policy,))
+    _thread_affinity = policy
+
+
+def get_num_threads():
+    """
+    Return the number of worker threads used by the parallel code.
     """
     from . import workqueue as lib
     from ctypes import CFUNCTYPE, c_int
 
-    launch_threads = CFUNCTYPE(None, c_int)(lib.launch_threads)
-    launch_threads(NUM_CPU)
+    return CFUNCTYPE(c_int)(lib.get_num_threads)()
+
+
+def set_num_threads(n):
+    """
+    Set the number of worker threads used by the parallel code, from 1 to
+    NUM_THREADS (set by the NUMBA_NUM_THREADS environment variable).  This
+    applies to the subsequent calls of already compiled functions too.
+    """
+    from . import workqueue as lib
+    from ctypes import CFUNCTYPE, c_int
+
+    if (not isinstance(n, utils.INT_TYPES) or
+        not 1 <= n <= NUM_THREADS):
+        raise ValueError("The number of threads must be between 1 and %d, "
+                         "got %r" % (NUM_THREADS, n))
+    CFUNCTYPE(None, c_int)(lib.set_num_threads)(n)
 
 
 def _init():
     from . import workqueue as lib
-    from ctypes import CFUNCTYPE, c_void_p
+    from ctypes import CFUNCTYPE, c_int
 
     ll.add_symbol('numba_add_task', lib.add_task)
     ll.add_symbol('numba_synchronize', lib.synchronize)
     ll.add_symbol('numba_ready', lib.ready)
-
-    set_cas = CFUNCTYPE(None, c_void_p)(lib.set_cas)
-
-    engine, cas_ptr = _make_cas_function()
-    set_cas(c_void_p(cas_ptr))
-
-    _keepalive.append(_ProtectEngineDestroy(set_cas, engine))
+    ll.add_symbol('numba_get_num_threads', lib.get_num_threads)
+
+    # The threads are launched on first use, which may be by code loaded
+    # from the cache: the placement of the threads is recorded beforehand
+    CFUNCTYPE(None, c_int)(lib.init_threads)(NUM_THREADS)
+    CFUNCTYPE(None, c_int)(lib.set_num_threads)(NUM_THREADS)
+    if _thread_affinity != 'none':
+        _pin_threads(_thread_affinity)
+
+
+# The placement policy of the worker threads, applied when launched
+_thread_affinity = config.THREAD_AFFINITY
+if _thread_affinity not in AFFINITIES:
+    warnings.warn("Unsupported NUMBA_THREAD_AFFINITY value %r, ignoring"
+                  % (_thread_affinity,), config.NumbaWarning)
+    _thread_affinity = 'none'
 
 
 _init()
@@ -0,0 +1,580 @@
+"""
+Parallel execution of prange() loops.
+
+When a function is compiled with parallel=True, the RewriteParallelLoops
+rewrite replaces each top-level `for ... in prange(...)` loop with a
+"prange_loop" expression holding the loop's body blocks.  Its lowering
+outlines the body to a separate function, run in chunks of iterations
+by the worker threads of numba.npyufunc.parallel.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from collections import defaultdict
+import warnings
+
+from .. import cgutils, config, ir, rewrites, types
+from ..special import prange
+
+
+def _reduce_add(acc, v):
+    return acc + v
+
+def _reduce_mul(acc, v):
+    return acc * v
+
+def _reduce_min(acc, v):
+    return min(acc, v)
+
+def _reduce_max(acc, v):
+    return max(acc, v)
+
+# Supported reductions: their combining function and the initial value
+# of each chunk's accumulator (None if it is the reduction variable's
+# value before the loop).
+_reductions = {
+    '+': (_reduce_add, 0),
+    '*': (_reduce_mul, 1),
+    'min': (_reduce_min, None),
+    'max': (_reduce_max, None),
+    }
+
+
+def _successors(block):
+    term = block.terminator
+    if isinstance(term, ir.Jump):
+        return [term.target]
+    elif isinstance(term, ir.Branch):
+        return [term.truebr, term.falsebr]
+    return []
+
+
+def _stmt_reads(stmt):
+    """
+    Return the names of the variables read by *stmt*.
+    """
+    if isinstance(stmt, ir.Del):
+        return []
+    if isinstance(stmt, ir.Assign):
+        value = stmt.value
+        if isinstance(value, ir.Var):
+            return [value.name]
+        elif isinstance(value, ir.Inst):
+            return [var.name for var in value.list_vars()]
+        return []
+    return [var.name for var in stmt.list_vars()]
+
+
+def _stmt_writes(stmt):
+    """
+    Return the names of the variables assigned by *stmt*.
+    """
+    if not isinstance(stmt, ir.Assign):
+        return []
+    names = [stmt.target.name]
+    value = stmt.value
+    if isinstance(value, ir.Expr) and value.op == 'prange_loop':
+        # A nested loop assigns its reduction variables
+        names.extend(var.name for var, _ in value.reductions)
+    return names
+
+
+def _compute_live_in(blocks, offsets):
+    """
+    Compute the variables live at the beginning of each of the blocks
+    whose *offsets* are given, ignoring the other blocks (i.e. assuming
+    nothing is live there).
+    """
+    uses = {}
+    defs = {}
+    for offset in offsets:
+        block_uses = uses[offset] = set()
+        block_defs = defs[offset] = set()
+        for stmt in blocks[offset].body:
+            block_uses.update(name for name in _stmt_reads(stmt)
+                              if name not in block_defs)
+            block_defs.update(_stmt_writes(stmt))
+
+    live_in = dict((offset, set(uses[offset])) for offset in offsets)
+    changed = True
+    while changed:
+        changed = False
+        for offset in offsets:
+            live_out = set()
+            for succ in _successors(blocks[offset]):
+                live_out |= live_in.get(succ, set())
+            new = uses[offset] | (live_out - defs[offset])
+            if new != live_in[offset]:
+                live_in[offset] = new
+                changed = True
+    return live_in
+
+
+class _UnsupportedLoop(Exception):
+    """
+    A prange() loop can't be run in parallel.
+    """
+
+
+@rewrites.register_rewrite
+class RewriteParallelLoops(rewrites.Rewrite):
+    '''Rewrite prange() loops, in functions compiled with parallel=True,
+    to "prange_loop" expressions running them on the worker threads.
+    '''
+
+    def __init__(self, pipeline, *args, **kws):
+        super(RewriteParallelLoops, self).__init__(pipeline, *args, **kws)
+        self.enabled = (pipeline.flags.auto_parallel and
+                        pipeline.interp.generator_info is None)
+        # Install a lowering hook if we are using this rewrite.
+        special_ops = self.pipeline.targetctx.special_ops
+        if 'prange_loop' not in special_ops:
+            special_ops['prange_loop'] = _lower_prange_loop
+
+    def match(self, block, typemap, calltypes):
+        '''Check whether *block* is the header of a prange() loop.
+        '''
+        if not self.enabled:
+            return False
+        blocks = self.pipeline.interp.blocks
+        stmts = [stmt for stmt in block.body if not isinstance(stmt, ir.Del)]
+        if not (stmts and isinstance(stmts[0], ir.Assign) and
+                isinstance(stmts[0].value, ir.Expr) and
+                stmts[0].value.op == 'iternext'):
+            return False
+        self.definitions = defaultdict(list)
+        for blk in blocks.values():
+            for stmt in blk.body:
+                if isinstance(stmt, ir.Assign):
+                    self.definitions[stmt.target.name].append(stmt.value)
+        iterator = stmts[0].value.value
+        if not self._is_prange_iterator(iterator.name):
+            return False
+        self.crnt_block = block
+        self.typemap = typemap
+        try:
+            self._analyze_loop(block, stmts)
+        except _UnsupportedLoop as e:
+            warnings.warn_explicit("prange() loop will run serially: %s"
+                                   % (e,), config.NumbaWarning,
+                                   block.loc.filename, block.loc.line)
+            return False
+        return True
+
+    def _get_definition(self, name):
+        # Return the unique expression defining *name*, looking through
+        # variable copies, or None.
+        values = []
+        seen = set()
+        todo = [name]
+        while todo:
+            name = todo.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            for value in self.definitions[name]:
+                if isinstance(value, ir.Var):
+                    todo.append(value.name)
+                else:
+                    values.append(value)
+        if len(values) == 1:
+            return values[0]
+        return None
+
+    def _get_global(self, var):
+        value = self._get_definition(var.name)
+        if isinstance(value, (ir.Global, ir.FreeVar)):
+            return value.value
+        return None
+
+    def _is_prange_iterator(self, name):
+        getiter = self._get_definition(name)
+        if not (isinstance(getiter, ir.Expr) and getiter.op == 'getiter'):
+            return False
+        call = self._get_definition(getiter.value.name)
+        if not (isinstance(call, ir.Expr) and call.op == 'call'):
+            return False
+        return self._get_global(call.func) is prange
+
+    def _analyze_loop(self, header, stmts):
+        '''Analyze the loop whose header block is *header*, and record
+        what is needed to rewrite it.  _UnsupportedLoop is raised if the
+        loop can't be run in parallel.
+        '''
+        blocks = self.pipeline.interp.blocks
+        header_offset = [offset for offset, blk in blocks.items()
+                         if blk is header][0]
+
+        # The header is made of the iternext() call, the extraction of
+        # the index and validity flag, and copies of the index and
+        # iterator to the body's incoming variables.
+        iterator = stmts[0].value.value.name
+        index_vars = set()
+        iterator_vars = set([iterator])
+        for stmt in stmts[1:-1]:
+            if not isinstance(stmt, ir.Assign):
+                raise _UnsupportedLoop("unexpected loop header")
+            value = stmt.value
+            target = stmt.target.name
+            if isinstance(value, ir.Expr) and value.op == 'pair_first':
+                index_vars.add(target)
+            elif isinstance(value, ir.Expr) and value.op == 'pair_second':
+                pass
+            elif isinstance(value, ir.Var) and value.name in index_vars:
+                index_vars.add(target)
+            elif isinstance(value, ir.Var) and value.name in iterator_vars:
+                iterator_vars.add(target)
+            else:
+                raise _UnsupportedLoop("unexpected loop header")
+        branch = stmts[-1]
+        if not isinstance(branch, ir.Branch):
+            raise _UnsupportedLoop("unexpected loop header")
+        entry = branch.truebr
+        exit = branch.falsebr
+
+        # The body is made of the blocks dominated by its entry, reachable
+        # from it without going through the header.
+        doms = self.pipeline.interp.cfa.graph.dominators()
+        body = set()
+        todo = [entry]
+        while todo:
+            offset = todo.pop()
+            if (offset in body or offset == header_offset or
+                entry not in doms[offset]):
+                continue
+            body.add(offset)
+            todo.extend(_successors(blocks[offset]))
+        for offset in body:
+            blk = blocks[offset]
+            if isinstance(blk.terminator, ir.Return):
+                raise _UnsupportedLoop("return statement in loop body")
+            for succ in _successors(blk):
+                if succ not in body and succ != header_offset:
+                    raise _UnsupportedLoop("break statement in loop body")
+
+        # Classify the variables used by the body
+        reads = set()
+        assigned = set()
+        for offset in body:
+            for stmt in blocks[offset].body:
+                reads.update(_stmt_reads(stmt))
+                assigned.update(_stmt_writes(stmt))
+        # Variables read by an iteration before being assigned by it
+        exposed = _compute_live_in(blocks, body)[entry]
+        # Variables alive after the loop
+        live_out = _compute_live_in(blocks, list(blocks))[exit]
+
+        provided = index_vars | iterator_vars
+        inputs = sorted(exposed - assigned - provided)
+        reductions = []
+        for name in sorted(assigned):
+            if name in exposed:
+                op = self._match_reduction(name, body)
+                if op is None:
+                    raise _UnsupportedLoop(
+                        "variable %r depends on previous iterations"
+                        % (name,))
+                reductions.append((name, op))
+            elif name in live_out:
+                raise _UnsupportedLoop(
+                    "variable %r is assigned in the loop body and used "
+                    "after the loop" % (name,))
+
+        self.loop_info = dict(header=header_offset, entry=entry, exit=exit,
+                              body=body, inputs=inputs,
+                              index_vars=sorted(index_vars & reads),
+                              iterator_vars=sorted(iterator_vars & reads),
+                              iterator=stmts[0].value.value,
+                              reductions=reductions)
+
+    def _match_reduction(self, name, body):
+        '''Return the operator if variable *name* is a supported
+        reduction in the loop *body*, None otherwise.
+        '''
+        if not isinstance(self.typemap[name], (types.Integer, types.Float)):
+            return None
+        blocks = self.pipeline.interp.blocks
+        assigns = []
+        nreads = defaultdict(int)
+        for offset in body:
+            for stmt in blocks[offset].body:
+                for read in _stmt_reads(stmt):
+                    nreads[read] += 1
+                if name in _stmt_writes(stmt):
+                    assigns.append(stmt)
+        # A single assignment *name = $tmp*, where $tmp is only used there
+        # and computed from the only read of *name* in the loop.
+        if len(assigns) != 1 or nreads[name] != 1:
+            return None
+        tmp = assigns[0].value
+        if not isinstance(tmp, ir.Var) or nreads[tmp.name] != 1:
+            return None
+        tmp_defs = self.definitions[tmp.name]
+        if len(tmp_defs) != 1 or not isinstance(tmp_defs[0], ir.Expr):
+            return None
+        expr = tmp_defs[0]
+        if expr.op == 'inplace_binop':
+            if expr.lhs.name == name and expr.immutable_fn in ('+', '*'):
+                return expr.immutable_fn
+        elif expr.op == 'binop':
+            if (name in (expr.lhs.name, expr.rhs.name) and
+                expr.fn in ('+', '*')):
+                return expr.fn
+        elif expr.op == 'call':
+            if (len(expr.args) == 2 and not expr.kws and
+                expr.vararg is None and
+                name in [arg.name for arg in expr.args]):
+                func = self._get_global(expr.func)
+                if func is min:
+                    return 'min'
+                elif func is max:
+                    return 'max'
+        return None
+
+    def apply(self):
+        '''Replace the loop header with the "prange_loop" expression
+        followed by a jump to the loop exit, and remove the loop body
+        from the function.
+        '''
+        info = self.loop_info
+        blocks = self.pipeline.interp.blocks
+        block = self.crnt_block
+        loc = block.loc
+        body = dict((offset, blocks.pop(offset)) for offset in info['body'])
+
+        # Nested array expressions and loops run serially inside the
+        # loop body.  Calls of other parallel code are serialized by the
+        # workqueue, as they submit tasks from a worker thread.
+        for blk in body.values():
+            for stmt in blk.body:
+                if (isinstance(stmt, ir.Assign) and
+                    isinstance(stmt.value, ir.Expr) and
+                    stmt.value.op in ('arrayexpr', 'arrayreduce',
+                                      'prange_loop')):
+                    stmt.value.parallel = False
+
+        scope = block.scope
+        expr = ir.Expr(op='prange_loop', loc=loc,
+                       iterator=info['iterator'],
+                       inputs=[scope.get(name) for name in info['inputs']],
+                       reductions=[(scope.get(name), op)
+                                   for name, op in info['reductions']],
+                       index_vars=info['index_vars'],
+                       iterator_vars=info['iterator_vars'],
+                       header=info['header'], entry=info['entry'],
+                       body=body, parallel=True)
+        target = scope.make_temp(loc)
+        self.typemap[target.name] = types.none
+        new_block = ir.Block(scope, loc)
+        new_block.append(ir.Assign(expr, target, loc))
+        new_block.append(ir.Jump(info['exit'], loc))
+        return new_block
+
+
+def _get_iteration_space(lowerer, expr):
+    """
+    Return the start, step and number of iterations, as intp values, of
+    the range iterated over by the prange() loop *expr*.
+    """
+    from ..targets.rangeobj import make_range_iterator
+
+    context = lowerer.context
+    builder = lowerer.builder
+    iter_ty = lowerer.typeof(expr.iterator.name)
+    int_ty = iter_ty.yield_type
+    iterval = lowerer.loadvar(expr.iterator.name)
+    rangeiter = make_range_iterator(iter_ty)(context, builder, value=iterval)
+    start = builder.load(rangeiter.iter)
+    count = builder.load(rangeiter.count)
+    return [context.cast(builder, val, int_ty, types.intp)
+            for val in (start, rangeiter.step, count)]
+
+
+def _emit_prange_iterations(lowerer, expr, range_start, range_step,
+                            start, stop):
+    """
+    Emit the loop running iterations [start, stop) of the prange() loop
+    *expr*, with the current function, builder and variables of the
+    *lowerer*.  The builder is left positioned after the loop.
+    """
+    context = lowerer.context
+    builder = lowerer.builder
+    fn = builder.function
+    bb_cond = fn.append_basic_block('prange.cond')
+    bb_iter = fn.append_basic_block('prange.iter')
+    for offset in sorted(expr.body):
+        lowerer.blkmap[offset] = fn.append_basic_block('B%s' % (offset,))
+    bb_latch = fn.append_basic_block('prange.latch')
+    bb_end = fn.append_basic_block('prange.end')
+    # Going back to the loop header starts the next iteration
+    header_block = lowerer.blkmap.get(expr.header)
+    lowerer.blkmap[expr.header] = bb_latch
+
+    index_ptr = cgutils.alloca_once(builder, start.type)
+    builder.store(start, index_ptr)
+    builder.branch(bb_cond)
+
+    builder.position_at_end(bb_cond)
+    index = builder.load(index_ptr)
+    builder.cbranch(builder.icmp_signed('<', index, stop), bb_iter, bb_end)
+
+    builder.position_at_end(bb_iter)
+    value = builder.add(range_start, builder.mul(index, range_step))
+    for name in expr.index_vars:
+        lowerer.storevar(context.cast(builder, value, types.intp,
+                                      lowerer.typeof(name)),
+                         name)
+    builder.branch(lowerer.blkmap[expr.entry])
+
+    for offset in sorted(expr.body):
+        builder.position_at_end(lowerer.blkmap[offset])
+        lowerer.lower_block(expr.body[offset])
+
+    builder.position_at_end(bb_latch)
+    builder.store(builder.add(builder.load(index_ptr),
+                              context.get_constant(types.intp, 1)),
+                  index_ptr)
+    builder.branch(bb_cond)
+
+    builder.position_at_end(bb_end)
+    if header_block is None:
+        del lowerer.blkmap[expr.header]
+    else:
+        lowerer.blkmap[expr.header] = header_block
+
+
+def _lower_serial_prange_loop(lowerer, expr):
+    """
+    Lower a prange() loop nested in another one: it runs serially, inline.
+    """
+    context = lowerer.context
+    builder = lowerer.builder
+    iterval = lowerer.loadvar(expr.iterator.name)
+    range_start, range_step, count = _get_iteration_space(lowerer, expr)
+    for name in expr.iterator_vars:
+        lowerer.storevar(iterval, name)
+    _emit_prange_iterations(lowerer, expr, range_start, range_step,
+                            context.get_constant(types.intp, 0), count)
+    return context.get_dummy_value()
+
+
+def _lower_prange_loop(lowerer, expr):
+    '''Lower a prange() loop rewritten by RewriteParallelLoops.
+    '''
+    from . import parallel
+
+    if not expr.parallel:
+        return _lower_serial_prange_loop(lowerer, expr)
+
+    context = lowerer.context
+    builder = lowerer.builder
+    iter_ty = lowerer.typeof(expr.iterator.name)
+    iterval = lowerer.loadvar(expr.iterator.name)
+    range_start, range_step, count = _get_iteration_space(lowerer, expr)
+
+    # The arguments of the outlined body: the range, the iterator, the
+    # values of the variables read by the loop and, for each reduction,
+    # the reduction variable's value and the array of partial results.
+    nchunks = parallel.NUM_THREADS
+    argtys = [types.intp, types.intp, iter_ty]
+    argvals = [range_start, range_step, iterval]
+    for var in expr.inputs:
+        argtys.append(lowerer.typeof(var.name))
+        argvals.append(lowerer.loadvar(var.name))
+    partials = []
+    for var, op in expr.reductions:
+        ty = lowerer.typeof(var.name)
+        ptr = cgutils.alloca_once(builder, context.get_value_type(ty),
+                                  size=nchunks)
+        # Chunks which don't run (if fewer threads are active) leave
+        # a neutral value
+        _, identity = _reductions[op]
+        if identity is None:
+            init = lowerer.loadvar(var.name)
+        else:
+            init = context.get_constant(ty, identity)
+        for i in range(nchunks):
+            builder.store(init, cgutils.gep_inbounds(builder, ptr, i))
+        partials.append(ptr)
+        argtys += [ty, types.CPointer(ty)]
+        argvals += [lowerer.loadvar(var.name), ptr]
+
+    body_fn, body_builder, body_args = parallel.define_parallel_body(
+        context, builder.module, argtys,
+        '%s.prange' % (lowerer.fndesc.unique_name,))
+    _lower_prange_body(lowerer, expr, body_fn, body_builder, body_args)
+
+    _, status = parallel.parallel_for(context, builder, body_fn, argtys,
+                                      argvals, count)
+    with cgutils.if_unlikely(builder, status.is_error):
+        context.call_conv.return_status_propagate(builder, status)
+
+    # Combine the chunks' partial results, in order
+    for (var, op), ptr in zip(expr.reductions, partials):
+        ty = lowerer.typeof(var.name)
+        combine, _ = _reductions[op]
+        sig = ty(ty, ty)
+        acc = lowerer.loadvar(var.name)
+        for i in range(nchunks):
+            val = builder.load(cgutils.gep_inbounds(builder, ptr, i))
+            acc = context.compile_internal(builder, combine, sig, [acc, val])
+        lowerer.storevar(acc, var.name)
+
+    return context.get_dummy_value()
+
+
+def _lower_prange_body(lowerer, expr, fn, builder, args):
+    '''Lower the body of the prange() loop *expr* into the function *fn*
+    (see parallel.define_parallel_body()), with *builder* positioned at
+    its entry and *args* its arguments.
+    '''
+    context = lowerer.context
+    saved = (lowerer.function, lowerer.builder, lowerer.varmap,
+             lowerer.blkmap, lowerer.call_helper)
+    lowerer.function = fn
+    lowerer.builder = builder
+    lowerer.varmap = {}
+    lowerer.blkmap = {}
+    lowerer.call_helper = context.call_conv.init_call_helper(builder)
+    try:
+        start, stop, chunk, range_start, range_step, iterval = args[:6]
+        args = list(args[6:])
+
+        borrowed = set()
+
+        def bind(name, val):
+            # Bind the variable to a value owned by the caller
+            ptr = lowerer.alloca_lltype(name, val.type)
+            builder.store(val, ptr)
+            lowerer.varmap[name] = ptr
+            borrowed.add(name)
+
+        for name in expr.iterator_vars:
+            bind(name, iterval)
+        for var in expr.inputs:
+            bind(var.name, args.pop(0))
+        partials = []
+        for var, op in expr.reductions:
+            init, ptr = args.pop(0), args.pop(0)
+            ty = lowerer.typeof(var.name)
+            _, identity = _reductions[op]
+            if identity is not None:
+                init = context.get_constant(ty, identity)
+            bind(var.name, init)
+            partials.append(ptr)
+
+        _emit_prange_iterations(lowerer, expr, range_start, range_step,
+                                start, stop)
+
+        for (var, op), ptr in zip(expr.reductions, partials):
+            builder.store(lowerer.loadvar(var.name),
+                          cgutils.gep_inbounds(builder, ptr, chunk))
+        # The variables local to the loop body are deleted after the loop
+        # (outside of this function)
+        for name in sorted(lowerer.varmap):
+            if name not in borrowed:
+                lowerer.decref(lowerer.typeof(name), lowerer.loadvar(name))
+        context.call_conv.return_native_none(builder)
+    finally:
+        (lowerer.function, lowerer.builder, lowerer.varmap,
+         lowerer.blkmap, lowerer.call_helper) = saved
@@ -0,0 +1,166 @@
+"""
+Compiled parallel implementations of the reduce() and accumulate() methods
+of binary ufuncs with an identity.
+
+The element-wise function is folded over the reduced axis by parallel
+gufuncs.  When there are fewer outer iterations than threads (e.g. when
+reducing a 1-d array), the reduced axis is split into one chunk per thread
+and the partial results are combined afterwards.  This reorders the
+operations, which is only valid for associative functions: this is the
+contract of ufuncs with an identity.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+
+from numba import config, njit
+from numba.numpy_support import from_dtype
+from .decorators import guvectorize
+from .parallel import get_num_threads
+
+
+def _make_fold(scalar):
+    def fold(a, init, out):
+        acc = init
+        for i in range(a.shape[0]):
+            acc = scalar(acc, a[i])
+        out[0] = acc
+    return fold
+
+
+def _make_scan(scalar):
+    def scan(a, init, out):
+        acc = init
+        for i in range(a.shape[0]):
+            acc = scalar(acc, a[i])
+            out[i] = acc
+    return scan
+
+
+def _normalize_axis(axis, ndim):
+    if axis < -ndim or axis >= ndim:
+        raise ValueError("axis %d is out of bounds for an array of "
+                         "dimension %d" % (axis, ndim))
+    return axis % ndim
+
+
+class ParallelReducer(object):
+    """
+    The parallel reduce() and accumulate() of the binary function
+    *py_func*, whose identity is *identity*.  The kernels are compiled
+    lazily for each dtype.
+    """
+
+    def __init__(self, py_func, identity):
+        self.py_func = py_func
+        self.identity = identity
+        self._scalar = njit(py_func)
+        self._folds = {}
+        self._scans = {}
+
+    def _get_kernel(self, cache, make, layout, dtype):
+        try:
+            return cache[dtype]
+        except KeyError:
+            ty = from_dtype(dtype)
+            kernel = guvectorize([(ty[:], ty, ty[:])], layout,
+                                 target='parallel')(make(self._scalar))
+            cache[dtype] = kernel
+            return kernel
+
+    def _get_fold(self, dtype):
+        return self._get_kernel(self._folds, _make_fold, '(n),()->()', dtype)
+
+    def _get_scan(self, dtype):
+        return self._get_kernel(self._scans, _make_scan, '(n),()->(n)', dtype)
+
+    def _split(self, a):
+        """
+        If the last axis of *a* should be split for the reduction to run
+        in parallel, return the number of chunks and their size.
+        """
+        nchunks = get_num_threads()
+        n = a.shape[-1]
+        nouter = a.size // n if n else 0
+        if nchunks > 1 and nouter < nchunks and n >= 2 * nchunks:
+            return nchunks, n // nchunks
+        return None
+
+    def _reduce_last_axis(self, a):
+        fold = self._get_fold(a.dtype)
+        init = np.array(self.identity, dtype=a.dtype)
+        split = self._split(a)
+        if split is None:
+            return fold(a, init)
+        nchunks, size = split
+        m = nchunks * size
+        outer = a.shape[:-1]
+        partials = fold(a[..., :m].reshape(outer + (nchunks, size)), init)
+        if m < a.shape[-1]:
+            tail = fold(a[..., m:], init)
+            partials = np.concatenate([partials, tail[..., np.newaxis]],
+                                      axis=-1)
+        return fold(partials, init)
+
+    def _accumulate_last_axis(self, a):
+        fold = self._get_fold(a.dtype)
+        scan = self._get_scan(a.dtype)
+        init = np.array(self.identity, dtype=a.dtype)
+        split = self._split(a)
+        if split is None:
+            return scan(a, init)
+        nchunks, size = split
+        m = nchunks * size
+        outer = a.shape[:-1]
+        head = a[..., :m].reshape(outer + (nchunks, size))
+        # Each chunk starts from the combination of all previous chunks
+        totals = scan(fold(head, init), init)
+        starts = np.empty_like(totals)
+        starts[..., 0] = init
+        starts[..., 1:] = totals[..., :-1]
+        result = np.empty(a.shape, dtype=a.dtype)
+        result[..., :m] = scan(head, starts).reshape(outer + (m,))
+        if m < a.shape[-1]:
+            result[..., m:] = scan(a[..., m:], totals[..., -1])
+        return result
+
+    def reduce(self, array, axis=0, keepdims=False):
+        """
+        Reduce *array* along *axis* (an integer, a tuple of integers or
+        None for all axes).
+        """
+        if axis is None:
+            axes = tuple(range(array.ndim))
+        elif isinstance(axis, tuple):
+            axes = tuple(_normalize_axis(ax, array.ndim) for ax in axis)
+            if len(set(axes)) != len(axes):
+                raise ValueError("duplicate value in 'axis'")
+        else:
+            axes = (_normalize_axis(axis, array.ndim),)
+        result = array
+        # Reduce the last axes first so that the others keep their index
+        for ax in sorted(axes, reverse=True):
+            result = self._reduce_last_axis(np.rollaxis(result, ax,
+                                                        result.ndim))
+        result = np.asarray(result)
+        if keepdims:
+            for ax in sorted(axes):
+                result = np.expand_dims(result, ax)
+        return result
+
+    def accumulate(self, array, axis=0):
+        """
+        Accumulate *array* along *axis*.
+        """
+        axis = _normalize_axis(axis, array.ndim)
+        result = self._accumulate_last_axis(np.rollaxis(array, axis,
+                                                        array.ndim))
+        return np.rollaxis(result, result.ndim - 1, axis)
+
+    def can_run(self, array):
+        """
+        Whether the compiled kernels should be used for *array*: large
+        enough arrays of booleans or numbers.
+        """
+        return (array.ndim > 0 and array.dtype.kind in 'biufc' and
+                array.size >= config.PARALLEL_THRESHOLD)
@@ -2,23 +2,37 @@
 Implement parallel vectorize workqueue.
 
 This keeps a set of worker threads running all the time.
-They wait and spin on a task queue for jobs.
-
-**WARNING**
-This module is not thread-safe.  Adding task to queue is not protected from
-race condition.
+They wait on a task queue for jobs: after spinning briefly, waiting
+threads block on the queue's condition variable, so that idle workers
+don't use any CPU.
+
+Several threads can submit tasks concurrently: the first add_task() of a
+thread acquires the submission lock, which is only released by the
+synchronize() ending the thread's batch of tasks.  Batches from different
+threads are therefore run one after the other.
+
+Tasks submitted by the worker threads themselves (parallel code called
+from a task) can't wait for the other workers, which may be busy with the
+outer batch: they are run right away on the submitting worker.
 */
 
+#if defined(__linux__) && !defined(_GNU_SOURCE)
+    /* For pthread_setaffinity_np() */
+    #define _GNU_SOURCE
+#endif
+
 #ifdef _MSC_VER
     /* Windows */
     #include <windows.h>
 	#include <process.h>
     #define NUMBA_WINTHREAD
+    #define THREAD_LOCAL __declspec(thread)
 #else
     /* PThread */
     #include <pthread.h>
     #include <unistd.h>
     #define NUMBA_PTHREAD
+    #define THREAD_LOCAL __thread
 #endif
 
 #include <string.h>
@@ -26,34 +40,34 @@ race condition.
 #include "workqueue.h"
 #include "../_pymodule.h"
 
-static cas_function_t *cas = NULL;
-
-void cas_wait(volatile int *ptr, const int old, const int repl) {
-    int out = repl;
-    int timeout = 1;   /* starting from 1us nap */
-    static const int MAX_WAIT_TIME = 20 * 1000; /* max wait is 20ms */
-
-    while (1) {
-        if (cas) { /* protect against CAS function being released by LLVM during
-                      interpreter teardown. */
-            out = cas(ptr, old, repl);
-            if (out == old) return;
-        }
+typedef struct Task{
+    void (*func)(void *args, void *dims, void *steps, void *data);
+    void *args, *dims, *steps, *data;
+} Task;
 
-        take_a_nap(timeout);
+struct Queue {
+    volatile int state;
+    Task task;
+    thread_pointer thread;
+#ifdef NUMBA_PTHREAD
+    pthread_mutex_t mutex;
+    pthread_cond_t cond;
+#else
+    CRITICAL_SECTION mutex;
+    CONDITION_VARIABLE cond;
+#endif
+};
 
-        /* Exponentially increase the wait time until the max has reached*/
-        timeout <<= 1;
-        if (timeout >= MAX_WAIT_TIME) {
-            timeout = MAX_WAIT_TIME;
-        }
-    }
-}
+/* Number of polls of the queue state before blocking */
+#define SPIN_COUNT 2000
 
 /* As the thread-pool isn't inherited by children,
    free the task-queue, too. */
 static void reset_after_fork(void);
 
+/* Launch the worker threads if not running yet */
+static int start_threads(void);
+
 /* PThread */
 #ifdef NUMBA_PTHREAD
 
@@ -63,8 +77,6 @@ thread_pointer numba_new_thread(void *worker, void *arg)
     pthread_attr_t attr;
     pthread_t th;
 
-    pthread_atfork(0, 0, reset_after_fork);
-
     /* Create detached threads */
     pthread_attr_init(&attr);
     pthread_attr_setdetachstate(&attr, PTHREAD_CREATE_DETACHED);
@@ -79,10 +91,74 @@ thread_pointer numba_new_thread(void *worker, void *arg)
     return (thread_pointer)th;
 }
 
-void take_a_nap(int usec) {
-    usleep(usec);
+void queue_lock_init(Queue *queue)
+{
+    pthread_mutex_init(&queue->mutex, NULL);
+    pthread_cond_init(&queue->cond, NULL);
 }
 
+void queue_lock(Queue *queue)
+{
+    pthread_mutex_lock(&queue->mutex);
+}
+
+void queue_unlock(Queue *queue)
+{
+    pthread_mutex_unlock(&queue->mutex);
+}
+
+void queue_wait(Queue *queue)
+{
+    pthread_cond_wait(&queue->cond, &queue->mutex);
+}
+
+void queue_signal(Queue *queue)
+{
+    pthread_cond_broadcast(&queue->cond);
+}
+
+int numba_pin_thread(thread_pointer thread, int cpu)
+{
+#ifdef __linux__
+    cpu_set_t cpuset;
+    int i;
+
+    CPU_ZERO(&cpuset);
+    if (cpu < 0) {
+        /* Allow all CPUs; the kernel ignores those which don't exist */
+        for (i = 0; i < CPU_SETSIZE; ++i)
+            CPU_SET(i, &cpuset);
+    }
+    else if (cpu < CPU_SETSIZE) {
+        CPU_SET(cpu, &cpuset);
+    }
+    else {
+        return -1;
+    }
+    return pthread_setaffinity_np((pthread_t)thread, sizeof(cpuset),
+                                  &cpuset) ? -1 : 0;
+#else
+    /* Not supported */
+    return -1;
+#endif
+}
+
+static pthread_mutex_t submit_mutex = PTHREAD_MUTEX_INITIALIZER;
+
+void submit_lock_init(void)
+{
+    pthread_mutex_init(&submit_mutex, NULL);
+}
+
+void submit_lock(void)
+{
+    pthread_mutex_lock(&submit_mutex);
+}
+
+void submit_unlock(void)
+{
+    pthread_mutex_unlock(&submit_mutex);
+}
 
 #endif
 
@@ -128,39 +204,128 @@ thread_pointer numba_new_thread(void *worker, void *arg)
     return (thread_pointer)handle;
 }
 
-void take_a_nap(int usec) {
-    /* MS does not have usec resolution sleep function.
-    Sleeping for zero second will yield this thread.
-    */
-    Sleep(0);
+void queue_lock_init(Queue *queue)
+{
+    InitializeCriticalSection(&queue->mutex);
+    InitializeConditionVariable(&queue->cond);
 }
 
+void queue_lock(Queue *queue)
+{
+    EnterCriticalSection(&queue->mutex);
+}
 
-#endif
+void queue_unlock(Queue *queue)
+{
+    LeaveCriticalSection(&queue->mutex);
+}
 
-typedef struct Task{
-    void (*func)(void *args, void *dims, void *steps, void *data);
-    void *args, *dims, *steps, *data;
-} Task;
+void queue_wait(Queue *queue)
+{
+    SleepConditionVariableCS(&queue->cond, &queue->mutex, INFINITE);
+}
 
-typedef struct {
-    volatile int lock;
-    Task task;
-} Queue;
+void queue_signal(Queue *queue)
+{
+    WakeAllConditionVariable(&queue->cond);
+}
+
+int numba_pin_thread(thread_pointer thread, int cpu)
+{
+    DWORD_PTR mask, process_mask, system_mask;
+
+    if (cpu < 0) {
+        if (!GetProcessAffinityMask(GetCurrentProcess(), &process_mask,
+                                    &system_mask))
+            return -1;
+        mask = process_mask;
+    }
+    else if (cpu < (int) (8 * sizeof(DWORD_PTR))) {
+        mask = (DWORD_PTR) 1 << cpu;
+    }
+    else {
+        return -1;
+    }
+    return SetThreadAffinityMask((HANDLE)thread, mask) ? 0 : -1;
+}
 
+static CRITICAL_SECTION submit_mutex;
+
+void submit_lock_init(void)
+{
+    InitializeCriticalSection(&submit_mutex);
+}
+
+void submit_lock(void)
+{
+    EnterCriticalSection(&submit_mutex);
+}
+
+void submit_unlock(void)
+{
+    LeaveCriticalSection(&submit_mutex);
+}
+
+#endif
 
 static Queue *queues = NULL;
 static int queue_count;
+/* Number of threads to launch, see init_threads() */
+static int launch_count = 1;
+/* The CPU each worker thread is pinned to, or -1 (see pin_thread()) */
+static int *thread_cpus = NULL;
 static int queue_pivot = 0;
-
-void set_cas(void *ptr) {
-    cas = ptr;
+/* Number of queues which were given a task since the last synchronize() */
+static int queue_used = 0;
+/* Number of threads the generated code should give tasks to */
+static volatile int num_threads = 1;
+/* Whether the current thread holds the submission lock */
+static THREAD_LOCAL int submitting = 0;
+/* Whether the current thread is a worker thread */
+static THREAD_LOCAL int is_worker = 0;
+
+void queue_state_wait(Queue *queue, const int old, const int repl)
+{
+    int i;
+    /* Tasks are often short: poll for a while before blocking */
+    for (i = 0; i < SPIN_COUNT && queue->state != old; ++i) {
+    }
+    queue_lock(queue);
+    while (queue->state != old) {
+        queue_wait(queue);
+    }
+    queue->state = repl;
+    queue_signal(queue);
+    queue_unlock(queue);
 }
 
 void add_task(void *fn, void *args, void *dims, void *steps, void *data) {
     void (*func)(void *args, void *dims, void *steps, void *data) = fn;
+    Queue *queue;
+
+    if (is_worker) {
+        /* Nested parallel code runs serially */
+        func(args, dims, steps, data);
+        return;
+    }
+
+    /* The first task of a batch waits for the batches of other threads */
+    if (!submitting) {
+        submit_lock();
+        submitting = 1;
+        /* The threads aren't running yet if the calling code was loaded
+           from the cache, or after a fork() */
+        if (!queues)
+            start_threads();
+    }
+
+    if (!queues) {
+        /* The threads couldn't be launched: run the task right away */
+        func(args, dims, steps, data);
+        return;
+    }
 
-    Queue *queue = &queues[queue_pivot];
+    queue = &queues[queue_pivot];
 
     Task *task = &queue->task;
     task->func = func;
@@ -169,6 +334,9 @@ void add_task(void *fn, void *args, void *dims, void *steps, void *data) {
     task->steps = steps;
     task->data = data;
 
+    if (queue_used < queue_count)
+        ++queue_used;
+
     /* Move pivot */
     if ( ++queue_pivot == queue_count ) {
         queue_pivot = 0;
@@ -181,51 +349,115 @@ void thread_worker(void *arg) {
     Queue *queue = (Queue*)arg;
     Task *task;
 
+    is_worker = 1;
     while (1) {
-        cas_wait(&queue->lock, READY, RUNNING);
+        queue_state_wait(queue, READY, RUNNING);
 
         task = &queue->task;
         task->func(task->args, task->dims, task->steps, task->data);
 
-        cas_wait(&queue->lock, RUNNING, DONE);
+        queue_state_wait(queue, RUNNING, DONE);
     }
 }
 
-void launch_threads(int count) {
+/* The caller holds the submission lock */
+static
+int start_threads(void) {
     if ( !queues ) {
         /* If queues are not yet allocated,
            create them, one for each thread. */
        int i;
-       size_t sz = sizeof(Queue) * count;
+       size_t sz = sizeof(Queue) * launch_count;
 
        queues = malloc(sz);     /* this memory will leak */
+       if (!queues)
+           return 0;
        memset(queues, 0, sz);
-       queue_count = count;
+       queue_count = launch_count;
 
-       for (i = 0; i < count; ++i) {
-            numba_new_thread(thread_worker, &queues[i]);
+       for (i = 0; i < queue_count; ++i) {
+            queue_lock_init(&queues[i]);
+            queues[i].thread = numba_new_thread(thread_worker, &queues[i]);
+            if (queues[i].thread && thread_cpus && thread_cpus[i] >= 0)
+                numba_pin_thread(queues[i].thread, thread_cpus[i]);
        }
+       return 1;
     }
+    return 0;
+}
+
+void init_threads(int count) {
+    int i;
+    launch_count = count;
+    free(thread_cpus);
+    thread_cpus = malloc(sizeof(int) * count);
+    if (thread_cpus) {
+        for (i = 0; i < count; ++i)
+            thread_cpus[i] = -1;
+    }
+}
+
+int launch_threads(void) {
+    int res;
+    submit_lock();
+    res = start_threads();
+    submit_unlock();
+    return res;
+}
+
+int pin_thread(int index, int cpu) {
+    if (!thread_cpus || index < 0 || index >= launch_count)
+        return -1;
+    /* Remembered for the threads launched later */
+    thread_cpus[index] = cpu;
+    if (!queues)
+        return 0;
+    if (index >= queue_count || !queues[index].thread)
+        return -1;
+    return numba_pin_thread(queues[index].thread, cpu);
 }
 
 void synchronize(void) {
     int i;
-    for (i = 0; i < queue_count; ++i) {
-        cas_wait(&queues[i].lock, DONE, IDLE);
+    if (is_worker)
+        return;
+    for (i = 0; i < queue_used; ++i) {
+        queue_state_wait(&queues[i], DONE, IDLE);
+    }
+    queue_used = 0;
+    queue_pivot = 0;
+    if (submitting) {
+        submitting = 0;
+        submit_unlock();
     }
 }
 
 void ready(void) {
     int i;
-    for (i = 0; i < queue_count; ++i) {
-        cas_wait(&queues[i].lock, IDLE, READY);
+    if (is_worker)
+        return;
+    for (i = 0; i < queue_used; ++i) {
+        queue_state_wait(&queues[i], IDLE, READY);
     }
 }
 
+void set_num_threads(int count) {
+    num_threads = count;
+}
+
+int get_num_threads(void) {
+    return num_threads;
+}
+
 static void reset_after_fork(void)
 {
   free(queues);
   queues = NULL;
+  queue_used = 0;
+  queue_pivot = 0;
+  /* The lock may have been held by another thread of the parent */
+  submit_lock_init();
+  submitting = 0;
 }
 
 MOD_INIT(workqueue) {
@@ -234,8 +466,15 @@ MOD_INIT(workqueue) {
     if (m == NULL)
         return MOD_ERROR_VAL;
 
-    PyObject_SetAttrString(m, "set_cas",
-                           PyLong_FromVoidPtr(&set_cas));
+#ifdef NUMBA_WINTHREAD
+    submit_lock_init();
+#endif
+#ifdef NUMBA_PTHREAD
+    pthread_atfork(0, 0, reset_after_fork);
+#endif
+
+    PyObject_SetAttrString(m, "init_threads",
+                           PyLong_FromVoidPtr(&init_threads));
     PyObject_SetAttrString(m, "launch_threads",
                            PyLong_FromVoidPtr(&launch_threads));
     PyObject_SetAttrString(m, "synchronize",
@@ -244,6 +483,12 @@ MOD_INIT(workqueue) {
                            PyLong_FromVoidPtr(&ready));
     PyObject_SetAttrString(m, "add_task",
                            PyLong_FromVoidPtr(&add_task));
+    PyObject_SetAttrString(m, "pin_thread",
+                           PyLong_FromVoidPtr(&pin_thread));
+    PyObject_SetAttrString(m, "set_num_threads",
+                           PyLong_FromVoidPtr(&set_num_threads));
+    PyObject_SetAttrString(m, "get_num_threads",
+                           PyLong_FromVoidPtr(&get_num_threads));
 
     return MOD_SUCCESS_VAL(m);
 }
@@ -12,57 +12,87 @@ enum QUEUE_STATE {
     IDLE = 0, READY, RUNNING, DONE
 };
 
+typedef struct Queue Queue;
+
 /*
-sleep for a short time
+Wait until the state of `queue` is `old`, then set it to `repl` and wake up
+the other threads waiting on the queue.
+The state is polled for a while first, then the thread blocks on the
+queue's condition variable.
 */
 static
-void take_a_nap(int usec);
-
+void queue_state_wait(Queue *queue, const int old, const int repl);
 
-/*
-CAS: compare and swap function
-
-It is generated from parallel.py by LLVM to get a portable CAS function.
-*/
-typedef int cas_function_t(volatile int *ptr, int old, int val);
+/* Initialize the mutex and condition variable of `queue` */
+static
+void queue_lock_init(Queue *queue);
 
-/*
-Do CAS until successful.
-Spin until the value in `ptr` changes from `old` to `repl`.
-Takes a 1us nap in after each CAS failure.
-*/
+/* Initialize the lock serializing the task submissions of concurrent
+threads */
 static
-void cas_wait(volatile int *ptr, const int old, const int repl);
+void submit_lock_init(void);
 
 /* Launch new thread */
 static
 thread_pointer numba_new_thread(void *worker, void *arg);
 
-/* Set CAS function.
-Note: During interpreter teardown, LLVM will release all function memory.
-      To protect against the fault due to calling non-executable memory,
-      Call set_cas(NULL) to disable the workqueue.
+/* Restrict `thread` to run on CPU number `cpu`, or on all CPUs if `cpu` is
+negative.  Return 0 on success, -1 on failure or if unsupported on this
+platform.
 */
 static
-void set_cas(void *ptr);
+int numba_pin_thread(thread_pointer thread, int cpu);
 
-/* Launch `count` number of threads and create the associated thread queue.
-Must invoke once before each add_task() is used.
+/* Set the number of threads launched by launch_threads().
+Must be invoked before launching the threads.
+*/
+static
+void init_threads(int count);
+
+/* Launch the threads and create the associated thread queues, if not
+running yet.  The threads are also launched by the first add_task(), as
+code loaded from the cache may run before any code generation.
+Return 1 if the threads were launched, 0 if they were already running.
 *Warning* queues memory are leaked at interpreter tear down!
 */
 static
-void launch_threads(int count);
+int launch_threads(void);
+
+/* Pin the `index`-th worker thread to CPU number `cpu` (see
+numba_pin_thread()).  Worker threads are given the tasks in order: the
+`index`-th task added after a synchronize() runs on the `index`-th thread.
+The CPU is remembered and applied to threads launched later, e.g. after
+a fork().
+*/
+static
+int pin_thread(int index, int cpu);
 
 /* Add task to queue
 Automatically assigned to queues of different thread in a round robin fashion.
+The first call of a batch blocks while another thread has tasks in flight;
+the batch ends with synchronize().  If the threads can't be launched, or
+if called from a worker thread, the task is run right away on the calling
+thread.
 */
 static
 void add_task(void *fn, void *args, void *dims, void *steps, void *data);
 
-/* Wait until all tasks are done */
+/* Wait until all tasks are done.
+Only the queues which were given a task are waited for.  This lets other
+threads submit their tasks.
+*/
 static
 void synchronize(void);
 
 /* Signal worker threads that tasks are added and it is ready to run */
 static
 void ready(void);
+
+/* Set the number of threads the generated code gives tasks to,
+at most the number of launched threads. */
+static
+void set_num_threads(int count);
+
+/* Get the number of threads the generated code gives tasks to */
+static
+int get_num_threads(void);
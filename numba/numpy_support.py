@@ -1,11 +1,13 @@
 from __future__ import print_function, division, absolute_import
 
 import collections
+import ctypes
+import os
 import re
 
 import numpy
 
-from . import types, config, npdatetime
+from . import types, config, npdatetime, utils
 from .targets import ufunc_db
 
 
@@ -337,3 +339,159 @@ def from_struct_dtype(dtype):
     aligned = _is_aligned_struct(dtype)
 
     return types.Record(str(dtype.descr), fields, size, aligned, dtype)
+
+
+def _get_pointer_info(ptr):
+    """
+    Return the (address, dtype) pair of the ctypes pointer, cffi pointer
+    or integer address *ptr*.  The dtype is None if it can't be inferred
+    from the pointer type.
+    """
+    if isinstance(ptr, utils.INT_TYPES):
+        return ptr, None
+    if isinstance(ptr, ctypes.c_void_p):
+        return ptr.value or 0, None
+    if isinstance(ptr, ctypes._Pointer):
+        from .typing.ctypes_utils import convert_ctypes
+        ptrty = convert_ctypes(type(ptr))
+        address = ctypes.cast(ptr, ctypes.c_void_p).value or 0
+        return address, as_dtype(ptrty.dtype)
+
+    from .typing import cffi_utils
+    if cffi_utils.SUPPORTED and isinstance(ptr, cffi_utils.ffi.CData):
+        ffi = cffi_utils.ffi
+        cffi_type = ffi.typeof(ptr)
+        if cffi_type.kind in ('pointer', 'array'):
+            address = int(ffi.cast('uintptr_t', ptr))
+            item = cffi_type.item
+            if item.kind == 'void':
+                return address, None
+            return address, as_dtype(cffi_utils.map_type(item))
+
+    raise TypeError("expected a ctypes pointer, a cffi pointer or an "
+                    "integer address, got %r" % (ptr,))
+
+
+def _array_from_pointer(ptr, shape, dtype, owner, order):
+    address, ptr_dtype = _get_pointer_info(ptr)
+    if dtype is None:
+        if ptr_dtype is None:
+            raise TypeError("explicit dtype required for pointer %r"
+                            % (ptr,))
+        dtype = ptr_dtype
+    else:
+        dtype = numpy.dtype(dtype)
+        if ptr_dtype is not None and dtype != ptr_dtype:
+            raise TypeError("mismatching dtype '%s' for pointer %r"
+                            % (dtype, ptr))
+
+    if isinstance(shape, utils.INT_TYPES):
+        shape = (shape,)
+    shape = tuple(shape)
+    if any(s < 0 for s in shape):
+        raise ValueError("negative dimensions not allowed")
+    nbytes = dtype.itemsize
+    for s in shape:
+        nbytes *= s
+    if not address and nbytes:
+        raise ValueError("NULL pointer for a non-empty array")
+
+    buf = (ctypes.c_byte * nbytes).from_address(address)
+    # The buffer ends up as the array's base: have it keep the owner alive
+    buf._owner = ptr if owner is None else owner
+    return numpy.frombuffer(buf, dtype).reshape(shape, order=order)
+
+
+def carray(ptr, shape, dtype=None, owner=None):
+    """
+    Return a Numpy array view over the data pointed to by *ptr*, with
+    the given *shape* in C order.  *ptr* can be a ctypes pointer, a cffi
+    pointer or an integer address.  *dtype* is inferred from the pointer
+    type if not given, and is mandatory for untyped pointers.
+
+    No copy is made: the array keeps a reference to *owner* (by default,
+    to *ptr* itself), which should keep the memory alive.
+
+    This function is also supported in nopython mode, where *ptr* can be
+    a typed pointer, a void pointer or an integer address, and *owner*
+    an array whose lifetime the result then shares.
+    """
+    return _array_from_pointer(ptr, shape, dtype, owner, 'C')
+
+
+def farray(ptr, shape, dtype=None, owner=None):
+    """
+    Same as carray(), but the *shape* is in Fortran order.
+    """
+    return _array_from_pointer(ptr, shape, dtype, owner, 'F')
+
+
+# Access advice values for madvise(); they are translated to the
+# platform's values by Numba_memmap_advise() in _helperlib.c.
+MADV_NORMAL = 0
+MADV_RANDOM = 1
+MADV_SEQUENTIAL = 2
+MADV_WILLNEED = 3
+MADV_DONTNEED = 4
+
+_memmap_advise = None
+
+def _get_memory_extent(arr):
+    """
+    Return the (address, size in bytes) of the memory area spanned by
+    array *arr*.
+    """
+    if arr.size == 0:
+        return arr.ctypes.data, 0
+    lo = 0
+    hi = arr.itemsize
+    for dim_size, stride in zip(arr.shape, arr.strides):
+        extent = (dim_size - 1) * stride
+        if extent < 0:
+            lo += extent
+        else:
+            hi += extent
+    return arr.ctypes.data + lo, hi - lo
+
+
+def madvise(arr, advice):
+    """
+    Advise the operating system about the expected access pattern to
+    the memory-mapped array *arr*, with one of the MADV_* constants:
+    e.g. MADV_SEQUENTIAL before scanning a file, MADV_WILLNEED to
+    prefetch the next chunk and MADV_DONTNEED to release a chunk after
+    processing it.  The advice applies to the pages spanned by *arr*,
+    which can be a view of a larger mapping.  It is ignored on platforms
+    not supporting it.
+
+    This function is also supported in nopython mode.
+    """
+    global _memmap_advise
+    if not isinstance(arr, numpy.memmap):
+        raise TypeError("expected a numpy.memmap, got %r" % (type(arr),))
+    if _memmap_advise is None:
+        from . import _helperlib
+        proto = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p,
+                                 ctypes.c_ssize_t, ctypes.c_int)
+        _memmap_advise = proto(_helperlib.c_helpers['memmap_advise'])
+    address, size = _get_memory_extent(arr)
+    err = _memmap_advise(address, size, advice)
+    if err:
+        raise OSError(err, os.strerror(err))
+
+
+def as_memmap(arr, parent):
+    """
+    Return the array *arr*, returned by compiled code, as a memory-mapped
+    array.  If *parent*, the memory-mapped array *arr* was derived from,
+    is not None the result shares its file information.
+    """
+    if isinstance(arr, numpy.memmap):
+        return arr
+    if isinstance(parent, numpy.memmap):
+        res = arr.view(type(parent))
+        # Inherit the file information, as when slicing *parent*
+        res.__array_finalize__(parent)
+    else:
+        res = arr.view(numpy.memmap)
+    return res
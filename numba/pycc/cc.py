@@ -3,7 +3,9 @@ from __future__ import print_function, division, absolute_import
 from collections import defaultdict
 import logging
 import os
+import shutil
 import sys
+import tempfile
 
 from numba import sigutils
 from .compiler import ModuleCompiler, ExportEntry
@@ -34,6 +36,7 @@ class CC(object):
         self._source_module = source_module
         self._toolchain = Toolchain()
         self._debug = False
+        self._isa_levels = ()
         # By default, output in directory of caller module
         self._output_dir = source_dir
         self._output_file = self._toolchain.get_ext_filename(basename)
@@ -67,6 +70,19 @@ class CC(object):
         self._debug = value
         self._toolchain.debug = value
 
+    @property
+    def isa_levels(self):
+        """
+        The instruction set levels (e.g. 'avx2') to compile additional
+        versions of the exported functions for.  The best version for
+        the host CPU is chosen when the function is first called.
+        """
+        return self._isa_levels
+
+    @isa_levels.setter
+    def isa_levels(self, value):
+        self._isa_levels = tuple(value)
+
     def export(self, exported_name, sig):
         sig = sigutils.parse_signature(sig)
         if exported_name in self._exported_functions:
@@ -85,17 +101,29 @@ class CC(object):
                       key=lambda entry: entry.symbol)
 
     def compile(self):
-        compiler = ModuleCompiler(self._export_entries, self._basename)
-        # First compile object file
+        compiler = ModuleCompiler(self._export_entries, self._basename,
+                                  isa_levels=self._isa_levels)
+        # First compile object file(s)
         temp_obj = os.path.join(self._output_dir,
                                 os.path.splitext(self._output_file)[0] + '.o')
         output_obj = os.path.join(self._output_dir, self._output_file)
         compiler.write_native_object(temp_obj, wrap=True)
-
-        # Then create shared library
-        libraries = self._toolchain.get_python_libraries()
-        library_dirs = self._toolchain.get_python_library_dirs()
-        self._toolchain.link_shared(output_obj, [temp_obj],
-                                    libraries, library_dirs,
-                                    export_symbols=compiler.dll_exports)
-        os.remove(temp_obj)
+        objects = [temp_obj] + compiler.extra_objects
+
+        build_dir = tempfile.mkdtemp(prefix='pycc-build-')
+        try:
+            if compiler.extra_sources:
+                objects += self._toolchain.compile_objects(
+                    compiler.extra_sources, build_dir)
+
+            # Then create shared library
+            libraries = self._toolchain.get_python_libraries()
+            library_dirs = self._toolchain.get_python_library_dirs()
+            self._toolchain.link_shared(output_obj, objects,
+                                        libraries, library_dirs,
+                                        export_symbols=compiler.dll_exports)
+        finally:
+            shutil.rmtree(build_dir)
+            os.remove(temp_obj)
+            for obj in compiler.extra_objects:
+                os.remove(obj)
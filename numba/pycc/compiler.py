@@ -10,10 +10,11 @@ import llvmlite.llvmpy.ee as le
 import llvmlite.llvmpy.passes as lp
 import llvmlite.binding as ll
 
-from numba import cgutils
+from numba import cgutils, types
 from numba.utils import IS_PY3
 from . import llvm_types as lt
 from numba.compiler import compile_extra, Flags
+from numba.targets.codegen import get_isa_level_number, supports_isa_levels
 from numba.targets.registry import CPUTarget
 
 
@@ -83,6 +84,10 @@ class _ModuleCompiler(object):
 
     :param export_entries: a list of ExportEntry instances.
     :param module_name: the name of the exported module.
+    :param isa_levels: names of instruction set levels (see
+        numba.targets.codegen.ISA_LEVELS) to compile additional versions
+        of each exported function for.  The best version for the host CPU
+        is then chosen at runtime by a resolver stub.
     """
 
     #: Structure used to describe a method of an extension type.
@@ -100,11 +105,22 @@ class _ModuleCompiler(object):
 
     method_def_ptr = lc.Type.pointer(method_def_ty)
 
-    def __init__(self, export_entries, module_name):
+    def __init__(self, export_entries, module_name, isa_levels=()):
         self.module_name = module_name
         self.export_python_wrap = False
         self.dll_exports = []
         self.export_entries = export_entries
+        self.isa_levels = sorted(set(isa_levels), key=get_isa_level_number)
+        if self.isa_levels and not supports_isa_levels(ll.get_default_triple()):
+            raise ValueError("ISA levels are not supported on %s"
+                             % (ll.get_default_triple(),))
+        # Object files and C sources which must be linked with the
+        # native object to produce the final shared library.
+        self.extra_objects = []
+        self.extra_sources = []
+        if self.isa_levels:
+            self.extra_sources.append(
+                os.path.join(os.path.dirname(__file__), 'cpudispatch.c'))
 
     def _emit_python_wrapper(self, llvm_module):
         """Emit generated Python wrapper and extension module code.
@@ -116,6 +132,9 @@ class _ModuleCompiler(object):
         environment, and join them into a single LLVM module.
         """
         self.exported_function_types = {}
+        # The actual LLVM types of the exported symbols
+        self.exported_symbol_types = {}
+        self.isa_libraries = []
 
         typing_ctx = CPUTarget.typing_context
         target_ctx = CPUTarget.target_context.with_aot_codegen(self.module_name)
@@ -129,6 +148,39 @@ class _ModuleCompiler(object):
         if not self.export_python_wrap:
             flags.set("no_cpython_wrapper")
 
+        if not self.isa_levels:
+            self._compile_exports(typing_ctx, target_ctx, library, flags)
+        else:
+            # The baseline version is compiled into the main library,
+            # the others into one library per ISA level.
+            self._compile_exports(typing_ctx, target_ctx, library, flags,
+                                  suffix='__generic')
+            for level in self.isa_levels:
+                isa_ctx = CPUTarget.target_context.with_aot_codegen(
+                    self.module_name, isa_level=level)
+                isa_library = isa_ctx.codegen().create_library(
+                    "%s.%s" % (self.module_name, level))
+                suffix = '__' + level
+                self._compile_exports(typing_ctx, isa_ctx, isa_library,
+                                      flags, suffix=suffix)
+                self._localize_symbols(isa_library, suffix)
+                self.isa_libraries.append((level, isa_library))
+            self._emit_isa_resolvers(library)
+
+        if self.export_python_wrap:
+            wrapper_module = library.create_ir_module("wrapper")
+            self._emit_python_wrapper(wrapper_module)
+            library.add_ir_module(wrapper_module)
+        else:
+            self.dll_exports = [entry.symbol for entry in self.export_entries]
+
+        return library
+
+    def _compile_exports(self, typing_ctx, target_ctx, library, flags,
+                         suffix=''):
+        """Compile all exported functions into *library*, exporting them
+        under their symbol name plus *suffix*.
+        """
         for entry in self.export_entries:
             cres = compile_extra(typing_ctx, target_ctx, entry.function,
                                  entry.signature.args,
@@ -137,28 +189,82 @@ class _ModuleCompiler(object):
 
             func_name = cres.fndesc.llvm_func_name
             llvm_func = cres.library.get_function(func_name)
+            fnty = cres.target_context.call_conv.get_function_type(
+                cres.fndesc.restype, cres.fndesc.argtypes)
 
             if self.export_python_wrap:
                 llvm_func.linkage = lc.LINKAGE_INTERNAL
                 wrappername = cres.fndesc.llvm_cpython_wrapper_name
                 wrapper = cres.library.get_function(wrappername)
-                wrapper.name = entry.symbol
+                wrapper.name = entry.symbol + suffix
                 wrapper.linkage = lc.LINKAGE_EXTERNAL
-                fnty = cres.target_context.call_conv.get_function_type(
-                    cres.fndesc.restype, cres.fndesc.argtypes)
                 self.exported_function_types[entry] = fnty
+                # The signature of PyCFunctionWithKeywords
+                pyobj = cres.target_context.get_argument_type(types.pyobject)
+                self.exported_symbol_types[entry] = lc.Type.function(
+                    pyobj, [pyobj] * 3)
             else:
-                llvm_func.name = entry.symbol
-                self.dll_exports.append(entry.symbol)
+                llvm_func.name = entry.symbol + suffix
+                self.exported_symbol_types[entry] = fnty
 
-        if self.export_python_wrap:
-            wrapper_module = library.create_ir_module("wrapper")
-            self._emit_python_wrapper(wrapper_module)
-            library.add_ir_module(wrapper_module)
+    def _localize_symbols(self, library, suffix):
+        """Give internal linkage to everything defined in *library* except
+        the exported functions, so that the support code duplicated in
+        the libraries for each ISA level doesn't clash when linking.
+        """
+        library.finalize()
+        exported = set(entry.symbol + suffix for entry in self.export_entries)
+        ll_module = library._final_module
+        for gv in list(ll_module.functions) + list(ll_module.global_variables):
+            if not gv.is_declaration and gv.name not in exported:
+                gv.linkage = 'internal'
+
+    def _emit_isa_resolvers(self, library):
+        """Emit, for each exported function, a resolver stub forwarding
+        to the version best suited to the host CPU.  The choice is made
+        on the first call and cached in a global variable.
+        """
+        ir_module = library.create_ir_module("isa_resolvers")
+        level_fnty = lc.Type.function(lt._int32, ())
+        get_level = ir_module.add_function(level_fnty,
+                                           "numba_pycc_get_isa_level")
+        for entry in self.export_entries:
+            fnty = self.exported_symbol_types[entry]
+            fnptrty = lc.Type.pointer(fnty)
+            slot = ir_module.add_global_variable(fnptrty,
+                                                 entry.symbol + '__impl')
+            slot.initializer = lc.Constant.null(fnptrty)
+            slot.linkage = lc.LINKAGE_INTERNAL
+
+            resolver = ir_module.add_function(fnty, entry.symbol)
+            builder = lc.Builder.new(resolver.append_basic_block('entry'))
+            with cgutils.if_unlikely(builder,
+                                     cgutils.is_null(builder,
+                                                     builder.load(slot))):
+                host_level = builder.call(get_level, ())
+                choice = ir_module.add_function(fnty,
+                                                entry.symbol + '__generic')
+                for level in self.isa_levels:
+                    version = ir_module.add_function(fnty,
+                                                     entry.symbol + '__' + level)
+                    number = lc.Constant.int(lt._int32,
+                                             get_isa_level_number(level))
+                    usable = builder.icmp(lc.ICMP_SGE, host_level, number)
+                    choice = builder.select(usable, version, choice)
+                builder.store(choice, slot)
+
+            res = builder.call(builder.load(slot), resolver.args)
+            if fnty.return_type == lc.Type.void():
+                builder.ret_void()
+            else:
+                builder.ret(res)
 
-        return library
+        library.add_ir_module(ir_module)
 
     def write_llvm_bitcode(self, output, wrap=False, **kws):
+        if self.isa_levels:
+            raise ValueError("cannot emit LLVM bitcode for several "
+                             "ISA levels")
         self.export_python_wrap = wrap
         library = self._cull_exports()
         with open(output, 'wb') as fout:
@@ -169,6 +275,12 @@ class _ModuleCompiler(object):
         library = self._cull_exports()
         with open(output, 'wb') as fout:
             fout.write(library.emit_native_object())
+        self.extra_objects = []
+        for level, isa_library in self.isa_libraries:
+            isa_output = '%s.%s.o' % (os.path.splitext(output)[0], level)
+            with open(isa_output, 'wb') as fout:
+                fout.write(isa_library.emit_native_object())
+            self.extra_objects.append(isa_output)
 
     def emit_type(self, tyobj):
         ret_val = str(tyobj)
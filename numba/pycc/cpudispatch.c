@@ -0,0 +1,133 @@
+/*
+Runtime detection of the host CPU's instruction set level.
+
+This is linked into the shared libraries produced by numba.pycc when
+exported functions are compiled for several ISA levels: the resolver stub
+of each function calls numba_pycc_get_isa_level() once and forwards to
+the best version.
+
+The level numbers must match numba.targets.codegen.ISA_LEVELS.
+*/
+
+#define ISA_GENERIC     0
+#define ISA_SSE42       1
+#define ISA_AVX2        2
+#define ISA_AVX512      3
+
+#if defined(__x86_64__) || defined(__i386__) || defined(_M_X64) || defined(_M_IX86)
+    #define HAVE_CPUID
+#endif
+
+#ifdef HAVE_CPUID
+
+#ifdef _MSC_VER
+    #include <intrin.h>
+
+static void
+get_cpuid(unsigned int leaf, unsigned int subleaf, unsigned int regs[4])
+{
+    int out[4];
+    __cpuidex(out, (int) leaf, (int) subleaf);
+    regs[0] = out[0];
+    regs[1] = out[1];
+    regs[2] = out[2];
+    regs[3] = out[3];
+}
+
+/* Only the low 32 bits of XCR0 are of interest */
+static unsigned int
+get_xcr0(void)
+{
+    /* _xgetbv() appeared in Visual Studio 2010 SP1 */
+#if _MSC_FULL_VER >= 160040219
+    return (unsigned int) _xgetbv(0);
+#else
+    return 0;
+#endif
+}
+
+#else
+    #include <cpuid.h>
+
+static void
+get_cpuid(unsigned int leaf, unsigned int subleaf, unsigned int regs[4])
+{
+    __cpuid_count(leaf, subleaf, regs[0], regs[1], regs[2], regs[3]);
+}
+
+static unsigned int
+get_xcr0(void)
+{
+    unsigned int eax, edx;
+    /* "xgetbv" may be unknown to old assemblers */
+    __asm__ __volatile__(".byte 0x0f, 0x01, 0xd0"
+                         : "=a" (eax), "=d" (edx) : "c" (0));
+    return eax;
+}
+
+#endif  /* _MSC_VER */
+
+#define HAS_BITS(value, mask)  (((value) & (mask)) == (mask))
+
+/* CPUID leaf 1, ECX */
+#define SSE42_BITS      ((1u << 20) | (1u << 23))      /* SSE4.2, POPCNT */
+#define OSXSAVE_BIT     (1u << 27)
+#define AVX_FMA_BITS    ((1u << 28) | (1u << 12))      /* AVX, FMA */
+/* CPUID leaf 7, EBX */
+#define AVX2_BITS       ((1u << 5) | (1u << 3) | (1u << 8))  /* AVX2, BMI1, BMI2 */
+#define AVX512_BITS     ((1u << 16) | (1u << 17) | (1u << 28) | \
+                         (1u << 30) | (1u << 31))      /* F, DQ, CD, BW, VL */
+/* XCR0: state enabled by the OS */
+#define XCR0_AVX        0x06u     /* SSE, AVX */
+#define XCR0_AVX512     0xe6u     /* SSE, AVX, opmask, ZMM */
+
+static int
+detect_isa_level(void)
+{
+    unsigned int regs[4];
+    unsigned int max_leaf, ecx1, ebx7, xcr0;
+
+    get_cpuid(0, 0, regs);
+    max_leaf = regs[0];
+    if (max_leaf < 1)
+        return ISA_GENERIC;
+
+    get_cpuid(1, 0, regs);
+    ecx1 = regs[2];
+    if (!HAS_BITS(ecx1, SSE42_BITS))
+        return ISA_GENERIC;
+    /* AVX and above need support from the OS for saving the registers */
+    if (!HAS_BITS(ecx1, OSXSAVE_BIT | AVX_FMA_BITS) || max_leaf < 7)
+        return ISA_SSE42;
+    xcr0 = get_xcr0();
+    if (!HAS_BITS(xcr0, XCR0_AVX))
+        return ISA_SSE42;
+
+    get_cpuid(7, 0, regs);
+    ebx7 = regs[1];
+    if (!HAS_BITS(ebx7, AVX2_BITS))
+        return ISA_SSE42;
+    if (!HAS_BITS(ebx7, AVX512_BITS) || !HAS_BITS(xcr0, XCR0_AVX512))
+        return ISA_AVX2;
+    return ISA_AVX512;
+}
+
+#else
+
+static int
+detect_isa_level(void)
+{
+    return ISA_GENERIC;
+}
+
+#endif  /* HAVE_CPUID */
+
+int
+numba_pycc_get_isa_level(void)
+{
+    static int level = -1;
+    /* Racing threads compute the same value, so no locking is needed */
+    if (level < 0)
+        level = detect_isa_level();
+    return level;
+}
@@ -50,6 +50,15 @@ class Toolchain(object):
         self._debug = value
         log.set_threshold(log.DEBUG if value else log.WARN)
 
+    def compile_objects(self, sources, output_dir, include_dirs=()):
+        """
+        Compile the given C *sources* into object files under *output_dir*.
+        A list of the object file paths is returned.
+        """
+        return self._compiler.compile(sources, output_dir=output_dir,
+                                      include_dirs=list(include_dirs),
+                                      debug=self._debug)
+
     def link_shared(self, output, objects, libraries=(),
                     library_dirs=(), export_symbols=()):
         """
@@ -397,6 +397,24 @@ class PythonAPI(object):
         cstr = self.context.insert_const_string(self.module, name)
         return self.builder.call(fn, (dictobj, cstr, valobj))
 
+    def dict_size(self, dictobj):
+        fnty = Type.function(self.py_ssize_t, [self.pyobj])
+        fn = self._get_function(fnty, name="PyDict_Size")
+        return self.builder.call(fn, [dictobj])
+
+    def dict_items(self, dictobj):
+        """
+        Returns a new list of (key, value) tuples.
+        """
+        fnty = Type.function(self.pyobj, [self.pyobj])
+        fn = self._get_function(fnty, name="PyDict_Items")
+        return self.builder.call(fn, [dictobj])
+
+    def dict_clear(self, dictobj):
+        fnty = Type.function(Type.void(), [self.pyobj])
+        fn = self._get_function(fnty, name="PyDict_Clear")
+        return self.builder.call(fn, [dictobj])
+
     def dict_pack(self, keyvalues):
         """
         Args
@@ -449,6 +467,14 @@ class PythonAPI(object):
         fn = self._get_function(fnty, name="PyLong_AsVoidPtr")
         return self.builder.call(fn, [numobj])
 
+    def long_from_voidptr(self, ptr):
+        """
+        Convert the given void* to a Python integer.
+        """
+        fnty = Type.function(self.pyobj, [self.voidptr])
+        fn = self._get_function(fnty, name="PyLong_FromVoidPtr")
+        return self.builder.call(fn, [ptr])
+
     def _long_from_native_int(self, ival, func_name, native_int_type,
                               signed):
         fnty = Type.function(self.pyobj, [native_int_type])
@@ -792,6 +818,16 @@ class PythonAPI(object):
         fn = self._get_function(fnty, name="PySet_Add")
         return self.builder.call(fn, [set, value])
 
+    def set_size(self, set):
+        fnty = Type.function(self.py_ssize_t, [self.pyobj])
+        fn = self._get_function(fnty, name="PySet_Size")
+        return self.builder.call(fn, [set])
+
+    def set_clear(self, set):
+        fnty = Type.function(Type.int(), [self.pyobj])
+        fn = self._get_function(fnty, name="PySet_Clear")
+        return self.builder.call(fn, [set])
+
     #
     # GIL APIs
     #
@@ -1025,6 +1061,36 @@ class PythonAPI(object):
         fn = self._get_function(fnty, name=fname)
         return self.builder.call(fn, [string])
 
+    def string_from_kind_and_data(self, kind, string, size):
+        """
+        Build a str object from PEP 393 character data of the given
+        *kind* (Python 3 only).
+        """
+        fnty = Type.function(self.pyobj, [Type.int(), self.cstring,
+                                          self.py_ssize_t])
+        fn = self._get_function(fnty, name="PyUnicode_FromKindAndData")
+        return self.builder.call(fn, [kind, string, size])
+
+    def extract_unicode(self, strobj):
+        """
+        Returns a tuple of ``(ok, data, length, kind, hash)`` describing
+        the PEP 393 representation of *strobj* (Python 3 only).
+        The ``data`` is a i8* pointing to the object's character data.
+        The ``hash`` is the object's cached hash value, or -1.
+        """
+        p_length = cgutils.alloca_once(self.builder, self.py_ssize_t)
+        p_kind = cgutils.alloca_once(self.builder, Type.int())
+        p_hash = cgutils.alloca_once(self.builder, self.py_ssize_t)
+        fnty = Type.function(self.cstring, [self.pyobj,
+                                            self.py_ssize_t.as_pointer(),
+                                            Type.int().as_pointer(),
+                                            self.py_ssize_t.as_pointer()])
+        fn = self._get_function(fnty, name="numba_extract_unicode")
+        data = self.builder.call(fn, [strobj, p_length, p_kind, p_hash])
+        ok = cgutils.is_not_null(self.builder, data)
+        return (ok, data, self.builder.load(p_length),
+                self.builder.load(p_kind), self.builder.load(p_hash))
+
     def bytes_from_string_and_size(self, string, size):
         fnty = Type.function(self.pyobj, [self.cstring, self.py_ssize_t])
         if PYVERSION >= (3, 0):
@@ -1099,6 +1165,18 @@ class PythonAPI(object):
         fn.args[1].add_attribute(lc.ATTR_NO_CAPTURE)
         return self.builder.call(fn, (buf, ptr))
 
+    def nrt_meminfo_new_from_pyobject(self, data, pyobj):
+        """
+        Allocate a new MemInfo pointing to *data* and keeping a reference
+        to *pyobj*, which owns the data.  NULL is returned, with a
+        MemoryError set, if allocation failed.
+        """
+        assert self.context.enable_nrt
+        fnty = Type.function(self.voidptr, [self.voidptr, self.pyobj])
+        fn = self._get_function(fnty, name="NRT_meminfo_new_from_pyobject")
+        fn.return_value.add_attribute("noalias")
+        return self.builder.call(fn, [data, pyobj])
+
     # ------ utils -----
 
     def _get_function(self, fnty, name):
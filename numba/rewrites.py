@@ -57,6 +57,9 @@ class RewriteRegistry(object):
             work_list = list(blocks.items())
             while work_list:
                 key, block = work_list.pop()
+                if blocks.get(key) is not block:
+                    # The block was removed or replaced by a rewrite
+                    continue
                 matches = rewrite.match(block, pipeline.typemap,
                                         pipeline.calltypes)
                 if matches:
@@ -73,7 +76,7 @@ class RewriteRegistry(object):
                         print("_" * 70)
         # If any blocks were changed, perform a sanity check.
         for key, block in blocks.items():
-            if block != old_blocks[key]:
+            if block is not old_blocks[key]:
                 block.verify()
 
 
@@ -28,6 +28,28 @@ memsys_use_cpython_allocator(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+static PyObject *
+memsys_use_pool_allocator(PyObject *self, PyObject *args) {
+    Py_ssize_t max_retained;
+    if (!PyArg_ParseTuple(args, "n", &max_retained)) {
+        return NULL;
+    }
+    NRT_Pool_init(PyMem_RawMalloc,
+                  PyMem_RawRealloc,
+                  PyMem_RawFree,
+                  max_retained);
+    NRT_MemSys_set_allocator(NRT_Pool_malloc,
+                             NRT_Pool_realloc,
+                             NRT_Pool_free);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_pool_flush(PyObject *self, PyObject *args) {
+    NRT_Pool_flush();
+    Py_RETURN_NONE;
+}
+
 static
 PyObject*
 memsys_set_atomic_inc_dec(PyObject *self, PyObject *args) {
@@ -82,6 +104,69 @@ memsys_get_stats_mi_free(PyObject *self, PyObject *args) {
     return PyLong_FromSize_t(NRT_MemSys_get_stats_mi_free());
 }
 
+static
+PyObject*
+memsys_get_pool_stats_hits(PyObject *self, PyObject *args) {
+    return PyLong_FromSize_t(NRT_Pool_get_stats_hits());
+}
+
+static
+PyObject*
+memsys_get_pool_stats_misses(PyObject *self, PyObject *args) {
+    return PyLong_FromSize_t(NRT_Pool_get_stats_misses());
+}
+
+static
+PyObject*
+memsys_get_pool_stats_cached(PyObject *self, PyObject *args) {
+    return PyLong_FromSize_t(NRT_Pool_get_stats_cached());
+}
+
+static
+PyObject*
+memsys_get_pool_stats_released(PyObject *self, PyObject *args) {
+    return PyLong_FromSize_t(NRT_Pool_get_stats_released());
+}
+
+static PyObject *
+memsys_get_trace_sites(PyObject *self, PyObject *args) {
+    NRT_TraceSite *sites;
+    PyObject *list;
+    size_t i, n;
+
+    n = NRT_Trace_get_sites(NULL, 0);
+    sites = PyMem_Malloc((n ? n : 1) * sizeof(NRT_TraceSite));
+    if (sites == NULL)
+        return PyErr_NoMemory();
+    /* More sites may have been registered in the meantime */
+    n = Py_MIN(n, NRT_Trace_get_sites(sites, n));
+
+    list = PyList_New(n);
+    if (list == NULL)
+        goto error;
+    for (i = 0; i < n; ++i) {
+        PyObject *item = Py_BuildValue("ssinnnn",
+                                       sites[i].function,
+                                       sites[i].filename,
+                                       sites[i].line,
+                                       (Py_ssize_t) sites[i].allocs,
+                                       (Py_ssize_t) sites[i].frees,
+                                       (Py_ssize_t) sites[i].total_bytes,
+                                       (Py_ssize_t) sites[i].live_bytes);
+        if (item == NULL) {
+            Py_DECREF(list);
+            goto error;
+        }
+        PyList_SET_ITEM(list, i, item);
+    }
+    PyMem_Free(sites);
+    return list;
+
+error:
+    PyMem_Free(sites);
+    return NULL;
+}
+
 static
 void pyobject_dtor(void *ptr, void* info) {
     PyGILState_STATE gstate;
@@ -96,8 +181,24 @@ void pyobject_dtor(void *ptr, void* info) {
 static
 MemInfo* meminfo_new_from_pyobject(void *data, PyObject *ownerobj) {
     size_t dummy_size = 0;
-    Py_INCREF(ownerobj);
-    return NRT_MemInfo_new(data, dummy_size, pyobject_dtor, ownerobj);
+    MemInfo *mi = NRT_MemInfo_new(data, dummy_size, pyobject_dtor, ownerobj);
+    if (mi != NULL)
+        Py_INCREF(ownerobj);
+    return mi;
+}
+
+
+/*
+ * Same as meminfo_new_from_pyobject(), for use by compiled code
+ * (e.g. to keep alive the Python object owning some unboxed data).
+ * Return NULL with a MemoryError set on failure.
+ */
+static MemInfo*
+NRT_meminfo_new_from_pyobject(void *data, PyObject *ownerobj) {
+    MemInfo *mi = meminfo_new_from_pyobject(data, ownerobj);
+    if (mi == NULL)
+        PyErr_NoMemory();
+    return mi;
 }
 
 
@@ -527,6 +628,8 @@ static PyMethodDef ext_methods[] = {
 #define declmethod(func) { #func , ( PyCFunction )func , METH_VARARGS , NULL }
 #define declmethod_noargs(func) { #func , ( PyCFunction )func , METH_NOARGS, NULL }
     declmethod_noargs(memsys_use_cpython_allocator),
+    declmethod(memsys_use_pool_allocator),
+    declmethod_noargs(memsys_pool_flush),
     declmethod_noargs(memsys_shutdown),
     declmethod(memsys_set_atomic_inc_dec),
     declmethod(memsys_set_atomic_cas),
@@ -534,6 +637,11 @@ static PyMethodDef ext_methods[] = {
     declmethod_noargs(memsys_get_stats_free),
     declmethod_noargs(memsys_get_stats_mi_alloc),
     declmethod_noargs(memsys_get_stats_mi_free),
+    declmethod_noargs(memsys_get_pool_stats_hits),
+    declmethod_noargs(memsys_get_pool_stats_misses),
+    declmethod_noargs(memsys_get_pool_stats_cached),
+    declmethod_noargs(memsys_get_pool_stats_released),
+    declmethod_noargs(memsys_get_trace_sites),
     declmethod(meminfo_new),
     declmethod(meminfo_alloc),
     declmethod(meminfo_alloc_safe),
@@ -574,6 +682,10 @@ declmethod(MemInfo_alloc_safe_aligned);
 declmethod(MemInfo_call_dtor);
 declmethod(MemInfo_varsize_alloc);
 declmethod(MemInfo_varsize_realloc);
+declmethod(MemInfo_new_varsize_dtor);
+declmethod(meminfo_new_from_pyobject);
+declmethod(MemInfo_trace);
+declmethod(Trace_set_site);
 
 
 #undef declmethod
@@ -3,6 +3,14 @@
 #include "nrt.h"
 #include "assert.h"
 
+#ifdef _MSC_VER
+    #include <windows.h>
+    #define NRT_THREAD_LOCAL __declspec(thread)
+#else
+    #include <pthread.h>
+    #define NRT_THREAD_LOCAL __thread
+#endif
+
 #if !defined MIN
 #define MIN(a, b) ((a) < (b)) ? (a) : (b)
 #endif
@@ -19,6 +27,7 @@ struct MemInfo {
     void          *dtor_info;
     void          *data;
     size_t         size;    /* only used for NRT allocated memory */
+    NRT_TraceSite *site;    /* allocation site when traced, or NULL */
 };
 
 
@@ -67,6 +76,9 @@ void NRT_MemSys_init(void) {
     TheMSys.allocator.malloc = malloc;
     TheMSys.allocator.realloc = realloc;
     TheMSys.allocator.free = free;
+#ifdef _MSC_VER
+    InitializeCriticalSection(&TheTrace.lock);
+#endif
 }
 
 void NRT_MemSys_shutdown(void) {
@@ -164,6 +176,137 @@ void NRT_MemSys_set_atomic_cas_stub(void) {
 }
 
 
+/*
+ * Allocation tracing.
+ */
+
+static struct {
+    /* Registered sites */
+    NRT_TraceSite *sites;
+    size_t nsites;
+    /* Protects the sites and their counters */
+#ifdef _MSC_VER
+    CRITICAL_SECTION lock;
+#else
+    pthread_mutex_t lock;
+#endif
+} TheTrace
+#ifndef _MSC_VER
+    = { NULL, 0, PTHREAD_MUTEX_INITIALIZER }
+#endif
+;
+
+static NRT_THREAD_LOCAL NRT_TraceSite *trace_current_site;
+
+#ifdef _MSC_VER
+#define trace_lock() EnterCriticalSection(&TheTrace.lock)
+#define trace_unlock() LeaveCriticalSection(&TheTrace.lock)
+#else
+#define trace_lock() pthread_mutex_lock(&TheTrace.lock)
+#define trace_unlock() pthread_mutex_unlock(&TheTrace.lock)
+#endif
+
+static
+char *trace_strdup(const char *str) {
+    size_t size = strlen(str) + 1;
+    char *copy = malloc(size);
+    if (copy != NULL)
+        memcpy(copy, str, size);
+    return copy;
+}
+
+static
+NRT_TraceSite *trace_get_site(const char *function, const char *filename,
+                              int line)
+{
+    NRT_TraceSite *site;
+    trace_lock();
+    for (site = TheTrace.sites; site != NULL; site = site->next) {
+        if (site->line == line && !strcmp(site->function, function) &&
+            !strcmp(site->filename, filename))
+            break;
+    }
+    if (site == NULL) {
+        /* Sites are never freed, as MemInfos may outlive the code */
+        site = calloc(1, sizeof(NRT_TraceSite));
+        if (site != NULL) {
+            site->function = trace_strdup(function);
+            site->filename = trace_strdup(filename);
+            site->line = line;
+            if (site->function == NULL || site->filename == NULL) {
+                free(site->function);
+                free(site->filename);
+                free(site);
+                site = NULL;
+            }
+            else {
+                site->next = TheTrace.sites;
+                TheTrace.sites = site;
+                TheTrace.nsites++;
+            }
+        }
+    }
+    trace_unlock();
+    return site;
+}
+
+void NRT_Trace_set_site(NRT_TraceSite **cache, const char *function,
+                        const char *filename, int line)
+{
+    NRT_TraceSite *site = *cache;
+    if (site == NULL) {
+        site = trace_get_site(function, filename, line);
+        *cache = site;
+    }
+    trace_current_site = site;
+}
+
+void NRT_MemInfo_trace(MemInfo *mi) {
+    NRT_TraceSite *site = trace_current_site;
+    if (mi == NULL || site == NULL)
+        return;
+    mi->site = site;
+    trace_lock();
+    site->allocs++;
+    site->total_bytes += mi->size;
+    site->live_bytes += mi->size;
+    trace_unlock();
+}
+
+static
+void trace_resize(MemInfo *mi, size_t new_size) {
+    NRT_TraceSite *site = mi->site;
+    trace_lock();
+    if (new_size > mi->size)
+        site->total_bytes += new_size - mi->size;
+    site->live_bytes += new_size;
+    site->live_bytes -= mi->size;
+    trace_unlock();
+}
+
+static
+void trace_free(MemInfo *mi) {
+    NRT_TraceSite *site = mi->site;
+    trace_lock();
+    site->frees++;
+    site->live_bytes -= mi->size;
+    trace_unlock();
+}
+
+size_t NRT_Trace_get_sites(NRT_TraceSite *out, size_t n) {
+    NRT_TraceSite *site;
+    size_t nsites;
+    trace_lock();
+    for (site = TheTrace.sites; site != NULL && n > 0; site = site->next) {
+        *out++ = *site;
+        n--;
+    }
+    nsites = TheTrace.nsites;
+    trace_unlock();
+    return nsites;
+}
+
+
 /*
  * The MemInfo structure.
  */
@@ -176,6 +319,7 @@ void NRT_MemInfo_init(MemInfo *mi,void *data, size_t size, dtor_function dtor,
     mi->dtor_info = dtor_info;
     mi->data = data;
     mi->size = size;
+    mi->site = NULL;
     /* Update stats */
     TheMSys.atomic_inc(&TheMSys.stats_mi_alloc);
 }
@@ -184,7 +328,8 @@ MemInfo* NRT_MemInfo_new(void *data, size_t size, dtor_function dtor,
                          void *dtor_info)
 {
     MemInfo * mi = NRT_Allocate(sizeof(MemInfo));
-    NRT_MemInfo_init(mi, data, size, dtor, dtor_info);
+    if (mi != NULL)
+        NRT_MemInfo_init(mi, data, size, dtor, dtor_info);
     return mi;
 }
 
@@ -271,6 +416,8 @@ MemInfo* NRT_MemInfo_alloc_safe_aligned(size_t size, unsigned align) {
 }
 
 void NRT_MemInfo_destroy(MemInfo *mi) {
+    if (mi->site != NULL)
+        trace_free(mi);
     NRT_Free(mi);
     TheMSys.atomic_inc(&TheMSys.stats_mi_free);
 }
@@ -321,6 +468,11 @@ void NRT_MemInfo_dump(MemInfo *mi, FILE *out) {
 static void
 nrt_varsize_dtor(void *ptr, void *info) {
     NRT_Debug(nrt_debug_print("nrt_buffer_dtor %p\n", ptr));
+    if (info) {
+        /* Call the contents' destructor */
+        varsize_dtor_function dtor = (varsize_dtor_function) info;
+        dtor(ptr);
+    }
     NRT_Free(ptr);
 }
 
@@ -337,6 +489,14 @@ MemInfo *NRT_MemInfo_varsize_alloc(size_t size)
     return mi;
 }
 
+MemInfo *NRT_MemInfo_new_varsize_dtor(size_t size, varsize_dtor_function dtor)
+{
+    MemInfo *mi = NRT_MemInfo_varsize_alloc(size);
+    if (mi != NULL)
+        mi->dtor_info = (void *) dtor;
+    return mi;
+}
+
 void *NRT_MemInfo_varsize_realloc(MemInfo *mi, size_t size)
 {
     if (mi->dtor != nrt_varsize_dtor) {
@@ -347,6 +507,8 @@ void *NRT_MemInfo_varsize_realloc(MemInfo *mi, size_t size)
     mi->data = NRT_Reallocate(mi->data, size);
     if (mi->data == NULL)
         return NULL;
+    if (mi->site != NULL)
+        trace_resize(mi, size);
     mi->size = size;
     NRT_Debug(nrt_debug_print("NRT_MemInfo_varsize_realloc %p size=%zu "
                               "-> data=%p\n", mi, size, mi->data));
@@ -376,3 +538,222 @@ void NRT_Free(void *ptr) {
     TheMSys.allocator.free(ptr);
     TheMSys.atomic_inc(&TheMSys.stats_free);
 }
+
+/*
+ * Pool allocator.
+ */
+
+static const size_t pool_class_sizes[] = {
+    16, 32, 48, 64, 96, 128, 192, 256, 384, 512, 768, 1024, 1536, 2048,
+    3072, NRT_POOL_MAX_BLOCK
+};
+
+#define NRT_POOL_NCLASSES (sizeof(pool_class_sizes) / sizeof(size_t))
+/* The size class of blocks larger than NRT_POOL_MAX_BLOCK */
+#define NRT_POOL_LARGE ((size_t) -1)
+
+/* Stored before each block */
+typedef union {
+    size_t cls;
+    /* Keep the blocks aligned as the backend's */
+    char pad[16];
+} PoolHeader;
+
+typedef struct PoolFreeBlock {
+    struct PoolFreeBlock *next;
+} PoolFreeBlock;
+
+/* The free lists of a thread */
+typedef struct {
+    PoolFreeBlock *heads[NRT_POOL_NCLASSES];
+    size_t retained;
+    int registered;
+} PoolCache;
+
+static struct {
+    /* Backend allocation functions */
+    NRT_malloc_func malloc;
+    NRT_realloc_func realloc;
+    NRT_free_func free;
+    /* Maximum number of bytes in the free lists of a thread */
+    size_t max_retained;
+    /* Stats */
+    size_t stats_hits, stats_misses, stats_cached, stats_released;
+    /* Key to flush the free lists at thread exit */
+    int key_created;
+#ifdef _MSC_VER
+    DWORD key;
+#else
+    pthread_key_t key;
+#endif
+} ThePool;
+
+static NRT_THREAD_LOCAL PoolCache pool_cache;
+
+static
+size_t pool_size_class(size_t size) {
+    size_t i;
+    for (i = 0; i < NRT_POOL_NCLASSES; ++i) {
+        if (size <= pool_class_sizes[i])
+            return i;
+    }
+    return NRT_POOL_LARGE;
+}
+
+static
+void pool_flush_cache(PoolCache *cache) {
+    size_t i;
+    for (i = 0; i < NRT_POOL_NCLASSES; ++i) {
+        PoolFreeBlock *block = cache->heads[i];
+        while (block != NULL) {
+            PoolFreeBlock *next = block->next;
+            ThePool.free((PoolHeader *) block - 1);
+            TheMSys.atomic_inc(&ThePool.stats_released);
+            block = next;
+        }
+        cache->heads[i] = NULL;
+    }
+    cache->retained = 0;
+}
+
+#ifdef _MSC_VER
+static
+void WINAPI pool_thread_exit(void *cache) {
+    if (cache != NULL)
+        pool_flush_cache((PoolCache *) cache);
+}
+#else
+static
+void pool_thread_exit(void *cache) {
+    pool_flush_cache((PoolCache *) cache);
+}
+#endif
+
+static
+PoolCache *pool_get_cache(void) {
+    PoolCache *cache = &pool_cache;
+    if (!cache->registered) {
+        /* Have the free lists flushed when the thread exits */
+        if (ThePool.key_created) {
+#ifdef _MSC_VER
+            FlsSetValue(ThePool.key, cache);
+#else
+            pthread_setspecific(ThePool.key, cache);
+#endif
+        }
+        cache->registered = 1;
+    }
+    return cache;
+}
+
+void NRT_Pool_init(NRT_malloc_func malloc_func,
+                   NRT_realloc_func realloc_func,
+                   NRT_free_func free_func,
+                   size_t max_retained)
+{
+    ThePool.malloc = malloc_func;
+    ThePool.realloc = realloc_func;
+    ThePool.free = free_func;
+    ThePool.max_retained = max_retained;
+    if (!ThePool.key_created) {
+#ifdef _MSC_VER
+        ThePool.key = FlsAlloc(pool_thread_exit);
+        ThePool.key_created = ThePool.key != FLS_OUT_OF_INDEXES;
+#else
+        ThePool.key_created = !pthread_key_create(&ThePool.key,
+                                                  pool_thread_exit);
+#endif
+    }
+}
+
+void *NRT_Pool_malloc(size_t size) {
+    size_t cls = pool_size_class(size);
+    PoolHeader *header;
+    if (cls != NRT_POOL_LARGE) {
+        PoolCache *cache = pool_get_cache();
+        PoolFreeBlock *block = cache->heads[cls];
+        if (block != NULL) {
+            cache->heads[cls] = block->next;
+            cache->retained -= pool_class_sizes[cls];
+            TheMSys.atomic_inc(&ThePool.stats_hits);
+            return block;
+        }
+        TheMSys.atomic_inc(&ThePool.stats_misses);
+        size = pool_class_sizes[cls];
+    }
+    header = ThePool.malloc(sizeof(PoolHeader) + size);
+    if (header == NULL)
+        return NULL;
+    header->cls = cls;
+    return header + 1;
+}
+
+void NRT_Pool_free(void *ptr) {
+    PoolHeader *header;
+    size_t cls;
+    if (ptr == NULL)
+        return;
+    header = (PoolHeader *) ptr - 1;
+    cls = header->cls;
+    if (cls != NRT_POOL_LARGE) {
+        PoolCache *cache = pool_get_cache();
+        size_t size = pool_class_sizes[cls];
+        if (cache->retained + size <= ThePool.max_retained) {
+            PoolFreeBlock *block = (PoolFreeBlock *) ptr;
+            block->next = cache->heads[cls];
+            cache->heads[cls] = block;
+            cache->retained += size;
+            TheMSys.atomic_inc(&ThePool.stats_cached);
+            return;
+        }
+        TheMSys.atomic_inc(&ThePool.stats_released);
+    }
+    ThePool.free(header);
+}
+
+void *NRT_Pool_realloc(void *ptr, size_t new_size) {
+    PoolHeader *header;
+    size_t cls, new_cls, copy_size;
+    void *new_ptr;
+    if (ptr == NULL)
+        return NRT_Pool_malloc(new_size);
+    header = (PoolHeader *) ptr - 1;
+    cls = header->cls;
+    new_cls = pool_size_class(new_size);
+    if (cls == NRT_POOL_LARGE && new_cls == NRT_POOL_LARGE) {
+        header = ThePool.realloc(header, sizeof(PoolHeader) + new_size);
+        return header != NULL ? header + 1 : NULL;
+    }
+    if (cls == new_cls)
+        return ptr;
+    /* Move to a block of another size class */
+    new_ptr = NRT_Pool_malloc(new_size);
+    if (new_ptr == NULL)
+        return NULL;
+    copy_size = new_size;
+    if (cls != NRT_POOL_LARGE && pool_class_sizes[cls] < new_size)
+        copy_size = pool_class_sizes[cls];
+    memcpy(new_ptr, ptr, copy_size);
+    NRT_Pool_free(ptr);
+    return new_ptr;
+}
+
+void NRT_Pool_flush(void) {
+    pool_flush_cache(pool_get_cache());
+}
+
+size_t NRT_Pool_get_stats_hits(void) {
+    return ThePool.stats_hits;
+}
+
+size_t NRT_Pool_get_stats_misses(void) {
+    return ThePool.stats_misses;
+}
+
+size_t NRT_Pool_get_stats_cached(void) {
+    return ThePool.stats_cached;
+}
+
+size_t NRT_Pool_get_stats_released(void) {
+    return ThePool.stats_released;
+}
@@ -29,6 +29,7 @@ void nrt_debug_print(char *fmt, ...) {
 
 /* TypeDefs */
 typedef void (*dtor_function)(void *ptr, void *info);
+typedef void (*varsize_dtor_function)(void *ptr);
 typedef size_t (*atomic_inc_dec_func)(size_t *ptr);
 typedef int (*atomic_cas_func)(void * volatile *ptr, void *cmp, void *repl,
                                void **oldptr);
@@ -84,6 +85,82 @@ size_t NRT_MemSys_get_stats_free(void);
 size_t NRT_MemSys_get_stats_mi_alloc(void);
 size_t NRT_MemSys_get_stats_mi_free(void);
 
+/*
+ * Pool allocator for small blocks, to be installed with
+ * NRT_MemSys_set_allocator().  Blocks of up to NRT_POOL_MAX_BLOCK bytes
+ * are rounded up to a size class; freed blocks are kept in free lists
+ * local to the freeing thread, up to `max_retained` bytes per thread, and
+ * reused by the next allocations of the same size class.  Other blocks
+ * go to the backend allocation functions.
+ */
+#define NRT_POOL_MAX_BLOCK 4096
+
+/*
+ * Set the backend allocation functions and the maximum number of bytes
+ * retained by each thread.  Must not be called while pool blocks are
+ * allocated.
+ */
+void NRT_Pool_init(NRT_malloc_func malloc_func,
+                   NRT_realloc_func realloc_func,
+                   NRT_free_func free_func,
+                   size_t max_retained);
+
+void *NRT_Pool_malloc(size_t size);
+void *NRT_Pool_realloc(void *ptr, size_t new_size);
+void NRT_Pool_free(void *ptr);
+
+/*
+ * Return the free blocks of the current thread to the backend.
+ * This is done automatically when a thread exits.
+ */
+void NRT_Pool_flush(void);
+
+/*
+ * The following functions get statistics of the pool allocator: the
+ * small allocations served from a free list (hits) or by the backend
+ * (misses), and the freed small blocks kept in a free list (cached) or
+ * given back to the backend (released).
+ */
+size_t NRT_Pool_get_stats_hits(void);
+size_t NRT_Pool_get_stats_misses(void);
+size_t NRT_Pool_get_stats_cached(void);
+size_t NRT_Pool_get_stats_released(void);
+
+/*
+ * Allocation tracing.  Compiled code declares the current allocation
+ * site of the calling thread with NRT_Trace_set_site(); the MemInfos
+ * passed to NRT_MemInfo_trace() are then attributed to that site, which
+ * counts the allocations, the frees and the allocated and live bytes.
+ */
+typedef struct NRT_TraceSite NRT_TraceSite;
+
+struct NRT_TraceSite {
+    NRT_TraceSite *next;
+    char          *function;
+    char          *filename;
+    int            line;
+    size_t         allocs, frees, total_bytes, live_bytes;
+};
+
+/*
+ * Set the current allocation site of the calling thread.  `*cache` is
+ * the site previously returned for the same location, or NULL; the site
+ * is looked up or registered on the first call.
+ */
+void NRT_Trace_set_site(NRT_TraceSite **cache, const char *function,
+                        const char *filename, int line);
+
+/*
+ * Attribute a new MemInfo to the current allocation site, if any.
+ */
+void NRT_MemInfo_trace(MemInfo *mi);
+
+/*
+ * Copy at most `n` registered sites into `out` (their `next` field is
+ * meaningless) and return the number of registered sites.
+ */
+size_t NRT_Trace_get_sites(NRT_TraceSite *out, size_t n);
+
 /* Memory Info API */
 
 /* Create a new MemInfo for external memory
@@ -165,6 +242,13 @@ size_t NRT_MemInfo_size(MemInfo* mi);
 MemInfo *NRT_MemInfo_varsize_alloc(size_t size);
 void *NRT_MemInfo_varsize_realloc(MemInfo *mi, size_t size);
 
+/*
+ * Same as NRT_MemInfo_varsize_alloc(), but *dtor* is called with the
+ * data pointer before the data area is freed (e.g. to release the
+ * references held by the items of a container).
+ */
+MemInfo *NRT_MemInfo_new_varsize_dtor(size_t size, varsize_dtor_function dtor);
+
 
 /*
  * Print debug info to FILE
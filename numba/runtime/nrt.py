@@ -5,11 +5,20 @@ from collections import namedtuple
 from . import atomicops
 from llvmlite import binding as ll
 
+from numba import config
 from numba.utils import finalize as _finalize
 from . import _nrt_python as _nrt
 
 _nrt_mstats = namedtuple("nrt_mstats", ["alloc", "free", "mi_alloc", "mi_free"])
 
+_nrt_pool_stats = namedtuple("nrt_pool_stats",
+                             ["hits", "misses", "cached", "released"])
+
+_nrt_allocation_site = namedtuple("nrt_allocation_site",
+                                  ["function", "filename", "lineno",
+                                   "allocs", "frees", "total_bytes",
+                                   "live_bytes"])
+
 
 class _Runtime(object):
     def __init__(self):
@@ -94,12 +103,77 @@ class _Runtime(object):
                            mi_alloc=_nrt.memsys_get_stats_mi_alloc(),
                            mi_free=_nrt.memsys_get_stats_mi_free())
 
+    def _check_no_allocation(self):
+        stats = self.get_allocation_stats()
+        if stats.alloc != stats.free or stats.mi_alloc != stats.mi_free:
+            raise RuntimeError("cannot change the NRT allocator while "
+                               "memory is allocated")
+
+    def use_pool_allocator(self, max_retained):
+        """
+        Allocate the memory with the pool allocator: the freed blocks of up
+        to 4096 bytes are kept in free lists local to each thread, up to
+        `max_retained` bytes per thread, for reuse by the next allocations.
+        This avoids the cost of the system allocator when many small arrays
+        are created.  See `NRT_Pool_init()` in "nrt.h" for details.
+
+        No memory may be allocated by the NRT when switching allocators.
+        """
+        if max_retained < 0:
+            raise ValueError("max_retained must be non-negative, got %r"
+                             % (max_retained,))
+        self._check_no_allocation()
+        _nrt.memsys_use_pool_allocator(max_retained)
+
+    def use_system_allocator(self):
+        """
+        Allocate the memory with the system (CPython's raw) allocator.
+        The free blocks kept by the current thread for the pool allocator
+        are released.
+
+        No memory may be allocated by the NRT when switching allocators.
+        """
+        self._check_no_allocation()
+        _nrt.memsys_use_cpython_allocator()
+        _nrt.memsys_pool_flush()
+
+    def get_pool_stats(self):
+        """
+        Returns a namedtuple of (hits, misses, cached, released) counting
+        the small allocations of the pool allocator served from a free list
+        or by the system allocator, and the freed small blocks kept in a
+        free list or given back to the system allocator.
+        """
+        return _nrt_pool_stats(hits=_nrt.memsys_get_pool_stats_hits(),
+                               misses=_nrt.memsys_get_pool_stats_misses(),
+                               cached=_nrt.memsys_get_pool_stats_cached(),
+                               released=_nrt.memsys_get_pool_stats_released())
+
+    def get_allocation_sites(self):
+        """
+        Returns a list of namedtuples of (function, filename, lineno,
+        allocs, frees, total_bytes, live_bytes) for the source lines of
+        the compiled functions which allocated memory, with the count of
+        allocations and frees and the number of bytes allocated and still
+        alive.  The list is sorted by decreasing live bytes.
+
+        Only the allocations of the functions compiled while
+        NUMBA_NRT_TRACE is set are recorded.
+        """
+        sites = [_nrt_allocation_site(*site)
+                 for site in _nrt.memsys_get_trace_sites()]
+        sites.sort(key=lambda site: (-site.live_bytes, -site.total_bytes,
+                                     site.filename, site.lineno))
+        return sites
+
 
 # Alias to _nrt_python._MemInfo
 MemInfo = _nrt._MemInfo
 
 # Create runtime
 _nrt.memsys_use_cpython_allocator()
+if config.NRT_POOL > 0:
+    _nrt.memsys_use_pool_allocator(config.NRT_POOL)
 rtsys = _Runtime()
 
 # Install finalizer
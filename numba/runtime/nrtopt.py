@@ -0,0 +1,277 @@
+"""
+NRT specific optimizations: pruning of redundant reference count operations.
+
+The pass works on the textual form of a function-optimized LLVM module
+(by then, mem2reg and friends have turned the values passed to NRT_incref
+and NRT_decref into SSA registers which can be compared by name).  For
+each function, it rebuilds the control flow graph and removes:
+
+- refcount operations on a null pointer (they are no-ops);
+- incref/decref pairs on the same value within a basic block;
+- incref/decref pairs on the same value in two control-equivalent basic
+  blocks, i.e. where the incref's block dominates the decref's block, the
+  decref's block post-dominates the incref's block, and both belong to
+  the same loops.  Such blocks execute the same number of times, in
+  alternating order, so removing the pair doesn't change the refcount
+  balance.
+
+As for the original per-block pass, this assumes the value is kept alive
+by another reference between the incref and the decref.
+"""
+
+from __future__ import print_function, absolute_import, division
+
+import re
+from collections import defaultdict
+
+from llvmlite import binding as llvm
+
+from numba import controlflow
+
+
+_regex_incref = re.compile(r'(?:tail |notail |musttail )?'
+                           r'call void @NRT_incref\(([^)]*)\)')
+_regex_decref = re.compile(r'(?:tail |notail |musttail )?'
+                           r'call void @NRT_decref\(([^)]*)\)')
+_regex_null = re.compile(r'\S+ null$')
+_regex_bb = re.compile(r'(?:("[^"]*")|([-a-zA-Z$._0-9]+)):'
+                       r'|; <label>:(\d+)')
+_regex_label_ref = re.compile(r'label %("[^"]*"|[-a-zA-Z$._0-9]+)')
+
+
+class PruneStats(object):
+    """
+    Counters of the reference count operations removed by
+    remove_redundant_nrt_refct(), by kind.
+    """
+
+    __slots__ = ('null', 'per_block', 'cross_block')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.null = 0
+        self.per_block = 0
+        self.cross_block = 0
+
+    @property
+    def total(self):
+        return self.null + self.per_block + self.cross_block
+
+    def __repr__(self):
+        return ("PruneStats(null=%d, per_block=%d, cross_block=%d)"
+                % (self.null, self.per_block, self.cross_block))
+
+
+# Process-wide counters
+stats = PruneStats()
+
+
+class _Block(object):
+    """
+    A basic block of a LLVM function, as far as refcount pruning is
+    concerned.
+    """
+
+    __slots__ = ('name', 'increfs', 'decrefs', 'successors')
+
+    def __init__(self, name):
+        self.name = name
+        # Lists of (line number, operand) in program order
+        self.increfs = []
+        self.decrefs = []
+        # Names of successor blocks
+        self.successors = set()
+
+
+def _parse_functions(lines):
+    """
+    Yield the list of basic blocks of each function definition in the
+    module's *lines*.
+    """
+    blocks = None
+    current = None
+    for lineno, line in enumerate(lines):
+        if blocks is None:
+            if line.startswith('define '):
+                blocks = []
+                current = None
+            continue
+        if line.startswith('}'):
+            yield blocks
+            blocks = None
+            continue
+        m = _regex_bb.match(line)
+        if m is not None:
+            current = _Block(m.group(1) or m.group(2) or m.group(3))
+            blocks.append(current)
+            continue
+        stripped = line.strip()
+        if not stripped or stripped.startswith(';'):
+            continue
+        if current is None:
+            # The entry block is unnamed
+            current = _Block(None)
+            blocks.append(current)
+        m = _regex_incref.match(stripped)
+        if m is not None:
+            current.increfs.append((lineno, m.group(1)))
+            continue
+        m = _regex_decref.match(stripped)
+        if m is not None:
+            current.decrefs.append((lineno, m.group(1)))
+            continue
+        current.successors.update(_regex_label_ref.findall(line))
+
+
+def _is_reducible(cfg):
+    """
+    Whether all the cycles of the processed *cfg* are natural loops, i.e.
+    every retreating edge of a depth-first traversal is a back edge.
+    """
+    doms = cfg.dominators()
+    entry = cfg.entry_point()
+    on_stack = set([entry])
+    visited = set([entry])
+    stack = [(entry, iter([dest for dest, _ in cfg.successors(entry)]))]
+    while stack:
+        node, succs = stack[-1]
+        for succ in succs:
+            if succ in on_stack:
+                if succ not in doms[node]:
+                    return False
+            elif succ not in visited:
+                visited.add(succ)
+                on_stack.add(succ)
+                stack.append((succ, iter([dest for dest, _
+                                          in cfg.successors(succ)])))
+                break
+        else:
+            stack.pop()
+            on_stack.discard(node)
+    return True
+
+
+def _build_cfg(blocks):
+    """
+    Build and process a CFGraph for the given *blocks*, whose nodes are
+    the block indices.  None is returned if the graph is unsuitable
+    for the analysis.
+    """
+    cfg = controlflow.CFGraph()
+    indices = {}
+    for i, blk in enumerate(blocks):
+        cfg.add_node(i)
+        if blk.name is not None:
+            indices[blk.name] = i
+    for i, blk in enumerate(blocks):
+        for succ in blk.successors:
+            if succ not in indices:
+                return None
+            cfg.add_edge(i, indices[succ])
+    cfg.set_entry_point(0)
+    try:
+        cfg.process()
+    except (AssertionError, RuntimeError):
+        # CFGraph makes assumptions valid for Python bytecode, such as
+        # a single back edge per block; give up if they don't hold.
+        return None
+    if not _is_reducible(cfg):
+        return None
+    return cfg
+
+
+def _prune_function(blocks, removed):
+    """
+    Find the redundant refcount operations in the function made of
+    *blocks*, and add their line numbers to the *removed* set.
+    """
+    # Unmatched operations, per operand: lists of (block index, line number)
+    increfs = defaultdict(list)
+    decrefs = defaultdict(list)
+
+    for i, blk in enumerate(blocks):
+        block_increfs = defaultdict(list)
+        block_decrefs = defaultdict(list)
+        for ops, block_ops in ((blk.increfs, block_increfs),
+                               (blk.decrefs, block_decrefs)):
+            for lineno, operand in ops:
+                if _regex_null.match(operand):
+                    removed.add(lineno)
+                    stats.null += 1
+                else:
+                    block_ops[operand].append(lineno)
+
+        # Pair the operations on the same value within the block
+        for operand, inc_lines in block_increfs.items():
+            dec_lines = block_decrefs.get(operand, [])
+            npairs = min(len(inc_lines), len(dec_lines))
+            for _ in range(npairs):
+                removed.add(inc_lines.pop())
+                removed.add(dec_lines.pop(0))
+            stats.per_block += 2 * npairs
+
+        for operand, lines in block_increfs.items():
+            increfs[operand].extend((i, lineno) for lineno in lines)
+        for operand, lines in block_decrefs.items():
+            decrefs[operand].extend((i, lineno) for lineno in lines)
+
+    candidates = [operand for operand in increfs
+                  if increfs[operand] and decrefs.get(operand)]
+    if not candidates:
+        return
+
+    cfg = _build_cfg(blocks)
+    if cfg is None:
+        return
+    doms = cfg.dominators()
+    postdoms = cfg.post_dominators()
+    live = cfg.nodes()
+
+    def control_equivalent(a, b):
+        return (a in doms[b] and b in postdoms[a]
+                and cfg.in_loops(a) == cfg.in_loops(b))
+
+    # Pair the remaining operations across control-equivalent blocks
+    for operand in candidates:
+        dec_list = [(b, lineno) for b, lineno in decrefs[operand]
+                    if b in live]
+        for inc_block, inc_line in increfs[operand]:
+            if inc_block not in live:
+                continue
+            for k, (dec_block, dec_line) in enumerate(dec_list):
+                if control_equivalent(inc_block, dec_block):
+                    removed.add(inc_line)
+                    removed.add(dec_line)
+                    stats.cross_block += 2
+                    del dec_list[k]
+                    break
+
+
+def remove_redundant_nrt_refct(ll_module):
+    """
+    Remove redundant reference count operations from the
+    `llvmlite.binding.ModuleRef`.  The same module is returned if nothing
+    was removed, otherwise a new module.
+    """
+    # Early escape if NRT_incref is not used
+    try:
+        ll_module.get_function('NRT_incref')
+    except NameError:
+        return ll_module
+
+    lines = str(ll_module).splitlines()
+    removed = set()
+    for blocks in _parse_functions(lines):
+        _prune_function(blocks, removed)
+
+    if not removed:
+        return ll_module
+
+    newll = '\n'.join(ln for lno, ln in enumerate(lines)
+                      if lno not in removed)
+    # Regenerate the LLVM module
+    newmod = llvm.parse_assembly(newll)
+    newmod.name = ll_module.name
+    return newmod
@@ -1,6 +1,17 @@
 from __future__ import print_function, division, absolute_import
 
+from .six.moves import range
 from .typing.typeof import typeof
 
 
-__all__ = ['typeof']
+def prange(*args):
+    """
+    Provides a 1D parallel iterator that generates a sequence of integers.
+    In functions compiled with `parallel=True`, the iterations of a
+    `for` loop over prange() are run in parallel; otherwise prange()
+    behaves like range().
+    """
+    return range(*args)
+
+
+__all__ = ['typeof', 'prange']
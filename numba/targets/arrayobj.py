@@ -12,7 +12,7 @@ from llvmlite.llvmpy.core import Constant
 
 import numpy
 from numba import types, cgutils, typing
-from numba.numpy_support import as_dtype
+from numba.numpy_support import as_dtype, carray, farray, madvise
 from numba.numpy_support import version as numpy_version
 from numba.targets.imputils import (builtin, builtin_attr, implement,
                                     impl_attribute, impl_attribute_generic,
@@ -2460,6 +2460,21 @@ def iternext_numpy_ndindex(context, builder, sig, args, result):
 # -----------------------------------------------------------------------------
 # Numpy array constructors
 
+def _assume_aligned(context, builder, ptr, align):
+    """
+    Inform LLVM that *ptr* is aligned to *align* bytes, so that it can
+    emit aligned vector accesses to the memory derived from it.
+    """
+    intp_t = context.get_value_type(types.intp)
+    mask = Constant.int(intp_t, align - 1)
+    low_bits = builder.and_(builder.ptrtoint(ptr, intp_t), mask)
+    is_aligned = builder.icmp_unsigned('==', low_bits,
+                                       Constant.null(intp_t))
+    fnty = lc.Type.function(lc.Type.void(), [lc.Type.int(1)])
+    fn = builder.module.get_or_insert_function(fnty, name="llvm.assume")
+    builder.call(fn, [is_aligned])
+
+
 def _empty_nd_impl(context, builder, arrtype, shapes):
     """Utility function used for allocating a new array during LLVM code
     generation (lowering).  Given a target context, builder, array
@@ -2496,11 +2511,14 @@ def _empty_nd_impl(context, builder, arrtype, shapes):
                 arrtype.layout))
 
     allocsize = builder.mul(itemsize, arrlen)
-    # NOTE: AVX prefer 32-byte alignment
+    # NOTE: vector loads and stores prefer aligned data (e.g. 32 bytes
+    # for AVX, 64 bytes for AVX-512)
+    align = context.array_alignment
     meminfo = context.nrt_meminfo_alloc_aligned(builder, size=allocsize,
-                                                align=32)
+                                                align=align)
 
     data = context.nrt_meminfo_data(builder, meminfo)
+    _assume_aligned(context, builder, data, align)
 
     intp_t = context.get_value_type(types.intp)
     shape_array = cgutils.pack_array(builder, shapes, ty=intp_t)
@@ -2972,6 +2990,147 @@ def np_frombuffer(context, builder, sig, args):
     return impl_ret_borrowed(context, builder, sig.return_type, res)
 
 
+@builtin
+@implement(carray, types.Any, types.Any)
+@implement(carray, types.Any, types.Any, types.Any)
+@implement(carray, types.Any, types.Any, types.Any, types.Any)
+@implement(farray, types.Any, types.Any)
+@implement(farray, types.Any, types.Any, types.Any)
+@implement(farray, types.Any, types.Any, types.Any, types.Any)
+def np_cfarray(context, builder, sig, args):
+    """
+    numba.carray() and numba.farray(), wrapping a pointer as an array
+    without copying.  If an owner array is given, the result shares its
+    meminfo; otherwise the result doesn't manage the memory it points to.
+    """
+    ptrty, shapety = sig.args[:2]
+    ptr, shape = args[:2]
+    aryty = sig.return_type
+    assert aryty.layout in 'CF'
+
+    out_ary = make_array(aryty)(context, builder)
+    itemsize = get_itemsize(context, aryty)
+    ll_itemsize = context.get_constant(types.intp, itemsize)
+
+    if isinstance(shapety, types.BaseTuple):
+        shapes = cgutils.unpack_tuple(builder, shape)
+        shapes = [context.cast(builder, s, ty, types.intp)
+                  for s, ty in zip(shapes, shapety)]
+    else:
+        shapes = [context.cast(builder, shape, shapety, types.intp)]
+
+    zero = context.get_constant(types.intp, 0)
+    for dim_size in shapes:
+        is_neg = builder.icmp_signed('<', dim_size, zero)
+        with cgutils.if_unlikely(builder, is_neg):
+            context.call_conv.return_user_exc(
+                builder, ValueError, ("negative dimensions not allowed",))
+
+    # Contiguous strides, from the innermost dimension outwards
+    strides = []
+    stride = ll_itemsize
+    inner_first = shapes[::-1] if aryty.layout == 'C' else shapes
+    for dim_size in inner_first:
+        strides.append(stride)
+        stride = builder.mul(stride, dim_size)
+    if aryty.layout == 'C':
+        strides.reverse()
+
+    data_type = context.get_value_type(
+        out_ary._datamodel.get_type('data'))
+    if isinstance(ptrty, types.Integer):
+        ptr = context.cast(builder, ptr, ptrty, types.uintp)
+        data = builder.inttoptr(ptr, data_type)
+    else:
+        data = builder.bitcast(ptr, data_type)
+
+    meminfo = None
+    if len(sig.args) == 4 and isinstance(sig.args[3], types.Array):
+        owner = make_array(sig.args[3])(context, builder, value=args[3])
+        meminfo = owner.meminfo
+
+    populate_array(out_ary,
+                   data=data,
+                   shape=shapes,
+                   strides=strides,
+                   itemsize=ll_itemsize,
+                   meminfo=meminfo)
+
+    res = out_ary._getvalue()
+    return impl_ret_borrowed(context, builder, sig.return_type, res)
+
+
+# -----------------------------------------------------------------------------
+# Memory-mapped arrays
+
+def _get_memory_extent(context, builder, aryty, ary):
+    """
+    Return the (start pointer, size in bytes) of the memory area spanned
+    by array *ary*.
+    """
+    shapes = cgutils.unpack_tuple(builder, ary.shape, aryty.ndim)
+    strides = cgutils.unpack_tuple(builder, ary.strides, aryty.ndim)
+    zero = context.get_constant(types.intp, 0)
+    one = context.get_constant(types.intp, 1)
+
+    lo = zero
+    hi = ary.itemsize
+    is_empty = cgutils.false_bit
+    for dim_size, stride in zip(shapes, strides):
+        extent = builder.mul(builder.sub(dim_size, one), stride)
+        is_neg = builder.icmp_signed('<', extent, zero)
+        lo = builder.add(lo, builder.select(is_neg, extent, zero))
+        hi = builder.add(hi, builder.select(is_neg, zero, extent))
+        is_empty = builder.or_(is_empty,
+                               builder.icmp_signed('==', dim_size, zero))
+
+    size = builder.select(is_empty, zero, builder.sub(hi, lo))
+    pchar = lc.Type.int(8).as_pointer()
+    start = builder.gep(builder.bitcast(ary.data, pchar), [lo])
+    return start, size
+
+
+def _call_memmap_helper(context, builder, name, args, msg):
+    """
+    Call the C helper *name*, raising OSError with *msg* if it fails.
+    """
+    fnty = lc.Type.function(lc.Type.int(), [a.type for a in args])
+    fn = builder.module.get_or_insert_function(fnty, name=name)
+    err = builder.call(fn, args)
+    with cgutils.if_unlikely(builder, cgutils.is_not_null(builder, err)):
+        context.call_conv.return_user_exc(builder, OSError, (msg,))
+
+
+@builtin
+@implement("array.flush", types.Kind(types.MemMapArray))
+def array_flush(context, builder, sig, args):
+    """
+    Write back the memory-mapped array to its file.  Unlike
+    numpy.memmap.flush(), only the pages spanned by the array are
+    written back.
+    """
+    aryty, = sig.args
+    ary = make_array(aryty)(context, builder, value=args[0])
+    start, size = _get_memory_extent(context, builder, aryty, ary)
+    _call_memmap_helper(context, builder, "numba_memmap_sync",
+                        (start, size), "flushing memory-mapped array failed")
+    return impl_ret_untracked(context, builder, sig.return_type,
+                              context.get_dummy_value())
+
+
+@builtin
+@implement(madvise, types.Kind(types.MemMapArray), types.intc)
+def np_madvise(context, builder, sig, args):
+    aryty = sig.args[0]
+    ary = make_array(aryty)(context, builder, value=args[0])
+    start, size = _get_memory_extent(context, builder, aryty, ary)
+    _call_memmap_helper(context, builder, "numba_memmap_advise",
+                        (start, size, args[1]),
+                        "advising memory-mapped array failed")
+    return impl_ret_untracked(context, builder, sig.return_type,
+                              context.get_dummy_value())
+
+
 # -----------------------------------------------------------------------------
 # Sorting
 
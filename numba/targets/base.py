@@ -17,7 +17,8 @@ from numba.targets.imputils import (user_function, user_generator,
                                     builtin_registry, impl_attribute,
                                     impl_ret_borrowed)
 from . import (
-    arrayobj, builtins, iterators, rangeobj, optional, slicing, tupleobj)
+    arrayobj, builtins, classobj, iterators, rangeobj, optional, slicing,
+    tupleobj, unicode)
 from numba import datamodel
 
 try:
@@ -152,12 +153,23 @@ class BaseContext(object):
     # NRT
     enable_nrt = False
 
+    # Trace the NRT allocations (see NUMBA_NRT_TRACE)
+    enable_nrt_trace = False
+
+    # Declare the allocation sites of the lowered functions when tracing.
+    # This is disabled for internal functions, so that their allocations
+    # are attributed to the caller's site.
+    nrt_trace_sites = True
+
     # PYCC
     aot_mode = False
 
     # Error model for various operations (only FP exceptions currently)
     error_model = None
 
+    # Alignment in bytes of the data of new arrays (see NUMBA_ARRAY_ALIGNMENT)
+    array_alignment = 32
+
     def __init__(self, typing_context):
         _load_global_helpers()
         self.address_size = utils.MACHINE_BITS
@@ -372,6 +384,9 @@ class BaseContext(object):
                       for b in bytearray(val.tostring())]
             return Constant.array(consts[0].type, consts)
 
+        elif isinstance(ty, types.UnicodeType):
+            return unicode.make_constant_string(self, builder, ty, val)
+
         else:
             raise NotImplementedError("%s as constant unsupported" % ty)
 
@@ -432,6 +447,9 @@ class BaseContext(object):
 
             return _wrap_impl(imp, self, sig)
 
+        if isinstance(typ, types.ClassInstanceType):
+            return _wrap_impl(classobj.get_setattr_impl(attr), self, sig)
+
     def get_function(self, fn, sig):
         """
         Return the implementation of function *fn* for signature *sig*.
@@ -713,7 +731,9 @@ class BaseContext(object):
         elif (isinstance(fromty, types.Array) and
               isinstance(toty, types.Array)):
             # Type inference should have prevented illegal array casting.
-            assert toty.layout == 'A'
+            # Same-layout casts drop a more specific kind of array
+            # (e.g. memory-mapped).
+            assert toty.layout in ('A', fromty.layout)
             return val
 
         elif (isinstance(fromty, types.List) and
@@ -722,6 +742,19 @@ class BaseContext(object):
             assert fromty.dtype == toty.dtype
             return val
 
+        elif (isinstance(fromty, types.Dict) and
+              isinstance(toty, types.Dict)):
+            # Casting from non-reflected to reflected
+            assert fromty.key_type == toty.key_type
+            assert fromty.value_type == toty.value_type
+            return val
+
+        elif (isinstance(fromty, types.Set) and
+              isinstance(toty, types.Set)):
+            # Casting from non-reflected to reflected
+            assert fromty.dtype == toty.dtype
+            return val
+
         elif (isinstance(fromty, types.RangeType) and
               isinstance(toty, types.RangeType)):
             olditems = cgutils.unpack_tuple(builder, val, 3)
@@ -834,7 +867,14 @@ class BaseContext(object):
         flags = compiler.Flags()
         flags.set('no_compile')
         flags.set('no_cpython_wrapper')
-        cres = compiler.compile_internal(self.typing_context, self,
+        # Arrays are allocated with the caller's alignment
+        flags.set('array_alignment', self.array_alignment)
+        # When tracing, the allocations are attributed to the caller's site
+        if self.enable_nrt_trace:
+            context = self.subtarget(nrt_trace_sites=False)
+        else:
+            context = self
+        cres = compiler.compile_internal(self.typing_context, context,
                                          library,
                                          impl, sig.args,
                                          sig.return_type, flags,
@@ -850,7 +890,7 @@ class BaseContext(object):
         Return a placeholder object that's callable from another Numba
         function.
         """
-        cache_key = (impl.__code__, sig)
+        cache_key = (impl.__code__, sig, self.array_alignment)
         if impl.__closure__:
             # XXX This obviously won't work if a cell's value is
             # unhashable.
@@ -1014,7 +1054,7 @@ class BaseContext(object):
                                    [self.get_value_type(types.intp)])
         fn = mod.get_or_insert_function(fnty, name="NRT_MemInfo_alloc_safe")
         fn.return_value.add_attribute("noalias")
-        return builder.call(fn, [size])
+        return self._nrt_trace_meminfo(builder, builder.call(fn, [size]))
 
     def nrt_meminfo_alloc_aligned(self, builder, size, align):
         """
@@ -1037,7 +1077,7 @@ class BaseContext(object):
             align = self.get_constant(types.uint32, align)
         else:
             assert align.type == u32, "align must be a uint32"
-        return builder.call(fn, [size, align])
+        return self._nrt_trace_meminfo(builder, builder.call(fn, [size, align]))
 
     def nrt_meminfo_varsize_alloc(self, builder, size):
         """
@@ -1054,7 +1094,27 @@ class BaseContext(object):
                                    [self.get_value_type(types.intp)])
         fn = mod.get_or_insert_function(fnty, name="NRT_MemInfo_varsize_alloc")
         fn.return_value.add_attribute("noalias")
-        return builder.call(fn, [size])
+        return self._nrt_trace_meminfo(builder, builder.call(fn, [size]))
+
+    def nrt_meminfo_new_varsize_dtor(self, builder, size, dtor):
+        """
+        Same as nrt_meminfo_varsize_alloc(), but *dtor* (a LLVM function
+        taking the data pointer) is called before the data area is
+        freed.
+
+        A pointer to the MemInfo is returned.
+        """
+        if not self.enable_nrt:
+            raise Exception("Require NRT")
+        mod = builder.module
+        fnty = llvmir.FunctionType(void_ptr,
+                                   [self.get_value_type(types.intp),
+                                    void_ptr])
+        fn = mod.get_or_insert_function(fnty,
+                                        name="NRT_MemInfo_new_varsize_dtor")
+        fn.return_value.add_attribute("noalias")
+        return self._nrt_trace_meminfo(
+            builder, builder.call(fn, [size, builder.bitcast(dtor, void_ptr)]))
 
     def nrt_meminfo_varsize_realloc(self, builder, meminfo, size):
         """
@@ -1070,6 +1130,43 @@ class BaseContext(object):
         fn.return_value.add_attribute("noalias")
         return builder.call(fn, [meminfo, size])
 
+    def nrt_trace_site(self, builder, function, loc):
+        """
+        Declare the source location *loc*, in the function named
+        *function*, as the site of the next NRT allocations of the
+        calling thread, when tracing them.
+        """
+        if not self.enable_nrt_trace:
+            return
+        mod = builder.module
+        name = ".nrt_trace_site.%s.%s" % (function, loc.line)
+        cache = mod.get_global(name)
+        if cache is None:
+            cache = mod.add_global_variable(void_ptr, name=name)
+            cache.linkage = lc.LINKAGE_INTERNAL
+            cache.initializer = Constant.null(void_ptr)
+        int_t = self.get_value_type(types.intc)
+        fnty = llvmir.FunctionType(llvmir.VoidType(),
+                                   [void_ptr.as_pointer(), void_ptr, void_ptr,
+                                    int_t])
+        fn = mod.get_or_insert_function(fnty, name="NRT_Trace_set_site")
+        builder.call(fn, [cache,
+                          self.insert_const_string(mod, function),
+                          self.insert_const_string(mod, loc.filename),
+                          Constant.int(int_t, loc.line)])
+
+    def _nrt_trace_meminfo(self, builder, meminfo):
+        """
+        Attribute the new *meminfo* to the current allocation site, when
+        tracing the NRT allocations.  *meminfo* is returned.
+        """
+        if self.enable_nrt_trace:
+            mod = builder.module
+            fnty = llvmir.FunctionType(llvmir.VoidType(), [void_ptr])
+            fn = mod.get_or_insert_function(fnty, name="NRT_MemInfo_trace")
+            builder.call(fn, [meminfo])
+        return meminfo
+
     def nrt_meminfo_data(self, builder, meminfo):
         """
         Given a MemInfo pointer, return a pointer to the allocated data
@@ -4,10 +4,10 @@ Boxing and unboxing of native Numba values to / from CPython objects.
 
 from llvmlite import ir
 
-from .. import cgutils, numpy_support, types
+from .. import cgutils, numpy_support, types, typing
 from ..pythonapi import box, unbox, reflect, NativeValue
 
-from . import listobj
+from . import dictobj, listobj, setobj, unicode
 
 
 #
@@ -239,6 +239,55 @@ def unbox_charseq(c, typ, obj):
     return NativeValue(ret, is_error=c.builder.not_(ok))
 
 
+@box(types.UnicodeType)
+def box_unicode(c, typ, val):
+    """
+    Convert native string *val* to a str object.
+    """
+    s = unicode.UnicodeInstance(c.context, c.builder, val)
+    obj = s.parent
+    res = cgutils.alloca_once_value(c.builder, obj)
+    with c.builder.if_else(cgutils.is_not_null(c.builder, obj)) as (has_parent, otherwise):
+        with has_parent:
+            # String was unboxed => return the original object
+            c.pyapi.incref(obj)
+        with otherwise:
+            obj = c.pyapi.string_from_kind_and_data(s.kind, s.data, s.length)
+            c.builder.store(obj, res)
+
+    # Steal NRT ref
+    c.context.nrt_decref(c.builder, typ, val)
+    return c.builder.load(res)
+
+
+@unbox(types.UnicodeType)
+def unbox_unicode(c, typ, obj):
+    """
+    Convert str *obj* to a native string sharing its character data.
+    """
+    strptr = cgutils.alloca_once_value(
+        c.builder, c.context.get_constant_null(typ))
+    errorptr = cgutils.alloca_once_value(c.builder, cgutils.true_bit)
+    ok, data, length, kind, hashv = c.pyapi.extract_unicode(obj)
+    with c.builder.if_then(ok, likely=True):
+        # The meminfo keeps the str object alive
+        meminfo = c.pyapi.nrt_meminfo_new_from_pyobject(data, obj)
+        with c.builder.if_then(cgutils.is_not_null(c.builder, meminfo),
+                               likely=True):
+            s = unicode.UnicodeInstance(c.context, c.builder)
+            s.data = data
+            s.length = length
+            s.kind = kind
+            s.hash = hashv
+            s.meminfo = meminfo
+            s.parent = obj
+            c.builder.store(s.value, strptr)
+            c.builder.store(cgutils.false_bit, errorptr)
+
+    return NativeValue(c.builder.load(strptr),
+                       is_error=c.builder.load(errorptr))
+
+
 @unbox(types.Optional)
 def unbox_optional(c, typ, obj):
     """
@@ -310,6 +359,28 @@ def box_array(c, typ, val):
         c.pyapi.incref(parent)
         return parent
 
+@box(types.MemMapArray)
+def box_memmap_array(c, typ, val):
+    """
+    Convert native memory-mapped array *val* to a numpy.memmap object.
+    Views of a memmap passed to compiled code share its file information.
+    """
+    nativeary = c.context.make_array(typ)(c.context, c.builder, value=val)
+    parent = nativeary.parent
+    aryobj = box_array(c, typ, val)
+    res = cgutils.alloca_once_value(c.builder, c.pyapi.get_null_object())
+    with c.builder.if_then(cgutils.is_not_null(c.builder, aryobj),
+                           likely=True):
+        # The parent is kept alive by the boxed array
+        parentobj = c.builder.select(cgutils.is_null(c.builder, parent),
+                                     c.pyapi.borrow_none(), parent)
+        wrapper = c.env_manager.read_const(
+            c.env_manager.add_const(numpy_support.as_memmap))
+        obj = c.pyapi.call_function_objargs(wrapper, [aryobj, parentobj])
+        c.pyapi.decref(aryobj)
+        c.builder.store(obj, res)
+    return c.builder.load(res)
+
 @unbox(types.Buffer)
 def unbox_buffer(c, typ, obj):
     """
@@ -442,6 +513,7 @@ def box_list(c, typ, val):
                                    likely=True):
                 with cgutils.for_range(c.builder, nitems) as loop:
                     item = list.getitem(loop.index)
+                    list.incref_value(item)
                     itemobj = c.box(typ.dtype, item)
                     c.pyapi.list_setitem(obj, loop.index, itemobj)
 
@@ -489,7 +561,7 @@ def unbox_list(c, typ, obj):
                     itemobj = c.pyapi.list_getitem(obj, loop.index)
                     # XXX error checking
                     native = c.unbox(typ.dtype, itemobj)
-                    list.setitem(loop.index, native.value)
+                    list.inititem(loop.index, native.value, incref=False)
                 if typ.reflected:
                     list.parent = obj
                 # Stuff meminfo pointer into the Python object for
@@ -528,12 +600,14 @@ def reflect_list(c, typ, val):
                 # First overwrite existing items
                 with cgutils.for_range(c.builder, size) as loop:
                     item = list.getitem(loop.index)
+                    list.incref_value(item)
                     itemobj = c.box(typ.dtype, item)
                     c.pyapi.list_setitem(obj, loop.index, itemobj)
                 # Then add missing items
                 with cgutils.for_range(c.builder, diff) as loop:
                     idx = c.builder.add(size, loop.index)
                     item = list.getitem(idx)
+                    list.incref_value(item)
                     itemobj = c.box(typ.dtype, item)
                     c.pyapi.list_append(obj, itemobj)
                     c.pyapi.decref(itemobj)
@@ -544,6 +618,7 @@ def reflect_list(c, typ, val):
                 # Then overwrite remaining items
                 with cgutils.for_range(c.builder, new_size) as loop:
                     item = list.getitem(loop.index)
+                    list.incref_value(item)
                     itemobj = c.box(typ.dtype, item)
                     c.pyapi.list_setitem(obj, loop.index, itemobj)
 
@@ -551,6 +626,361 @@ def reflect_list(c, typ, val):
         list.set_dirty(False)
 
 
+@box(types.TypedList)
+def box_typed_list(c, typ, val):
+    """
+    Convert native typed list *val* to a numba.typed.List object sharing
+    the native storage.
+    """
+    from numba.typed.typedlist import _from_meminfo
+
+    list = listobj.ListInstance(c.context, c.builder, typ, val)
+    meminfo = c.builder.bitcast(list.meminfo, c.pyapi.voidptr)
+    ptrobj = c.pyapi.long_from_voidptr(meminfo)
+    res = cgutils.alloca_once_value(c.builder, c.pyapi.get_null_object())
+    with c.builder.if_then(cgutils.is_not_null(c.builder, ptrobj),
+                           likely=True):
+        func = c.pyapi.unserialize(c.pyapi.serialize_object(_from_meminfo))
+        typobj = c.pyapi.unserialize(c.pyapi.serialize_object(typ))
+        # The new object steals the NRT ref on success
+        obj = c.pyapi.call_function_objargs(func, [ptrobj, typobj])
+        c.pyapi.decref(func)
+        c.pyapi.decref(typobj)
+        c.pyapi.decref(ptrobj)
+        c.builder.store(obj, res)
+
+    obj = c.builder.load(res)
+    with c.builder.if_then(cgutils.is_null(c.builder, obj), likely=False):
+        c.context.nrt_decref(c.builder, typ, val)
+    return obj
+
+
+@unbox(types.TypedList)
+def unbox_typed_list(c, typ, obj):
+    """
+    Convert numba.typed.List *obj* to a native list sharing its storage
+    (no copy is made and there is nothing to reflect).
+    """
+    listptr = cgutils.alloca_once_value(
+        c.builder, c.context.get_constant_null(typ))
+    ptrobj = c.pyapi.object_getattr_string(obj, "_meminfo_ptr")
+    with c.builder.if_then(cgutils.is_not_null(c.builder, ptrobj),
+                           likely=True):
+        ptr = c.pyapi.long_as_voidptr(ptrobj)
+        c.pyapi.decref(ptrobj)
+        with c.builder.if_then(cgutils.is_not_null(c.builder, ptr),
+                               likely=True):
+            list = listobj.ListInstance.from_meminfo(c.context, c.builder,
+                                                     typ, ptr)
+            c.builder.store(list.value, listptr)
+
+    return NativeValue(c.builder.load(listptr), is_error=c.pyapi.c_api_error())
+
+
+def _call_subroutine(c, impl, sig, args):
+    """
+    Call the Python function *impl*, compiled separately in nopython mode
+    for *sig*, with the given *args*.  Native exceptions can't propagate
+    through the Python call wrapper, so an error is raised as a Python
+    exception instead.  Return whether an error occurred (a LLVM boolean).
+    """
+    fnty = c.context.compile_subroutine(c.builder, impl, sig)
+    func = c.context.declare_function(c.builder.module, fnty.fndesc)
+    status, _ = c.context.call_conv.call_function(
+        c.builder, func, sig.return_type, sig.args, args)
+    with cgutils.if_unlikely(c.builder, status.is_error):
+        c.context.call_conv.raise_error(c.builder, c.pyapi, status)
+    return status.is_error
+
+
+def _release_native(c, typ, native):
+    """
+    Release the references held by the unboxed value *native* of type
+    *typ*, once it has been stored elsewhere.
+    """
+    c.context.nrt_decref(c.builder, typ, native.value)
+    if native.cleanup is not None:
+        native.cleanup()
+
+
+def _dict_setitem(d, key, value):
+    d[key] = value
+
+
+def _fill_dict_object(c, typ, inst, obj):
+    """
+    Store the native dict *inst*'s items into the Python dict *obj*.
+    """
+    # XXX no error checking below
+    with inst._iterate() as entry:
+        keyobj = c.box(typ.key_type, inst.get_entry_key(entry))
+        valobj = c.box(typ.value_type, inst.get_entry_value(entry))
+        c.pyapi.dict_setitem(obj, keyobj, valobj)
+        c.pyapi.decref(keyobj)
+        c.pyapi.decref(valobj)
+
+
+@box(types.Dict)
+def box_dict(c, typ, val):
+    """
+    Convert native dict *val* to a dict object.
+    """
+    inst = dictobj.DictInstance(c.context, c.builder, typ, val)
+    obj = inst.parent
+    res = cgutils.alloca_once_value(c.builder, obj)
+    with c.builder.if_else(cgutils.is_not_null(c.builder, obj)) as (has_parent, otherwise):
+        with has_parent:
+            # Dict is actually reflected => return the original object
+            c.pyapi.incref(obj)
+
+        with otherwise:
+            # Build a new Python dict
+            obj = c.pyapi.dict_new()
+            with c.builder.if_then(cgutils.is_not_null(c.builder, obj),
+                                   likely=True):
+                _fill_dict_object(c, typ, inst, obj)
+
+            c.builder.store(obj, res)
+
+    # Steal NRT ref
+    c.context.nrt_decref(c.builder, typ, val)
+    return c.builder.load(res)
+
+
+@unbox(types.Dict)
+def unbox_dict(c, typ, obj):
+    """
+    Convert dict *obj* to a native dict.
+
+    Unlike lists, a dict is copied each time it is unboxed.
+    """
+    size = c.pyapi.dict_size(obj)
+
+    errorptr = cgutils.alloca_once_value(c.builder, cgutils.true_bit)
+    dictptr = cgutils.alloca_once(c.builder, c.context.get_value_type(typ))
+
+    items = c.pyapi.dict_items(obj)
+    with c.builder.if_then(cgutils.is_not_null(c.builder, items), likely=True):
+        ok, inst = dictobj.DictInstance.allocate_for_size_ex(c.context,
+                                                             c.builder,
+                                                             typ, size)
+        with c.builder.if_then(ok, likely=True):
+            c.builder.store(cgutils.false_bit, errorptr)
+            sig = typing.signature(types.none, typ, typ.key_type,
+                                   typ.value_type)
+            with cgutils.for_range(c.builder, size) as loop:
+                itemobj = c.pyapi.list_getitem(items, loop.index)
+                keyobj = c.pyapi.tuple_getitem(itemobj, 0)
+                valobj = c.pyapi.tuple_getitem(itemobj, 1)
+                # XXX error checking
+                key = c.unbox(typ.key_type, keyobj)
+                value = c.unbox(typ.value_type, valobj)
+                failed = _call_subroutine(c, _dict_setitem, sig,
+                                          (inst.value, key.value,
+                                           value.value))
+                # The dict doesn't own the key and value
+                _release_native(c, typ.key_type, key)
+                _release_native(c, typ.value_type, value)
+                with c.builder.if_then(failed, likely=False):
+                    c.builder.store(cgutils.true_bit, errorptr)
+                    loop.do_break()
+            with c.builder.if_else(c.builder.load(errorptr), likely=False) \
+                as (if_error, if_ok):
+                with if_error:
+                    c.context.nrt_decref(c.builder, typ, inst.value)
+                with if_ok:
+                    # The native dict starts clean
+                    inst.set_dirty(False)
+                    if typ.reflected:
+                        inst.parent = obj
+                    c.builder.store(inst.value, dictptr)
+        c.pyapi.decref(items)
+
+    return NativeValue(c.builder.load(dictptr),
+                       is_error=c.builder.load(errorptr))
+
+
+@reflect(types.Dict)
+def reflect_dict(c, typ, val):
+    """
+    Reflect the native dict's contents into the Python object.
+    """
+    if not typ.reflected:
+        return
+    inst = dictobj.DictInstance(c.context, c.builder, typ, val)
+    with c.builder.if_then(inst.dirty, likely=False):
+        obj = inst.parent
+        c.pyapi.dict_clear(obj)
+        _fill_dict_object(c, typ, inst, obj)
+        # Mark the dict clean, in case it is reflected twice
+        inst.set_dirty(False)
+
+
+def _set_add(s, item):
+    s.add(item)
+
+
+def _fill_set_object(c, typ, inst, obj):
+    """
+    Store the native set *inst*'s items into the Python set *obj*.
+    """
+    # XXX no error checking below
+    with inst._iterate() as entry:
+        itemobj = c.box(typ.dtype, inst.get_entry_key(entry))
+        c.pyapi.set_add(obj, itemobj)
+        c.pyapi.decref(itemobj)
+
+
+@box(types.Set)
+def box_set(c, typ, val):
+    """
+    Convert native set *val* to a set object.
+    """
+    inst = setobj.SetInstance(c.context, c.builder, typ, val)
+    obj = inst.parent
+    res = cgutils.alloca_once_value(c.builder, obj)
+    with c.builder.if_else(cgutils.is_not_null(c.builder, obj)) as (has_parent, otherwise):
+        with has_parent:
+            # Set is actually reflected => return the original object
+            c.pyapi.incref(obj)
+
+        with otherwise:
+            # Build a new Python set
+            obj = c.pyapi.set_new()
+            with c.builder.if_then(cgutils.is_not_null(c.builder, obj),
+                                   likely=True):
+                _fill_set_object(c, typ, inst, obj)
+
+            c.builder.store(obj, res)
+
+    # Steal NRT ref
+    c.context.nrt_decref(c.builder, typ, val)
+    return c.builder.load(res)
+
+
+@unbox(types.Set)
+def unbox_set(c, typ, obj):
+    """
+    Convert set *obj* to a native set.
+
+    As with dicts, a set is copied each time it is unboxed.
+    """
+    size = c.pyapi.set_size(obj)
+
+    errorptr = cgutils.alloca_once_value(c.builder, cgutils.true_bit)
+    setptr = cgutils.alloca_once(c.builder, c.context.get_value_type(typ))
+
+    iterobj = c.pyapi.object_getiter(obj)
+    with c.builder.if_then(cgutils.is_not_null(c.builder, iterobj),
+                           likely=True):
+        ok, inst = setobj.SetInstance.allocate_for_size_ex(c.context,
+                                                           c.builder,
+                                                           typ, size)
+        with c.builder.if_then(ok, likely=True):
+            c.builder.store(cgutils.false_bit, errorptr)
+            sig = typing.signature(types.none, typ, typ.dtype)
+            with cgutils.for_range(c.builder, size) as loop:
+                itemobj = c.pyapi.iter_next(iterobj)
+                # XXX error checking
+                native = c.unbox(typ.dtype, itemobj)
+                c.pyapi.decref(itemobj)
+                failed = _call_subroutine(c, _set_add, sig,
+                                          (inst.value, native.value))
+                # The set doesn't own the item
+                _release_native(c, typ.dtype, native)
+                with c.builder.if_then(failed, likely=False):
+                    c.builder.store(cgutils.true_bit, errorptr)
+                    loop.do_break()
+            with c.builder.if_else(c.builder.load(errorptr), likely=False) \
+                as (if_error, if_ok):
+                with if_error:
+                    c.context.nrt_decref(c.builder, typ, inst.value)
+                with if_ok:
+                    # The native set starts clean
+                    inst.set_dirty(False)
+                    if typ.reflected:
+                        inst.parent = obj
+                    c.builder.store(inst.value, setptr)
+        c.pyapi.decref(iterobj)
+
+    return NativeValue(c.builder.load(setptr),
+                       is_error=c.builder.load(errorptr))
+
+
+@reflect(types.Set)
+def reflect_set(c, typ, val):
+    """
+    Reflect the native set's contents into the Python object.
+    """
+    if not typ.reflected:
+        return
+    inst = setobj.SetInstance(c.context, c.builder, typ, val)
+    with c.builder.if_then(inst.dirty, likely=False):
+        obj = inst.parent
+        c.pyapi.set_clear(obj)
+        _fill_set_object(c, typ, inst, obj)
+        # Mark the set clean, in case it is reflected twice
+        inst.set_dirty(False)
+
+
+#
+# jitclass instances
+#
+
+@box(types.ClassInstanceType)
+def box_class_instance(c, typ, val):
+    """
+    Convert jitclass instance *val* to a Python object of the jitclass
+    referencing the same native instance.
+    """
+    inst = cgutils.create_struct_proxy(typ)(c.context, c.builder, value=val)
+    meminfo = c.builder.bitcast(inst.meminfo, c.pyapi.voidptr)
+    ptrobj = c.pyapi.long_from_voidptr(meminfo)
+    res = cgutils.alloca_once_value(c.builder, c.pyapi.get_null_object())
+    with c.builder.if_then(cgutils.is_not_null(c.builder, ptrobj),
+                           likely=True):
+        jitcls = typ.class_type.class_def
+        clsobj = c.env_manager.read_const(c.env_manager.add_const(jitcls))
+        func = c.pyapi.object_getattr_string(clsobj, "_from_meminfo")
+        # The new object steals the NRT ref on success
+        obj = c.pyapi.call_function_objargs(func, [ptrobj])
+        c.pyapi.decref(func)
+        c.pyapi.decref(ptrobj)
+        c.builder.store(obj, res)
+
+    obj = c.builder.load(res)
+    with c.builder.if_then(cgutils.is_null(c.builder, obj), likely=False):
+        c.context.nrt_decref(c.builder, typ, val)
+    return obj
+
+
+@unbox(types.ClassInstanceType)
+def unbox_class_instance(c, typ, obj):
+    """
+    Convert jitclass object *obj* to a native instance (no copy is made).
+    """
+    instptr = cgutils.alloca_once_value(
+        c.builder, c.context.get_constant_null(typ))
+    ptrobj = c.pyapi.object_getattr_string(obj, "_meminfo_ptr")
+    with c.builder.if_then(cgutils.is_not_null(c.builder, ptrobj),
+                           likely=True):
+        ptr = c.pyapi.long_as_voidptr(ptrobj)
+        c.pyapi.decref(ptrobj)
+        with c.builder.if_then(cgutils.is_not_null(c.builder, ptr),
+                               likely=True):
+            inst = cgutils.create_struct_proxy(typ)(c.context, c.builder)
+            inst.meminfo = ptr
+            data_ptr_type = types.CPointer(typ.get_data_type())
+            inst.data = c.builder.bitcast(
+                c.context.nrt_meminfo_data(c.builder, ptr),
+                c.context.get_value_type(data_ptr_type))
+            c.context.nrt_incref(c.builder, typ, inst._getvalue())
+            c.builder.store(inst._getvalue(), instptr)
+
+    return NativeValue(c.builder.load(instptr),
+                       is_error=c.pyapi.c_api_error())
+
+
 #
 # Other types
 #
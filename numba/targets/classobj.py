@@ -0,0 +1,188 @@
+"""
+Support for jitclass instances (see numba.jitclass).
+
+An instance is a reference-counted NRT allocation holding the fields
+in declaration order, as a C structure.  Its native value is a
+(meminfo, data pointer) pair.  The references held by the fields are
+released by the meminfo's destructor.
+"""
+
+from __future__ import print_function, absolute_import, division
+
+from llvmlite import ir
+from numba import types, cgutils
+from numba.targets.imputils import (builtin, builtin_attr, implement,
+                                    impl_attribute_generic, Registry,
+                                    impl_ret_borrowed, impl_ret_new_ref,
+                                    impl_ret_untracked)
+
+
+def _get_data(context, builder, instance_type, value):
+    """
+    Return a data structure proxy to the fields of the instance *value*.
+    """
+    inst = cgutils.create_struct_proxy(instance_type)(context, builder,
+                                                      value=value)
+    data_type = instance_type.get_data_type()
+    return cgutils.create_struct_proxy(data_type, kind='data')(
+        context, builder, ref=inst.data)
+
+
+def _call_method(context, builder, method, sig, args, cleanup=None):
+    """
+    Call the jitted *method* (a Dispatcher object) with the given *sig*
+    and *args*, the first of which is the instance.  A new reference
+    is returned.  If the method raises, *cleanup* is called (if given)
+    before propagating the exception.
+    """
+    call = context.get_function(types.Dispatcher(method), sig)
+    # The method was compiled in a separate library
+    for lib in call.libs:
+        context.codegen().add_linking_library(lib)
+    fndesc = call.fndesc
+    func = context.declare_function(builder.module, fndesc)
+    status, res = context.call_conv.call_function(
+        builder, func, fndesc.restype, fndesc.argtypes, args, env=None)
+    with cgutils.if_unlikely(builder, status.is_error):
+        if cleanup is not None:
+            cleanup()
+        context.call_conv.return_status_propagate(builder, status)
+    return res
+
+
+def _get_method_signature(context, method, args):
+    """
+    Return the compiled signature of *method* for the argument types
+    *args* (which must have been typed already).
+    """
+    disp_type = types.Dispatcher(method)
+    return disp_type.get_call_type(context.typing_context, args, {})
+
+
+def define_dtor(context, module, instance_type):
+    """
+    Define the destructor of *instance_type*'s data, which releases
+    the fields' references, if not already defined in *module*.
+    """
+    fnty = ir.FunctionType(ir.VoidType(), [ir.IntType(8).as_pointer()])
+    fn = module.get_or_insert_function(
+        fnty, name=".dtor.%s" % (instance_type.class_type,))
+    if not fn.is_declaration:
+        # Already defined
+        return fn
+    fn.linkage = 'linkonce_odr'
+    builder = ir.IRBuilder(fn.append_basic_block())
+    data_type = instance_type.get_data_type()
+    ptr = builder.bitcast(fn.args[0],
+                          context.get_data_type(data_type).as_pointer())
+    data = cgutils.create_struct_proxy(data_type, kind='data')(
+        context, builder, ref=ptr)
+    for attr, attrty in instance_type.struct.items():
+        context.nrt_decref(builder, attrty, getattr(data, attr))
+    builder.ret_void()
+    return fn
+
+
+@builtin
+@implement(types.ClassType, types.VarArg(types.Any))
+def class_constructor(context, builder, sig, args):
+    instance_type = sig.return_type
+    data_type = instance_type.get_data_type()
+    llty = context.get_data_type(data_type)
+    size = max(context.get_abi_sizeof(llty), 1)
+    dtor = define_dtor(context, builder.module, instance_type)
+    meminfo = context.nrt_meminfo_new_varsize_dtor(
+        builder, size=context.get_constant(types.intp, size), dtor=dtor)
+    with builder.if_then(cgutils.is_null(builder, meminfo), likely=False):
+        context.call_conv.return_user_exc(builder, MemoryError,
+                                          ("cannot allocate instance",))
+    ptr = builder.bitcast(context.nrt_meminfo_data(builder, meminfo),
+                          llty.as_pointer())
+    # Zero-fill the fields, so that references not assigned by __init__
+    # (or released before an exception is raised) are NULL
+    builder.store(ir.Constant(llty, None), ptr)
+
+    inst = cgutils.create_struct_proxy(instance_type)(context, builder)
+    inst.meminfo = meminfo
+    inst.data = ptr
+    res = inst._getvalue()
+
+    init = instance_type.jitmethods.get('__init__')
+    if init is not None:
+        init_args = (instance_type,) + sig.args
+        init_sig = _get_method_signature(context, init, init_args)
+        # Release the new instance if __init__ raises
+        cleanup = lambda: context.nrt_decref(builder, instance_type, res)
+        _call_method(context, builder, init, init_sig, [res] + list(args),
+                     cleanup=cleanup)
+
+    return impl_ret_new_ref(context, builder, instance_type, res)
+
+
+@builtin_attr
+@impl_attribute_generic(types.Kind(types.ClassInstanceType))
+def instance_getattr(context, builder, typ, value, attr):
+    if attr in typ.struct:
+        data = _get_data(context, builder, typ, value)
+        attrty = typ.struct[attr]
+        return impl_ret_borrowed(context, builder, attrty,
+                                 getattr(data, attr))
+
+    getter = typ.jitprops[attr]['get']
+    sig = _get_method_signature(context, getter, (typ,))
+    res = _call_method(context, builder, getter, sig, [value])
+    return impl_ret_new_ref(context, builder, sig.return_type, res)
+
+
+def get_setattr_impl(attr):
+    """
+    Return an implementation for setting *attr* on jitclass instances
+    (a field or a property with a setter).
+    """
+    def imp(context, builder, sig, args):
+        typ, valty = sig.args
+        target, val = args
+
+        if attr in typ.struct:
+            data = _get_data(context, builder, typ, target)
+            old = getattr(data, attr)
+            context.nrt_incref(builder, valty, val)
+            setattr(data, attr, val)
+            context.nrt_decref(builder, valty, old)
+        else:
+            setter = typ.jitprops[attr]['set']
+            setter_sig = _get_method_signature(context, setter, sig.args)
+            _call_method(context, builder, setter, setter_sig, args)
+
+        return impl_ret_untracked(context, builder, sig.return_type,
+                                  context.get_dummy_value())
+
+    return imp
+
+
+_implemented_methods = set()
+
+def _implement_method(registry, attr):
+
+    @registry.register
+    @implement((types.ClassInstanceType, attr),
+               types.Kind(types.ClassInstanceType), types.VarArg(types.Any))
+    def method_impl(context, builder, sig, args):
+        instance_type = sig.args[0]
+        method = instance_type.jitmethods[attr]
+        res = _call_method(context, builder, method, sig, args)
+        return impl_ret_new_ref(context, builder, sig.return_type, res)
+
+
+def install_methods(context, class_type):
+    """
+    Install into target *context* the implementations of *class_type*'s
+    methods.  Methods are looked up by name, so a single implementation
+    serves all classes having a method of a given name.
+    """
+    registry = Registry()
+    for attr in class_type.jitmethods:
+        if attr not in _implemented_methods:
+            _implement_method(registry, attr)
+            _implemented_methods.add(attr)
+    context.install_registry(registry)
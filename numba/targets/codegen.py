@@ -10,7 +10,7 @@ import llvmlite.binding as ll
 import llvmlite.ir as llvmir
 
 from numba import config, utils
-from numba.runtime.atomicops import remove_redundant_nrt_refct
+from numba.runtime.nrtopt import remove_redundant_nrt_refct
 
 _x86arch = frozenset(['x86', 'i386', 'i486', 'i586', 'i686', 'i786',
                       'i886', 'i986'])
@@ -20,6 +20,39 @@ def _is_x86(triple):
     return arch in _x86arch
 
 
+# Instruction set levels code can be multiversioned for (see numba.pycc),
+# from the least to the most capable.  Each level maps to the LLVM CPU
+# name and features to compile for.  Level numbers (the position in this
+# mapping, starting at 1; 0 is the generic baseline) must match
+# numba/pycc/cpudispatch.c.
+ISA_LEVELS = utils.OrderedDict([
+    ('sse42', ('nehalem', ('sse4.2', 'popcnt'))),
+    ('avx2', ('haswell', ('avx', 'avx2', 'fma', 'bmi', 'bmi2'))),
+    ('avx512', ('skx', ('avx512f', 'avx512cd', 'avx512bw', 'avx512dq',
+                        'avx512vl'))),
+])
+
+
+def get_isa_level_number(name):
+    """
+    Return the number of the ISA level *name*, as returned by the
+    runtime CPU detection.
+    """
+    try:
+        return list(ISA_LEVELS).index(name) + 1
+    except ValueError:
+        raise ValueError("unknown ISA level %r, expected one of %s"
+                         % (name, ', '.join(ISA_LEVELS)))
+
+
+def supports_isa_levels(triple):
+    """
+    Whether ISA levels can be targeted on the given target *triple*.
+    """
+    arch = triple.split('-')[0]
+    return arch == 'x86_64' or arch in _x86arch
+
+
 def dump(header, body):
     print(header.center(80, '-'))
     print(body)
@@ -481,9 +514,22 @@ class AOTCPUCodegen(BaseCPUCodegen):
 
     _library_class = AOTCodeLibrary
 
+    def __init__(self, module_name, isa_level=None):
+        if isa_level is not None:
+            get_isa_level_number(isa_level)
+        self._isa_level = isa_level
+        BaseCPUCodegen.__init__(self, module_name)
+
     def _customize_tm_options(self, options):
         options['reloc'] = 'pic'
         options['codemodel'] = 'default'
+        if self._isa_level is not None:
+            cpu, features = ISA_LEVELS[self._isa_level]
+            options['cpu'] = cpu
+            options['features'] = ','.join('+' + f for f in features)
+
+    def magic_tuple(self):
+        return BaseCPUCodegen.magic_tuple(self) + (self._isa_level,)
 
     def _add_module(self, module):
         pass
@@ -12,8 +12,9 @@ from .base import BaseContext, PYOBJECT
 from numba import utils, cgutils, types
 from numba.utils import cached_property
 from numba.targets import (
-    callconv, cffiimpl, codegen, externals, intrinsics, listobj, cmathimpl,
-    mathimpl, npyimpl, operatorimpl, printimpl, randomimpl)
+    callconv, cffiimpl, codegen, externals, intrinsics, dictobj, hashing,
+    listobj, setobj, cmathimpl, mathimpl, npyimpl, operatorimpl, printimpl,
+    randomimpl)
 from .options import TargetOptions
 from numba.runtime import rtsys
 
@@ -62,9 +63,9 @@ class CPUContext(BaseContext):
     def target_data(self):
         return self._internal_codegen.target_data
 
-    def with_aot_codegen(self, name):
-        return self.subtarget(_internal_codegen=codegen.AOTCPUCodegen(name),
-                              aot_mode=True)
+    def with_aot_codegen(self, name, **aot_options):
+        aot_codegen = codegen.AOTCPUCodegen(name, **aot_options)
+        return self.subtarget(_internal_codegen=aot_codegen, aot_mode=True)
 
     def codegen(self):
         return self._internal_codegen
@@ -111,6 +112,19 @@ class CPUContext(BaseContext):
         """
         return listobj.build_list(self, builder, list_type, items)
 
+    def build_map(self, builder, dict_type, items):
+        """
+        Build a dict from the Numba *dict_type* and its initial *items*
+        (a list of (key, value) pairs).
+        """
+        return dictobj.build_map(self, builder, dict_type, items)
+
+    def build_set(self, builder, set_type, items):
+        """
+        Build a set from the Numba *set_type* and its initial *items*.
+        """
+        return setobj.build_set(self, builder, set_type, items)
+
     def post_lowering(self, mod, library):
         if self.is32bit:
             # 32-bit machine needs to replace all 64-bit div/rem to avoid
@@ -177,6 +191,9 @@ class CPUTargetOptions(TargetOptions):
         "boundcheck": bool,
         "_nrt": bool,
         "no_rewrites": bool,
+        "_static_args": tuple,
+        "parallel": bool,
+        "array_alignment": config._parse_alignment,
     }
 
 
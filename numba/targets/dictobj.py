@@ -0,0 +1,955 @@
+"""
+Support for native homogenous dicts.
+
+A dict is a hash table with open addressing, as in CPython before 3.6:
+the entries are (hash, key, value) triples stored in an array whose size
+is a power of two, and a key is looked up by probing a sequence of
+entries determined by its hash value.
+
+The hash table machinery is shared with sets (see setobj.py), whose
+entries are (hash, key) pairs.
+"""
+
+from __future__ import print_function, absolute_import, division
+
+import contextlib
+
+from llvmlite import ir
+from numba import types, cgutils
+from numba.targets.imputils import (builtin, implement, iternext_impl,
+                                    impl_ret_borrowed, impl_ret_new_ref,
+                                    impl_ret_untracked)
+from .hashing import get_hash_value
+
+
+# The hash values of the free entries.  The hash values of the live
+# entries are made non-negative.
+EMPTY = -1
+DELETED = -2
+
+# The minimum number of entries in a table
+MINSIZE = 8
+
+# Perturbation of the probe sequence, as in CPython
+PERTURB_SHIFT = 5
+
+
+def make_dict_cls(dict_type):
+    """
+    Return the Structure representation of the given *dict_type*
+    (an instance of types.Dict).
+    """
+    return cgutils.create_struct_proxy(dict_type)
+
+
+def get_payload_type(table_type):
+    """
+    Return the payload type of the given *table_type* (an instance of
+    types.Dict or types.Set).
+    """
+    if isinstance(table_type, types.Set):
+        return types.SetPayload(table_type)
+    else:
+        return types.DictPayload(table_type)
+
+
+def get_entry_type(table_type):
+    """
+    Return the entry type of the given *table_type* (an instance of
+    types.Dict or types.Set).
+    """
+    if isinstance(table_type, types.Set):
+        fields = (types.intp, table_type.dtype)
+    else:
+        fields = (types.intp, table_type.key_type, table_type.value_type)
+    return types.BaseTuple.from_types(fields)
+
+
+def make_payload_cls(dict_type):
+    """
+    Return the Structure representation of the given *dict_type*'s payload
+    (an instance of types.Dict or types.Set).
+    """
+    # Note the payload is stored durably in memory, so we consider it
+    # data and not value.
+    return cgutils.create_struct_proxy(get_payload_type(dict_type),
+                                       kind='data')
+
+
+def get_dict_payload(context, builder, dict_type, value):
+    """
+    Given a dict value and type, get its payload structure (as a
+    reference, so that mutations are seen by all).
+    """
+    payload_type = context.get_data_type(get_payload_type(dict_type))
+    payload = context.nrt_meminfo_data(builder, value.meminfo)
+    payload = builder.bitcast(payload, payload_type.as_pointer())
+    return make_payload_cls(dict_type)(context, builder, ref=payload)
+
+
+def get_entry_size(context, dict_type):
+    """
+    Return the entry size for the given dict type.
+    """
+    llty = context.get_data_type(get_entry_type(dict_type))
+    return context.get_abi_sizeof(llty)
+
+
+def get_payload_size(context, builder, dict_type, nentries):
+    """
+    Return a (size, overflow bit) pair for the payload of a dict with
+    *nentries* entries.
+    """
+    intp_t = context.get_value_type(types.intp)
+    payload_type = context.get_data_type(get_payload_type(dict_type))
+    payload_size = context.get_abi_sizeof(payload_type)
+    entry_size = get_entry_size(context, dict_type)
+    # Total allocation size = <payload header size> + nentries * entry_size
+    return cgutils.muladd_with_overflow(builder, nentries,
+                                        ir.Constant(intp_t, entry_size),
+                                        ir.Constant(intp_t, payload_size))
+
+
+class _DictPayloadMixin(object):
+
+    @property
+    def used(self):
+        return self._payload.used
+
+    @used.setter
+    def used(self, value):
+        self._payload.used = value
+
+    @property
+    def fill(self):
+        return self._payload.fill
+
+    @fill.setter
+    def fill(self, value):
+        self._payload.fill = value
+
+    @property
+    def mask(self):
+        return self._payload.mask
+
+    @property
+    def dirty(self):
+        return self._payload.dirty
+
+    @property
+    def entries(self):
+        return self._payload._get_ptr_by_name('entries')
+
+    def _entry(self, idx):
+        return cgutils.gep(self._builder, self.entries, idx)
+
+    # Note about NRT: the entries don't own references to the keys and
+    # values, so NRT-managed key and value types are rejected by the
+    # typing layer (see typing/dictdecl.py).
+
+    def get_entry_hash(self, entry):
+        return self._builder.load(cgutils.gep(self._builder, entry, 0, 0))
+
+    def get_entry_key(self, entry):
+        ptr = cgutils.gep(self._builder, entry, 0, 1)
+        return self._keymodel.from_data(self._builder, self._builder.load(ptr))
+
+    def get_entry_value(self, entry):
+        ptr = cgutils.gep(self._builder, entry, 0, 2)
+        return self._valuemodel.from_data(self._builder,
+                                          self._builder.load(ptr))
+
+    def set_entry_hash(self, entry, h):
+        self._builder.store(h, cgutils.gep(self._builder, entry, 0, 0))
+
+    def set_entry_value(self, entry, value):
+        ptr = cgutils.gep(self._builder, entry, 0, 2)
+        self._builder.store(self._valuemodel.as_data(self._builder, value),
+                            ptr)
+
+    def set_entry(self, entry, h, key, value):
+        self.set_entry_hash(entry, h)
+        ptr = cgutils.gep(self._builder, entry, 0, 1)
+        self._builder.store(self._keymodel.as_data(self._builder, key), ptr)
+        if value is not None:
+            self.set_entry_value(entry, value)
+
+    def is_live(self, h):
+        """
+        Whether an entry with hash value *h* is live.
+        """
+        return self._builder.icmp_signed('>=', h, ir.Constant(h.type, 0))
+
+    @contextlib.contextmanager
+    def _iterate(self):
+        """
+        Iterate over the live entries of the table (a context manager
+        yielding a pointer to each entry).
+        """
+        builder = self._builder
+        mask = self.mask
+        nentries = builder.add(mask, ir.Constant(mask.type, 1))
+        with cgutils.for_range(builder, nentries) as loop:
+            entry = self._entry(loop.index)
+            with builder.if_then(self.is_live(self.get_entry_hash(entry))):
+                yield entry
+
+
+class DictInstance(_DictPayloadMixin):
+
+    def __init__(self, context, builder, dict_type, dict_val):
+        self._context = context
+        self._builder = builder
+        self._ty = dict_type
+        self._dict = make_dict_cls(dict_type)(context, builder, dict_val)
+        self._keymodel = context.data_model_manager[self.key_type]
+        if self.value_type is not None:
+            self._valuemodel = context.data_model_manager[self.value_type]
+
+    @property
+    def key_type(self):
+        return self._ty.key_type
+
+    @property
+    def value_type(self):
+        return self._ty.value_type
+
+    @property
+    def _payload(self):
+        # This cannot be cached as it can be reallocated
+        return get_dict_payload(self._context, self._builder, self._ty,
+                                self._dict)
+
+    @property
+    def parent(self):
+        return self._dict.parent
+
+    @parent.setter
+    def parent(self, value):
+        self._dict.parent = value
+
+    @property
+    def value(self):
+        return self._dict._getvalue()
+
+    @property
+    def meminfo(self):
+        return self._dict.meminfo
+
+    def set_dirty(self, val):
+        if self._ty.reflected:
+            self._payload.dirty = cgutils.true_bit if val else cgutils.false_bit
+
+    def get_hash(self, key):
+        """
+        Return the hash value of *key*, made non-negative.
+        """
+        h = get_hash_value(self._context, self._builder, self.key_type, key)
+        return self._builder.and_(h, ir.Constant(h.type,
+                                                 (1 << (h.type.width - 1)) - 1))
+
+    def _lookup(self, key, h):
+        """
+        Look up *key* with the hash value *h*.  Return a (found, index)
+        tuple: if *found* is true, *index* is the index of the key's
+        entry, otherwise it is the index of the entry where the key
+        should be inserted.
+        """
+        context = self._context
+        builder = self._builder
+        intp_t = h.type
+
+        mask = self.mask
+        entries = self.entries
+        index = cgutils.alloca_once_value(builder, builder.and_(h, mask))
+        perturb = cgutils.alloca_once_value(builder, h)
+        free_index = cgutils.alloca_once_value(builder,
+                                               ir.Constant(intp_t, -1))
+        found = cgutils.alloca_once_value(builder, cgutils.false_bit)
+        res_index = cgutils.alloca_once(builder, intp_t)
+
+        bb_body = builder.append_basic_block("dict.lookup.body")
+        bb_cmp_hash = builder.append_basic_block("dict.lookup.cmp_hash")
+        bb_cmp_key = builder.append_basic_block("dict.lookup.cmp_key")
+        bb_next = builder.append_basic_block("dict.lookup.next")
+        bb_found = builder.append_basic_block("dict.lookup.found")
+        bb_missing = builder.append_basic_block("dict.lookup.missing")
+        bb_end = builder.append_basic_block("dict.lookup.end")
+
+        builder.branch(bb_body)
+        with builder.goto_block(bb_body):
+            i = builder.load(index)
+            entry = cgutils.gep(builder, entries, i)
+            entry_hash = self.get_entry_hash(entry)
+            is_empty = builder.icmp_signed('==', entry_hash,
+                                           ir.Constant(intp_t, EMPTY))
+            builder.cbranch(is_empty, bb_missing, bb_cmp_hash)
+
+        with builder.goto_block(bb_cmp_hash):
+            same_hash = builder.icmp_signed('==', entry_hash, h)
+            builder.cbranch(same_hash, bb_cmp_key, bb_next)
+
+        with builder.goto_block(bb_cmp_key):
+            entry_key = self.get_entry_key(entry)
+            eq = context.generic_compare(builder, '==',
+                                         (self.key_type, self.key_type),
+                                         (key, entry_key))
+            builder.cbranch(eq, bb_found, bb_next)
+
+        with builder.goto_block(bb_next):
+            # Remember the first deleted entry, where the key would be
+            # inserted
+            is_deleted = builder.icmp_signed('==', entry_hash,
+                                             ir.Constant(intp_t, DELETED))
+            no_free = builder.icmp_signed('<', builder.load(free_index),
+                                          ir.Constant(intp_t, 0))
+            with builder.if_then(builder.and_(is_deleted, no_free)):
+                builder.store(i, free_index)
+            # i = (i * 5 + 1 + perturb) & mask
+            p = builder.lshr(builder.load(perturb),
+                             ir.Constant(intp_t, PERTURB_SHIFT))
+            builder.store(p, perturb)
+            next_i = builder.add(builder.mul(i, ir.Constant(intp_t, 5)),
+                                 builder.add(ir.Constant(intp_t, 1), p))
+            builder.store(builder.and_(next_i, mask), index)
+            builder.branch(bb_body)
+
+        with builder.goto_block(bb_found):
+            builder.store(cgutils.true_bit, found)
+            builder.store(i, res_index)
+            builder.branch(bb_end)
+
+        with builder.goto_block(bb_missing):
+            free = builder.load(free_index)
+            has_free = builder.icmp_signed('>=', free, ir.Constant(intp_t, 0))
+            builder.store(builder.select(has_free, free, i), res_index)
+            builder.branch(bb_end)
+
+        builder.position_at_end(bb_end)
+        return builder.load(found), builder.load(res_index)
+
+    def _insert_clean(self, h, entry_data):
+        """
+        Store the raw *entry_data* of hash value *h* in the first empty
+        entry of its probe sequence.  The key must not be in the table.
+        """
+        builder = self._builder
+        intp_t = h.type
+
+        mask = self.mask
+        entries = self.entries
+        index = cgutils.alloca_once_value(builder, builder.and_(h, mask))
+        perturb = cgutils.alloca_once_value(builder, h)
+
+        bb_body = builder.append_basic_block("dict.insert.body")
+        bb_next = builder.append_basic_block("dict.insert.next")
+        bb_store = builder.append_basic_block("dict.insert.store")
+
+        builder.branch(bb_body)
+        with builder.goto_block(bb_body):
+            i = builder.load(index)
+            entry = cgutils.gep(builder, entries, i)
+            is_empty = builder.icmp_signed('==', self.get_entry_hash(entry),
+                                           ir.Constant(intp_t, EMPTY))
+            builder.cbranch(is_empty, bb_store, bb_next)
+
+        with builder.goto_block(bb_next):
+            p = builder.lshr(builder.load(perturb),
+                             ir.Constant(intp_t, PERTURB_SHIFT))
+            builder.store(p, perturb)
+            next_i = builder.add(builder.mul(i, ir.Constant(intp_t, 5)),
+                                 builder.add(ir.Constant(intp_t, 1), p))
+            builder.store(builder.and_(next_i, mask), index)
+            builder.branch(bb_body)
+
+        builder.position_at_end(bb_store)
+        builder.store(entry_data, entry)
+
+    def get(self, key):
+        """
+        Look up *key* and return a (found, value) tuple.  The value is
+        undefined if the key wasn't found.
+        """
+        h = self.get_hash(key)
+        found, i = self._lookup(key, h)
+        value = self.get_entry_value(self._entry(i))
+        return found, value
+
+    def contains(self, key):
+        h = self.get_hash(key)
+        found, i = self._lookup(key, h)
+        return found
+
+    def setitem(self, key, value):
+        builder = self._builder
+        h = self.get_hash(key)
+        found, i = self._lookup(key, h)
+        entry = self._entry(i)
+        with builder.if_else(found) as (if_found, if_missing):
+            with if_found:
+                if value is not None:
+                    self.set_entry_value(entry, value)
+            with if_missing:
+                intp_t = h.type
+                was_empty = builder.icmp_signed('==',
+                                                self.get_entry_hash(entry),
+                                                ir.Constant(intp_t, EMPTY))
+                self.set_entry(entry, h, key, value)
+                self.used = builder.add(self.used, ir.Constant(intp_t, 1))
+                self.fill = builder.add(self.fill,
+                                        builder.zext(was_empty, intp_t))
+                self._maybe_grow()
+        self.set_dirty(True)
+
+    def _delete_entry(self, entry):
+        """
+        Mark the live *entry* deleted.
+        """
+        builder = self._builder
+        intp_t = self._context.get_value_type(types.intp)
+        self.set_entry_hash(entry, ir.Constant(intp_t, DELETED))
+        self.used = builder.sub(self.used, ir.Constant(intp_t, 1))
+        self.set_dirty(True)
+
+    def delitem(self, key):
+        """
+        Remove *key* from the dict.  Return whether it was found.
+        """
+        h = self.get_hash(key)
+        found, i = self._lookup(key, h)
+        with self._builder.if_then(found):
+            self._delete_entry(self._entry(i))
+        return found
+
+    def pop_value(self, key):
+        """
+        Remove *key* from the dict and return a (found, value) tuple.
+        The value is undefined if the key wasn't found.
+        """
+        h = self.get_hash(key)
+        found, i = self._lookup(key, h)
+        entry = self._entry(i)
+        value = self.get_entry_value(entry)
+        with self._builder.if_then(found):
+            self._delete_entry(entry)
+        return found, value
+
+    def clear(self):
+        context = self._context
+        builder = self._builder
+        intp_t = context.get_value_type(types.intp)
+        nentries = ir.Constant(intp_t, MINSIZE)
+        size, _ = get_payload_size(context, builder, self._ty, nentries)
+        ptr = context.nrt_meminfo_varsize_realloc(builder, self.meminfo,
+                                                  size=size)
+        cgutils.guard_memory_error(context, builder, ptr,
+                                   "cannot resize dict")
+        self._init_payload(nentries)
+        self.set_dirty(True)
+
+    def _init_payload(self, nentries):
+        builder = self._builder
+        intp_t = nentries.type
+        payload = self._payload
+        payload.used = ir.Constant(intp_t, 0)
+        payload.fill = ir.Constant(intp_t, 0)
+        payload.mask = builder.sub(nentries, ir.Constant(intp_t, 1))
+        # Mark all entries empty (EMPTY is all ones)
+        entry_size = get_entry_size(self._context, self._ty)
+        cgutils.memset(builder, self.entries,
+                       builder.mul(nentries, ir.Constant(intp_t, entry_size)),
+                       0xFF)
+
+    def _maybe_grow(self):
+        """
+        Grow the table when it is two-thirds full.
+        """
+        builder = self._builder
+        fill = self.fill
+        intp_t = fill.type
+        nentries = builder.add(self.mask, ir.Constant(intp_t, 1))
+        is_full = builder.icmp_signed(
+            '>=', builder.mul(fill, ir.Constant(intp_t, 3)),
+            builder.mul(nentries, ir.Constant(intp_t, 2)))
+        with builder.if_then(is_full, likely=False):
+            # As in CPython 2.x, quadruple the size of small tables
+            used = self.used
+            is_large = builder.icmp_signed('>', used,
+                                           ir.Constant(intp_t, 50000))
+            minused = builder.select(
+                is_large, builder.mul(used, ir.Constant(intp_t, 2)),
+                builder.mul(used, ir.Constant(intp_t, 4)))
+            self._resize(compute_nentries(builder, minused))
+
+    def _resize(self, nentries):
+        """
+        Move the live entries to a new table of *nentries* entries.
+        """
+        context = self._context
+        builder = self._builder
+
+        # Reinsert the live entries in a temporary table
+        tmp = type(self).allocate(context, builder, self._ty, nentries)
+        with self._iterate() as entry:
+            tmp._insert_clean(self.get_entry_hash(entry), builder.load(entry))
+        tmp.used = self.used
+        tmp.fill = self.used
+        tmp._payload.dirty = self.dirty
+
+        # Then move the temporary table to our payload
+        size, _ = get_payload_size(context, builder, self._ty, nentries)
+        ptr = context.nrt_meminfo_varsize_realloc(builder, self.meminfo,
+                                                  size=size)
+        with builder.if_then(cgutils.is_null(builder, ptr), likely=False):
+            context.nrt_decref(builder, self._ty, tmp.value)
+            context.call_conv.return_user_exc(builder, MemoryError,
+                                              ("cannot resize dict",))
+        tmp_ptr = context.nrt_meminfo_data(builder, tmp.meminfo)
+        cgutils.memmove(builder, ptr, tmp_ptr, size, itemsize=1)
+        context.nrt_decref(builder, self._ty, tmp.value)
+
+    def copy(self):
+        """
+        Return a new DictInstance with the same contents.
+        """
+        context = self._context
+        builder = self._builder
+        intp_t = context.get_value_type(types.intp)
+        nentries = builder.add(self.mask, ir.Constant(intp_t, 1))
+        other = type(self).allocate(context, builder, self._ty, nentries)
+        size, _ = get_payload_size(context, builder, self._ty, nentries)
+        cgutils.memmove(builder, context.nrt_meminfo_data(builder,
+                                                          other.meminfo),
+                        context.nrt_meminfo_data(builder, self.meminfo),
+                        size, itemsize=1)
+        other._payload.dirty = cgutils.false_bit
+        return other
+
+    @classmethod
+    def allocate_ex(cls, context, builder, dict_type, nentries):
+        """
+        Allocate a DictInstance with a table of *nentries* entries
+        (a power of two).
+        Return a (ok, instance) tuple where *ok* is a LLVM boolean and
+        *instance* is a DictInstance object (the object's contents are
+        only valid when *ok* is true).
+        """
+        intp_t = context.get_value_type(types.intp)
+
+        if isinstance(nentries, int):
+            nentries = ir.Constant(intp_t, nentries)
+
+        ok = cgutils.alloca_once_value(builder, cgutils.true_bit)
+        self = cls(context, builder, dict_type, None)
+
+        allocsize, ovf = get_payload_size(context, builder, dict_type,
+                                          nentries)
+        with builder.if_then(ovf, likely=False):
+            builder.store(cgutils.false_bit, ok)
+
+        with builder.if_then(builder.load(ok), likely=True):
+            meminfo = context.nrt_meminfo_varsize_alloc(builder, size=allocsize)
+            with builder.if_else(cgutils.is_null(builder, meminfo),
+                                 likely=False) as (if_error, if_ok):
+                with if_error:
+                    builder.store(cgutils.false_bit, ok)
+                with if_ok:
+                    self._dict.meminfo = meminfo
+                    self._dict.parent = context.get_constant_null(types.pyobject)
+                    self._payload.dirty = cgutils.false_bit
+                    self._init_payload(nentries)
+
+        return builder.load(ok), self
+
+    @classmethod
+    def allocate(cls, context, builder, dict_type, nentries):
+        """
+        Allocate a DictInstance with a table of *nentries* entries.  Same
+        as allocate_ex(), but return an initialized *instance*.  If
+        allocation failed, control is transferred to the caller using the
+        target's current call convention.
+        """
+        ok, self = cls.allocate_ex(context, builder, dict_type, nentries)
+        with builder.if_then(builder.not_(ok), likely=False):
+            context.call_conv.return_user_exc(builder, MemoryError,
+                                              ("cannot allocate dict",))
+        return self
+
+    @classmethod
+    def allocate_for_size_ex(cls, context, builder, dict_type, nitems):
+        """
+        Same as allocate_ex(), but the table is able to hold *nitems*
+        keys without resizing.
+        """
+        intp_t = nitems.type
+        # The table must stay less than two-thirds full
+        minused = builder.add(nitems,
+                              builder.ashr(nitems, ir.Constant(intp_t, 1)))
+        return cls.allocate_ex(context, builder, dict_type,
+                               compute_nentries(builder, minused))
+
+
+def compute_nentries(builder, minused):
+    """
+    Return the number of entries (a power of two, at least MINSIZE) of a
+    table able to hold more than *minused* keys.
+    """
+    intp_t = minused.type
+    nentries = cgutils.alloca_once_value(builder, ir.Constant(intp_t, MINSIZE))
+
+    bb_cond = builder.append_basic_block("dict.nentries.cond")
+    bb_body = builder.append_basic_block("dict.nentries.body")
+    bb_end = builder.append_basic_block("dict.nentries.end")
+
+    builder.branch(bb_cond)
+    with builder.goto_block(bb_cond):
+        too_small = builder.icmp_signed('<=', builder.load(nentries), minused)
+        builder.cbranch(too_small, bb_body, bb_end)
+
+    with builder.goto_block(bb_body):
+        builder.store(builder.shl(builder.load(nentries),
+                                  ir.Constant(intp_t, 1)),
+                      nentries)
+        builder.branch(bb_cond)
+
+    builder.position_at_end(bb_end)
+    return builder.load(nentries)
+
+
+class DictIterInstance(_DictPayloadMixin):
+
+    def __init__(self, context, builder, iter_type, iter_val):
+        self._context = context
+        self._builder = builder
+        self._ty = iter_type
+        self._iter = make_dictiter_cls(iter_type)(context, builder, iter_val)
+        table_type = self._table_type
+        if isinstance(table_type, types.Set):
+            self._keymodel = context.data_model_manager[table_type.dtype]
+        else:
+            self._keymodel = context.data_model_manager[table_type.key_type]
+            self._valuemodel = context.data_model_manager[table_type.value_type]
+
+    @classmethod
+    def from_dict(cls, context, builder, iter_type, dict_val):
+        self = cls(context, builder, iter_type, None)
+        table = make_dict_cls(self._table_type)(context, builder, dict_val)
+        index = context.get_constant(types.intp, 0)
+        self._iter.index = cgutils.alloca_once_value(builder, index)
+        self._iter.meminfo = table.meminfo
+        return self
+
+    @property
+    def _table_type(self):
+        return self._ty.dict_type
+
+    @property
+    def _payload(self):
+        # This cannot be cached as it can be reallocated
+        return get_dict_payload(self._context, self._builder,
+                                self._table_type, self._iter)
+
+    @property
+    def value(self):
+        return self._iter._getvalue()
+
+    @property
+    def index(self):
+        return self._builder.load(self._iter.index)
+
+    @index.setter
+    def index(self, value):
+        self._builder.store(value, self._iter.index)
+
+    def iternext(self, result):
+        context = self._context
+        builder = self._builder
+        intp_t = context.get_value_type(types.intp)
+        one = ir.Constant(intp_t, 1)
+        nentries = builder.add(self.mask, one)
+
+        # Skip the free entries
+        bb_cond = builder.append_basic_block("dict.iternext.cond")
+        bb_check = builder.append_basic_block("dict.iternext.check")
+        bb_incr = builder.append_basic_block("dict.iternext.incr")
+        bb_end = builder.append_basic_block("dict.iternext.end")
+
+        builder.branch(bb_cond)
+        with builder.goto_block(bb_cond):
+            in_range = builder.icmp_signed('<', self.index, nentries)
+            builder.cbranch(in_range, bb_check, bb_end)
+
+        with builder.goto_block(bb_check):
+            h = self.get_entry_hash(self._entry(self.index))
+            builder.cbranch(self.is_live(h), bb_end, bb_incr)
+
+        with builder.goto_block(bb_incr):
+            self.index = builder.add(self.index, one)
+            builder.branch(bb_cond)
+
+        builder.position_at_end(bb_end)
+        index = self.index
+        is_valid = builder.icmp_signed('<', index, nentries)
+        result.set_valid(is_valid)
+
+        with builder.if_then(is_valid):
+            result.yield_(self._get_item(self._entry(index)))
+            self.index = builder.add(index, one)
+
+    def _get_item(self, entry):
+        """
+        Return the value yielded for the live *entry*.
+        """
+        kind = self._ty.kind
+        if kind == 'keys':
+            return self.get_entry_key(entry)
+        elif kind == 'values':
+            return self.get_entry_value(entry)
+        else:
+            return self._context.make_tuple(self._builder, self._ty.yield_type,
+                                            [self.get_entry_key(entry),
+                                             self.get_entry_value(entry)])
+
+
+def make_dictiter_cls(iterator_type):
+    """
+    Return the Structure representation of the given *iterator_type* (an
+    instance of types.DictIter).
+    """
+    return cgutils.create_struct_proxy(iterator_type)
+
+
+#-------------------------------------------------------------------------------
+# Constructors
+
+def build_map(context, builder, dict_type, items):
+    """
+    Build a dict of the given type, containing the given (key, value)
+    pairs.
+    """
+    intp_t = context.get_value_type(types.intp)
+    ok, inst = DictInstance.allocate_for_size_ex(
+        context, builder, dict_type, ir.Constant(intp_t, len(items)))
+    with builder.if_then(builder.not_(ok), likely=False):
+        context.call_conv.return_user_exc(builder, MemoryError,
+                                          ("cannot allocate dict",))
+    for key, value in items:
+        inst.setitem(key, value)
+
+    return impl_ret_new_ref(context, builder, dict_type, inst.value)
+
+
+@builtin
+@implement(dict)
+def dict_empty_constructor(context, builder, sig, args):
+    inst = DictInstance.allocate(context, builder, sig.return_type, MINSIZE)
+    return impl_ret_new_ref(context, builder, sig.return_type, inst.value)
+
+
+@builtin
+@implement(dict, types.Kind(types.Dict))
+def dict_copy_constructor(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    other = inst.copy()
+    return impl_ret_new_ref(context, builder, sig.return_type, other.value)
+
+
+#-------------------------------------------------------------------------------
+# Various operations
+
+@builtin
+@implement(types.len_type, types.Kind(types.Dict))
+def dict_len(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    return inst.used
+
+
+@builtin
+@implement("is_true", types.Kind(types.Dict))
+def dict_bool(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    used = inst.used
+    return builder.icmp_signed('!=', used, ir.Constant(used.type, 0))
+
+
+@builtin
+@implement('getiter', types.Kind(types.Dict))
+def getiter_dict(context, builder, sig, args):
+    inst = DictIterInstance.from_dict(context, builder, sig.return_type,
+                                      args[0])
+    return impl_ret_borrowed(context, builder, sig.return_type, inst.value)
+
+
+@builtin
+@implement('iternext', types.Kind(types.DictIter))
+@iternext_impl
+def iternext_dictiter(context, builder, sig, args, result):
+    inst = DictIterInstance(context, builder, sig.args[0], args[0])
+    inst.iternext(result)
+
+
+@builtin
+@implement('getitem', types.Kind(types.Dict), types.Any)
+def getitem_dict(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    found, value = inst.get(args[1])
+    with builder.if_then(builder.not_(found), likely=False):
+        context.call_conv.return_user_exc(builder, KeyError, ())
+
+    return impl_ret_borrowed(context, builder, sig.return_type, value)
+
+
+@builtin
+@implement('setitem', types.Kind(types.Dict), types.Any, types.Any)
+def setitem_dict(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    inst.setitem(args[1], args[2])
+    return context.get_dummy_value()
+
+
+@builtin
+@implement('delitem', types.Kind(types.Dict), types.Any)
+def delitem_dict(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    found = inst.delitem(args[1])
+    with builder.if_then(builder.not_(found), likely=False):
+        context.call_conv.return_user_exc(builder, KeyError, ())
+
+    return context.get_dummy_value()
+
+
+@builtin
+@implement("in", types.Any, types.Kind(types.Dict))
+def in_dict(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[1], args[1])
+    return inst.contains(args[0])
+
+
+#-------------------------------------------------------------------------------
+# Methods
+
+@builtin
+@implement("dict.clear", types.Kind(types.Dict))
+def dict_clear(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    inst.clear()
+    return context.get_dummy_value()
+
+
+@builtin
+@implement("dict.copy", types.Kind(types.Dict))
+def dict_copy(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    other = inst.copy()
+    return impl_ret_new_ref(context, builder, sig.return_type, other.value)
+
+
+def _value_or_default(context, builder, sig, args, found, value):
+    """
+    Return the *value* of the key if *found* is true, or the default
+    value (if given, and None otherwise) if the key is missing.
+    """
+    restype = sig.return_type
+    if len(args) == 3:
+        default_type, default = sig.args[2], args[2]
+    else:
+        default_type, default = types.none, context.get_dummy_value()
+
+    res = cgutils.alloca_once(builder, context.get_value_type(restype))
+    with builder.if_else(found) as (if_found, if_missing):
+        with if_found:
+            builder.store(context.cast(builder, value, sig.args[0].value_type,
+                                       restype), res)
+        with if_missing:
+            builder.store(context.cast(builder, default, default_type,
+                                       restype), res)
+    return builder.load(res)
+
+
+@builtin
+@implement("dict.get", types.Kind(types.Dict), types.Any)
+@implement("dict.get", types.Kind(types.Dict), types.Any, types.Any)
+def dict_get(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    found, value = inst.get(args[1])
+    res = _value_or_default(context, builder, sig, args, found, value)
+    return impl_ret_borrowed(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement("dict.pop", types.Kind(types.Dict), types.Any)
+def dict_pop(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    found, value = inst.pop_value(args[1])
+    with builder.if_then(builder.not_(found), likely=False):
+        context.call_conv.return_user_exc(builder, KeyError, ())
+    return value
+
+
+@builtin
+@implement("dict.pop", types.Kind(types.Dict), types.Any, types.Any)
+def dict_pop_default(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    found, value = inst.pop_value(args[1])
+    return _value_or_default(context, builder, sig, args, found, value)
+
+
+@builtin
+@implement("dict.setdefault", types.Kind(types.Dict), types.Any, types.Any)
+def dict_setdefault(context, builder, sig, args):
+    inst = DictInstance(context, builder, sig.args[0], args[0])
+    key, default = args[1:]
+    found, value = inst.get(key)
+    res = cgutils.alloca_once_value(builder, value)
+    with builder.if_then(builder.not_(found)):
+        inst.setitem(key, default)
+        builder.store(default, res)
+    return impl_ret_borrowed(context, builder, sig.return_type,
+                             builder.load(res))
+
+
+@builtin
+@implement("dict.update", types.Kind(types.Dict), types.Kind(types.Dict))
+def dict_update(context, builder, sig, args):
+    def dict_update_impl(dct, other):
+        for k, v in other.items():
+            dct[k] = v
+
+    return context.compile_internal(builder, dict_update_impl, sig, args)
+
+
+#-------------------------------------------------------------------------------
+# Views
+
+def make_dictview_cls(view_type):
+    return cgutils.create_struct_proxy(view_type)
+
+
+@builtin
+@implement("dict.keys", types.Kind(types.Dict))
+@implement("dict.values", types.Kind(types.Dict))
+@implement("dict.items", types.Kind(types.Dict))
+def dict_view(context, builder, sig, args):
+    view = make_dictview_cls(sig.return_type)(context, builder)
+    view.dict = args[0]
+    return impl_ret_borrowed(context, builder, sig.return_type,
+                             view._getvalue())
+
+
+@builtin
+@implement(types.len_type, types.Kind(types.DictView))
+def dictview_len(context, builder, sig, args):
+    [viewty] = sig.args
+    view = make_dictview_cls(viewty)(context, builder, value=args[0])
+    inst = DictInstance(context, builder, viewty.dict_type, view.dict)
+    return inst.used
+
+
+@builtin
+@implement('getiter', types.Kind(types.DictView))
+def getiter_dictview(context, builder, sig, args):
+    [viewty] = sig.args
+    view = make_dictview_cls(viewty)(context, builder, value=args[0])
+    inst = DictIterInstance.from_dict(context, builder, sig.return_type,
+                                      view.dict)
+    return impl_ret_borrowed(context, builder, sig.return_type, inst.value)
@@ -0,0 +1,168 @@
+"""
+Implementation of hash() for numbers and tuples.  The algorithms are the
+ones of CPython 3, so that the hash values match the interpreter's
+(except for tuples under Python 3.8 and later).
+"""
+
+from __future__ import print_function, absolute_import, division
+
+import math
+
+from llvmlite import ir
+
+from numba import types, typing, utils
+from numba.targets.imputils import builtin, implement, impl_ret_untracked
+
+
+if utils.MACHINE_BITS == 64:
+    _PyHASH_BITS = 61
+else:
+    _PyHASH_BITS = 31
+_PyHASH_MODULUS = (1 << _PyHASH_BITS) - 1
+_PyHASH_INF = 314159
+_PyHASH_NAN = 0
+_PyHASH_IMAG = 1000003
+
+
+def get_hash_value(context, builder, typ, val):
+    """
+    Return the hash value (an intp) of the LLVM value *val* of Numba
+    type *typ*.
+    """
+    sig = typing.signature(types.intp, typ)
+    fn = context.get_function(types.hash_type, sig)
+    return fn(builder, (val,))
+
+
+def _fix_minus_one(builder, h):
+    """
+    -1 is not a valid hash value, it is replaced with -2.
+    """
+    minus_one = ir.Constant(h.type, -1)
+    return builder.select(builder.icmp_signed('==', h, minus_one),
+                          ir.Constant(h.type, -2), h)
+
+
+@builtin
+@implement(types.hash_type, types.boolean)
+def bool_hash_impl(context, builder, sig, args):
+    [val] = args
+    res = builder.zext(val, context.get_value_type(types.intp))
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement(types.hash_type, types.Kind(types.Integer))
+def int_hash_impl(context, builder, sig, args):
+    # The hash is the integer value reduced modulo _PyHASH_MODULUS,
+    # preserving the sign.
+    [val] = args
+    [ty] = sig.args
+    i64 = ir.IntType(64)
+    modulus = ir.Constant(i64, _PyHASH_MODULUS)
+    if ty.signed:
+        if ty.bitwidth < 64:
+            val = builder.sext(val, i64)
+        is_neg = builder.icmp_signed('<', val, ir.Constant(i64, 0))
+        # -(val + 1) doesn't overflow for the minimum value
+        absval_m1 = builder.sub(ir.Constant(i64, -1), val)
+        pos_hash = builder.urem(val, modulus)
+        neg_hash = builder.urem(builder.add(builder.urem(absval_m1, modulus),
+                                            ir.Constant(i64, 1)),
+                                modulus)
+        res = builder.select(is_neg, builder.neg(neg_hash), pos_hash)
+    else:
+        if ty.bitwidth < 64:
+            val = builder.zext(val, i64)
+        res = builder.urem(val, modulus)
+    intp_t = context.get_value_type(types.intp)
+    if intp_t.width < 64:
+        res = builder.trunc(res, intp_t)
+    res = _fix_minus_one(builder, res)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+def _float_hash(v):
+    if math.isinf(v):
+        if v > 0:
+            return _PyHASH_INF
+        else:
+            return -_PyHASH_INF
+    if math.isnan(v):
+        return _PyHASH_NAN
+
+    m, e = math.frexp(v)
+    sign = 1
+    if m < 0:
+        sign = -1
+        m = -m
+    # Process 28 bits of the mantissa at a time
+    x = 0
+    while m:
+        x = ((x << 28) & _PyHASH_MODULUS) | x >> (_PyHASH_BITS - 28)
+        m *= 268435456.0
+        e -= 28
+        y = int(m)
+        m -= y
+        x += y
+        if x >= _PyHASH_MODULUS:
+            x -= _PyHASH_MODULUS
+    # Multiply by 2**e modulo _PyHASH_MODULUS
+    if e >= 0:
+        e = e % _PyHASH_BITS
+    else:
+        e = _PyHASH_BITS - 1 - ((-1 - e) % _PyHASH_BITS)
+    x = ((x << e) & _PyHASH_MODULUS) | x >> (_PyHASH_BITS - e)
+    x = x * sign
+    if x == -1:
+        x = -2
+    return x
+
+
+@builtin
+@implement(types.hash_type, types.Kind(types.Float))
+def float_hash_impl(context, builder, sig, args):
+    [val] = args
+    [ty] = sig.args
+    val = context.cast(builder, val, ty, types.float64)
+    hash_sig = typing.signature(types.intp, types.float64)
+    res = context.compile_internal(builder, _float_hash, hash_sig, [val])
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement(types.hash_type, types.Kind(types.Complex))
+def complex_hash_impl(context, builder, sig, args):
+    [val] = args
+    [ty] = sig.args
+    cplxcls = context.make_complex(ty)
+    z = cplxcls(context, builder, value=val)
+    hash_real = get_hash_value(context, builder, ty.underlying_float, z.real)
+    hash_imag = get_hash_value(context, builder, ty.underlying_float, z.imag)
+    # Wraparound arithmetic, as with CPython's unsigned hash values
+    res = builder.add(hash_real,
+                      builder.mul(ir.Constant(hash_imag.type, _PyHASH_IMAG),
+                                  hash_imag))
+    res = _fix_minus_one(builder, res)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement(types.hash_type, types.Kind(types.BaseTuple))
+def tuple_hash_impl(context, builder, sig, args):
+    [tup] = args
+    [tupty] = sig.args
+    intp_t = context.get_value_type(types.intp)
+    n = len(tupty)
+    x = ir.Constant(intp_t, 0x345678)
+    mult = ir.Constant(intp_t, 1000003)
+    for i, ty in enumerate(tupty):
+        item = builder.extract_value(tup, i)
+        y = get_hash_value(context, builder, ty, item)
+        x = builder.mul(builder.xor(x, y), mult)
+        remaining = n - 1 - i
+        mult = builder.add(mult, ir.Constant(intp_t,
+                                             82520 + remaining + remaining))
+    x = builder.add(x, ir.Constant(intp_t, 97531))
+    res = _fix_minus_one(builder, x)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
@@ -75,6 +75,7 @@ def user_function(fndesc, libs):
         return impl_ret_new_ref(context, builder, fndesc.restype, retval)
 
     imp.signature = typing.signature(fndesc.restype, *fndesc.argtypes)
+    imp.fndesc = fndesc
     imp.libs = tuple(libs)
     return imp
 
@@ -46,6 +46,15 @@ def get_list_payload(context, builder, list_type, value):
     return make_payload_cls(list_type)(context, builder, ref=payload)
 
 
+def has_nrt_items(context, dtype):
+    """
+    Whether list items of the given *dtype* hold NRT references.
+    """
+    dmm = context.data_model_manager
+    return any(dmm[ty].has_nrt_meminfo()
+               for ty in dmm[dtype].traverse_types())
+
+
 def get_itemsize(context, list_type):
     """
     Return the item size for the given list type.
@@ -75,15 +84,46 @@ class _ListPayloadMixin(object):
     def _gep(self, idx):
         return cgutils.gep(self._builder, self.data, idx)
 
-    # Note about NRT: lists of NRT-managed objects (included nested lists)
-    # cannot be handled right now, as the number of nested meminfos is
-    # dynamic.
+    # Note about NRT: the payload owns a reference to each of the list
+    # items, which is released by the payload's destructor (see
+    # ListInstance.define_dtor()).
 
     def getitem(self, idx):
         ptr = self._gep(idx)
         data_item = self._builder.load(ptr)
         return self._datamodel.from_data(self._builder, data_item)
 
+    def incref_value(self, val):
+        """
+        Incref a list item value.
+        """
+        if self._context.enable_nrt:
+            self._context.nrt_incref(self._builder, self.dtype, val)
+
+    def decref_value(self, val):
+        """
+        Decref a list item value.
+        """
+        if self._context.enable_nrt:
+            self._context.nrt_decref(self._builder, self.dtype, val)
+
+    def decref_items(self, start, stop):
+        """
+        Release the references held by the items in [start, stop).  The
+        positions become uninitialized.
+        """
+        if not self._has_nrt_items:
+            return
+        one = ir.Constant(start.type, 1)
+        with cgutils.for_range_slice(self._builder, start, stop,
+                                     one) as (idx, _):
+            self.decref_value(self.getitem(idx))
+
+    @property
+    def _has_nrt_items(self):
+        return (self._context.enable_nrt and
+                has_nrt_items(self._context, self.dtype))
+
     def fix_index(self, idx):
         """
         Fix negative indices by adding the size to them.  Positive
@@ -178,13 +218,25 @@ class ListInstance(_ListPayloadMixin):
             self._payload.dirty = cgutils.true_bit if val else cgutils.false_bit
 
     def setitem(self, idx, val):
+        """
+        Replace the item at *idx*, which must be initialized.
+        """
         ptr = self._gep(idx)
+        self.incref_value(val)
+        if self._has_nrt_items:
+            self.decref_value(self.getitem(idx))
         data_item = self._datamodel.as_data(self._builder, val)
         self._builder.store(data_item, ptr)
         self.set_dirty(True)
 
-    def inititem(self, idx, val):
+    def inititem(self, idx, val, incref=True):
+        """
+        Store an item at an uninitialized position *idx*.  If *incref*
+        is false, the list steals the reference to *val*.
+        """
         ptr = self._gep(idx)
+        if incref:
+            self.incref_value(val)
         data_item = self._datamodel.as_data(self._builder, val)
         self._builder.store(data_item, ptr)
 
@@ -217,7 +269,12 @@ class ListInstance(_ListPayloadMixin):
             builder.store(cgutils.false_bit, ok)
 
         with builder.if_then(builder.load(ok), likely=True):
-            meminfo = context.nrt_meminfo_varsize_alloc(builder, size=allocsize)
+            if self._has_nrt_items:
+                meminfo = context.nrt_meminfo_new_varsize_dtor(
+                    builder, size=allocsize, dtor=self.define_dtor())
+            else:
+                meminfo = context.nrt_meminfo_varsize_alloc(builder,
+                                                            size=allocsize)
             with builder.if_else(cgutils.is_null(builder, meminfo),
                                  likely=False) as (if_error, if_ok):
                 with if_error:
@@ -245,6 +302,27 @@ class ListInstance(_ListPayloadMixin):
                                               ("cannot allocate list",))
         return self
 
+    def define_dtor(self):
+        """
+        Define the destructor of the payload, which releases the items'
+        references, if not already defined in the current module.
+        """
+        context = self._context
+        mod = self._builder.module
+        fnty = ir.FunctionType(ir.VoidType(), [ir.IntType(8).as_pointer()])
+        fn = mod.get_or_insert_function(fnty,
+                                        name=".dtor.list.%s" % (self.dtype,))
+        if not fn.is_declaration:
+            # Already defined
+            return fn
+        fn.linkage = 'linkonce_odr'
+        builder = ir.IRBuilder(fn.append_basic_block())
+        payload = _ListPayloadAccessor(context, builder, self._ty, fn.args[0])
+        zero = context.get_constant(types.intp, 0)
+        payload.decref_items(zero, payload.size)
+        builder.ret_void()
+        return fn
+
     @classmethod
     def from_meminfo(cls, context, builder, list_type, meminfo):
         """
@@ -324,6 +402,25 @@ class ListInstance(_ListPayloadMixin):
         self.set_dirty(True)
 
 
+class _ListPayloadAccessor(_ListPayloadMixin):
+    """
+    A helper object to access the payload at the raw pointer *ptr*.
+    """
+
+    def __init__(self, context, builder, list_type, ptr):
+        self._context = context
+        self._builder = builder
+        self._ty = list_type
+        self._datamodel = context.data_model_manager[list_type.dtype]
+        payload_type = context.get_data_type(types.ListPayload(list_type))
+        ptr = builder.bitcast(ptr, payload_type.as_pointer())
+        self._payload = make_payload_cls(list_type)(context, builder, ref=ptr)
+
+    @property
+    def dtype(self):
+        return self._ty.dtype
+
+
 class ListIterInstance(_ListPayloadMixin):
     
     def __init__(self, context, builder, iter_type, iter_val):
@@ -342,6 +439,10 @@ class ListIterInstance(_ListPayloadMixin):
         self._iter.meminfo = list_inst.meminfo
         return self
 
+    @property
+    def dtype(self):
+        return self._ty.yield_type
+
     @property
     def _payload(self):
         # This cannot be cached as it can be reallocated
@@ -373,7 +474,7 @@ def build_list(context, builder, list_type, items):
     # Populate list
     inst.size = context.get_constant(types.intp, nitems)
     for i, val in enumerate(items):
-        inst.setitem(context.get_constant(types.intp, i), val)
+        inst.inititem(context.get_constant(types.intp, i), val)
 
     return impl_ret_new_ref(context, builder, list_type, inst.value)
 
@@ -390,6 +491,13 @@ def list_constructor(context, builder, sig, args):
     return context.compile_internal(builder, list_impl, sig, args)
 
 
+@builtin
+@implement(types.TypedListClass)
+def typed_list_constructor(context, builder, sig, args):
+    inst = ListInstance.allocate(context, builder, sig.return_type, 0)
+    return impl_ret_new_ref(context, builder, sig.return_type, inst.value)
+
+
 #-------------------------------------------------------------------------------
 # Various operations
 
@@ -425,7 +533,9 @@ def iternext_listiter(context, builder, sig, args, result):
     result.set_valid(is_valid)
 
     with builder.if_then(is_valid):
-        result.yield_(inst.getitem(index))
+        value = inst.getitem(index)
+        inst.incref_value(value)
+        result.yield_(value)
         inst.index = builder.add(index, context.get_constant(types.intp, 1))
 
 
@@ -502,6 +612,12 @@ def setitem_list(context, builder, sig, args):
             # Size of the list tail, after the end of slice
             tail_size = builder.sub(dest.size, real_stop)
 
+            # Take the new references first, in case the source and
+            # destination items are the same objects
+            with cgutils.for_range(builder, src_size) as loop:
+                dest.incref_value(src.getitem(loop.index))
+            dest.decref_items(slice.start, real_stop)
+
             with builder.if_then(builder.icmp_signed('>', size_delta, zero)):
                 # Grow list then move list tail
                 dest.resize(builder.add(dest.size, size_delta))
@@ -518,7 +634,9 @@ def setitem_list(context, builder, sig, args):
 
             with cgutils.for_range(builder, src_size) as loop:
                 value = src.getitem(loop.index)
-                dest.setitem(builder.add(loop.index, dest_offset), value)
+                dest.inititem(builder.add(loop.index, dest_offset), value,
+                              incref=False)
+            dest.set_dirty(True)
         
         with otherwise:
             with builder.if_then(builder.icmp_signed('!=', size_delta, zero)):
@@ -560,6 +678,7 @@ def setitem_list(context, builder, sig, args):
     real_stop = builder.add(start, slice_len)
     # Size of the list tail, after the end of slice
     tail_size = builder.sub(inst.size, real_stop)
+    inst.decref_items(start, real_stop)
     inst.move(start, real_stop, tail_size)
     inst.resize(builder.sub(inst.size, slice_len))
 
@@ -603,11 +722,11 @@ def list_add(context, builder, sig, args):
     with cgutils.for_range(builder, a_size) as loop:
         value = a.getitem(loop.index)
         value = context.cast(builder, value, a.dtype, dest.dtype)
-        dest.setitem(loop.index, value)
+        dest.inititem(loop.index, value)
     with cgutils.for_range(builder, b_size) as loop:
         value = b.getitem(loop.index)
         value = context.cast(builder, value, b.dtype, dest.dtype)
-        dest.setitem(builder.add(loop.index, a_size), value)
+        dest.inititem(builder.add(loop.index, a_size), value)
 
     return impl_ret_new_ref(context, builder, sig.return_type, dest.value)
 
@@ -637,7 +756,7 @@ def list_mul(context, builder, sig, args):
     with cgutils.for_range_slice(builder, zero, nitems, src_size, inc=True) as (dest_offset, _):
         with cgutils.for_range(builder, src_size) as loop:
             value = src.getitem(loop.index)
-            dest.setitem(builder.add(loop.index, dest_offset), value)
+            dest.inititem(builder.add(loop.index, dest_offset), value)
 
     return impl_ret_new_ref(context, builder, sig.return_type, dest.value)
 
@@ -652,12 +771,14 @@ def list_mul_inplace(context, builder, sig, args):
     mult = builder.select(cgutils.is_neg_int(builder, mult), zero, mult)
     nitems = builder.mul(mult, src_size)
 
+    # Release the items dropped when multiplying by zero
+    inst.decref_items(nitems, src_size)
     inst.resize(nitems)
 
     with cgutils.for_range_slice(builder, src_size, nitems, src_size, inc=True) as (dest_offset, _):
         with cgutils.for_range(builder, src_size) as loop:
             value = inst.getitem(loop.index)
-            inst.setitem(builder.add(loop.index, dest_offset), value)
+            inst.inititem(builder.add(loop.index, dest_offset), value)
 
     return impl_ret_borrowed(context, builder, sig.return_type, inst.value)
 
@@ -770,7 +891,7 @@ def list_append(context, builder, sig, args):
     n = inst.size
     new_size = builder.add(n, ir.Constant(n.type, 1))
     inst.resize(new_size)
-    inst.setitem(n, item)
+    inst.inititem(n, item)
 
     return context.get_dummy_value()
 
@@ -778,7 +899,9 @@ def list_append(context, builder, sig, args):
 @implement("list.clear", types.Kind(types.List))
 def list_clear(context, builder, sig, args):
     inst = ListInstance(context, builder, sig.args[0], args[0])
-    inst.resize(context.get_constant(types.intp, 0))
+    zero = context.get_constant(types.intp, 0)
+    inst.decref_items(zero, inst.size)
+    inst.resize(zero)
 
     return context.get_dummy_value()
 
@@ -816,7 +939,7 @@ def _list_extend_list(context, builder, sig, args):
     with cgutils.for_range(builder, src_size) as loop:
         value = src.getitem(loop.index)
         value = context.cast(builder, value, src.dtype, dest.dtype)
-        dest.setitem(builder.add(loop.index, dest_size), value)
+        dest.inititem(builder.add(loop.index, dest_size), value)
 
     return dest
 
@@ -905,7 +1028,7 @@ def list_insert(context, builder, sig, args):
     new_size = builder.add(n, one)
     inst.resize(new_size)
     inst.move(builder.add(index, one), index, builder.sub(n, index))
-    inst.setitem(index, value)
+    inst.inititem(index, value)
 
     return context.get_dummy_value()
 
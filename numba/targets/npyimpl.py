@@ -9,6 +9,7 @@ import math
 import sys
 import itertools
 from collections import namedtuple
+from contextlib import contextmanager
 
 from llvmlite.llvmpy import core as lc
 
@@ -208,10 +209,11 @@ def _broadcast_onto(src_ndim, src_shape, dest_ndim, dest_shape):
             dest_index += 1
     return dest_index
 
-def _build_array(context, builder, array_ty, arg_arrays):
-    """Utility function to handle allocation of an implicit output array
-    given the target context, builder, output array type, and a list of
-    _ArrayHelper instances.
+def _broadcast_shape(context, builder, ndim, arg_arrays):
+    """Utility function computing the shape the given list of
+    _ArrayHelper (or _ScalarHelper) instances broadcast to, as a tuple
+    of *ndim* values.  An exception is raised if the arguments cannot
+    be broadcast together.
     """
     intp_ty = context.get_value_type(types.intp)
     def make_intp_const(val):
@@ -220,13 +222,13 @@ def _build_array(context, builder, array_ty, arg_arrays):
     ZERO = make_intp_const(0)
     ONE = make_intp_const(1)
 
-    src_shape = cgutils.alloca_once(builder, intp_ty, array_ty.ndim,
+    src_shape = cgutils.alloca_once(builder, intp_ty, ndim,
                                     "src_shape")
-    dest_ndim = make_intp_const(array_ty.ndim)
-    dest_shape = cgutils.alloca_once(builder, intp_ty, array_ty.ndim,
+    dest_ndim = make_intp_const(ndim)
+    dest_shape = cgutils.alloca_once(builder, intp_ty, ndim,
                                      "dest_shape")
     dest_shape_addrs = tuple(cgutils.gep_inbounds(builder, dest_shape, index)
-                             for index in range(array_ty.ndim))
+                             for index in range(ndim))
 
     # Initialize the destination shape with all ones.
     for dest_shape_addr in dest_shape_addrs:
@@ -251,8 +253,17 @@ def _build_array(context, builder, array_ty, arg_arrays):
                 arg_number,)
             context.call_conv.return_user_exc(builder, ValueError, (msg,))
 
-    dest_shape_tup = tuple(builder.load(dest_shape_addr)
-                           for dest_shape_addr in dest_shape_addrs)
+    return tuple(builder.load(dest_shape_addr)
+                 for dest_shape_addr in dest_shape_addrs)
+
+
+def _build_array(context, builder, array_ty, arg_arrays):
+    """Utility function to handle allocation of an implicit output array
+    given the target context, builder, output array type, and a list of
+    _ArrayHelper instances.
+    """
+    dest_shape_tup = _broadcast_shape(context, builder, array_ty.ndim,
+                                      arg_arrays)
     array_val = arrayobj._empty_nd_impl(context, builder, array_ty,
                                         dest_shape_tup)
     return _prepare_argument(context, builder, array_val._getvalue(), array_ty,
@@ -260,7 +271,7 @@ def _build_array(context, builder, array_ty, arg_arrays):
 
 
 def numpy_ufunc_kernel(context, builder, sig, args, kernel_class,
-                       explicit_output=True):
+                       explicit_output=True, parallel=False):
     # This is the code generator that builds all the looping needed
     # to execute a numpy functions over several dimensions (including
     # scalar cases).
@@ -272,6 +283,8 @@ def numpy_ufunc_kernel(context, builder, sig, args, kernel_class,
     # kernel_class -  a code generating subclass of _Kernel that provides
     # explicit_output - if the output was explicit in the call
     #                   (ie: np.add(x,y,r))
+    # parallel - whether to split the loop across the worker threads
+    #            of numba.npyufunc.parallel
 
     arguments = [_prepare_argument(context, builder, arg, tyarg)
                  for arg, tyarg in zip(args, sig.args)]
@@ -291,7 +304,43 @@ def numpy_ufunc_kernel(context, builder, sig, args, kernel_class,
     inputs = arguments[0:-1]
     output = arguments[-1]
 
-    outer_sig = [a.base_type for a in arguments]
+    if parallel and isinstance(output, _ArrayHelper) and output.ndim > 0:
+        argtys = list(sig.args)
+        argvals = list(args)
+        if not explicit_output:
+            argtys.append(sig.return_type)
+            argvals.append(output.return_val)
+        _parallel_ufunc_loop(context, builder, kernel_class, argtys, argvals,
+                             output)
+    else:
+        _ufunc_loop(context, builder, kernel_class, inputs, output)
+
+    out = arguments[-1].return_val
+    return impl_ret_new_ref(context, builder, sig.return_type, out)
+
+
+@contextmanager
+def _loop_nest_range(builder, shape, intp, start=None, stop=None):
+    """
+    Like cgutils.loop_nest(), but iterate only over [start, stop) along
+    the first dimension if *start* and *stop* are given.
+    """
+    if start is None:
+        with cgutils.loop_nest(builder, shape, intp=intp) as indices:
+            yield indices
+    else:
+        one = lc.Constant.int(intp, 1)
+        with cgutils.for_range_slice(builder, start, stop, one,
+                                     intp=intp) as (index, _):
+            with cgutils.loop_nest(builder, shape[1:], intp=intp) as indices:
+                yield (index,) + tuple(indices)
+
+
+def _ufunc_loop(context, builder, kernel_class, inputs, output,
+                start=None, stop=None):
+    # Emit the loop computing the kernel over the *output*'s shape
+    # (or rows [start, stop) of it).
+    outer_sig = [a.base_type for a in inputs + [output]]
     #signature expects return type first, while we have it last:
     outer_sig = outer_sig[-1:] + outer_sig[:-1]
     outer_sig = typing.signature(*outer_sig)
@@ -301,7 +350,8 @@ def numpy_ufunc_kernel(context, builder, sig, args, kernel_class,
     indices = [inp.create_iter_indices() for inp in inputs]
 
     loopshape = output.shape
-    with cgutils.loop_nest(builder, loopshape, intp=intpty) as loop_indices:
+    with _loop_nest_range(builder, loopshape, intpty,
+                          start, stop) as loop_indices:
         vals_in = []
         for i, (index, arg) in enumerate(zip(indices, inputs)):
             index.update_indices(loop_indices, i)
@@ -309,8 +359,218 @@ def numpy_ufunc_kernel(context, builder, sig, args, kernel_class,
 
         val_out = kernel.generate(*vals_in)
         output.store_data(loop_indices, val_out)
-    out = arguments[-1].return_val
-    return impl_ret_new_ref(context, builder, sig.return_type, out)
+
+
+def _parallel_ufunc_loop(context, builder, kernel_class, argtys, argvals,
+                         output):
+    # Same as _ufunc_loop(), but with the first dimension split across
+    # the worker threads.  *argtys* and *argvals* are the types and values
+    # of the inputs and the output.
+    from numba.npyufunc import parallel
+
+    body, body_builder, body_args = parallel.define_parallel_body(
+        context, builder.module, argtys, 'numba.parallel.ufunc')
+    start, stop, _ = body_args[:3]
+    body_arguments = [_prepare_argument(context, body_builder, arg, tyarg)
+                      for arg, tyarg in zip(body_args[3:], argtys)]
+    _ufunc_loop(context, body_builder, kernel_class, body_arguments[:-1],
+                body_arguments[-1], start, stop)
+    context.call_conv.return_native_none(body_builder)
+
+    _, status = parallel.parallel_for(context, builder, body, argtys, argvals,
+                                      output.shape[0])
+    with cgutils.if_unlikely(builder, status.is_error):
+        context.call_conv.return_status_propagate(builder, status)
+
+
+def _reduce_add(acc, v):
+    return acc + v
+
+def _reduce_mul(acc, v):
+    return acc * v
+
+def _reduce_min(acc, v):
+    if v < acc:
+        return v
+    return acc
+
+def _reduce_max(acc, v):
+    if v > acc:
+        return v
+    return acc
+
+def _reduce_mean(acc, count):
+    return acc / count
+
+# Reducers supported by numpy_reduce_kernel(): their step function,
+# initial value (None if the first element is used) and, for the latter,
+# the name of the ufunc to mention in the error on empty inputs.
+_reducers = {
+    'sum': (_reduce_add, 0, None),
+    'prod': (_reduce_mul, 1, None),
+    'mean': (_reduce_add, 0, None),
+    'min': (_reduce_min, None, 'minimum'),
+    'max': (_reduce_max, None, 'maximum'),
+    }
+
+
+def numpy_reduce_kernel(context, builder, sig, args, kernel_class, reducer,
+                        return_type, parallel=False):
+    # This is the code generator for a reduction (see _reducers) of the
+    # values computed by a kernel over the broadcast shape of its
+    # arguments, without materializing them in an array.
+    #
+    # context - the code generation context
+    # builder - the code emitter
+    # sig - signature of the kernel, as an array operation (i.e. the
+    #       return type is the array that would hold the values)
+    # args - the args to the kernel
+    # kernel_class - a code generating subclass of _Kernel
+    # reducer - the name of the reduction
+    # return_type - the type of the reduction's result
+    # parallel - whether to split the loop across the worker threads
+    #            of numba.npyufunc.parallel
+
+    _, _, ufunc_name = _reducers[reducer]
+    arguments = [_prepare_argument(context, builder, arg, tyarg)
+                 for arg, tyarg in zip(args, sig.args)]
+    loopshape = _broadcast_shape(context, builder, sig.return_type.ndim,
+                                 arguments)
+
+    acc_ty = return_type
+    acc = cgutils.alloca_once(builder, context.get_value_type(acc_ty))
+    is_first = cgutils.alloca_once(builder, lc.Type.int(1))
+
+    if parallel and loopshape:
+        _parallel_reduce_loop(context, builder, sig, args, kernel_class,
+                              reducer, acc_ty, loopshape, acc, is_first)
+    else:
+        _reduce_loop(context, builder, sig, kernel_class, reducer, acc_ty,
+                     arguments, loopshape, acc, is_first)
+
+    if ufunc_name is not None:
+        with cgutils.if_unlikely(builder, builder.load(is_first)):
+            msg = ("zero-size array to reduction operation %s which has "
+                   "no identity" % (ufunc_name,))
+            context.call_conv.return_user_exc(builder, ValueError, (msg,))
+
+    res = builder.load(acc)
+    if reducer == 'mean':
+        count = context.get_constant(types.intp, 1)
+        for dim in loopshape:
+            count = builder.mul(count, dim)
+        res = context.compile_internal(
+            builder, _reduce_mean, typing.signature(acc_ty, acc_ty, types.intp),
+            [res, count])
+    return res
+
+
+def _reduce_init(context, builder, reducer, acc_ty, acc, is_first):
+    # Initialize the accumulator *acc* and the *is_first* flag, which
+    # is true as long as no value has been accumulated.
+    _, init, _ = _reducers[reducer]
+    if init is not None:
+        builder.store(context.get_constant(acc_ty, init), acc)
+    builder.store(cgutils.true_bit, is_first)
+
+
+def _reduce_step(context, builder, reducer, acc_ty, acc, is_first, val):
+    # Accumulate *val* into *acc*.
+    step, init, _ = _reducers[reducer]
+    step_sig = typing.signature(acc_ty, acc_ty, acc_ty)
+    if init is not None:
+        res = context.compile_internal(builder, step, step_sig,
+                                       [builder.load(acc), val])
+        builder.store(res, acc)
+    else:
+        with builder.if_else(builder.load(is_first)) as (then, otherwise):
+            with then:
+                builder.store(val, acc)
+            with otherwise:
+                res = context.compile_internal(builder, step, step_sig,
+                                               [builder.load(acc), val])
+                builder.store(res, acc)
+    builder.store(cgutils.false_bit, is_first)
+
+
+def _reduce_loop(context, builder, sig, kernel_class, reducer, acc_ty,
+                 arguments, loopshape, acc, is_first, start=None, stop=None):
+    # Emit the loop reducing the kernel's values over *loopshape* (or
+    # rows [start, stop) of it) into *acc*.
+    dtype = sig.return_type.dtype
+    outer_sig = typing.signature(dtype, *[a.base_type for a in arguments])
+    kernel = kernel_class(context, builder, outer_sig)
+    intpty = context.get_value_type(types.intp)
+
+    _reduce_init(context, builder, reducer, acc_ty, acc, is_first)
+
+    indices = [inp.create_iter_indices() for inp in arguments]
+
+    with _loop_nest_range(builder, loopshape, intpty,
+                          start, stop) as loop_indices:
+        vals_in = []
+        for i, (index, arg) in enumerate(zip(indices, arguments)):
+            index.update_indices(loop_indices, i)
+            vals_in.append(arg.load_data(index.as_values()))
+
+        val = kernel.cast(kernel.generate(*vals_in), dtype, acc_ty)
+        _reduce_step(context, builder, reducer, acc_ty, acc, is_first, val)
+
+
+def _parallel_reduce_loop(context, builder, sig, args, kernel_class, reducer,
+                          acc_ty, loopshape, acc, is_first):
+    # Same as _reduce_loop(), but with the first dimension split across
+    # the worker threads.  Each chunk reduces its rows into its own slot
+    # of a partial results array, which are then reduced serially.
+    from numba.npyufunc import parallel
+
+    nchunks = parallel.NUM_THREADS
+    acc_llty = context.get_value_type(acc_ty)
+    partials = cgutils.alloca_once(builder, acc_llty, size=nchunks)
+    partial_flags = cgutils.alloca_once(builder, lc.Type.int(8),
+                                        size=nchunks)
+    # Chunks which don't run (if fewer threads are active) stay empty
+    for i in range(nchunks):
+        builder.store(lc.Constant.int(lc.Type.int(8), 1),
+                      cgutils.gep_inbounds(builder, partial_flags, i))
+    ptr_tys = [types.CPointer(acc_ty), types.CPointer(types.uint8)]
+    argtys = ptr_tys + list(sig.args)
+    argvals = [partials, partial_flags] + list(args)
+
+    body, body_builder, body_args = parallel.define_parallel_body(
+        context, builder.module, argtys, 'numba.parallel.reduce')
+    start, stop, chunk = body_args[:3]
+    chunk_acc = cgutils.gep_inbounds(body_builder, body_args[3], chunk)
+    chunk_is_first = cgutils.gep_inbounds(body_builder, body_args[4], chunk)
+    body_arguments = [_prepare_argument(context, body_builder, arg, tyarg)
+                      for arg, tyarg in zip(body_args[5:], sig.args)]
+    body_loopshape = _broadcast_shape(context, body_builder,
+                                      sig.return_type.ndim, body_arguments)
+    body_acc = cgutils.alloca_once(body_builder, acc_llty)
+    body_is_first = cgutils.alloca_once(body_builder, lc.Type.int(1))
+    _reduce_loop(context, body_builder, sig, kernel_class, reducer, acc_ty,
+                 body_arguments, body_loopshape, body_acc, body_is_first,
+                 start, stop)
+    body_builder.store(body_builder.load(body_acc), chunk_acc)
+    body_builder.store(body_builder.zext(body_builder.load(body_is_first),
+                                         lc.Type.int(8)),
+                       chunk_is_first)
+    context.call_conv.return_native_none(body_builder)
+
+    nchunks, status = parallel.parallel_for(context, builder, body, argtys,
+                                            argvals, loopshape[0])
+    with cgutils.if_unlikely(builder, status.is_error):
+        context.call_conv.return_status_propagate(builder, status)
+
+    # Combine the chunks' results, in order
+    _reduce_init(context, builder, reducer, acc_ty, acc, is_first)
+    for i in range(nchunks):
+        chunk_is_first = builder.load(cgutils.gep_inbounds(builder,
+                                                           partial_flags, i))
+        with builder.if_then(cgutils.is_null(builder, chunk_is_first)):
+            val = builder.load(cgutils.gep_inbounds(builder, partials, i))
+            _reduce_step(context, builder, reducer, acc_ty, acc, is_first,
+                         val)
 
 
 # Kernels are the code to be executed inside the multidimensional loop.
@@ -61,6 +61,17 @@ class TargetOptions(object):
         if kws.pop('no_rewrites', False):
             flags.set('no_rewrites')
 
+        if kws.pop('parallel', False):
+            flags.set('auto_parallel')
+
+        array_alignment = kws.pop('array_alignment', None)
+        if array_alignment is not None:
+            flags.set('array_alignment', array_alignment)
+
+        static_args = kws.pop('_static_args', ())
+        if static_args:
+            flags.set('static_args', static_args)
+
         flags.set("enable_pyobject_looplift")
 
         if kws:
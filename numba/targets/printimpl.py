@@ -59,6 +59,21 @@ def print_charseq(context, builder, sig, args):
     return impl_ret_untracked(context, builder, sig.return_type, res)
 
 
+@register
+@implement(types.print_item_type, types.Kind(types.UnicodeType))
+def print_unicode(context, builder, sig, args):
+    [tx] = sig.args
+    [x] = args
+    py = context.get_python_api(builder)
+    # Boxing steals a reference
+    context.nrt_incref(builder, tx, x)
+    strobj = py.from_native_value(tx, x)
+    py.print_object(strobj)
+    py.decref(strobj)
+    res = context.get_dummy_value()
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
 @register
 @implement(types.print_type, types.VarArg(types.Any))
 def print_varargs(context, builder, sig, args):
@@ -0,0 +1,448 @@
+"""
+Support for native homogenous sets.
+
+A set is stored as a hash table of (hash, key) entries, using the same
+machinery as dicts (see dictobj.py).
+"""
+
+from __future__ import print_function, absolute_import, division
+
+from llvmlite import ir
+from numba import types, cgutils, typing
+from numba.targets.imputils import (builtin, implement, iternext_impl,
+                                    impl_ret_borrowed, impl_ret_new_ref,
+                                    impl_ret_untracked)
+from .dictobj import DictInstance, DictIterInstance, MINSIZE
+
+
+class SetInstance(DictInstance):
+
+    @property
+    def key_type(self):
+        return self._ty.dtype
+
+    @property
+    def value_type(self):
+        return None
+
+    def add(self, item):
+        self.setitem(item, None)
+
+    def discard(self, item):
+        """
+        Remove *item* from the set.  Return whether it was found.
+        """
+        return self.delitem(item)
+
+    def pop(self):
+        """
+        Remove an arbitrary item from the set and return it.  The set
+        must not be empty.
+        """
+        builder = self._builder
+        payload = self._payload
+        mask = self.mask
+        intp_t = mask.type
+        one = ir.Constant(intp_t, 1)
+        # As in CPython, resume the search where the last pop() stopped,
+        # so that emptying the set takes linear time
+        index = cgutils.alloca_once_value(builder,
+                                          builder.and_(payload.finger, mask))
+
+        # Look for the next live entry
+        bb_cond = builder.append_basic_block("set.pop.cond")
+        bb_incr = builder.append_basic_block("set.pop.incr")
+        bb_end = builder.append_basic_block("set.pop.end")
+
+        builder.branch(bb_cond)
+        with builder.goto_block(bb_cond):
+            h = self.get_entry_hash(self._entry(builder.load(index)))
+            builder.cbranch(self.is_live(h), bb_end, bb_incr)
+
+        with builder.goto_block(bb_incr):
+            builder.store(builder.and_(builder.add(builder.load(index), one),
+                                       mask),
+                          index)
+            builder.branch(bb_cond)
+
+        builder.position_at_end(bb_end)
+        i = builder.load(index)
+        entry = self._entry(i)
+        item = self.get_entry_key(entry)
+        self._delete_entry(entry)
+        payload.finger = builder.add(i, one)
+        return item
+
+    def _init_payload(self, nentries):
+        super(SetInstance, self)._init_payload(nentries)
+        self._payload.finger = ir.Constant(nentries.type, 0)
+
+
+class SetIterInstance(DictIterInstance):
+
+    @classmethod
+    def from_set(cls, context, builder, iter_type, set_val):
+        return cls.from_dict(context, builder, iter_type, set_val)
+
+    @property
+    def _table_type(self):
+        return self._ty.set_type
+
+    def _get_item(self, entry):
+        return self.get_entry_key(entry)
+
+
+#-------------------------------------------------------------------------------
+# Constructors
+
+def build_set(context, builder, set_type, items):
+    """
+    Build a set of the given type, containing the given items.
+    """
+    intp_t = context.get_value_type(types.intp)
+    ok, inst = SetInstance.allocate_for_size_ex(
+        context, builder, set_type, ir.Constant(intp_t, len(items)))
+    with builder.if_then(builder.not_(ok), likely=False):
+        context.call_conv.return_user_exc(builder, MemoryError,
+                                          ("cannot allocate set",))
+    for item in items:
+        inst.add(item)
+
+    return impl_ret_new_ref(context, builder, set_type, inst.value)
+
+
+@builtin
+@implement(set)
+def set_empty_constructor(context, builder, sig, args):
+    inst = SetInstance.allocate(context, builder, sig.return_type, MINSIZE)
+    return impl_ret_new_ref(context, builder, sig.return_type, inst.value)
+
+
+@builtin
+@implement(set, types.Kind(types.Set))
+def set_copy_constructor(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    other = inst.copy()
+    return impl_ret_new_ref(context, builder, sig.return_type, other.value)
+
+
+@builtin
+@implement(set, types.Kind(types.IterableType))
+def set_constructor(context, builder, sig, args):
+    def set_impl(iterable):
+        res = set()
+        res.update(iterable)
+        return res
+
+    return context.compile_internal(builder, set_impl, sig, args)
+
+
+#-------------------------------------------------------------------------------
+# Various operations
+
+@builtin
+@implement(types.len_type, types.Kind(types.Set))
+def set_len(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    return inst.used
+
+
+@builtin
+@implement("is_true", types.Kind(types.Set))
+def set_bool(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    used = inst.used
+    return builder.icmp_signed('!=', used, ir.Constant(used.type, 0))
+
+
+@builtin
+@implement("in", types.Any, types.Kind(types.Set))
+def in_set(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[1], args[1])
+    return inst.contains(args[0])
+
+
+@builtin
+@implement('getiter', types.Kind(types.Set))
+def getiter_set(context, builder, sig, args):
+    inst = SetIterInstance.from_set(context, builder, sig.return_type, args[0])
+    return impl_ret_borrowed(context, builder, sig.return_type, inst.value)
+
+
+@builtin
+@implement('iternext', types.Kind(types.SetIter))
+@iternext_impl
+def iternext_setiter(context, builder, sig, args, result):
+    inst = SetIterInstance(context, builder, sig.args[0], args[0])
+    inst.iternext(result)
+
+
+#-------------------------------------------------------------------------------
+# Methods
+
+@builtin
+@implement("set.add", types.Kind(types.Set), types.Any)
+def set_add(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    inst.add(args[1])
+    return context.get_dummy_value()
+
+
+@builtin
+@implement("set.discard", types.Kind(types.Set), types.Any)
+def set_discard(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    inst.discard(args[1])
+    return context.get_dummy_value()
+
+
+@builtin
+@implement("set.remove", types.Kind(types.Set), types.Any)
+def set_remove(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    found = inst.discard(args[1])
+    with builder.if_then(builder.not_(found), likely=False):
+        context.call_conv.return_user_exc(builder, KeyError, ())
+    return context.get_dummy_value()
+
+
+@builtin
+@implement("set.pop", types.Kind(types.Set))
+def set_pop(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    cgutils.guard_zero(context, builder, inst.used,
+                       (KeyError, "pop from an empty set"))
+    return inst.pop()
+
+
+@builtin
+@implement("set.clear", types.Kind(types.Set))
+def set_clear(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    inst.clear()
+    return context.get_dummy_value()
+
+
+@builtin
+@implement("set.copy", types.Kind(types.Set))
+def set_copy(context, builder, sig, args):
+    inst = SetInstance(context, builder, sig.args[0], args[0])
+    other = inst.copy()
+    return impl_ret_new_ref(context, builder, sig.return_type, other.value)
+
+
+@builtin
+@implement("set.update", types.Kind(types.Set), types.Kind(types.IterableType))
+def set_update(context, builder, sig, args):
+    def set_update_impl(s, iterable):
+        for x in iterable:
+            s.add(x)
+
+    return context.compile_internal(builder, set_update_impl, sig, args)
+
+
+#-------------------------------------------------------------------------------
+# Set algebra
+
+def _set_operator(context, builder, sig, args, impl):
+    res = context.compile_internal(builder, impl, sig, args)
+    return impl_ret_new_ref(context, builder, sig.return_type, res)
+
+def _set_inplace_operator(context, builder, sig, args, impl):
+    impl_sig = typing.signature(types.none, *sig.args)
+    context.compile_internal(builder, impl, impl_sig, args)
+    if sig.return_type == types.none:
+        return context.get_dummy_value()
+    # The in-place operators return the left operand
+    return impl_ret_borrowed(context, builder, sig.return_type, args[0])
+
+def _set_comparator(context, builder, sig, args, impl):
+    res = context.compile_internal(builder, impl, sig, args)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement("|", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.union", types.Kind(types.Set), types.Kind(types.Set))
+def set_union(context, builder, sig, args):
+    def union_impl(a, b):
+        s = set(a)
+        s.update(b)
+        return s
+
+    return _set_operator(context, builder, sig, args, union_impl)
+
+
+@builtin
+@implement("&", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.intersection", types.Kind(types.Set), types.Kind(types.Set))
+def set_intersection(context, builder, sig, args):
+    def intersection_impl(a, b):
+        if len(a) > len(b):
+            a, b = b, a
+        s = set(a)
+        for x in a:
+            if x not in b:
+                s.discard(x)
+        return s
+
+    return _set_operator(context, builder, sig, args, intersection_impl)
+
+
+@builtin
+@implement("-", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.difference", types.Kind(types.Set), types.Kind(types.Set))
+def set_difference(context, builder, sig, args):
+    def difference_impl(a, b):
+        s = set(a)
+        for x in b:
+            s.discard(x)
+        return s
+
+    return _set_operator(context, builder, sig, args, difference_impl)
+
+
+@builtin
+@implement("^", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.symmetric_difference", types.Kind(types.Set),
+           types.Kind(types.Set))
+def set_symmetric_difference(context, builder, sig, args):
+    def symmetric_difference_impl(a, b):
+        s = set(a)
+        for x in b:
+            if x in a:
+                s.discard(x)
+            else:
+                s.add(x)
+        return s
+
+    return _set_operator(context, builder, sig, args,
+                         symmetric_difference_impl)
+
+
+@builtin
+@implement("|=", types.Kind(types.Set), types.Kind(types.Set))
+def set_inplace_union(context, builder, sig, args):
+    def inplace_union_impl(a, b):
+        a.update(b)
+
+    return _set_inplace_operator(context, builder, sig, args,
+                                 inplace_union_impl)
+
+
+@builtin
+@implement("&=", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.intersection_update", types.Kind(types.Set),
+           types.Kind(types.Set))
+def set_intersection_update(context, builder, sig, args):
+    def intersection_update_impl(a, b):
+        for x in set(a):
+            if x not in b:
+                a.discard(x)
+
+    return _set_inplace_operator(context, builder, sig, args,
+                                 intersection_update_impl)
+
+
+@builtin
+@implement("-=", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.difference_update", types.Kind(types.Set),
+           types.Kind(types.Set))
+def set_difference_update(context, builder, sig, args):
+    def difference_update_impl(a, b):
+        for x in b:
+            a.discard(x)
+
+    return _set_inplace_operator(context, builder, sig, args,
+                                 difference_update_impl)
+
+
+@builtin
+@implement("^=", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.symmetric_difference_update", types.Kind(types.Set),
+           types.Kind(types.Set))
+def set_symmetric_difference_update(context, builder, sig, args):
+    def symmetric_difference_update_impl(a, b):
+        for x in b:
+            if x in a:
+                a.discard(x)
+            else:
+                a.add(x)
+
+    return _set_inplace_operator(context, builder, sig, args,
+                                 symmetric_difference_update_impl)
+
+
+@builtin
+@implement("set.isdisjoint", types.Kind(types.Set), types.Kind(types.Set))
+def set_isdisjoint(context, builder, sig, args):
+    def isdisjoint_impl(a, b):
+        if len(a) > len(b):
+            a, b = b, a
+        for x in a:
+            if x in b:
+                return False
+        return True
+
+    return _set_comparator(context, builder, sig, args, isdisjoint_impl)
+
+
+@builtin
+@implement("<=", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.issubset", types.Kind(types.Set), types.Kind(types.Set))
+def set_issubset(context, builder, sig, args):
+    def issubset_impl(a, b):
+        if len(a) > len(b):
+            return False
+        for x in a:
+            if x not in b:
+                return False
+        return True
+
+    return _set_comparator(context, builder, sig, args, issubset_impl)
+
+
+@builtin
+@implement(">=", types.Kind(types.Set), types.Kind(types.Set))
+@implement("set.issuperset", types.Kind(types.Set), types.Kind(types.Set))
+def set_issuperset(context, builder, sig, args):
+    def issuperset_impl(a, b):
+        return b.issubset(a)
+
+    return _set_comparator(context, builder, sig, args, issuperset_impl)
+
+
+@builtin
+@implement("<", types.Kind(types.Set), types.Kind(types.Set))
+def set_lt(context, builder, sig, args):
+    def lt_impl(a, b):
+        return len(a) < len(b) and a.issubset(b)
+
+    return _set_comparator(context, builder, sig, args, lt_impl)
+
+
+@builtin
+@implement(">", types.Kind(types.Set), types.Kind(types.Set))
+def set_gt(context, builder, sig, args):
+    def gt_impl(a, b):
+        return len(a) > len(b) and b.issubset(a)
+
+    return _set_comparator(context, builder, sig, args, gt_impl)
+
+
+@builtin
+@implement("==", types.Kind(types.Set), types.Kind(types.Set))
+def set_eq(context, builder, sig, args):
+    def eq_impl(a, b):
+        return len(a) == len(b) and a.issubset(b)
+
+    return _set_comparator(context, builder, sig, args, eq_impl)
+
+
+@builtin
+@implement("!=", types.Kind(types.Set), types.Kind(types.Set))
+def set_ne(context, builder, sig, args):
+    def ne_impl(a, b):
+        return not (len(a) == len(b) and a.issubset(b))
+
+    return _set_comparator(context, builder, sig, args, ne_impl)
@@ -0,0 +1,802 @@
+"""
+Support for native unicode strings (Python 3 str objects).
+
+Strings use the PEP 393 representation: the characters are stored as
+an array of code points of 1, 2 or 4 bytes each (the string's "kind"),
+the kind being the narrowest one able to represent all characters.
+Keeping the canonical kind allows str objects to be unboxed without
+copying their data, and makes hash() match the interpreter's.
+"""
+
+from __future__ import print_function, absolute_import, division
+
+import hashlib
+
+from llvmlite import ir
+
+from numba import types, cgutils, typing
+from numba.targets.imputils import (builtin, implement, iternext_impl,
+                                    impl_ret_borrowed, impl_ret_new_ref,
+                                    impl_ret_untracked)
+from . import slicing
+from .hashing import _fix_minus_one
+from .listobj import ListInstance
+
+
+_char_ptr = ir.IntType(8).as_pointer()
+_code_point = ir.IntType(32)
+
+_KINDS = (1, 2, 4)
+
+# The code points matched by str.isspace() (and used by str.split()),
+# as inclusive ranges.
+_WHITESPACE_RANGES = [
+    (0x09, 0x0d), (0x1c, 0x20), (0x85, 0x85), (0xa0, 0xa0),
+    (0x1680, 0x1680), (0x2000, 0x200a), (0x2028, 0x2029),
+    (0x202f, 0x202f), (0x205f, 0x205f), (0x3000, 0x3000),
+]
+
+
+def _kind_for_maxchar(maxchar):
+    """
+    Return the canonical kind for a string whose largest code point
+    is *maxchar* (a Python int).
+    """
+    if maxchar < 256:
+        return 1
+    elif maxchar < 65536:
+        return 2
+    else:
+        return 4
+
+
+def _emit_kind_for_maxchar(builder, maxchar):
+    """
+    Same as _kind_for_maxchar(), for a LLVM int32 value.
+    """
+    def const(v):
+        return ir.Constant(_code_point, v)
+
+    return builder.select(
+        builder.icmp_unsigned('<', maxchar, const(256)), const(1),
+        builder.select(builder.icmp_unsigned('<', maxchar, const(65536)),
+                       const(2), const(4)))
+
+
+def _switch_kind(builder, kind, emit):
+    """
+    Emit *emit(width)* for each possible *kind* of a string, and
+    dispatch between them at runtime.
+    """
+    bb_end = builder.append_basic_block("unicode.kind.end")
+    switch = builder.switch(kind, bb_end)
+    for width in _KINDS:
+        bb = builder.append_basic_block("unicode.kind.%d" % width)
+        switch.add_case(ir.Constant(kind.type, width), bb)
+        with builder.goto_block(bb):
+            emit(width)
+            builder.branch(bb_end)
+    builder.position_at_end(bb_end)
+
+
+def _char_pointer(builder, data, width, idx):
+    ptr = builder.bitcast(data, ir.IntType(width * 8).as_pointer())
+    return builder.gep(ptr, [idx])
+
+
+def _get_code_point(builder, data, kind, idx):
+    """
+    Load the code point at *idx* of the character *data* of the
+    given *kind*.
+    """
+    res = cgutils.alloca_once(builder, _code_point)
+
+    def emit(width):
+        cp = builder.load(_char_pointer(builder, data, width, idx))
+        if width < 4:
+            cp = builder.zext(cp, _code_point)
+        builder.store(cp, res)
+
+    _switch_kind(builder, kind, emit)
+    return builder.load(res)
+
+
+def _set_code_point(builder, data, kind, idx, cp):
+    """
+    Store the code point *cp* at *idx* of the character *data* of the
+    given *kind*.
+    """
+    def emit(width):
+        val = cp
+        if width < 4:
+            val = builder.trunc(cp, ir.IntType(width * 8))
+        builder.store(val, _char_pointer(builder, data, width, idx))
+
+    _switch_kind(builder, kind, emit)
+
+
+def _search(builder, start, stop, predicate):
+    """
+    Emit a loop over the indices in [start, stop), exiting at the first
+    index for which *predicate(index)* (which should emit a LLVM boolean)
+    is true.  The index found is returned, or -1.
+    """
+    intp_t = start.type
+    res = cgutils.alloca_once_value(builder, ir.Constant(intp_t, -1))
+    index = cgutils.alloca_once_value(builder, start)
+
+    bb_cond = builder.append_basic_block("unicode.search.cond")
+    bb_body = builder.append_basic_block("unicode.search.body")
+    bb_found = builder.append_basic_block("unicode.search.found")
+    bb_end = builder.append_basic_block("unicode.search.end")
+
+    builder.branch(bb_cond)
+    builder.position_at_end(bb_cond)
+    idx = builder.load(index)
+    builder.cbranch(builder.icmp_signed('<', idx, stop), bb_body, bb_end)
+
+    builder.position_at_end(bb_body)
+    found = predicate(idx)
+    builder.store(builder.add(idx, ir.Constant(intp_t, 1)), index)
+    builder.cbranch(found, bb_found, bb_cond)
+
+    builder.position_at_end(bb_found)
+    builder.store(idx, res)
+    builder.branch(bb_end)
+
+    builder.position_at_end(bb_end)
+    return builder.load(res)
+
+
+def _is_whitespace(builder, cp):
+    res = cgutils.false_bit
+    for lo, hi in _WHITESPACE_RANGES:
+        if lo == hi:
+            pred = builder.icmp_unsigned('==', cp, ir.Constant(cp.type, lo))
+        else:
+            # lo <= cp <= hi  <=>  (cp - lo) <= (hi - lo), unsigned
+            pred = builder.icmp_unsigned('<=',
+                                         builder.sub(cp, ir.Constant(cp.type, lo)),
+                                         ir.Constant(cp.type, hi - lo))
+        res = builder.or_(res, pred)
+    return res
+
+
+class UnicodeInstance(object):
+
+    def __init__(self, context, builder, value=None):
+        self._context = context
+        self._builder = builder
+        self._str = cgutils.create_struct_proxy(types.unicode_type)(
+            context, builder, value)
+
+    @property
+    def data(self):
+        return self._str.data
+
+    @data.setter
+    def data(self, value):
+        self._str.data = value
+
+    @property
+    def length(self):
+        return self._str.length
+
+    @length.setter
+    def length(self, value):
+        self._str.length = value
+
+    @property
+    def kind(self):
+        return self._str.kind
+
+    @kind.setter
+    def kind(self, value):
+        self._str.kind = value
+
+    @property
+    def hash(self):
+        return self._str.hash
+
+    @hash.setter
+    def hash(self, value):
+        self._str.hash = value
+
+    @property
+    def meminfo(self):
+        return self._str.meminfo
+
+    @meminfo.setter
+    def meminfo(self, value):
+        self._str.meminfo = value
+
+    @property
+    def parent(self):
+        return self._str.parent
+
+    @parent.setter
+    def parent(self, value):
+        self._str.parent = value
+
+    @property
+    def value(self):
+        return self._str._getvalue()
+
+    @property
+    def nbytes(self):
+        """
+        The size of the character data in bytes.
+        """
+        builder = self._builder
+        return builder.mul(self.length,
+                           builder.zext(self.kind, self.length.type))
+
+    def getitem(self, idx):
+        """
+        Return the code point at *idx*, as an int32.
+        """
+        return _get_code_point(self._builder, self.data, self.kind, idx)
+
+    def setitem(self, idx, cp):
+        """
+        Set the code point at *idx*.  This is only valid while building
+        a newly-allocated string.
+        """
+        _set_code_point(self._builder, self.data, self.kind, idx, cp)
+
+    def maxchar(self, start, stop, step):
+        """
+        Return the largest code point in the given slice of the string.
+        """
+        builder = self._builder
+        res = cgutils.alloca_once_value(builder, ir.Constant(_code_point, 0))
+        with cgutils.for_range_slice_generic(builder, start, stop,
+                                             step) as (pos_range, neg_range):
+            for rng in (pos_range, neg_range):
+                with rng as (idx, _):
+                    cp = self.getitem(idx)
+                    cur = builder.load(res)
+                    builder.store(builder.select(
+                        builder.icmp_unsigned('>', cp, cur), cp, cur), res)
+        return builder.load(res)
+
+    @classmethod
+    def allocate(cls, context, builder, kind, length):
+        """
+        Allocate a new string of the given *kind* (an int32) and *length*
+        (an intp).  The characters are left uninitialized.
+        """
+        self = cls(context, builder)
+        intp_t = length.type
+        kind_size = builder.zext(kind, intp_t)
+        # Always reserve room for a terminating NUL, as CPython does
+        size, ovf = cgutils.muladd_with_overflow(builder, length, kind_size,
+                                                 kind_size)
+        with builder.if_then(ovf, likely=False):
+            context.call_conv.return_user_exc(builder, MemoryError,
+                                              ("cannot allocate string",))
+        meminfo = context.nrt_meminfo_alloc(builder, size)
+        cgutils.guard_memory_error(context, builder, meminfo,
+                                   "cannot allocate string")
+        self.meminfo = meminfo
+        self.data = context.nrt_meminfo_data(builder, meminfo)
+        self.length = length
+        self.kind = kind
+        self.hash = ir.Constant(intp_t, -1)
+        self.parent = context.get_constant_null(types.pyobject)
+        self.setitem(length, ir.Constant(_code_point, 0))
+        return self
+
+
+def _encode(val, kind):
+    """
+    Return the character data of str *val* in the given *kind*.
+    """
+    encoding = {1: 'latin-1', 2: 'utf-16-le', 4: 'utf-32-le'}[kind]
+    if kind == 1:
+        return val.encode(encoding)
+    return val.encode(encoding, 'surrogatepass')
+
+
+def make_constant_string(context, builder, ty, val):
+    """
+    Return a LLVM constant for str *val*.  The characters are stored in
+    a global constant and the string has no meminfo.
+    """
+    kind = _kind_for_maxchar(max(map(ord, val)) if val else 0)
+    buf = _encode(val, kind) + b"\x00" * kind
+    # Name the global after the data, so that equal constants share it
+    name = ".unicode.const.%s" % (hashlib.sha256(buf).hexdigest(),)
+    gv = context.insert_unique_const(builder.module, name,
+                                     cgutils.make_bytearray(buf))
+    struct_type = context.get_value_type(ty)
+    intp_t = context.get_value_type(types.intp)
+    return ir.Constant(struct_type, [
+        gv.bitcast(context.get_value_type(types.voidptr)),
+        ir.Constant(intp_t, len(val)),
+        ir.Constant(_code_point, kind),
+        ir.Constant(intp_t, -1),
+        ir.Constant(struct_type.elements[4], None),
+        ir.Constant(struct_type.elements[5], None),
+        ])
+
+
+def make_char(context, builder, cp):
+    """
+    Return a new one-character string for the code point *cp*.  Latin-1
+    characters point to a shared global table and aren't allocated.
+    """
+    intp_t = context.get_value_type(types.intp)
+    struct_type = context.get_value_type(types.unicode_type)
+    res = cgutils.alloca_once(builder, struct_type)
+    is_latin1 = builder.icmp_unsigned('<', cp, ir.Constant(cp.type, 256))
+    with builder.if_else(is_latin1, likely=True) as (then, otherwise):
+        with then:
+            table = context.insert_unique_const(
+                builder.module, ".unicode.latin1",
+                cgutils.make_bytearray(bytes(bytearray(range(256)))))
+            s = UnicodeInstance(context, builder,
+                                context.get_constant_null(types.unicode_type))
+            s.data = builder.bitcast(
+                builder.gep(table, [ir.Constant(intp_t, 0),
+                                    builder.zext(cp, intp_t)]),
+                _char_ptr)
+            s.length = ir.Constant(intp_t, 1)
+            s.kind = ir.Constant(_code_point, 1)
+            s.hash = ir.Constant(intp_t, -1)
+            builder.store(s.value, res)
+        with otherwise:
+            kind = _emit_kind_for_maxchar(builder, cp)
+            s = UnicodeInstance.allocate(context, builder, kind,
+                                         ir.Constant(intp_t, 1))
+            s.setitem(ir.Constant(intp_t, 0), cp)
+            builder.store(s.value, res)
+    return builder.load(res)
+
+
+def _copy_chars(builder, dest, dest_start, src, src_start, count):
+    """
+    Copy *count* characters from string *src* to string *dest*, which
+    may be of different kinds.
+    """
+    same_kind = builder.icmp_signed('==', dest.kind, src.kind)
+    with builder.if_else(same_kind, likely=True) as (then, otherwise):
+        with then:
+            kind_size = builder.zext(src.kind, count.type)
+            dest_ptr = builder.gep(builder.bitcast(dest.data, _char_ptr),
+                                   [builder.mul(dest_start, kind_size)])
+            src_ptr = builder.gep(builder.bitcast(src.data, _char_ptr),
+                                  [builder.mul(src_start, kind_size)])
+            cgutils.memmove(builder, dest_ptr, src_ptr,
+                            builder.mul(count, kind_size), 1)
+        with otherwise:
+            with cgutils.for_range(builder, count) as loop:
+                cp = src.getitem(builder.add(src_start, loop.index))
+                dest.setitem(builder.add(dest_start, loop.index), cp)
+
+
+def _substring(context, builder, s, start, stop):
+    """
+    Return a new string made of the characters [start, stop) of *s*.
+    """
+    one = ir.Constant(start.type, 1)
+    length = builder.sub(stop, start)
+    kind = _emit_kind_for_maxchar(builder, s.maxchar(start, stop, one))
+    res = UnicodeInstance.allocate(context, builder, kind, length)
+    _copy_chars(builder, res, ir.Constant(start.type, 0), s, start, length)
+    return res
+
+
+def _match_at(builder, s, sub, pos):
+    """
+    Whether string *sub* occurs in string *s* at position *pos*
+    (which must leave enough room for *sub*).
+    """
+    def differs(idx):
+        return builder.icmp_unsigned('!=',
+                                     s.getitem(builder.add(pos, idx)),
+                                     sub.getitem(idx))
+
+    zero = ir.Constant(pos.type, 0)
+    mismatch = _search(builder, zero, sub.length, differs)
+    return builder.icmp_signed('<', mismatch, zero)
+
+
+def _find(builder, s, sub, start, stop):
+    """
+    Return the lowest index in [start, stop) where *sub* is found
+    in *s*, or -1.
+    """
+    # The last position where *sub* may start
+    last = builder.sub(stop, sub.length)
+    return _search(builder, start, builder.add(last, ir.Constant(last.type, 1)),
+                   lambda pos: _match_at(builder, s, sub, pos))
+
+
+def _compare(builder, a, b):
+    """
+    Compare strings *a* and *b* lexicographically by code points.
+    Return an intp being negative, zero or positive.
+    """
+    intp_t = a.length.type
+    alen = a.length
+    blen = b.length
+    minlen = builder.select(builder.icmp_signed('<', alen, blen), alen, blen)
+
+    def differs(idx):
+        return builder.icmp_unsigned('!=', a.getitem(idx), b.getitem(idx))
+
+    zero = ir.Constant(intp_t, 0)
+    res = cgutils.alloca_once_value(builder, builder.sub(alen, blen))
+    mismatch = _search(builder, zero, minlen, differs)
+    with builder.if_then(builder.icmp_signed('>=', mismatch, zero)):
+        ca = builder.zext(a.getitem(mismatch), intp_t)
+        cb = builder.zext(b.getitem(mismatch), intp_t)
+        builder.store(builder.sub(ca, cb), res)
+    return builder.load(res)
+
+
+def _equal(builder, a, b):
+    """
+    Whether strings *a* and *b* are equal.
+    """
+    res = cgutils.alloca_once_value(builder, cgutils.false_bit)
+    # Strings of different kinds can't be equal, since the kinds are
+    # canonical
+    same_shape = builder.and_(
+        builder.icmp_signed('==', a.length, b.length),
+        builder.icmp_signed('==', a.kind, b.kind))
+    with builder.if_then(same_shape):
+        zero = ir.Constant(a.length.type, 0)
+        builder.store(builder.icmp_signed('==', _compare(builder, a, b), zero),
+                      res)
+    return builder.load(res)
+
+
+def _get_hash(context, builder, s):
+    """
+    Return the hash value of string *s*, as computed by CPython.
+    """
+    res = cgutils.alloca_once_value(builder, s.hash)
+    minus_one = ir.Constant(s.hash.type, -1)
+    with builder.if_then(builder.icmp_signed('==', s.hash, minus_one)):
+        intp_t = context.get_value_type(types.intp)
+        fnty = ir.FunctionType(intp_t, [_char_ptr, intp_t, s.kind.type])
+        fn = builder.module.get_or_insert_function(fnty,
+                                                   name="numba_hash_unicode")
+        h = builder.call(fn, [builder.bitcast(s.data, _char_ptr), s.length,
+                              s.kind])
+        builder.store(_fix_minus_one(builder, h), res)
+    return builder.load(res)
+
+
+#-------------------------------------------------------------------------------
+# Various operations
+
+@builtin
+@implement(types.len_type, types.Kind(types.UnicodeType))
+def unicode_len(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    return impl_ret_untracked(context, builder, sig.return_type, s.length)
+
+
+@builtin
+@implement("is_true", types.Kind(types.UnicodeType))
+def unicode_bool(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    res = builder.icmp_signed('!=', s.length, ir.Constant(s.length.type, 0))
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement(types.hash_type, types.Kind(types.UnicodeType))
+def unicode_hash(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    res = _get_hash(context, builder, s)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement('getitem', types.Kind(types.UnicodeType), types.intp)
+def getitem_unicode(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    idx = slicing.fix_index(builder, args[1], s.length)
+    is_out_of_bounds = builder.or_(
+        builder.icmp_signed('<', idx, ir.Constant(idx.type, 0)),
+        builder.icmp_signed('>=', idx, s.length))
+    with builder.if_then(is_out_of_bounds, likely=False):
+        context.call_conv.return_user_exc(builder, IndexError,
+                                          ("string index out of range",))
+    res = make_char(context, builder, s.getitem(idx))
+    return impl_ret_new_ref(context, builder, sig.return_type, res)
+
+
+@builtin
+@implement('getitem', types.Kind(types.UnicodeType), types.slice3_type)
+def getslice_unicode(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    slice = slicing.Slice(context, builder, value=args[1])
+    cgutils.guard_invalid_slice(context, builder, slice)
+    slicing.fix_slice(builder, slice, s.length)
+    length = slicing.get_slice_length(builder, slice)
+
+    kind = _emit_kind_for_maxchar(
+        builder, s.maxchar(slice.start, slice.stop, slice.step))
+    res = UnicodeInstance.allocate(context, builder, kind, length)
+    is_contiguous = builder.icmp_signed('==', slice.step,
+                                        ir.Constant(slice.step.type, 1))
+    with builder.if_else(is_contiguous, likely=True) as (then, otherwise):
+        with then:
+            _copy_chars(builder, res, ir.Constant(length.type, 0),
+                        s, slice.start, length)
+        with otherwise:
+            with cgutils.for_range_slice_generic(
+                builder, slice.start, slice.stop,
+                slice.step) as (pos_range, neg_range):
+                for rng in (pos_range, neg_range):
+                    with rng as (idx, count):
+                        res.setitem(count, s.getitem(idx))
+    return impl_ret_new_ref(context, builder, sig.return_type, res.value)
+
+
+@builtin
+@implement('+', types.Kind(types.UnicodeType), types.Kind(types.UnicodeType))
+def unicode_concat(context, builder, sig, args):
+    a = UnicodeInstance(context, builder, args[0])
+    b = UnicodeInstance(context, builder, args[1])
+    kind = builder.select(builder.icmp_signed('>', a.kind, b.kind),
+                          a.kind, b.kind)
+    total = builder.sadd_with_overflow(a.length, b.length)
+    length = builder.extract_value(total, 0)
+    with builder.if_then(builder.extract_value(total, 1), likely=False):
+        context.call_conv.return_user_exc(builder, MemoryError,
+                                          ("cannot allocate string",))
+    res = UnicodeInstance.allocate(context, builder, kind, length)
+    zero = ir.Constant(length.type, 0)
+    _copy_chars(builder, res, zero, a, zero, a.length)
+    _copy_chars(builder, res, a.length, b, zero, b.length)
+    return impl_ret_new_ref(context, builder, sig.return_type, res.value)
+
+
+@builtin
+@implement('*', types.Kind(types.UnicodeType), types.intp)
+def unicode_repeat(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    zero = ir.Constant(args[1].type, 0)
+    count = builder.select(builder.icmp_signed('<', args[1], zero),
+                           zero, args[1])
+    length, ovf = cgutils.muladd_with_overflow(builder, s.length, count, zero)
+    with builder.if_then(ovf, likely=False):
+        context.call_conv.return_user_exc(builder, MemoryError,
+                                          ("cannot allocate string",))
+    res = UnicodeInstance.allocate(context, builder, s.kind, length)
+    with cgutils.for_range(builder, count) as loop:
+        _copy_chars(builder, res, builder.mul(loop.index, s.length),
+                    s, zero, s.length)
+    return impl_ret_new_ref(context, builder, sig.return_type, res.value)
+
+
+@builtin
+@implement('*', types.intp, types.Kind(types.UnicodeType))
+def unicode_repeat_reflected(context, builder, sig, args):
+    rsig = typing.signature(sig.return_type, sig.args[1], sig.args[0])
+    return unicode_repeat(context, builder, rsig, args[::-1])
+
+
+@builtin
+@implement("in", types.Kind(types.UnicodeType), types.Kind(types.UnicodeType))
+def in_unicode(context, builder, sig, args):
+    sub = UnicodeInstance(context, builder, args[0])
+    s = UnicodeInstance(context, builder, args[1])
+    zero = ir.Constant(s.length.type, 0)
+    pos = _find(builder, s, sub, zero, s.length)
+    res = builder.icmp_signed('>=', pos, zero)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+def _unicode_comparator(op):
+    def impl(context, builder, sig, args):
+        a = UnicodeInstance(context, builder, args[0])
+        b = UnicodeInstance(context, builder, args[1])
+        if op in ('==', '!='):
+            res = _equal(builder, a, b)
+            if op == '!=':
+                res = builder.not_(res)
+        else:
+            res = builder.icmp_signed(op, _compare(builder, a, b),
+                                      ir.Constant(a.length.type, 0))
+        return impl_ret_untracked(context, builder, sig.return_type, res)
+    return impl
+
+for _op in ('==', '!=', '<', '<=', '>', '>='):
+    builtin(implement(_op, types.Kind(types.UnicodeType),
+                      types.Kind(types.UnicodeType))(_unicode_comparator(_op)))
+
+
+@builtin
+@implement('getiter', types.Kind(types.UnicodeType))
+def getiter_unicode(context, builder, sig, args):
+    iterobj = cgutils.create_struct_proxy(sig.return_type)(context, builder)
+    index = context.get_constant(types.intp, 0)
+    iterobj.index = cgutils.alloca_once_value(builder, index)
+    iterobj.data = args[0]
+    return impl_ret_borrowed(context, builder, sig.return_type,
+                             iterobj._getvalue())
+
+
+@builtin
+@implement('iternext', types.Kind(types.UnicodeIteratorType))
+@iternext_impl
+def iternext_unicode(context, builder, sig, args, result):
+    iterobj = cgutils.create_struct_proxy(sig.args[0])(context, builder,
+                                                       value=args[0])
+    s = UnicodeInstance(context, builder, iterobj.data)
+    index = builder.load(iterobj.index)
+    is_valid = builder.icmp_signed('<', index, s.length)
+    result.set_valid(is_valid)
+
+    with builder.if_then(is_valid):
+        # The yielded value is a new reference
+        result.yield_(make_char(context, builder, s.getitem(index)))
+        builder.store(builder.add(index, ir.Constant(index.type, 1)),
+                      iterobj.index)
+
+
+#-------------------------------------------------------------------------------
+# Methods
+
+def _fix_bounds(builder, start, stop, length):
+    """
+    Fix the optional *start* and *stop* arguments of str.find() and
+    friends for a string of the given *length*, as CPython does
+    (note *start* may end up beyond *stop*).
+    """
+    zero = ir.Constant(length.type, 0)
+
+    def fix_negative(bound):
+        bound = slicing.fix_index(builder, bound, length)
+        return builder.select(builder.icmp_signed('<', bound, zero),
+                              zero, bound)
+
+    if start is None:
+        start = zero
+    else:
+        start = fix_negative(start)
+    if stop is None:
+        stop = length
+    else:
+        stop = fix_negative(stop)
+        stop = builder.select(builder.icmp_signed('>', stop, length),
+                              length, stop)
+    return start, stop
+
+
+def _unpack_bounds(builder, s, args):
+    start = args[2] if len(args) > 2 else None
+    stop = args[3] if len(args) > 3 else None
+    return _fix_bounds(builder, start, stop, s.length)
+
+
+@builtin
+@implement("unicode.find", types.Kind(types.UnicodeType),
+           types.Kind(types.UnicodeType))
+@implement("unicode.find", types.Kind(types.UnicodeType),
+           types.Kind(types.UnicodeType), types.intp)
+@implement("unicode.find", types.Kind(types.UnicodeType),
+           types.Kind(types.UnicodeType), types.intp, types.intp)
+def unicode_find(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    sub = UnicodeInstance(context, builder, args[1])
+    start, stop = _unpack_bounds(builder, s, args)
+    res = _find(builder, s, sub, start, stop)
+    return impl_ret_untracked(context, builder, sig.return_type, res)
+
+
+def _unicode_affix_match(is_prefix):
+    def impl(context, builder, sig, args):
+        s = UnicodeInstance(context, builder, args[0])
+        affix = UnicodeInstance(context, builder, args[1])
+        start, stop = _unpack_bounds(builder, s, args)
+        res = cgutils.alloca_once_value(builder, cgutils.false_bit)
+        room = builder.sub(stop, start)
+        with builder.if_then(builder.icmp_signed('<=', affix.length, room)):
+            if is_prefix:
+                pos = start
+            else:
+                pos = builder.sub(stop, affix.length)
+            builder.store(_match_at(builder, s, affix, pos), res)
+        return impl_ret_untracked(context, builder, sig.return_type,
+                                  builder.load(res))
+    return impl
+
+for _name, _is_prefix in (("unicode.startswith", True),
+                          ("unicode.endswith", False)):
+    _impl = _unicode_affix_match(_is_prefix)
+    for _extra in ((), (types.intp,), (types.intp, types.intp)):
+        implement(_name, types.Kind(types.UnicodeType),
+                  types.Kind(types.UnicodeType), *_extra)(_impl)
+    builtin(_impl)
+
+
+def _list_append(builder, lst, item):
+    """
+    Append the new reference *item* to the native list *lst*.
+    """
+    size = lst.size
+    lst.resize(builder.add(size, ir.Constant(size.type, 1)))
+    lst.inititem(size, item, incref=False)
+
+
+@builtin
+@implement("unicode.split", types.Kind(types.UnicodeType),
+           types.Kind(types.UnicodeType))
+def unicode_split(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    sep = UnicodeInstance(context, builder, args[1])
+    zero = ir.Constant(s.length.type, 0)
+    with builder.if_then(builder.icmp_signed('==', sep.length, zero),
+                         likely=False):
+        context.call_conv.return_user_exc(builder, ValueError,
+                                          ("empty separator",))
+
+    lst = ListInstance.allocate(context, builder, sig.return_type, 0)
+    start = cgutils.alloca_once_value(builder, zero)
+
+    bb_loop = builder.append_basic_block("unicode.split.loop")
+    bb_found = builder.append_basic_block("unicode.split.found")
+    bb_end = builder.append_basic_block("unicode.split.end")
+    builder.branch(bb_loop)
+
+    builder.position_at_end(bb_loop)
+    cur = builder.load(start)
+    pos = _find(builder, s, sep, cur, s.length)
+    builder.cbranch(builder.icmp_signed('<', pos, zero), bb_end, bb_found)
+
+    builder.position_at_end(bb_found)
+    _list_append(builder, lst, _substring(context, builder, s, cur, pos).value)
+    builder.store(builder.add(pos, sep.length), start)
+    builder.branch(bb_loop)
+
+    builder.position_at_end(bb_end)
+    _list_append(builder, lst,
+                 _substring(context, builder, s, builder.load(start),
+                            s.length).value)
+    return impl_ret_new_ref(context, builder, sig.return_type, lst.value)
+
+
+@builtin
+@implement("unicode.split", types.Kind(types.UnicodeType))
+def unicode_split_whitespace(context, builder, sig, args):
+    s = UnicodeInstance(context, builder, args[0])
+    zero = ir.Constant(s.length.type, 0)
+    lst = ListInstance.allocate(context, builder, sig.return_type, 0)
+    start = cgutils.alloca_once_value(builder, zero)
+
+    def is_space(idx):
+        return _is_whitespace(builder, s.getitem(idx))
+
+    def is_not_space(idx):
+        return builder.not_(is_space(idx))
+
+    bb_loop = builder.append_basic_block("unicode.split.loop")
+    bb_word = builder.append_basic_block("unicode.split.word")
+    bb_end = builder.append_basic_block("unicode.split.end")
+    builder.branch(bb_loop)
+
+    builder.position_at_end(bb_loop)
+    # Skip leading whitespace
+    word_start = _search(builder, builder.load(start), s.length, is_not_space)
+    builder.cbranch(builder.icmp_signed('<', word_start, zero),
+                    bb_end, bb_word)
+
+    builder.position_at_end(bb_word)
+    word_end = _search(builder, word_start, s.length, is_space)
+    word_end = builder.select(builder.icmp_signed('<', word_end, zero),
+                              s.length, word_end)
+    _list_append(builder, lst,
+                 _substring(context, builder, s, word_start, word_end).value)
+    builder.store(word_end, start)
+    builder.branch(bb_loop)
+
+    builder.position_at_end(bb_end)
+    return impl_ret_new_ref(context, builder, sig.return_type, lst.value)
@@ -8,7 +8,7 @@ See test_dispatcher.py.
 
 import numpy as np
 
-from numba import jit
+from numba import jit, prange
 
 from numba.tests.ctypes_usecases import c_sin
 
@@ -94,3 +94,11 @@ aligned_arr = np.array(packed_arr, dtype=aligned_record_type)
 @jit(cache=True, nopython=True)
 def record_return(ary, i):
     return ary[i]
+
+
+@jit(cache=True, nopython=True, parallel=True)
+def parallel_usecase(a):
+    res = 0.0
+    for i in prange(a.shape[0]):
+        res += a[i] * 2.0
+    return res
@@ -19,6 +19,23 @@ _two = 2
 def square(u):
     return u ** _two
 
+# Exported functions can be compiled for several ISA levels
+# (see TestCC.test_compile_isa_levels)
+
+cc_multiversion = CC('pycc_test_multiversion')
+
+@cc_multiversion.export('multf', 'f4(f4, f4)')
+@cc_multiversion.export('multi', 'i4(i4, i4)')
+def mult_multiversion(a, b):
+    return a * b
+
+@cc_multiversion.export('sum_squares', 'f8(i8)')
+def sum_squares(n):
+    s = 0.0
+    for i in range(n):
+        s += i * i
+    return s
+
 # Fails because it needs _helperlib
 #@cc.export('power', 'i8(i8, i8)')
 def power(u, v):
@@ -61,6 +61,13 @@ if is_windows:
         c_sleep(x)
 
 
+# A libc function returning a typed pointer
+
+c_memcpy = libc.memcpy
+c_memcpy.argtypes = [c_void_p, c_void_p, c_size_t]
+c_memcpy.restype = POINTER(c_double)
+
+
 def use_c_pointer(x):
     """
     Running in Python will cause a segfault.
@@ -46,6 +46,70 @@ class TestGUFunc(unittest.TestCase):
         self.assertTrue(np.allclose(C, Gold))
 
 
+class TestParallelGUFunc(unittest.TestCase):
+    target = 'parallel'
+
+    def test_gufunc(self):
+        gufunc = GUVectorize(matmulcore, '(m,n),(n,p)->(m,p)',
+                             target=self.target)
+        gufunc.add(argtypes=[float32[:, :], float32[:, :], float32[:, :]])
+        gufunc = gufunc.build_ufunc()
+
+        # Odd numbers of matrices, also fewer than threads
+        for matrix_ct in (1001, 3, 1, 0):
+            A = np.arange(matrix_ct * 2 * 4, dtype=np.float32).reshape(
+                matrix_ct, 2, 4)
+            B = np.arange(matrix_ct * 4 * 5, dtype=np.float32).reshape(
+                matrix_ct, 4, 5)
+
+            C = gufunc(A, B)
+            Gold = ut.matrix_multiply(A, B)
+
+            self.assertEqual(C.shape, Gold.shape)
+            self.assertTrue(np.allclose(C, Gold))
+
+    def test_scalar_output(self):
+        @guvectorize(['void(int32[:], int32[:])'], '(n)->()',
+                     target=self.target)
+        def sum_row(inp, out):
+            tmp = 0.
+            for i in range(inp.shape[0]):
+                tmp += inp[i]
+            out[()] = tmp
+
+        inp = np.arange(30000, dtype=np.int32).reshape(10000, 3)
+        out = sum_row(inp)
+        np.testing.assert_equal(out, inp.sum(axis=1))
+
+    def test_scalar_input(self):
+        @guvectorize(['int32[:], int32[:], int32[:]'], '(n),()->(n)',
+                     target=self.target)
+        def foo(inp, n, out):
+            for i in range(inp.shape[0]):
+                out[i] = inp[i] * n[()]
+
+        inp = np.arange(3 * 1001, dtype=np.int32).reshape(1001, 3)
+        np.testing.assert_equal(foo(inp, 2), inp * 2)
+        # Broadcast scalar argument
+        n = np.arange(1001, dtype=np.int32)
+        np.testing.assert_equal(foo(inp, n), inp * n[:, None])
+
+    def test_multidimensional_outer_loop(self):
+        @guvectorize(['void(float64[:], float64[:])'], '(n)->(n)',
+                     target=self.target)
+        def cumsum(inp, out):
+            acc = 0.
+            for i in range(inp.shape[0]):
+                acc += inp[i]
+                out[i] = acc
+
+        inp = np.random.random((7, 11, 5))
+        np.testing.assert_allclose(cumsum(inp), np.cumsum(inp, axis=-1))
+        # Non-contiguous outer dimension
+        np.testing.assert_allclose(cumsum(inp[::2]),
+                                   np.cumsum(inp[::2], axis=-1))
+
+
 class TestGUVectorizeScalar(unittest.TestCase):
     """
     Nothing keeps user from out-of-bound memory access
@@ -0,0 +1,112 @@
+"""
+Tests for calls of the parallel targets from several Python threads at once.
+"""
+from __future__ import print_function, absolute_import, division
+
+import threading
+
+import numpy as np
+
+from numba import unittest_support as unittest
+from numba import guvectorize, njit, prange, vectorize
+
+
+def vector_add(a, b):
+    return a + b
+
+def gufunc_scale(a, b, out):
+    for i in range(a.shape[0]):
+        out[i] = a[i] * b
+
+def prange_sum(a):
+    s = 0
+    for i in prange(a.shape[0]):
+        s += a[i]
+    return s
+
+parallel_sum = njit(parallel=True)(prange_sum)
+
+def gufunc_parallel_sum(a, out):
+    out[0] = parallel_sum(a)
+
+
+class TestConcurrentSubmission(unittest.TestCase):
+
+    nthreads = 8
+    niters = 200
+
+    def run_threads(self, check):
+        errors = []
+
+        def run(seed):
+            try:
+                for i in range(self.niters):
+                    check(seed, i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(seed,))
+                   for seed in range(self.nthreads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+    def test_ufunc(self):
+        for schedule in ('static', 'dynamic'):
+            ufunc = vectorize(['float64(float64, float64)'],
+                              target='parallel',
+                              schedule=schedule)(vector_add)
+
+            def check(seed, i):
+                # Sizes vary so that the tasks of the calls differ
+                n = 1 + (seed * 997 + i * 31) % 5000
+                a = np.arange(n, dtype=np.float64) + seed
+                b = np.full(n, float(i))
+                np.testing.assert_equal(ufunc(a, b), a + b)
+
+            self.run_threads(check)
+
+    def test_gufunc(self):
+        gufunc = guvectorize(['void(float64[:], float64, float64[:])'],
+                             '(n),()->(n)', target='parallel')(gufunc_scale)
+
+        def check(seed, i):
+            a = np.arange(3 * (seed + 1) * 10.0).reshape((3 * (seed + 1), 10))
+            np.testing.assert_equal(gufunc(a, float(i)), a * i)
+
+        self.run_threads(check)
+
+    def test_mixed(self):
+        # Parallel ufuncs and prange loops releasing the GIL
+        ufunc = vectorize(['int64(int64, int64)'],
+                          target='parallel')(vector_add)
+        cfunc = njit(parallel=True, nogil=True)(prange_sum)
+
+        def check(seed, i):
+            a = np.arange(1000 + seed * 100 + i, dtype=np.int64)
+            if (seed + i) % 2:
+                np.testing.assert_equal(ufunc(a, a), a + a)
+            else:
+                self.assertEqual(cfunc(a), a.sum())
+
+        self.run_threads(check)
+
+    def test_nested(self):
+        # Parallel code called from the worker threads runs serially on
+        # each of them
+        gufunc = guvectorize(['void(int64[:], int64[:])'], '(n)->()',
+                             target='parallel')(gufunc_parallel_sum)
+        a = np.arange(200 * 1000, dtype=np.int64).reshape((200, 1000))
+        np.testing.assert_equal(gufunc(a), a.sum(axis=1))
+
+        def check(seed, i):
+            b = a[seed:seed + i % 50 + 1]
+            np.testing.assert_equal(gufunc(b), b.sum(axis=1))
+
+        self.run_threads(check)
+
+
+if __name__ == '__main__':
+    unittest.main()
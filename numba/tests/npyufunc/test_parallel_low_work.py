@@ -1,10 +1,11 @@
 """
 There was a deadlock problem when work count is smaller than number of threads.
+Small work counts may also be run serially, below the *threshold* option.
 """
 from __future__ import absolute_import, print_function, division
 from numba import unittest_support as unittest
 import numpy as np
-from numba import float32, float64, int32, uint32
+from numba import float32, float64, int32, uint32, guvectorize, vectorize
 from numba.npyufunc import Vectorize
 from timeit import default_timer as time
 
@@ -16,7 +17,7 @@ def vector_add(a, b):
 class TestParallelLowWorkCount(unittest.TestCase):
     def test_low_workcount(self):
         # build parallel native code ufunc
-        pv = Vectorize(vector_add, target='parallel')
+        pv = Vectorize(vector_add, target='parallel', threshold=0)
         pv.add(restype=int32, argtypes=[int32, int32])
         pv.add(restype=uint32, argtypes=[uint32, uint32])
         pv.add(restype=float32, argtypes=[float32, float32])
@@ -39,5 +40,41 @@ class TestParallelLowWorkCount(unittest.TestCase):
         test(np.uint32)
 
 
+class TestParallelThreshold(unittest.TestCase):
+
+    def test_vectorize(self):
+        for threshold in (0, 1, 100, 10 ** 6):
+            ufunc = vectorize(['float64(float64, float64)'],
+                              target='parallel',
+                              threshold=threshold)(vector_add)
+            for n in (0, 1, 99, 100, 101, 5000):
+                a = np.arange(n, dtype=np.float64)
+                b = a[::-1].copy()
+                np.testing.assert_equal(ufunc(a, b), a + b)
+                # Non-contiguous input
+                np.testing.assert_equal(ufunc(a[::2], b[::2]),
+                                        a[::2] + b[::2])
+
+    def test_guvectorize(self):
+        for threshold in (0, 10):
+            @guvectorize(['void(float64[:], float64[:])'], '(n)->()',
+                         target='parallel', threshold=threshold)
+            def row_sum(inp, out):
+                acc = 0.
+                for i in range(inp.shape[0]):
+                    acc += inp[i]
+                out[()] = acc
+
+            for n in (0, 1, 9, 10, 11, 1001):
+                data = np.arange(n * 5, dtype=np.float64).reshape((n, 5))
+                np.testing.assert_equal(row_sum(data), data.sum(axis=1))
+
+    def test_invalid_threshold(self):
+        for threshold in (-1, 1.5):
+            with self.assertRaises(ValueError) as raises:
+                Vectorize(vector_add, target='parallel', threshold=threshold)
+            self.assertIn("threshold", str(raises.exception))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for the scheduling policies of the parallel ufunc target.
+"""
+from __future__ import print_function, absolute_import, division
+
+import numpy as np
+
+from numba import unittest_support as unittest
+from numba import vectorize, guvectorize
+from numba.npyufunc import Vectorize
+
+
+def skewed(x):
+    # The cost of each element is proportional to its value
+    acc = 0
+    for i in range(x):
+        acc += i
+    return acc
+
+
+class TestParallelSchedule(unittest.TestCase):
+
+    options = [('static', 0), ('dynamic', 0), ('dynamic', 1),
+               ('dynamic', 7), ('dynamic', 100000), ('guided', 0),
+               ('guided', 13)]
+
+    def test_vectorize(self):
+        for schedule, chunksize in self.options:
+            ufunc = vectorize(['int64(int64)'], target='parallel',
+                              schedule=schedule, chunksize=chunksize,
+                              threshold=0)(skewed)
+            for n in (0, 1, 3, 1001, 20000):
+                data = np.arange(n, dtype=np.int64) % 300
+                np.testing.assert_equal(ufunc(data), data * (data - 1) // 2)
+            # Non-contiguous input
+            data = np.arange(3001, dtype=np.int64)[::3]
+            np.testing.assert_equal(ufunc(data), data * (data - 1) // 2)
+
+    def test_guvectorize(self):
+        for schedule, chunksize in self.options:
+            @guvectorize(['void(float64[:], float64[:])'], '(n)->()',
+                         target='parallel', schedule=schedule,
+                         chunksize=chunksize)
+            def row_sum(inp, out):
+                acc = 0.
+                for i in range(inp.shape[0]):
+                    acc += inp[i]
+                out[()] = acc
+
+            for n in (0, 1, 1001):
+                data = np.arange(n * 5, dtype=np.float64).reshape((n, 5))
+                np.testing.assert_equal(row_sum(data), data.sum(axis=1))
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError) as raises:
+            Vectorize(skewed, target='parallel', schedule='random')
+        self.assertIn("Unsupported schedule", str(raises.exception))
+        with self.assertRaises(ValueError) as raises:
+            Vectorize(skewed, target='parallel', chunksize=-1)
+        self.assertIn("chunksize", str(raises.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
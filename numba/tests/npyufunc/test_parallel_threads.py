@@ -0,0 +1,123 @@
+"""
+Tests for the number and placement of the worker threads of the parallel
+targets.
+"""
+from __future__ import print_function, absolute_import, division
+
+import sys
+
+import numpy as np
+
+from numba import unittest_support as unittest
+from numba import (get_num_threads, set_num_threads, get_thread_affinity,
+                   set_thread_affinity, njit, prange, vectorize)
+from numba.npyufunc import parallel
+
+
+def vector_add(a, b):
+    return a + b
+
+def array_sum(a):
+    return (a * 2).sum()
+
+def prange_sum(a):
+    s = 0
+    for i in prange(a.shape[0]):
+        s += a[i]
+    return s
+
+
+class TestNumThreads(unittest.TestCase):
+
+    def setUp(self):
+        self.orig_num_threads = get_num_threads()
+
+    def tearDown(self):
+        set_num_threads(self.orig_num_threads)
+
+    def thread_counts(self):
+        return sorted(set([1, 2, parallel.NUM_THREADS]) &
+                      set(range(1, parallel.NUM_THREADS + 1)))
+
+    def test_default(self):
+        self.assertEqual(get_num_threads(), parallel.NUM_THREADS)
+
+    def test_set_num_threads(self):
+        # Functions compiled once run with any number of active threads
+        ufunc = vectorize(['int64(int64, int64)'],
+                          target='parallel')(vector_add)
+        cfunc = njit(parallel=True)(array_sum)
+        cprange = njit(parallel=True)(prange_sum)
+        a = np.arange(1001, dtype=np.int64)
+        for n in self.thread_counts():
+            set_num_threads(n)
+            self.assertEqual(get_num_threads(), n)
+            np.testing.assert_equal(ufunc(a, a), a + a)
+            self.assertEqual(cfunc(a), array_sum(a))
+            self.assertEqual(cprange(a), prange_sum(a))
+            self.assertEqual(cprange(a[:1]), prange_sum(a[:1]))
+
+    def test_invalid(self):
+        for n in (0, -1, parallel.NUM_THREADS + 1, 1.5):
+            with self.assertRaises(ValueError):
+                set_num_threads(n)
+        self.assertEqual(get_num_threads(), self.orig_num_threads)
+
+
+pinning_supported = (sys.platform.startswith('linux') or
+                     sys.platform.startswith('win32'))
+
+
+class TestThreadAffinity(unittest.TestCase):
+
+    def setUp(self):
+        self.orig_affinity = get_thread_affinity()
+
+    def tearDown(self):
+        if pinning_supported:
+            set_thread_affinity(self.orig_affinity)
+
+    def test_parse_cpu_list(self):
+        self.assertEqual(parallel._parse_cpu_list("0-3,8,10-11\n"),
+                         [0, 1, 2, 3, 8, 10, 11])
+        self.assertEqual(parallel._parse_cpu_list("5"), [5])
+        self.assertEqual(parallel._parse_cpu_list(""), [])
+
+    def test_affinity_cpus(self):
+        nodes = [[0, 1, 2, 3], [4, 5, 6, 7]]
+        get_cpus = parallel._get_affinity_cpus
+        self.assertEqual(get_cpus('compact', nodes, 6), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(get_cpus('scatter', nodes, 6), [0, 4, 1, 5, 2, 6])
+        # More threads than CPUs
+        self.assertEqual(get_cpus('compact', [[0, 1]], 3), [0, 1, 0])
+        # Uneven nodes
+        self.assertEqual(get_cpus('scatter', [[0], [1, 2]], 3), [0, 1, 2])
+
+    def test_numa_nodes(self):
+        nodes = parallel._get_numa_nodes()
+        self.assertGreaterEqual(len(nodes), 1)
+        cpus = [cpu for node in nodes for cpu in node]
+        self.assertTrue(cpus)
+        self.assertEqual(len(cpus), len(set(cpus)))
+
+    @unittest.skipUnless(pinning_supported, "thread pinning not supported")
+    def test_set_thread_affinity(self):
+        ufunc = vectorize(['int64(int64, int64)'],
+                          target='parallel')(vector_add)
+        cprange = njit(parallel=True)(prange_sum)
+        a = np.arange(10001, dtype=np.int64)
+        for policy in parallel.AFFINITIES:
+            set_thread_affinity(policy)
+            self.assertEqual(get_thread_affinity(), policy)
+            np.testing.assert_equal(ufunc(a, a), a + a)
+            self.assertEqual(cprange(a), prange_sum(a))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError) as raises:
+            set_thread_affinity('spread')
+        self.assertIn("Unsupported thread affinity", str(raises.exception))
+        self.assertEqual(get_thread_affinity(), self.orig_affinity)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,33 @@ def call_stuff(a0, a1):
 def are_roots_imaginary(As, Bs, Cs):
     return (Bs ** 2 - 4 * As * Cs) < 0
 
+def chained_exprs(As, Bs, Cs):
+    t = As * Bs
+    u = t + Cs
+    return np.sqrt(u)
+
+def chained_with_side_effect(As, Bs, Cs):
+    t = As * Bs
+    As[0] = 42.
+    u = t + Cs
+    return np.sqrt(u)
+
+def sum_of_expr(As, Bs, Cs):
+    return np.sum(As * Bs + Cs)
+
+def prod_of_expr(As, Bs, Cs):
+    return np.prod(As * Bs + Cs)
+
+def min_of_expr(As, Bs, Cs):
+    return np.min(As * Bs - Cs)
+
+def max_of_expr(As, Bs, Cs):
+    t = np.sqrt(As + Bs)
+    return (t * Cs).max()
+
+def mean_of_expr(As, Bs, Cs):
+    return (As - Bs * Cs).mean()
+
 # From issue #1264
 def distance_matrix(vectors):
     n_vectors = vectors.shape[0]
@@ -200,12 +227,13 @@ class TestArrayExpressions(MemoryLeakMixin, unittest.TestCase):
         self.assertEqual(len(ir0), len(ir1))
         self.assertGreater(len(ir0[0].body), len(ir1[0].body))
         self.assertEqual(len(list(self._get_array_exprs(ir0[0].body))), 0)
-        # Verify that we didn't rewrite everything into a monolithic
-        # array expression since we stored temporary values in
-        # variables that might be used later (from the optimization's
-        # point of view).
+        # Verify that the variables used only once were fused into a
+        # single array expression, while _2As, which is used twice, is
+        # computed once and read by the array expression.
         array_expr_instrs = list(self._get_array_exprs(ir1[0].body))
-        self.assertGreater(len(array_expr_instrs), 1)
+        self.assertEqual(len(array_expr_instrs), 1)
+        self.assertIn('_2As', [var.name for var in
+                               array_expr_instrs[0].value.list_vars()])
         # Now check that we haven't duplicated any subexpressions in
         # the rewritten code.
         array_sets = list(self._array_expr_to_set(instr.value.expr)[1]
@@ -219,6 +247,90 @@ class TestArrayExpressions(MemoryLeakMixin, unittest.TestCase):
     def test_complex_subexpression(self):
         return self.test_common_subexpressions(neg_root_complex_subexpr)
 
+    def test_chained_statements(self):
+        '''
+        Verify that array operations stored in variables used only once
+        are fused across statements.
+        '''
+        ns = self._test_root_function(chained_exprs)
+        self._assert_total_rewrite(ns.control_pipeline.interp.blocks,
+                                   ns.test_pipeline.interp.blocks)
+
+    def test_chained_statements_side_effect(self):
+        '''
+        Verify that array operations are not fused across a statement
+        which may change their operands.
+        '''
+        A = np.random.random(10)
+        B = np.random.random(10)
+        C = np.random.random(10)
+        arg_tys = [typeof(arg) for arg in (A, B, C)]
+
+        test_pipeline = RewritesTester.mk_pipeline(arg_tys)
+        test_cres = test_pipeline.compile_extra(chained_with_side_effect)
+
+        expected = chained_with_side_effect(A.copy(), B, C)
+        actual = test_cres.entry_point(A.copy(), B, C)
+        np.testing.assert_array_almost_equal(expected, actual)
+
+        # `t` is still computed before the store, but `u` is fused
+        # into the square root.
+        array_expr_instrs = list(
+            self._get_array_exprs(test_pipeline.interp.blocks[0].body))
+        self.assertEqual(len(array_expr_instrs), 1)
+        self.assertIn('t', [var.name for var in
+                            array_expr_instrs[0].value.list_vars()])
+
+    def _get_array_reduces(self, block):
+        for instr in block:
+            if isinstance(instr, ir.Assign):
+                if isinstance(instr.value, ir.Expr):
+                    if instr.value.op == 'arrayreduce':
+                        yield instr
+
+    def _check_reduction(self, fn, args):
+        arg_tys = [typeof(arg) for arg in args]
+        test_pipeline = RewritesTester.mk_pipeline(arg_tys)
+        test_cres = test_pipeline.compile_extra(fn)
+
+        expected = fn(*args)
+        actual = test_cres.entry_point(*args)
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+        # The whole expression and its reduction were fused together
+        block = test_pipeline.interp.blocks[0].body
+        self.assertEqual(len(list(self._get_array_exprs(block))), 0)
+        self.assertEqual(len(list(self._get_array_reduces(block))), 1)
+        return test_cres.entry_point
+
+    def test_reductions(self):
+        '''
+        Verify that reductions of array expressions are computed without
+        materializing the array expression.
+        '''
+        A = np.random.random(10)
+        B = np.random.random(10)
+        C = np.random.random(10)
+        for fn in (sum_of_expr, prod_of_expr, min_of_expr, max_of_expr,
+                   mean_of_expr):
+            self._check_reduction(fn, (A, B, C))
+
+    def test_reductions_int(self):
+        A = np.arange(12, dtype=np.int32).reshape((3, 4))
+        B = np.arange(4, dtype=np.int16)
+        C = np.int32(3)
+        for fn in (sum_of_expr, min_of_expr, mean_of_expr):
+            self._check_reduction(fn, (A, B, C))
+
+    def test_reductions_empty(self):
+        A = np.random.random(10)
+        cfunc = self._check_reduction(sum_of_expr, (A, A, A))
+        self.assertEqual(cfunc(A[:0], A[:0], A[:0]), 0.0)
+        cfunc = self._check_reduction(min_of_expr, (A, A, A))
+        with self.assertRaises(ValueError) as raises:
+            cfunc(A[:0], A[:0], A[:0])
+        self.assertIn("zero-size array", str(raises.exception))
+
     def test_ufunc_and_dufunc_calls(self):
         '''
         Verify that ufunc and DUFunc calls are being properly included in
@@ -261,6 +373,87 @@ class TestArrayExpressions(MemoryLeakMixin, unittest.TestCase):
                                    ns.test_pipeline.interp.blocks)
 
 
+class TestParallelArrayExprs(MemoryLeakMixin, unittest.TestCase):
+    """
+    Tests for array expressions running on the worker threads
+    (the *parallel* jit option).
+    """
+
+    def _check_rewrite(self, fn, args, op='arrayexpr'):
+        flags = Flags()
+        flags.set('auto_parallel')
+        arg_tys = [typeof(arg) for arg in args]
+        test_pipeline = RewritesTester.mk_pipeline(arg_tys, flags=flags)
+        test_pipeline.compile_extra(fn)
+        exprs = [instr.value for instr in test_pipeline.interp.blocks[0].body
+                 if isinstance(instr, ir.Assign)
+                 and isinstance(instr.value, ir.Expr)
+                 and instr.value.op == op]
+        self.assertEqual(len(exprs), 1)
+        self.assertTrue(exprs[0].parallel)
+
+    def check(self, pyfunc, *args):
+        cfunc = njit(parallel=True)(pyfunc)
+        expected = pyfunc(*args)
+        got = cfunc(*args)
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+        return cfunc
+
+    def test_array_exprs(self):
+        A = np.random.random(1001)
+        B = np.random.random(1001)
+        C = np.random.random(1001)
+        self.check(axy, A, B, C)
+        self.check(neg_root_common_subexpr, A, B, C)
+        self.check(chained_exprs, A, B, C)
+        self._check_rewrite(axy, (A, B, C))
+
+    def test_single_operation(self):
+        # Single array operations are turned into array expressions too
+        def add(a, b):
+            return a + b
+
+        A = np.arange(1001.0)
+        B = np.arange(1001.0)
+        self.check(add, A, B)
+        self._check_rewrite(add, (A, B))
+
+    def test_broadcast(self):
+        A = np.random.random((37, 5))
+        B = np.random.random(5)
+        C = np.float64(2.5)
+        self.check(axy, A, B, C)
+        # Fewer rows than threads
+        self.check(axy, A[:1], B, C)
+        self.check(axy, A[:0], B, C)
+
+    def test_reductions(self):
+        A = np.random.random(1001)
+        B = np.random.random(1001)
+        C = np.random.random(1001)
+        for fn in (sum_of_expr, prod_of_expr, min_of_expr, max_of_expr,
+                   mean_of_expr):
+            self.check(fn, A, B, C)
+        self._check_rewrite(sum_of_expr, (A, B, C), op='arrayreduce')
+
+        A = np.arange(3003, dtype=np.int32).reshape((3, 1001))
+        B = np.arange(1001, dtype=np.int16)
+        C = np.int32(3)
+        for fn in (sum_of_expr, min_of_expr, mean_of_expr):
+            self.check(fn, A, B, C)
+
+    def test_reductions_empty(self):
+        A = np.random.random(10)
+        cfunc = self.check(sum_of_expr, A, A, A)
+        self.assertEqual(cfunc(A[:0], A[:0], A[:0]), 0.0)
+        # Some chunks are empty
+        self.check(min_of_expr, A[:1], A[:1], A[:1])
+        with self.assertRaises(ValueError) as raises:
+            cfunc = njit(parallel=True)(min_of_expr)
+            cfunc(A[:0], A[:0], A[:0])
+        self.assertIn("zero-size array", str(raises.exception))
+
+
 class TestRewriteIssues(MemoryLeakMixin, unittest.TestCase):
     def test_issue_1184(self):
         from numba import jit
@@ -7,8 +7,8 @@ import numpy
 
 from numba import unittest_support as unittest
 from numba.compiler import compile_isolated
-from numba import jit, types
-from .support import MemoryLeakMixin
+from numba import jit, types, carray, farray
+from .support import MemoryLeakMixin, TestCase
 from .ctypes_usecases import *
 
 
@@ -141,6 +141,94 @@ class TestCTypes(MemoryLeakMixin, unittest.TestCase):
         self.assertEqual(expected, got)
 
 
+def carray_voidptr_usecase(arr):
+    ptr = c_take_array_ptr(arr.ctypes.data)
+    return carray(ptr, (2, 3), numpy.float64, arr)
+
+def farray_voidptr_usecase(arr):
+    ptr = c_take_array_ptr(arr.ctypes.data)
+    return farray(ptr, (2, 3), numpy.float64, arr)
+
+def carray_typed_ptr_usecase(src, dest):
+    ptr = c_memcpy(dest.ctypes.data, src.ctypes.data, src.size * 8)
+    return carray(ptr, src.size, owner=dest)
+
+def carray_address_usecase(arr, n):
+    return carray(arr.ctypes.data, n, numpy.float64)
+
+
+class TestCArray(MemoryLeakMixin, TestCase):
+    """
+    Tests for numba.carray() and numba.farray().
+    """
+
+    def test_python_ctypes_pointer(self):
+        arr = numpy.arange(6, dtype=numpy.float64)
+        ptr = arr.ctypes.data_as(POINTER(c_double))
+        got = carray(ptr, (2, 3))
+        self.assertPreciseEqual(got, arr.reshape((2, 3)))
+        self.assertTrue(got.flags.c_contiguous)
+        got = farray(ptr, (2, 3))
+        self.assertPreciseEqual(got, arr.reshape((2, 3), order='F'))
+        self.assertTrue(got.flags.f_contiguous)
+        # No copy was made
+        got[0, 0] = 42.0
+        self.assertEqual(arr[0], 42.0)
+        with self.assertRaises(TypeError) as raises:
+            carray(ptr, 6, numpy.int64)
+        self.assertIn("mismatching dtype", str(raises.exception))
+
+    def test_python_untyped_pointer(self):
+        arr = numpy.arange(6, dtype=numpy.int32)
+        for ptr in (arr.ctypes.data, arr.ctypes.data_as(c_void_p)):
+            got = carray(ptr, 6, numpy.int32)
+            self.assertPreciseEqual(got, arr)
+            with self.assertRaises(TypeError) as raises:
+                carray(ptr, 6)
+            self.assertIn("explicit dtype required", str(raises.exception))
+        with self.assertRaises(ValueError):
+            carray(arr.ctypes.data, -1, numpy.int32)
+        with self.assertRaises(TypeError):
+            carray(1.5, 6, numpy.int32)
+
+    def test_python_owner(self):
+        arr = numpy.arange(6, dtype=numpy.float64)
+        refcount = sys.getrefcount(arr)
+        got = carray(arr.ctypes.data, 6, numpy.float64, owner=arr)
+        self.assertEqual(sys.getrefcount(arr), refcount + 1)
+        del got
+        self.assertEqual(sys.getrefcount(arr), refcount)
+
+    def test_nopython_voidptr(self):
+        arr = numpy.arange(6, dtype=numpy.float64)
+        cfunc = jit(nopython=True)(carray_voidptr_usecase)
+        got = cfunc(arr)
+        self.assertPreciseEqual(got, arr.reshape((2, 3)))
+        got[1, 2] = 42.0
+        self.assertEqual(arr[5], 42.0)
+        cfunc = jit(nopython=True)(farray_voidptr_usecase)
+        got = cfunc(arr)
+        self.assertPreciseEqual(got, arr.reshape((2, 3), order='F'))
+
+    def test_nopython_typed_pointer(self):
+        src = numpy.arange(6, dtype=numpy.float64)
+        dest = numpy.zeros_like(src)
+        cfunc = jit(nopython=True)(carray_typed_ptr_usecase)
+        got = cfunc(src, dest)
+        self.assertPreciseEqual(got, src)
+        # The result is a view over *dest*
+        got[0] = 42.0
+        self.assertEqual(dest[0], 42.0)
+
+    def test_nopython_address(self):
+        arr = numpy.arange(6, dtype=numpy.float64)
+        cfunc = jit(nopython=True)(carray_address_usecase)
+        self.assertPreciseEqual(cfunc(arr, 6), arr)
+        with self.assertRaises(ValueError) as raises:
+            cfunc(arr, -1)
+        self.assertIn("negative dimensions", str(raises.exception))
+
+
 if __name__ == '__main__':
     unittest.main()
 
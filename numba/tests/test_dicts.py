@@ -1,7 +1,12 @@
 from __future__ import print_function
 
+import sys
+
+import numpy as np
+
+from numba import errors, jit
 import numba.unittest_support as unittest
-from .support import TestCase, force_pyobj_flags
+from .support import TestCase, MemoryLeakMixin, force_pyobj_flags
 
 
 def build_map():
@@ -12,6 +17,161 @@ def build_map_from_local_vars():
     x = TestCase
     return {0: x, x: 1}
 
+def dict_literal(x, y):
+    return {x: y, y: x, 42: 0}
+
+def dict_empty_setitem(n):
+    d = {}
+    for i in range(n):
+        d[i] = i * 2
+    return d
+
+def dict_constructor(n):
+    d = dict()
+    for i in range(n):
+        d[i] = i + 0.5
+    return dict(d)
+
+def dict_getitem(d, k):
+    return d[k]
+
+def dict_delitem(n):
+    d = {}
+    for i in range(n):
+        d[i] = i
+    for i in range(0, n, 2):
+        del d[i]
+    return d
+
+def dict_delitem_missing(k):
+    d = {1: 2}
+    del d[k]
+
+def dict_len(n):
+    d = {}
+    for i in range(n):
+        d[i % 7] = i
+    return len(d)
+
+def dict_bool(n):
+    d = {}
+    for i in range(n):
+        d[i] = i
+    return bool(d)
+
+def dict_contains(n, k):
+    d = {}
+    for i in range(n):
+        d[i * 3] = i
+    return k in d, k not in d
+
+def dict_iteration(n):
+    d = {}
+    for i in range(n):
+        d[i] = i * i
+    res = 0
+    for k in d:
+        res += k * 7 + d[k]
+    return res
+
+def dict_items(n):
+    d = {}
+    for i in range(n):
+        d[i] = float(i)
+    keys = 0
+    values = 0.0
+    for k in d.keys():
+        keys += k
+    for v in d.values():
+        values += v
+    for k, v in d.items():
+        keys -= k
+        values -= v
+    return keys, values, len(d.items())
+
+def dict_get(n, k):
+    d = {}
+    for i in range(n):
+        d[i] = i + 1
+    return d.get(k), d.get(k, -1)
+
+def dict_pop(n, k):
+    d = {}
+    for i in range(n):
+        d[i] = i + 1
+    return d.pop(k, -1), len(d)
+
+def dict_pop_missing(k):
+    d = {1: 2}
+    return d.pop(k)
+
+def dict_setdefault(n, k):
+    d = {}
+    for i in range(n):
+        d[i] = i + 1
+    return d.setdefault(k, 42), len(d)
+
+def dict_update(n):
+    d = {0: 1.5}
+    e = {}
+    for i in range(n):
+        e[i] = i * 2.0
+    d.update(e)
+    return d
+
+def dict_clear(n):
+    d = {}
+    for i in range(n):
+        d[i] = i
+    d.clear()
+    d[42] = 0
+    return d
+
+def dict_copy(n):
+    d = {}
+    for i in range(n):
+        d[i] = i
+    e = d.copy()
+    e[n] = n
+    return len(d), len(e)
+
+def dict_tuple_keys(n):
+    d = {}
+    for i in range(n):
+        d[(i, i + 1)] = i
+    return d[(3, 4)], len(d)
+
+def dict_float_keys(n):
+    d = {}
+    for i in range(n):
+        d[i / 2.0] = i
+    return d[1.5], d[2.0]
+
+def dict_counter(a):
+    d = {}
+    for x in a:
+        d[x] = d.get(x, 0) + 1
+    return d
+
+def dict_array_values(n):
+    d = {}
+    d[0] = np.arange(n)
+    return d
+
+def dict_literal_array_values(a):
+    return {0: a}
+
+def reflect_setitem(d, k, v):
+    d[k] = v
+
+def reflect_dual(d, e):
+    d[42] = 1
+    del e[1]
+    return len(d), len(e)
+
+def hash_usecase(x):
+    return hash(x)
+
 
 class DictTestCase(TestCase):
 
@@ -22,5 +182,199 @@ class DictTestCase(TestCase):
         self.run_nullary_func(build_map_from_local_vars, flags=flags)
 
 
+class TestDicts(MemoryLeakMixin, TestCase):
+
+    def check_unary_with_size(self, pyfunc):
+        cfunc = jit(nopython=True)(pyfunc)
+        for n in [0, 1, 5, 7, 8, 100, 1000]:
+            expected = pyfunc(n)
+            self.assertPreciseEqual(cfunc(n), expected)
+
+    def test_literal(self):
+        pyfunc = dict_literal
+        cfunc = jit(nopython=True)(pyfunc)
+        self.assertPreciseEqual(cfunc(1, 2), pyfunc(1, 2))
+        self.assertPreciseEqual(cfunc(1, 1), pyfunc(1, 1))
+
+    def test_setitem(self):
+        self.check_unary_with_size(dict_empty_setitem)
+
+    def test_constructor(self):
+        self.check_unary_with_size(dict_constructor)
+
+    def test_getitem(self):
+        pyfunc = dict_getitem
+        cfunc = jit(nopython=True)(pyfunc)
+        d = {1: 2.5, 3: 4.5}
+        self.assertPreciseEqual(cfunc(d, 3), 4.5)
+        with self.assertRaises(KeyError):
+            cfunc(d, 5)
+
+    def test_delitem(self):
+        self.check_unary_with_size(dict_delitem)
+        cfunc = jit(nopython=True)(dict_delitem_missing)
+        cfunc(1)
+        with self.assertRaises(KeyError):
+            cfunc(2)
+
+    def test_len(self):
+        self.check_unary_with_size(dict_len)
+
+    def test_bool(self):
+        self.check_unary_with_size(dict_bool)
+
+    def test_contains(self):
+        pyfunc = dict_contains
+        cfunc = jit(nopython=True)(pyfunc)
+        for k in [0, 3, 4, 300, 301]:
+            self.assertPreciseEqual(cfunc(200, k), pyfunc(200, k))
+
+    def test_iteration(self):
+        self.check_unary_with_size(dict_iteration)
+
+    def test_items(self):
+        self.check_unary_with_size(dict_items)
+
+    def test_get(self):
+        pyfunc = dict_get
+        cfunc = jit(nopython=True)(pyfunc)
+        for k in [0, 5, 10]:
+            self.assertPreciseEqual(cfunc(10, k), pyfunc(10, k))
+
+    def test_pop(self):
+        pyfunc = dict_pop
+        cfunc = jit(nopython=True)(pyfunc)
+        for k in [0, 5, 10]:
+            self.assertPreciseEqual(cfunc(10, k), pyfunc(10, k))
+        cfunc = jit(nopython=True)(dict_pop_missing)
+        self.assertPreciseEqual(cfunc(1), 2)
+        with self.assertRaises(KeyError):
+            cfunc(2)
+
+    def test_setdefault(self):
+        pyfunc = dict_setdefault
+        cfunc = jit(nopython=True)(pyfunc)
+        for k in [0, 5, 10]:
+            self.assertPreciseEqual(cfunc(10, k), pyfunc(10, k))
+
+    def test_update(self):
+        self.check_unary_with_size(dict_update)
+
+    def test_clear(self):
+        self.check_unary_with_size(dict_clear)
+
+    def test_copy(self):
+        self.check_unary_with_size(dict_copy)
+
+    def test_tuple_keys(self):
+        pyfunc = dict_tuple_keys
+        cfunc = jit(nopython=True)(pyfunc)
+        self.assertPreciseEqual(cfunc(100), pyfunc(100))
+
+    def test_float_keys(self):
+        pyfunc = dict_float_keys
+        cfunc = jit(nopython=True)(pyfunc)
+        self.assertPreciseEqual(cfunc(100), pyfunc(100))
+
+    def test_unbox(self):
+        pyfunc = dict_counter
+        cfunc = jit(nopython=True)(pyfunc)
+        a = [1, 5, 3, 1, 1, 5, 7]
+        self.assertPreciseEqual(cfunc(a), pyfunc(a))
+
+    def test_unbox_argument(self):
+        cfunc = jit(nopython=True)(dict_getitem)
+        for n in [0, 1, 5, 100, 1000]:
+            # Float keys are hashed by a separately compiled function
+            d = dict((i / 3.0, i) for i in range(n))
+            with self.assertRefCount(d):
+                for k in list(d)[::7]:
+                    self.assertPreciseEqual(cfunc(d, k), d[k])
+            d = dict((i, -i) for i in range(n))
+            for k in list(d)[::7]:
+                self.assertPreciseEqual(cfunc(d, k), d[k])
+
+    def check_rejected(self, cfunc, *args):
+        with self.assertRaises(errors.TypingError) as raises:
+            cfunc(*args)
+        self.assertIn("cannot store items of type array(", str(raises.exception))
+
+    def test_array_values(self):
+        """
+        Dicts don't own references to their keys and values, so
+        NRT-managed values are rejected.
+        """
+        self.check_rejected(jit(nopython=True)(dict_array_values), 5)
+        self.check_rejected(jit(nopython=True)(dict_literal_array_values),
+                            np.arange(5))
+        self.check_rejected(jit(nopython=True)(dict_getitem),
+                            {1: np.arange(5)}, 1)
+
+
+class TestDictReflection(MemoryLeakMixin, TestCase):
+    """
+    Test reflection of native Numba dicts on Python dict objects.
+    """
+
+    def test_reflect_setitem(self):
+        cfunc = jit(nopython=True)(reflect_setitem)
+        d = {1: 2.5}
+        with self.assertRefCount(d):
+            cfunc(d, 3, 4.5)
+            cfunc(d, 1, 0.5)
+        self.assertPreciseEqual(d, {1: 0.5, 3: 4.5})
+
+    def test_reflect_unchanged(self):
+        cfunc = jit(nopython=True)(dict_getitem)
+        d = {1: 2.5}
+        cfunc(d, 1)
+        self.assertPreciseEqual(d, {1: 2.5})
+
+    def test_reflect_same_dict(self):
+        """
+        When the same dict object is passed twice, each argument is a
+        separate copy and both are reflected in turn.
+        """
+        cfunc = jit(nopython=True)(reflect_dual)
+        d = {1: 2, 3: 4}
+        with self.assertRefCount(d):
+            self.assertPreciseEqual(cfunc(d, d), (3, 1))
+        self.assertIn(d, ({1: 2, 3: 4, 42: 1}, {3: 4}))
+
+
+class TestHash(TestCase):
+    """
+    Test the hash() builtin in nopython mode.
+    """
+
+    def check_hash(self, values):
+        cfunc = jit(nopython=True)(hash_usecase)
+        for v in values:
+            self.assertPreciseEqual(cfunc(v), hash(v), msg=repr(v))
+
+    def test_ints(self):
+        self.check_hash([0, 1, -1, -2, 42, -42, 2**61 - 1, 2**61, 2**62,
+                         -2**63, 2**63 - 1])
+
+    def test_bools(self):
+        self.check_hash([False, True])
+
+    def test_floats(self):
+        self.check_hash([0.0, -0.0, 1.0, -1.0, 1.5, -2.25, 1e100, -1e-300,
+                         float('inf'), float('-inf'),
+                         2.0**61, 0.1])
+
+    def test_complex(self):
+        self.check_hash([0j, 1j, -1j, 1.5 + 2.5j, -3 - 0.5j])
+
+    def test_tuples(self):
+        cfunc = jit(nopython=True)(hash_usecase)
+        self.assertEqual(cfunc((1, 2.5)), cfunc((1, 2.5)))
+        self.assertNotEqual(cfunc((1, 2)), cfunc((2, 1)))
+        if sys.version_info < (3, 8):
+            for v in [(), (1, 2), (1, (2.5, 3j))]:
+                self.assertPreciseEqual(cfunc(v), hash(v))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -15,7 +15,8 @@ import numpy as np
 from numba import unittest_support as unittest
 from numba import utils, vectorize, jit
 from numba.config import NumbaWarning
-from .support import TestCase
+from numba.npyufunc import parallel
+from .support import TestCase, override_config
 
 
 def dummy(x):
@@ -380,6 +381,87 @@ class TestDispatcherMethods(TestCase):
         self.assertEqual(exp_f, got_f)
 
 
+def moving_sum(arr, window):
+    n = arr.shape[0] - window + 1
+    out = np.zeros(n)
+    for i in range(n):
+        for j in range(window):
+            out[i] += arr[i + j]
+    return out
+
+
+def scale(x, mode=1):
+    if mode == 1:
+        return x * 2
+    else:
+        return x * 3
+
+
+class TestStaticArgs(TestCase):
+
+    def test_specialize_on_value(self):
+        cfunc = jit(nopython=True, static_args=('window',))(moving_sum)
+        arr = np.arange(20.)
+        for window in (3, 5, 3):
+            self.assertPreciseEqual(cfunc(arr, window),
+                                    moving_sum(arr, window))
+        self.assertEqual([values for values, _ in cfunc.specializations],
+                         [(3,), (5,)])
+
+    def test_static_value_is_constant(self):
+        cfunc = jit(nopython=True, static_args=(1,))(moving_sum)
+        arr = np.arange(20.)
+        cfunc(arr, 4)
+        [(_, disp)] = cfunc.specializations
+        buf = utils.StringIO()
+        disp.inspect_types(buf)
+        self.assertIn("window = const(int, 4)", buf.getvalue())
+
+    def test_keyword_and_default(self):
+        cfunc = jit(nopython=True, static_args=('mode',))(scale)
+        self.assertPreciseEqual(cfunc(2), scale(2))
+        self.assertPreciseEqual(cfunc(2, mode=2), scale(2, mode=2))
+        self.assertPreciseEqual(cfunc(2, 2), scale(2, 2))
+        self.assertEqual([values for values, _ in cfunc.specializations],
+                         [(1,), (2,)])
+
+    def test_value_types_are_distinct(self):
+        cfunc = jit(nopython=True, static_args=('mode',))(scale)
+        self.assertPreciseEqual(cfunc(2, 1), scale(2, 1))
+        self.assertPreciseEqual(cfunc(2, True), scale(2, True))
+        self.assertPreciseEqual(cfunc(2, 1.0), scale(2, 1.0))
+        self.assertEqual(len(cfunc.specializations), 3)
+
+    def test_max_specializations(self):
+        cfunc = jit(nopython=True, static_args=('window',))(moving_sum)
+        arr = np.arange(20.)
+        with override_config('MAX_STATIC_SPECIALIZATIONS', 2):
+            for window in range(1, 6):
+                self.assertPreciseEqual(cfunc(arr, window),
+                                        moving_sum(arr, window))
+        self.assertEqual(len(cfunc.specializations), 2)
+        self.assertIsNotNone(cfunc._generic)
+
+    def test_nan_and_signed_zero(self):
+        cfunc = jit(nopython=True, static_args=('mode',))(scale)
+        for mode in (float('nan'), float('nan'), 0.0, -0.0, complex('nanj')):
+            self.assertPreciseEqual(cfunc(2, mode), scale(2, mode))
+        self.assertEqual(len(cfunc.specializations), 4)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            jit(static_args=('foo',))(scale)
+        with self.assertRaises(ValueError):
+            jit(static_args=(2,))(scale)
+        with self.assertRaises(TypeError):
+            jit("float64(float64, int64)", static_args=('mode',))(scale)
+        cfunc = jit(nopython=True, static_args=('mode',))(scale)
+        with self.assertRaises(TypeError) as raises:
+            cfunc(1, [1])
+        self.assertIn("unsupported value for a static argument",
+                      str(raises.exception))
+
+
 class TestCache(TestCase):
 
     here = os.path.dirname(__file__)
@@ -443,6 +525,14 @@ class TestCache(TestCase):
     def dummy_test(self):
         pass
 
+    def run_code_in_separate_process(self, code, env=None):
+        popen = subprocess.Popen([sys.executable, "-c", code], env=env,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = popen.communicate()
+        if popen.returncode != 0:
+            raise AssertionError("process failed with code %s: stderr follows\n%s\n"
+                                 % (popen.returncode, err.decode()))
+
     def run_in_separate_process(self):
         # Cached functions can be run from a distinct process
         code = """if 1:
@@ -459,13 +549,7 @@ class TestCache(TestCase):
             assert tuple(aligned_rec) == (2, 43.5), aligned_rec
             """ % dict(tempdir=self.tempdir, modname=self.modname,
                        test_class=self.__class__.__name__)
-
-        popen = subprocess.Popen([sys.executable, "-c", code],
-                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        out, err = popen.communicate()
-        if popen.returncode != 0:
-            raise AssertionError("process failed with code %s: stderr follows\n%s\n"
-                                 % (popen.returncode, err.decode()))
+        self.run_code_in_separate_process(code)
 
     def check_module(self, mod):
         self.check_cache(0)
@@ -529,6 +613,28 @@ class TestCache(TestCase):
         self.assertPreciseEqual(f(3.5, 2), 6.5)
         self.check_cache(5)  # 2 index, 3 data
 
+    def test_parallel(self):
+        mod = self.import_module()
+        arr = np.arange(1000.0)
+        self.assertPreciseEqual(mod.parallel_usecase(arr), arr.sum() * 2.0)
+        self.check_cache(2)  # 1 index, 1 data
+        # The worker threads are launched by the cached code itself, as
+        # nothing is compiled in the other process
+        code = """if 1:
+            import sys
+            import numpy as np
+
+            sys.path.insert(0, %(tempdir)r)
+            mod = __import__(%(modname)r)
+            arr = np.arange(1000.0)
+            assert mod.parallel_usecase(arr) == arr.sum() * 2.0
+            """ % dict(tempdir=self.tempdir, modname=self.modname)
+        self.run_code_in_separate_process(code)
+        # The cached code only uses as many threads as it was compiled for
+        env = dict(os.environ)
+        env['NUMBA_NUM_THREADS'] = str(parallel.NUM_THREADS * 2 + 1)
+        self.run_code_in_separate_process(code, env)
+
     def test_no_caching(self):
         mod = self.import_module()
 
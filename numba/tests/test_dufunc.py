@@ -10,6 +10,9 @@ from .support import MemoryLeakMixin
 def pyuadd(a0, a1):
     return a0 + a1
 
+def pyumax(a0, a1):
+    return a0 if a0 > a1 else a1
+
 class TestDUFunc(MemoryLeakMixin, unittest.TestCase):
 
     def test_frozen(self):
@@ -79,5 +82,82 @@ class TestDUFunc(MemoryLeakMixin, unittest.TestCase):
         self.assertEqual(duadd.ntypes, 1)
         self.assertEqual(duadd.ntypes, len(duadd.types))
 
+
+class TestDUFuncReduce(MemoryLeakMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(TestDUFuncReduce, self).setUp()
+        self.duadd = dufunc.DUFunc(pyuadd, identity=0, nopython=True)
+        # Valid for non-negative values only
+        self.dumax = dufunc.DUFunc(pyumax, identity=0, nopython=True)
+
+    def arrays(self):
+        # Sizes above and below the parallel threshold, with a remainder
+        # when split across threads
+        yield np.arange(10007, dtype=np.int64)
+        yield np.arange(7, dtype=np.int64)
+        yield np.arange(3 * 5003, dtype=np.int64).reshape((3, 5003))
+        yield np.arange(5003 * 3, dtype=np.int64).reshape((5003, 3))
+        yield np.arange(2 * 3 * 2001, dtype=np.int64).reshape((2, 3, 2001))
+        # Non-contiguous
+        yield np.arange(20014, dtype=np.int64)[::2]
+        yield np.arange(3 * 5003, dtype=np.int64).reshape((5003, 3)).T
+
+    def test_reduce(self):
+        for a in self.arrays():
+            for axis in list(range(-a.ndim, a.ndim)) + [None]:
+                np.testing.assert_equal(self.duadd.reduce(a, axis=axis),
+                                        np.add.reduce(a, axis=axis))
+                np.testing.assert_equal(self.dumax.reduce(a, axis=axis),
+                                        np.maximum.reduce(a, axis=axis))
+            np.testing.assert_equal(self.duadd.reduce(a),
+                                    np.add.reduce(a))
+        a = np.arange(2 * 3 * 2001, dtype=np.int64).reshape((2, 3, 2001))
+        for axis in [(0, 2), (2, 0), (-1, 1)]:
+            np.testing.assert_equal(self.duadd.reduce(a, axis=axis),
+                                    np.add.reduce(a, axis=axis))
+        self.assertEqual(self.duadd.reduce(a, axis=None), a.sum())
+
+    def test_reduce_options(self):
+        a = np.arange(3 * 5003, dtype=np.int64).reshape((3, 5003))
+        np.testing.assert_equal(self.duadd.reduce(a, axis=1, keepdims=True),
+                                np.add.reduce(a, axis=1, keepdims=True))
+        out = np.zeros(3, dtype=np.int64)
+        res = self.duadd.reduce(a, axis=1, out=out)
+        self.assertIs(res, out)
+        np.testing.assert_equal(out, a.sum(axis=1))
+        res = self.duadd.reduce(a, axis=None, dtype=np.float64)
+        self.assertEqual(res, float(a.sum()))
+        # Floating-point sums are reordered
+        b = np.random.random(100001)
+        np.testing.assert_allclose(self.duadd.reduce(b), b.sum())
+
+    def test_reduce_errors(self):
+        a = np.arange(10007, dtype=np.int64)
+        with self.assertRaises(ValueError):
+            self.duadd.reduce(a, axis=1)
+        with self.assertRaises(ValueError):
+            self.duadd.reduce(a.reshape((1, -1)), axis=(1, -1))
+
+    def test_accumulate(self):
+        for a in self.arrays():
+            for axis in range(-a.ndim, a.ndim):
+                np.testing.assert_equal(self.duadd.accumulate(a, axis=axis),
+                                        np.add.accumulate(a, axis=axis))
+                np.testing.assert_equal(self.dumax.accumulate(a, axis=axis),
+                                        np.maximum.accumulate(a, axis=axis))
+        a = np.random.random(100001)
+        np.testing.assert_allclose(self.duadd.accumulate(a), np.cumsum(a))
+        out = np.zeros_like(a)
+        self.assertIs(self.duadd.accumulate(a, out=out), out)
+        np.testing.assert_allclose(out, np.cumsum(a))
+
+    def test_without_identity(self):
+        # NumPy's implementation is used
+        duadd = dufunc.DUFunc(pyuadd, nopython=True)
+        a = np.arange(10007, dtype=np.int64)
+        self.assertEqual(duadd.reduce(a), a.sum())
+        np.testing.assert_equal(duadd.accumulate(a), np.cumsum(a))
+
 if __name__ == "__main__":
     unittest.main()
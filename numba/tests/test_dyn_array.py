@@ -9,7 +9,7 @@ from numba import unittest_support as unittest
 from numba import njit
 from numba import utils
 from numba.numpy_support import version as numpy_version
-from .support import MemoryLeakMixin, TestCase
+from .support import MemoryLeakMixin, TestCase, override_config
 
 
 nrtjit = njit(_nrt=True, nogil=True)
@@ -913,6 +913,45 @@ class TestNpyEmptyKeyword(TestCase):
             cfunc()
 
 
+def make_arrays(n):
+    # np.ones() and np.full() are compiled as separate internal functions
+    return (np.empty(n), np.zeros((n, 3), dtype=np.int8), np.arange(n) * 2,
+            np.ones(n), np.full((n, 2), 5, dtype=np.int16))
+
+
+class TestArrayAlignment(MemoryLeakMixin, TestCase):
+    """
+    Test the alignment of the data of arrays allocated in nopython mode.
+    """
+
+    def check_alignment(self, cfunc, align):
+        for n in (1, 3, 17):
+            for arr in cfunc(n):
+                self.assertEqual(arr.ctypes.data % align, 0, (n, arr.dtype))
+
+    def test_default(self):
+        self.check_alignment(njit(make_arrays), 32)
+
+    def test_jit_option(self):
+        for align in (16, 64, 128):
+            cfunc = njit(array_alignment=align)(make_arrays)
+            self.check_alignment(cfunc, align)
+            # The alignment assumption is passed to LLVM
+            llvm_ir = cfunc.inspect_llvm(cfunc.signatures[0])
+            self.assertIn("llvm.assume", llvm_ir)
+
+    def test_config(self):
+        with override_config('ARRAY_ALIGNMENT', 64):
+            cfunc = njit(make_arrays)
+            self.check_alignment(cfunc, 64)
+
+    def test_invalid_option(self):
+        for align in (0, 3, 48):
+            cfunc = njit(array_alignment=align)(make_arrays)
+            with self.assertRaises(ValueError):
+                cfunc(1)
+
+
 def benchmark_refct_speed():
     def pyfunc(x, y, t):
         """Swap array x and y for t number of times
@@ -0,0 +1,251 @@
+from __future__ import print_function
+
+from collections import OrderedDict
+
+import numpy as np
+
+from numba import jitclass, njit, typeof, types
+import numba.unittest_support as unittest
+from .support import TestCase, MemoryLeakMixin
+
+
+@jitclass([('x', types.int32), ('y', types.float64)])
+class Point(object):
+    """A point"""
+
+    def __init__(self, x, y=0.5):
+        self.x = x
+        self.y = y
+
+    def norm1(self):
+        return abs(self.x) + abs(self.y)
+
+    def move(self, dx, dy):
+        self.x += dx
+        self.y += dy
+
+    @property
+    def coords(self):
+        return self.x, self.y
+
+    @property
+    def double_x(self):
+        return self.x * 2
+
+    @double_x.setter
+    def double_x(self, value):
+        self.x = value // 2
+
+
+@jitclass(OrderedDict([('data', types.float64[:]), ('size', types.intp)]))
+class Stack(object):
+
+    def __init__(self, capacity):
+        self.data = np.zeros(capacity)
+        self.size = 0
+
+    def push(self, value):
+        if self.size == len(self.data):
+            raise IndexError("stack full")
+        self.data[self.size] = value
+        self.size += 1
+
+    def pop(self):
+        self.size -= 1
+        return self.data[self.size]
+
+
+@jitclass([('start', typeof(Point(0))), ('stop', typeof(Point(0)))])
+class Segment(object):
+
+    def __init__(self, start, stop):
+        self.start = start
+        self.stop = stop
+
+    def length1(self):
+        return (abs(self.stop.x - self.start.x) +
+                abs(self.stop.y - self.start.y))
+
+
+@jitclass([])
+class Empty(object):
+
+    def value(self):
+        return 42
+
+
+@njit
+def make_point(x, y):
+    return Point(x, y)
+
+@njit
+def point_norm1(p):
+    return p.norm1()
+
+@njit
+def move_point(p, dx, dy):
+    p.move(dx, dy)
+
+@njit
+def point_fields(p):
+    return p.x, p.y, p.coords, p.double_x
+
+@njit
+def set_double_x(p, value):
+    p.double_x = value
+
+@njit
+def fill_stack(n):
+    st = Stack(n)
+    for i in range(n):
+        st.push(i * 1.5)
+    return st
+
+@njit
+def drain_stack(st):
+    res = 0.0
+    while st.size > 0:
+        res += st.pop()
+    return res
+
+@njit
+def make_segment(x1, y1, x2, y2):
+    return Segment(Point(x1, y1), Point(x2, y2))
+
+@njit
+def segment_length1(seg):
+    return seg.length1()
+
+@njit
+def replace_start(seg, p):
+    seg.start = p
+
+
+class TestJitClass(MemoryLeakMixin, TestCase):
+
+    def test_construct(self):
+        p = Point(3, 4.5)
+        self.assertIsInstance(p, Point)
+        self.assertEqual(p.x, 3)
+        self.assertEqual(p.y, 4.5)
+        self.assertEqual(Point.__doc__, "A point")
+        # Default and keyword arguments
+        self.assertEqual(Point(1).y, 0.5)
+        self.assertEqual(Point(y=2.0, x=1).coords, (1, 2.0))
+
+    def test_typeof(self):
+        p = Point(1, 2.0)
+        self.assertIsInstance(typeof(Point), types.ClassType)
+        self.assertEqual(typeof(p), typeof(Point).instance_type)
+        self.assertEqual(typeof(p).struct,
+                         OrderedDict([('x', types.int32),
+                                      ('y', types.float64)]))
+
+    def test_construct_in_jitted(self):
+        p = make_point(-3, 1.5)
+        self.assertIsInstance(p, Point)
+        self.assertEqual(p.coords, (-3, 1.5))
+
+    def test_methods(self):
+        p = Point(-3, 1.5)
+        self.assertEqual(p.norm1(), 4.5)
+        self.assertEqual(point_norm1(p), 4.5)
+        p.move(1, 1.0)
+        self.assertEqual(p.coords, (-2, 2.5))
+        # Mutations made by compiled code are seen by the interpreter
+        move_point(p, 2, 0.5)
+        self.assertEqual(p.coords, (0, 3.0))
+
+    def test_fields_and_properties(self):
+        p = Point(3, 4.5)
+        self.assertEqual(point_fields(p), (3, 4.5, (3, 4.5), 6))
+        p.x = 7
+        p.y = 1
+        self.assertEqual(point_fields(p), (7, 1.0, (7, 1.0), 14))
+        p.double_x = 10
+        self.assertEqual(p.x, 5)
+        set_double_x(p, 4)
+        self.assertEqual(p.x, 2)
+        # Field values are converted to the field type
+        p.x = 2.7
+        self.assertEqual(p.x, 2)
+
+    def test_shared_instance(self):
+        p = make_point(1, 2.0)
+        self.assertEqual(point_norm1(p), 3.0)
+        # Unboxing doesn't copy the instance
+        move_point(p, 1, 1.0)
+        move_point(p, 1, 1.0)
+        self.assertEqual(p.coords, (3, 4.0))
+
+    def test_nrt_fields(self):
+        st = fill_stack(4)
+        self.assertEqual(st.size, 4)
+        np.testing.assert_equal(st.data, [0.0, 1.5, 3.0, 4.5])
+        self.assertEqual(drain_stack(st), 9.0)
+        self.assertEqual(st.size, 0)
+        with self.assertRaises(IndexError):
+            fill_stack(0).push(1.0)
+
+    def test_nested_instances(self):
+        seg = make_segment(0, 0.0, 3, 4.0)
+        self.assertEqual(segment_length1(seg), 7.0)
+        start = seg.start
+        self.assertIsInstance(start, Point)
+        # The field references the same instance
+        move_point(start, 1, 1.0)
+        self.assertEqual(segment_length1(seg), 5.0)
+        replace_start(seg, Point(3, 4.0))
+        self.assertEqual(segment_length1(seg), 0.0)
+        self.assertEqual(start.coords, (1, 1.0))
+
+    def test_empty(self):
+        e = Empty()
+        self.assertEqual(e.value(), 42)
+
+    def test_refcount(self):
+        p = Point(1, 2.0)
+        self.assertEqual(p._meminfo.refcount, 1)
+        for i in range(5):
+            point_norm1(p)
+            move_point(p, 1, 0.0)
+        self.assertEqual(p._meminfo.refcount, 1)
+        seg = Segment(p, p)
+        self.assertEqual(p._meminfo.refcount, 3)
+        del seg
+        self.assertEqual(p._meminfo.refcount, 1)
+
+    def test_invalid_spec(self):
+        with self.assertRaises(TypeError):
+            jitclass([('x', int)])(type('A', (object,), {}))
+        with self.assertRaises(TypeError):
+            jitclass([(1, types.int32)])(type('A', (object,), {}))
+        with self.assertRaises(TypeError):
+            jitclass([('x', types.int32), ('x', types.int64)])(
+                type('A', (object,), {}))
+
+    def test_invalid_members(self):
+        def method(self):
+            return 1
+
+        with self.assertRaises(TypeError):
+            jitclass([('x', types.int32)])(
+                type('A', (object,), {'x': method}))
+        with self.assertRaises(TypeError):
+            jitclass([])(type('A', (object,), {'y': 1}))
+        with self.assertRaises(TypeError):
+            jitclass([])(type('A', (object,),
+                              {'m': staticmethod(method)}))
+
+    def test_init_must_return_none(self):
+        def __init__(self):
+            return 1
+
+        A = jitclass([])(type('A', (object,), {'__init__': __init__}))
+        with self.assertRaises(Exception) as raises:
+            A()
+        self.assertIn("__init__() should return None", str(raises.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
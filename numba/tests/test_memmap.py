@@ -0,0 +1,141 @@
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from numba import (njit, typeof, types, errors, madvise, MADV_NORMAL,
+                   MADV_SEQUENTIAL, MADV_WILLNEED, MADV_DONTNEED)
+import numba.unittest_support as unittest
+from .support import TestCase, MemoryLeakMixin
+
+
+@njit
+def identity(a):
+    return a
+
+@njit
+def get_slice(a, start, stop):
+    return a[start:stop]
+
+@njit
+def copies(a):
+    return a.copy(), a[np.array([1, 3])], np.empty_like(a), a == a
+
+@njit
+def fill_and_flush(a, value):
+    for i in range(a.shape[0]):
+        a[i] = value
+    a.flush()
+
+@njit
+def sequential_sum(a, chunksize):
+    madvise(a, MADV_SEQUENTIAL)
+    res = 0.0
+    for start in range(0, a.shape[0], chunksize):
+        chunk = a[start:start + chunksize]
+        madvise(a[start + chunksize:start + 2 * chunksize], MADV_WILLNEED)
+        res += chunk.sum()
+        madvise(chunk, MADV_DONTNEED)
+    return res
+
+@njit
+def advise(a, advice):
+    madvise(a, advice)
+
+
+class TestMemMap(MemoryLeakMixin, TestCase):
+
+    def setUp(self):
+        super(TestMemMap, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+        super(TestMemMap, self).tearDown()
+
+    def make_memmap(self, n=100, mode='w+'):
+        filename = os.path.join(self.tempdir, 'data.bin')
+        if mode != 'w+':
+            np.arange(n, dtype=np.float64).tofile(filename)
+        mm = np.memmap(filename, dtype=np.float64, mode=mode, shape=(n,))
+        if mode == 'w+':
+            mm[:] = np.arange(n)
+        return mm
+
+    def test_typeof(self):
+        mm = self.make_memmap()
+        ty = typeof(mm)
+        self.assertIsInstance(ty, types.MemMapArray)
+        self.assertEqual(ty, types.MemMapArray(types.float64, 1, 'C'))
+        self.assertNotEqual(ty, types.Array(types.float64, 1, 'C'))
+        self.assertTrue(ty.mutable)
+        self.assertFalse(typeof(self.make_memmap(mode='r')).mutable)
+        # Regular arrays are unaffected
+        self.assertEqual(typeof(np.asarray(mm)),
+                         types.Array(types.float64, 1, 'C'))
+        del mm
+
+    def test_dispatch(self):
+        mm = self.make_memmap()
+        arr = np.arange(5.0)
+        self.assertIs(type(identity(arr)), np.ndarray)
+        self.assertIs(identity(mm), mm)
+        self.assertIs(type(identity(arr)), np.ndarray)
+        self.assertEqual(len(identity.signatures), 2)
+        del mm
+
+    def test_slice(self):
+        mm = self.make_memmap()
+        got = get_slice(mm, 10, 20)
+        self.assertIsInstance(got, np.memmap)
+        self.assertEqual(got.filename, mm.filename)
+        self.assertEqual(got.mode, mm.mode)
+        self.assertPreciseEqual(np.asarray(got), np.arange(10.0, 20.0))
+        # The slice is a view of the mapping
+        got[0] = 42.0
+        self.assertEqual(mm[10], 42.0)
+        del got, mm
+
+    def test_copies(self):
+        # Copies and new arrays are plain arrays, not mapped to the file
+        mm = self.make_memmap()
+        for got in copies(mm):
+            self.assertIs(type(got), np.ndarray)
+        got = copies(mm)[0]
+        self.assertPreciseEqual(got, np.arange(100.0))
+        got[0] = 42.0
+        self.assertEqual(mm[0], 0.0)
+        for ty in copies.nopython_signatures[0].return_type:
+            self.assertNotIsInstance(ty, types.MemMapArray)
+        del got, mm
+
+    def test_flush(self):
+        mm = self.make_memmap()
+        fill_and_flush(mm[:50], 3.0)
+        expected = np.arange(100.0)
+        expected[:50] = 3.0
+        self.assertPreciseEqual(np.fromfile(mm.filename), expected)
+        del mm
+
+    def test_madvise(self):
+        mm = self.make_memmap(mode='r')
+        self.assertEqual(sequential_sum(mm, 7), np.arange(100.0).sum())
+        for advice in (MADV_NORMAL, MADV_SEQUENTIAL, MADV_WILLNEED):
+            advise(mm, advice)
+            madvise(mm[::-3], advice)
+        with self.assertRaises(OSError):
+            advise(mm, 42)
+        with self.assertRaises(OSError):
+            madvise(mm, 42)
+        with self.assertRaises(TypeError):
+            madvise(np.arange(5.0), MADV_NORMAL)
+        with self.assertRaises(errors.TypingError):
+            advise(np.arange(5.0), MADV_NORMAL)
+        del mm
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ from __future__ import absolute_import, division, print_function
 import math
 import os
 import sys
+import threading
 
 import numpy as np
 
@@ -11,7 +12,7 @@ from numba import njit
 from numba.compiler import compile_isolated, Flags, types
 from numba.runtime import rtsys
 from numba.config import PYVERSION
-from .support import MemoryLeakMixin, TestCase
+from .support import MemoryLeakMixin, TestCase, override_config
 
 enable_nrt_flags = Flags()
 enable_nrt_flags.set("nrt")
@@ -234,6 +235,181 @@ class TestTracemalloc(unittest.TestCase):
         self.assertLess(stat.size, N * 0.01)
 
 
+def small_arrays(n):
+    s = 0.0
+    for i in range(n):
+        a = np.empty(i % 50 + 1)
+        a[:] = i
+        s += a.sum()
+    return s
+
+def growing_list(n):
+    l = []
+    for i in range(n):
+        l.append(i)
+    s = 0
+    for x in l:
+        s += x
+    return s
+
+
+class TestNrtPool(TestCase):
+    """
+    Test the pool allocator of the NRT.
+    """
+
+    def setUp(self):
+        # Make sure the NRT is initialized
+        self.small_arrays = njit(small_arrays)
+        self.small_arrays(1)
+        try:
+            rtsys.use_pool_allocator(1 << 20)
+        except RuntimeError:
+            self.skipTest("NRT memory is allocated")
+
+    def tearDown(self):
+        rtsys.use_system_allocator()
+
+    def check_balanced(self):
+        stats = rtsys.get_allocation_stats()
+        self.assertEqual(stats.alloc, stats.free)
+        self.assertEqual(stats.mi_alloc, stats.mi_free)
+
+    def test_reuse(self):
+        n = 1000
+        before = rtsys.get_pool_stats()
+        self.assertEqual(self.small_arrays(n), small_arrays(n))
+        after = rtsys.get_pool_stats()
+        # All arrays are freed before the next one is allocated: the
+        # blocks are reused
+        self.assertGreaterEqual(after.hits - before.hits, n - 50)
+        self.assertLessEqual(after.misses - before.misses, 50)
+        self.check_balanced()
+
+    def test_large_and_realloc(self):
+        cfunc = njit(growing_list)
+        for n in (0, 1, 100, 10000):
+            self.assertEqual(cfunc(n), growing_list(n))
+        big = njit(lambda n: np.ones(n).sum())
+        self.assertEqual(big(100000), 100000.0)
+        self.check_balanced()
+
+    def test_max_retained(self):
+        rtsys.use_pool_allocator(0)
+        before = rtsys.get_pool_stats()
+        self.small_arrays(100)
+        after = rtsys.get_pool_stats()
+        self.assertEqual(after.cached, before.cached)
+        self.assertEqual(after.hits, before.hits)
+        self.assertGreaterEqual(after.released - before.released, 100)
+        self.check_balanced()
+
+    def test_threads(self):
+        cfunc = njit(nogil=True)(small_arrays)
+        results = []
+
+        def run():
+            results.append(cfunc(500))
+
+        threads = [threading.Thread(target=run) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [small_arrays(500)] * 4)
+        self.check_balanced()
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            rtsys.use_pool_allocator(-1)
+        # Cannot switch while memory is allocated
+        keep = njit(lambda: np.empty(10))()
+        with self.assertRaises(RuntimeError):
+            rtsys.use_system_allocator()
+        del keep
+        self.check_balanced()
+
+
+def traced_arrays(n):
+    keep = np.empty(n)
+    for i in range(10):
+        a = np.ones(n)
+    return keep
+
+def traced_list(n):
+    l = []
+    for i in range(n):
+        l.append(i)
+    return len(l)
+
+
+class TestNrtTrace(TestCase):
+    """
+    Test the tracing of the NRT allocations.
+    """
+
+    def compile_traced(self, pyfunc):
+        with override_config('NRT_TRACE', 1):
+            cfunc = njit(pyfunc)
+            cfunc.compile((types.intp,))
+        return cfunc
+
+    def get_sites(self, pyfunc):
+        """
+        Return the allocation sites of *pyfunc*, by line offset.
+        """
+        code = pyfunc.__code__
+        return dict((site.lineno - code.co_firstlineno, site)
+                    for site in rtsys.get_allocation_sites()
+                    if site.function == pyfunc.__name__ and
+                    site.filename == code.co_filename)
+
+    def test_arrays(self):
+        cfunc = self.compile_traced(traced_arrays)
+        n = 1000
+        res = cfunc(n)
+        sites = self.get_sites(traced_arrays)
+        self.assertEqual(sorted(sites), [1, 3])
+        # The returned array is alive
+        self.assertEqual(sites[1].allocs, 1)
+        self.assertEqual(sites[1].frees, 0)
+        self.assertGreaterEqual(sites[1].live_bytes, n * 8)
+        self.assertEqual(sites[1].total_bytes, sites[1].live_bytes)
+        # The allocation of np.ones() is attributed to the caller
+        self.assertEqual(sites[3].allocs, 10)
+        self.assertEqual(sites[3].frees, 10)
+        self.assertEqual(sites[3].live_bytes, 0)
+        self.assertGreaterEqual(sites[3].total_bytes, 10 * n * 8)
+        del res
+        sites = self.get_sites(traced_arrays)
+        self.assertEqual(sites[1].frees, 1)
+        self.assertEqual(sites[1].live_bytes, 0)
+        # Sorted by live bytes
+        cfunc(n)
+        keep = cfunc(n)
+        all_sites = rtsys.get_allocation_sites()
+        self.assertEqual(all_sites[0], self.get_sites(traced_arrays)[1])
+        self.assertEqual(all_sites[0].live_bytes, sites[1].total_bytes)
+        del keep
+
+    def test_realloc(self):
+        cfunc = self.compile_traced(traced_list)
+        self.assertEqual(cfunc(10000), 10000)
+        sites = self.get_sites(traced_list)
+        self.assertEqual(sorted(sites), [1])
+        self.assertEqual(sites[1].allocs, sites[1].frees)
+        self.assertEqual(sites[1].live_bytes, 0)
+        # The list was grown
+        self.assertGreaterEqual(sites[1].total_bytes, 10000 * 8)
+
+    def test_untraced(self):
+        def untraced(n):
+            return np.ones(n)
+
+        self.assertEqual(njit(untraced)(10).sum(), 10)
+        self.assertEqual(self.get_sites(untraced), {})
+
+
 class TestNRTIssue(MemoryLeakMixin, TestCase):
     def test_issue_with_refct_op_pruning(self):
         """
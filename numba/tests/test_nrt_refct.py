@@ -4,10 +4,11 @@ Tests issues or edge cases for producing invalid NRT refct
 
 from __future__ import division, absolute_import, print_function
 
+import llvmlite.binding as ll
 import numba.unittest_support as unittest
 import numpy as np
 from numba import njit
-from numba.runtime import rtsys
+from numba.runtime import rtsys, nrtopt
 
 
 class TestNrtRefCt(unittest.TestCase):
@@ -54,5 +55,169 @@ class TestNrtRefCt(unittest.TestCase):
         self.assertEqual(cur_stats.free - init_stats.free, 1)
 
 
+_refct_decls = """
+declare void @NRT_incref(i8*)
+declare void @NRT_decref(i8*)
+"""
+
+
+class TestRefctPruning(unittest.TestCase):
+    """
+    Tests for the refcount pruning pass in numba.runtime.nrtopt.
+    """
+
+    def setUp(self):
+        nrtopt.stats.reset()
+
+    def prune(self, body):
+        mod = ll.parse_assembly(_refct_decls + body)
+        return str(nrtopt.remove_redundant_nrt_refct(mod))
+
+    def count_calls(self, asm, fname):
+        return asm.count("call void @%s(" % fname)
+
+    def test_null(self):
+        asm = self.prune("""
+            define void @f() {
+              call void @NRT_incref(i8* null)
+              call void @NRT_decref(i8* null)
+              ret void
+            }
+            """)
+        self.assertEqual(self.count_calls(asm, "NRT_incref"), 0)
+        self.assertEqual(self.count_calls(asm, "NRT_decref"), 0)
+        self.assertEqual(nrtopt.stats.null, 2)
+        self.assertEqual(nrtopt.stats.total, 2)
+
+    def test_same_block(self):
+        asm = self.prune("""
+            define void @f(i8* %x, i8* %y) {
+              call void @NRT_incref(i8* %x)
+              call void @NRT_incref(i8* %y)
+              call void @NRT_decref(i8* %x)
+              ret void
+            }
+            """)
+        self.assertEqual(self.count_calls(asm, "NRT_incref"), 1)
+        self.assertEqual(self.count_calls(asm, "NRT_decref"), 0)
+        self.assertIn("call void @NRT_incref(i8* %y)", asm)
+        self.assertEqual(nrtopt.stats.per_block, 2)
+
+    def test_diamond(self):
+        # The incref and decref blocks are control-equivalent
+        asm = self.prune("""
+            define void @f(i8* %x, i1 %c) {
+            entry:
+              call void @NRT_incref(i8* %x)
+              br i1 %c, label %a, label %b
+            a:
+              br label %exit
+            b:
+              br label %exit
+            exit:
+              call void @NRT_decref(i8* %x)
+              ret void
+            }
+            """)
+        self.assertEqual(self.count_calls(asm, "NRT_incref"), 0)
+        self.assertEqual(self.count_calls(asm, "NRT_decref"), 0)
+        self.assertEqual(nrtopt.stats.cross_block, 2)
+
+    def test_conditional_decref(self):
+        # The decref block doesn't post-dominate the incref block
+        body = """
+            define void @f(i8* %x, i1 %c) {
+            entry:
+              call void @NRT_incref(i8* %x)
+              br i1 %c, label %a, label %exit
+            a:
+              call void @NRT_decref(i8* %x)
+              br label %exit
+            exit:
+              ret void
+            }
+            """
+        asm = self.prune(body)
+        self.assertEqual(self.count_calls(asm, "NRT_incref"), 1)
+        self.assertEqual(self.count_calls(asm, "NRT_decref"), 1)
+        self.assertEqual(nrtopt.stats.total, 0)
+
+    def test_loop(self):
+        # The incref runs once per iteration, the decref only once
+        asm = self.prune("""
+            define void @f(i8* %x, i32 %n) {
+            entry:
+              br label %loop
+            loop:
+              %i = phi i32 [0, %entry], [%j, %loop]
+              call void @NRT_incref(i8* %x)
+              %j = add i32 %i, 1
+              %c = icmp slt i32 %j, %n
+              br i1 %c, label %loop, label %exit
+            exit:
+              call void @NRT_decref(i8* %x)
+              ret void
+            }
+            """)
+        self.assertEqual(self.count_calls(asm, "NRT_incref"), 1)
+        self.assertEqual(self.count_calls(asm, "NRT_decref"), 1)
+        self.assertEqual(nrtopt.stats.total, 0)
+
+    def test_inside_loop(self):
+        # Both operations are in the same loop iteration
+        asm = self.prune("""
+            define void @f(i8* %x, i32 %n, i1 %d) {
+            entry:
+              br label %loop
+            loop:
+              %i = phi i32 [0, %entry], [%j, %latch]
+              call void @NRT_incref(i8* %x)
+              br i1 %d, label %a, label %latch
+            a:
+              br label %latch
+            latch:
+              call void @NRT_decref(i8* %x)
+              %j = add i32 %i, 1
+              %c = icmp slt i32 %j, %n
+              br i1 %c, label %loop, label %exit
+            exit:
+              ret void
+            }
+            """)
+        self.assertEqual(self.count_calls(asm, "NRT_incref"), 0)
+        self.assertEqual(self.count_calls(asm, "NRT_decref"), 0)
+        self.assertEqual(nrtopt.stats.cross_block, 2)
+
+    def test_no_refct(self):
+        mod = ll.parse_assembly("""
+            define i32 @f(i32 %x) {
+              ret i32 %x
+            }
+            """)
+        self.assertIs(nrtopt.remove_redundant_nrt_refct(mod), mod)
+
+    def test_branchy_function(self):
+        """
+        Check refcounts stay balanced when compiled code has pruning
+        opportunities across blocks.
+        """
+        @njit
+        def foo(n, flag):
+            a = np.zeros(n)
+            b = a
+            if flag:
+                c = b[:1]
+            else:
+                c = b[1:]
+            return c.sum() + a.sum()
+
+        for flag in (True, False):
+            init_stats = rtsys.get_allocation_stats()
+            foo(10, flag)
+            cur_stats = rtsys.get_allocation_stats()
+            self.assertEqual(cur_stats.alloc - init_stats.alloc, 1)
+            self.assertEqual(cur_stats.free - init_stats.free, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
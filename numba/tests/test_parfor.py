@@ -0,0 +1,224 @@
+"""
+Tests for prange() loops run in parallel (the *parallel* jit option).
+"""
+from __future__ import print_function, division, absolute_import
+
+import warnings
+
+import numpy as np
+
+from numba import njit, prange
+from numba import unittest_support as unittest
+from numba.config import NumbaWarning
+from .support import MemoryLeakMixin, TestCase
+
+
+def double(a, b):
+    for i in prange(a.shape[0]):
+        b[i] = a[i] * 2
+
+def stepped(a, b, start, stop, step):
+    for i in prange(start, stop, step):
+        b[i] = a[i] + i
+
+def array_body(a, b):
+    for i in prange(a.shape[0]):
+        row = a[i] * 2 + 1
+        b[i] = row.sum()
+
+def sum_loop(a):
+    s = 0
+    for i in prange(a.shape[0]):
+        s += a[i]
+    return s
+
+def sum_binop_loop(a):
+    s = 0
+    for i in prange(a.shape[0]):
+        s = a[i] + s
+    return s
+
+def prod_loop(a):
+    p = 1
+    for i in prange(a.shape[0]):
+        p *= a[i]
+    return p
+
+def min_loop(a):
+    m = a[0]
+    for i in prange(a.shape[0]):
+        m = min(m, a[i])
+    return m
+
+def max_loop(a):
+    m = a[0]
+    for i in prange(a.shape[0]):
+        m = max(a[i], m)
+    return m
+
+def several_reductions(a):
+    s = 0
+    m = a[0]
+    for i in prange(a.shape[0]):
+        x = a[i] * 3
+        s += x
+        m = max(m, x)
+    return s, m
+
+def count_loop(n):
+    c = 0
+    for i in prange(n):
+        c += 1
+    return c
+
+def nested_loops(a):
+    s = 0
+    for i in prange(a.shape[0]):
+        for j in prange(a.shape[1]):
+            a[i, j] = i * j
+            s += a[i, j]
+    return s
+
+def raising_loop(a):
+    for i in prange(a.shape[0]):
+        if a[i] < 0:
+            raise ValueError("negative value")
+        a[i] = a[i] + 1
+
+def dependent_loop(a):
+    x = 0
+    for i in prange(a.shape[0]):
+        x = x * 2 + a[i]
+    return x
+
+def break_loop(a):
+    s = 0
+    for i in prange(a.shape[0]):
+        if a[i] < 0:
+            break
+        s += a[i]
+    return s
+
+def last_value_loop(a):
+    for i in prange(a.shape[0]):
+        last = a[i]
+    return last
+
+parallel_sum = njit(parallel=True)(sum_loop)
+
+@njit(parallel=True)
+def parallel_expr_sum(a):
+    return (a * 2 + 1).sum()
+
+def parallel_callee_loop(a):
+    res = np.zeros((a.shape[0], 2), dtype=a.dtype)
+    for i in prange(a.shape[0]):
+        res[i, 0] = parallel_sum(a[i])
+        res[i, 1] = parallel_expr_sum(a[i])
+    return res
+
+
+class TestParfor(MemoryLeakMixin, TestCase):
+
+    def compile_parallel(self, pyfunc):
+        return njit(parallel=True)(pyfunc)
+
+    def check_out(self, pyfunc, a, *args):
+        cfunc = self.compile_parallel(pyfunc)
+        expected = np.zeros_like(a)
+        got = np.zeros_like(a)
+        pyfunc(a, expected, *args)
+        cfunc(a, got, *args)
+        self.assertPreciseEqual(got, expected)
+
+    def check_result(self, pyfunc, *args):
+        cfunc = self.compile_parallel(pyfunc)
+        expected = pyfunc(*args)
+        got = cfunc(*args)
+        self.assertPreciseEqual(got, expected)
+
+    def check_serial(self, pyfunc, *args):
+        # The loop is run serially, with a warning
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always', NumbaWarning)
+            self.check_result(pyfunc, *args)
+        msgs = [str(x.message) for x in w if x.category is NumbaWarning]
+        self.assertTrue(any('prange() loop will run serially' in msg
+                            for msg in msgs), msgs)
+
+    def test_array_writes(self):
+        for n in (0, 1, 3, 1001):
+            self.check_out(double, np.arange(n, dtype=np.int64))
+        self.check_out(double, np.arange(1001.0))
+
+    def test_stepped_range(self):
+        a = np.arange(100, dtype=np.int64)
+        self.check_out(stepped, a, 3, 97, 7)
+        self.check_out(stepped, a, 97, 3, -5)
+        self.check_out(stepped, a, 10, 10, 1)
+
+    def test_array_expression_body(self):
+        self.check_out(array_body, np.arange(300.0).reshape((100, 3)))
+
+    def test_reductions(self):
+        a = np.arange(1, 10001, dtype=np.int64)
+        for pyfunc in (sum_loop, sum_binop_loop, min_loop, max_loop,
+                       several_reductions):
+            self.check_result(pyfunc, a)
+            self.check_result(pyfunc, a[::-1].copy())
+            self.check_result(pyfunc, a[:1])
+        self.check_result(prod_loop, np.arange(1, 21, dtype=np.int64))
+        self.check_result(prod_loop, np.arange(1, 3, dtype=np.int64))
+        a = np.random.random(1001)
+        self.check_result(min_loop, a)
+        self.check_result(max_loop, a)
+        cfunc = self.compile_parallel(sum_loop)
+        self.assertAlmostEqual(cfunc(a), a.sum())
+
+    def test_reductions_race_free(self):
+        # Lost updates would show up as a wrong count
+        cfunc = self.compile_parallel(count_loop)
+        for n in (0, 1, 7, 10 ** 6):
+            for _ in range(5):
+                self.assertEqual(cfunc(n), n)
+
+    def test_nested_loops(self):
+        a = np.zeros((17, 13), dtype=np.int64)
+        b = np.zeros((17, 13), dtype=np.int64)
+        self.assertEqual(self.compile_parallel(nested_loops)(a),
+                         nested_loops(b))
+        self.assertPreciseEqual(a, b)
+
+    def test_parallel_callee(self):
+        # Parallel functions called in the loop body run serially within
+        # each thread
+        a = np.arange(3000, dtype=np.int64).reshape((100, 30))
+        self.check_result(parallel_callee_loop, a)
+
+    def test_exception(self):
+        cfunc = self.compile_parallel(raising_loop)
+        a = np.arange(1000.0)
+        cfunc(a)
+        self.assertPreciseEqual(a, np.arange(1.0, 1001.0))
+        a[500] = -1
+        with self.assertRaises(ValueError) as raises:
+            cfunc(a)
+        self.assertIn("negative value", str(raises.exception))
+
+    def test_unsupported_loops(self):
+        a = np.arange(1, 100, dtype=np.int64)
+        self.check_serial(dependent_loop, a)
+        self.check_serial(last_value_loop, a)
+        a[50] = -1
+        self.check_serial(break_loop, a)
+
+    def test_without_parallel(self):
+        # prange() behaves as range()
+        a = np.arange(100, dtype=np.int64)
+        self.assertPreciseEqual(njit(sum_loop)(a), sum_loop(a))
+        self.assertPreciseEqual(njit(dependent_loop)(a), dependent_loop(a))
+        self.assertEqual(list(prange(2, 10, 3)), [2, 5, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,9 +6,12 @@ import os
 import sys
 from ctypes import *
 
+import llvmlite.binding as ll
+
 from numba import unittest_support as unittest
 from numba.pycc import find_shared_ending, find_pyext_ending, main
 from numba.pycc.decorators import clear_export_registry
+from numba.targets.codegen import supports_isa_levels
 from .support import TestCase
 
 from numba.tests.support import static_temp_directory
@@ -162,6 +165,29 @@ class TestCC(BasePYCCTest):
             res = lib.square(5)
             self.assertPreciseEqual(res, 25)
 
+    @unittest.skipUnless(supports_isa_levels(ll.get_default_triple()),
+                         "ISA levels need a x86 target")
+    def test_compile_isa_levels(self):
+        cc = self._test_module.cc_multiversion
+        cc.isa_levels = ('avx512', 'sse42', 'avx2')
+        cc.output_dir = self.tmpdir
+        cc.compile()
+
+        with self.check_c_ext(self.tmpdir, cc.name) as lib:
+            # Whichever version gets picked must give the same results
+            res = lib.multi(123, 321)
+            self.assertPreciseEqual(res, 123 * 321)
+            res = lib.multf(987, 321)
+            self.assertPreciseEqual(res, 987.0 * 321.0)
+            res = lib.sum_squares(1000)
+            self.assertPreciseEqual(res, float(sum(i * i for i in range(1000))))
+
+    def test_isa_levels_errors(self):
+        cc = self._test_module.cc_multiversion
+        cc.isa_levels = ('foo',)
+        with self.assertRaises(ValueError):
+            cc.compile()
+
 
 if __name__ == "__main__":
     unittest.main()
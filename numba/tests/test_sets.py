@@ -1,8 +1,11 @@
 from __future__ import print_function
 
+import numpy as np
+
+from numba import errors, jit
 import numba.unittest_support as unittest
 from numba.utils import PYVERSION
-from .support import TestCase, enable_pyobj_flags
+from .support import TestCase, MemoryLeakMixin, enable_pyobj_flags
 
 
 def build_set_usecase(*args):
@@ -16,6 +19,149 @@ def build_set_usecase(*args):
     return ns['build_set']
 
 
+def set_constructor(n):
+    return set(range(n))
+
+def set_constructor_list(n):
+    return set([np.arange(n)])
+
+def set_add(n):
+    s = set()
+    for i in range(n):
+        s.add(i % 13)
+    return s
+
+def set_literal(x, y):
+    return {x, y, 42}
+
+def set_len_bool(n):
+    s = set()
+    for i in range(n):
+        s.add(i // 2)
+    return len(s), bool(s)
+
+def set_contains(n, x):
+    s = set(range(0, n, 3))
+    return x in s, x not in s
+
+def set_iteration(n):
+    s = set(range(n))
+    res = 0
+    for x in s:
+        res += x * 7
+    return res
+
+def set_discard_remove(n):
+    s = set(range(n))
+    for i in range(0, n, 2):
+        s.discard(i)
+        s.discard(i)
+    for i in range(1, n, 4):
+        s.remove(i)
+    return s
+
+def set_remove_missing(x):
+    s = {1, 2}
+    s.remove(x)
+
+def set_pop(n):
+    s = set(range(n))
+    res = 0
+    while s:
+        res += s.pop()
+    return res, len(s)
+
+def set_pop_add(n):
+    s = set(range(n))
+    res = 0
+    i = 0
+    while s:
+        res += s.pop()
+        if i < n and i % 3 == 0:
+            s.add(n + i)
+        i += 1
+    return res, i
+
+def set_pop_empty():
+    s = {1}
+    s.pop()
+    s.pop()
+
+def set_clear_copy(n):
+    s = set(range(n))
+    t = s.copy()
+    s.clear()
+    s.add(42)
+    return s, t
+
+def set_update(n):
+    s = {0.5}
+    s.update(range(n))
+    s.update([1.5, 2.5])
+    return s
+
+def set_tuples(n):
+    s = set()
+    for i in range(n):
+        s.add((i % 5, i % 3))
+    return len(s), (4, 2) in s, (5, 2) in s
+
+def set_operators(a, b):
+    return a | b, a & b, a - b, a ^ b
+
+def set_methods(a, b):
+    return (a.union(b), a.intersection(b), a.difference(b),
+            a.symmetric_difference(b))
+
+def set_inplace_operators(a, b):
+    c = set(a)
+    c |= b
+    d = set(a)
+    d &= b
+    e = set(a)
+    e -= b
+    f = set(a)
+    f ^= b
+    return c, d, e, f
+
+def set_update_methods(a, b):
+    d = set(a)
+    d.intersection_update(b)
+    e = set(a)
+    e.difference_update(b)
+    f = set(a)
+    f.symmetric_difference_update(b)
+    return d, e, f
+
+def set_comparisons(a, b):
+    return (a == b, a != b, a < b, a <= b, a > b, a >= b,
+            a.issubset(b), a.issuperset(b), a.isdisjoint(b))
+
+def dedup(a):
+    seen = set()
+    res = []
+    for x in a:
+        if x not in seen:
+            seen.add(x)
+            res.append(x)
+    return res
+
+def set_array_items(n):
+    s = set()
+    s.add(np.arange(n))
+    return s
+
+def set_literal_array_items(a):
+    return {a}
+
+def reflect_add(s, x):
+    s.add(x)
+
+def reflect_discard(s, x):
+    s.discard(x)
+    return len(s)
+
+
 needs_set_literals = unittest.skipIf(PYVERSION < (2, 7),
                                      "set literals unavailable before Python 2.7")
 
@@ -38,5 +184,138 @@ class SetTestCase(TestCase):
         self.assertIs(type(got.pop()), type(expected.pop()))
 
 
+class TestSets(MemoryLeakMixin, TestCase):
+
+    def check_unary_with_size(self, pyfunc):
+        cfunc = jit(nopython=True)(pyfunc)
+        for n in [0, 1, 5, 8, 100, 1000]:
+            self.assertPreciseEqual(cfunc(n), pyfunc(n))
+
+    def test_constructor(self):
+        self.check_unary_with_size(set_constructor)
+
+    def test_add(self):
+        self.check_unary_with_size(set_add)
+
+    @needs_set_literals
+    def test_literal(self):
+        pyfunc = set_literal
+        cfunc = jit(nopython=True)(pyfunc)
+        self.assertPreciseEqual(cfunc(1, 2), pyfunc(1, 2))
+        self.assertPreciseEqual(cfunc(42, 42), pyfunc(42, 42))
+
+    def test_len_bool(self):
+        self.check_unary_with_size(set_len_bool)
+
+    def test_contains(self):
+        pyfunc = set_contains
+        cfunc = jit(nopython=True)(pyfunc)
+        for x in [0, 3, 4, 99, 300]:
+            self.assertPreciseEqual(cfunc(100, x), pyfunc(100, x))
+
+    def test_iteration(self):
+        self.check_unary_with_size(set_iteration)
+
+    def test_discard_remove(self):
+        self.check_unary_with_size(set_discard_remove)
+        cfunc = jit(nopython=True)(set_remove_missing)
+        cfunc(1)
+        with self.assertRaises(KeyError):
+            cfunc(3)
+
+    def test_pop(self):
+        self.check_unary_with_size(set_pop)
+        self.check_unary_with_size(set_pop_add)
+        cfunc = jit(nopython=True)(set_pop_empty)
+        with self.assertRaises(KeyError):
+            cfunc()
+
+    def test_clear_copy(self):
+        self.check_unary_with_size(set_clear_copy)
+
+    def test_update(self):
+        self.check_unary_with_size(set_update)
+
+    def test_tuples(self):
+        self.check_unary_with_size(set_tuples)
+
+    def check_binary(self, pyfunc):
+        cfunc = jit(nopython=True)(pyfunc)
+        samples = [({1, 2, 3}, {2, 3, 4}),
+                   ({1, 2, 3}, {1, 2, 3}),
+                   ({1, 2}, {1, 2, 3}),
+                   ({5, 6}, {1, 2, 3}),
+                   (set(range(100)), set(range(50, 200, 3)))]
+        for a, b in samples:
+            for x, y in [(a, b), (b, a)]:
+                self.assertPreciseEqual(cfunc(set(x), set(y)), pyfunc(x, y))
+
+    def test_operators(self):
+        self.check_binary(set_operators)
+
+    def test_methods(self):
+        self.check_binary(set_methods)
+
+    def test_inplace_operators(self):
+        self.check_binary(set_inplace_operators)
+
+    def test_update_methods(self):
+        self.check_binary(set_update_methods)
+
+    def test_comparisons(self):
+        self.check_binary(set_comparisons)
+
+    def test_dedup(self):
+        pyfunc = dedup
+        cfunc = jit(nopython=True)(pyfunc)
+        a = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+        self.assertPreciseEqual(cfunc(a), pyfunc(a))
+
+    def test_unbox(self):
+        pyfunc = set_operators
+        cfunc = jit(nopython=True)(pyfunc)
+        for n in [0, 1, 5, 100, 1000]:
+            # Float items are hashed by a separately compiled function
+            a = set(i / 3.0 for i in range(n))
+            b = set(i / 2.0 for i in range(n))
+            with self.assertRefCount(a, b):
+                self.assertPreciseEqual(cfunc(a, b), pyfunc(a, b))
+
+    def check_rejected(self, cfunc, *args):
+        with self.assertRaises(errors.TypingError) as raises:
+            cfunc(*args)
+        self.assertIn("cannot store items of type array(", str(raises.exception))
+
+    def test_array_items(self):
+        """
+        Sets don't own references to their items, so NRT-managed items
+        are rejected.
+        """
+        self.check_rejected(jit(nopython=True)(set_array_items), 5)
+        self.check_rejected(jit(nopython=True)(set_literal_array_items),
+                            np.arange(5))
+        self.check_rejected(jit(nopython=True)(set_constructor_list), 5)
+
+
+class TestSetReflection(MemoryLeakMixin, TestCase):
+    """
+    Test reflection of native Numba sets on Python set objects.
+    """
+
+    def test_reflect_add(self):
+        cfunc = jit(nopython=True)(reflect_add)
+        s = {1, 2}
+        with self.assertRefCount(s):
+            cfunc(s, 3)
+            cfunc(s, 1)
+        self.assertPreciseEqual(s, {1, 2, 3})
+
+    def test_reflect_discard(self):
+        cfunc = jit(nopython=True)(reflect_discard)
+        s = {1.5, 2.5}
+        self.assertPreciseEqual(cfunc(s, 1.5), 1)
+        self.assertPreciseEqual(s, {2.5})
+
+
 if __name__ == '__main__':
     unittest.main()
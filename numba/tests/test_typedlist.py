@@ -0,0 +1,131 @@
+from __future__ import print_function
+
+from numba import njit, types
+from numba.typed import List
+import numba.unittest_support as unittest
+from .support import TestCase, MemoryLeakMixin
+
+
+@njit
+def sum_list(lst):
+    res = 0
+    for x in lst:
+        res += x
+    return res
+
+@njit
+def append_range(lst, n):
+    for i in range(n):
+        lst.append(i)
+
+@njit
+def identity(lst):
+    return lst
+
+@njit
+def new_copy(lst):
+    res = lst.copy()
+    res.append(42)
+    return res
+
+@njit
+def first_item(lst):
+    return lst[0]
+
+
+class TestTypedList(MemoryLeakMixin, TestCase):
+
+    def test_construct(self):
+        lst = List([1, 2, 3])
+        self.assertEqual(lst.dtype, types.int64)
+        self.assertEqual(len(lst), 3)
+        self.assertEqual(list(lst), [1, 2, 3])
+
+        lst = List([1, 2], dtype=types.float64)
+        self.assertEqual(lst.dtype, types.float64)
+        self.assertEqual(list(lst), [1.0, 2.0])
+
+        lst = List(dtype=types.int32)
+        self.assertEqual(len(lst), 0)
+        with self.assertRaises(TypeError):
+            List()
+
+    def test_typeof(self):
+        lst = List([1.5])
+        self.assertEqual(lst._numba_type_, types.TypedList(types.float64))
+
+    def test_sequence_methods(self):
+        lst = List([3, 1, 2])
+        self.assertEqual(lst[0], 3)
+        self.assertEqual(lst[-1], 2)
+        with self.assertRaises(IndexError):
+            lst[3]
+        lst[1] = 5
+        self.assertEqual(list(lst), [3, 5, 2])
+        self.assertIn(5, lst)
+        self.assertNotIn(1, lst)
+
+        sliced = lst[1:]
+        self.assertIsInstance(sliced, List)
+        self.assertEqual(list(sliced), [5, 2])
+        lst[:2] = [7, 8, 9]
+        self.assertEqual(list(lst), [7, 8, 9, 2])
+        del lst[1]
+        del lst[-1]
+        self.assertEqual(list(lst), [7, 9])
+
+    def test_list_methods(self):
+        lst = List([4, 2], dtype=types.intp)
+        lst.append(3)
+        lst.extend([1, 5])
+        lst.insert(0, 6)
+        self.assertEqual(list(lst), [6, 4, 2, 3, 1, 5])
+        self.assertEqual(lst.pop(), 5)
+        self.assertEqual(lst.pop(0), 6)
+        lst.remove(2)
+        self.assertEqual(lst.index(3), 1)
+        self.assertEqual(lst.count(4), 1)
+        lst.sort()
+        self.assertEqual(list(lst), [1, 3, 4])
+        lst.reverse()
+        self.assertEqual(list(lst), [4, 3, 1])
+        self.assertEqual(lst, [4, 3, 1])
+        self.assertEqual(lst, lst.copy())
+        lst.clear()
+        self.assertEqual(len(lst), 0)
+        with self.assertRaises(IndexError):
+            lst.pop()
+
+    def test_pass_to_jitted(self):
+        lst = List(range(10))
+        self.assertEqual(sum_list(lst), 45)
+        self.assertEqual(first_item(lst), 0)
+
+    def test_mutation_is_shared(self):
+        lst = List(dtype=types.intp)
+        append_range(lst, 1000)
+        self.assertEqual(len(lst), 1000)
+        self.assertEqual(lst[999], 999)
+        lst.append(-1)
+        self.assertEqual(sum_list(lst), 499499)
+
+    def test_return_from_jitted(self):
+        lst = List([1, 2])
+        res = identity(lst)
+        self.assertIsInstance(res, List)
+        # Same native storage
+        self.assertEqual(res._meminfo_ptr, lst._meminfo_ptr)
+        res.append(3)
+        self.assertEqual(list(lst), [1, 2, 3])
+
+        res = new_copy(lst)
+        self.assertIsInstance(res, List)
+        self.assertEqual(list(res), [1, 2, 3, 42])
+        self.assertEqual(list(lst), [1, 2, 3])
+
+    def test_repr(self):
+        self.assertEqual(repr(List([1, 2])), "List([1, 2], dtype=int64)")
+
+
+if __name__ == '__main__':
+    unittest.main()
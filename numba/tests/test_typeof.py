@@ -12,7 +12,7 @@ import sys
 import numpy as np
 
 import numba.unittest_support as unittest
-from numba import cffi_support, numpy_support, types
+from numba import cffi_support, numpy_support, types, utils
 from numba.npdatetime import NPDATETIME_SUPPORTED
 from numba.special import typeof
 from numba._dispatcher import compute_fingerprint
@@ -162,7 +162,10 @@ class TestTypeof(ValueTypingTestBase, TestCase):
 
     def test_str(self):
         ty = typeof("abc")
-        self.assertEqual(ty, types.string)
+        if utils.IS_PY3:
+            self.assertEqual(ty, types.unicode_type)
+        else:
+            self.assertEqual(ty, types.string)
 
     def test_tuples(self):
         v = (1, 2)
@@ -0,0 +1,227 @@
+from __future__ import print_function
+
+from numba import errors, jit, types, utils
+from numba.special import typeof
+import numba.unittest_support as unittest
+from .support import TestCase, MemoryLeakMixin
+
+
+def len_usecase(s):
+    return len(s)
+
+def bool_usecase(s):
+    return bool(s)
+
+def getitem_usecase(s, i):
+    return s[i]
+
+def getslice_usecase(s, start, stop, step):
+    return s[start:stop:step]
+
+def concat_usecase(a, b):
+    return a + b
+
+def repeat_usecase(s, n):
+    return s * n, n * s
+
+def compare_usecase(a, b):
+    return a == b, a != b, a < b, a <= b, a > b, a >= b
+
+def contains_usecase(sub, s):
+    return sub in s, sub not in s
+
+def hash_usecase(s):
+    return hash(s)
+
+def find_usecase(s, sub):
+    return s.find(sub), s.find(sub, 2), s.find(sub, -4, -1)
+
+def affix_usecase(s, affix):
+    return s.startswith(affix), s.endswith(affix)
+
+def split_usecase(s, sep):
+    return s.split(sep)
+
+def split_whitespace_usecase(s):
+    return s.split()
+
+def iter_usecase(s):
+    res = []
+    for c in s:
+        res.append(c)
+    return res
+
+def identity_usecase(s):
+    return s
+
+def constant_usecase():
+    return "hello " + "w\xf6rld " + "\u20ac" + " \U0001f600"
+
+def count_words_usecase(text, word):
+    n = 0
+    for w in text.split():
+        if w == word:
+            n += 1
+    return n
+
+def dict_literal_usecase():
+    return {'a': 1}
+
+def word_counts_usecase(text):
+    d = {}
+    for w in text.split():
+        d[w] = d.get(w, 0) + 1
+    return d
+
+def word_set_usecase(text):
+    return set(text.split())
+
+def dict_getitem_usecase(d, k):
+    return d[k]
+
+
+UNICODE_EXAMPLES = [
+    '',
+    'ascii',
+    'l\xe0tin-1 \xff',
+    'bmp \u0100\u20ac\uffff',
+    'astral \U0001f600 \U0010ffff',
+]
+
+
+@unittest.skipUnless(utils.IS_PY3, "needs Python 3 str")
+class TestUnicode(MemoryLeakMixin, TestCase):
+
+    def check_unary(self, pyfunc, examples=UNICODE_EXAMPLES):
+        cfunc = jit(nopython=True)(pyfunc)
+        for s in examples:
+            self.assertPreciseEqual(cfunc(s), pyfunc(s))
+
+    def check_binary(self, pyfunc, examples=UNICODE_EXAMPLES):
+        cfunc = jit(nopython=True)(pyfunc)
+        for a in examples:
+            for b in examples:
+                self.assertPreciseEqual(cfunc(a, b), pyfunc(a, b))
+
+    def test_typeof(self):
+        self.assertEqual(typeof('abc'), types.unicode_type)
+
+    def test_len(self):
+        self.check_unary(len_usecase)
+
+    def test_bool(self):
+        self.check_unary(bool_usecase)
+
+    def test_getitem(self):
+        pyfunc = getitem_usecase
+        cfunc = jit(nopython=True)(pyfunc)
+        for s in UNICODE_EXAMPLES[1:]:
+            for i in range(-len(s), len(s)):
+                self.assertPreciseEqual(cfunc(s, i), pyfunc(s, i))
+        with self.assertRaises(IndexError):
+            cfunc('abc', 3)
+
+    def test_getslice(self):
+        pyfunc = getslice_usecase
+        cfunc = jit(nopython=True)(pyfunc)
+        for s in UNICODE_EXAMPLES:
+            for start, stop, step in [(0, 100, 1), (1, -1, 1), (-3, 100, 1),
+                                      (0, 100, 2), (100, 0, -1),
+                                      (5, 100, 1), (-100, 100, 3)]:
+                got = cfunc(s, start, stop, step)
+                expected = pyfunc(s, start, stop, step)
+                self.assertPreciseEqual(got, expected)
+                # The result must have the canonical kind, as hash() and
+                # equality rely on it
+                self.assertEqual(hash(got), hash(expected))
+
+    def test_concat(self):
+        self.check_binary(concat_usecase)
+
+    def test_repeat(self):
+        pyfunc = repeat_usecase
+        cfunc = jit(nopython=True)(pyfunc)
+        for s in UNICODE_EXAMPLES:
+            for n in [-1, 0, 1, 3]:
+                self.assertPreciseEqual(cfunc(s, n), pyfunc(s, n))
+
+    def test_compare(self):
+        examples = UNICODE_EXAMPLES + ['asci', 'ascii\xe0', 'b', '\u20ac']
+        self.check_binary(compare_usecase, examples)
+
+    def test_contains(self):
+        examples = UNICODE_EXAMPLES + ['sci', '\xff', '\U0010ffff', 'x']
+        self.check_binary(contains_usecase, examples)
+
+    def test_hash(self):
+        self.check_unary(hash_usecase)
+        # Strings built in compiled code must hash like the interpreter's
+        cfunc = jit(nopython=True)(lambda s: hash(s[1:]))
+        for s in UNICODE_EXAMPLES[1:]:
+            self.assertPreciseEqual(cfunc(s), hash(s[1:]))
+
+    def test_find(self):
+        examples = UNICODE_EXAMPLES + ['', 'i', '\u20ac\uffff', 'zz']
+        self.check_binary(find_usecase, examples)
+
+    def test_startswith_endswith(self):
+        examples = UNICODE_EXAMPLES + ['', 'as', '\xff', '\U0010ffff']
+        self.check_binary(affix_usecase, examples)
+
+    def test_split(self):
+        pyfunc = split_usecase
+        cfunc = jit(nopython=True)(pyfunc)
+        for s, sep in [('a,b,,c', ','), ('a, b, c', ', '), ('abc', 'x'),
+                       ('', ','), ('\u20ac-\xe0-\U0001f600', '-')]:
+            self.assertPreciseEqual(cfunc(s, sep), pyfunc(s, sep))
+        with self.assertRaises(ValueError):
+            cfunc('abc', '')
+
+    def test_split_whitespace(self):
+        examples = ['', '   ', 'a b  c', '  leading and trailing  ',
+                    'tabs\tand\nnewlines\r\n', 'nbsp\xa0and\u3000ideo']
+        self.check_unary(split_whitespace_usecase, examples)
+
+    def test_iter(self):
+        self.check_unary(iter_usecase)
+
+    def test_constant(self):
+        cfunc = jit(nopython=True)(constant_usecase)
+        self.assertPreciseEqual(cfunc(), constant_usecase())
+
+    def test_boxing(self):
+        # Unboxed strings share the original object's data, which is
+        # returned as-is when boxing
+        cfunc = jit(nopython=True)(identity_usecase)
+        for s in UNICODE_EXAMPLES:
+            self.assertIs(cfunc(s), s)
+        s = 'abc' * 10
+        with self.assertRefCount(s):
+            for i in range(5):
+                cfunc(s)
+
+    def test_list_of_strings(self):
+        pyfunc = count_words_usecase
+        cfunc = jit(nopython=True)(pyfunc)
+        text = 'the quick brown fox jumps over the lazy dog ' * 5
+        self.assertPreciseEqual(cfunc(text, 'the'), pyfunc(text, 'the'))
+        self.assertPreciseEqual(cfunc(text, 'cat'), pyfunc(text, 'cat'))
+
+    def test_dicts_and_sets(self):
+        # Dicts and sets don't own references to their items, so strings
+        # can't be stored in them
+        def check(pyfunc, *args):
+            cfunc = jit(nopython=True)(pyfunc)
+            with self.assertRaises(errors.TypingError) as raises:
+                cfunc(*args)
+            self.assertIn("cannot store items of type unicode_type",
+                          str(raises.exception))
+
+        check(dict_literal_usecase)
+        check(word_counts_usecase, 'a b a')
+        check(word_set_usecase, 'a b a')
+        check(dict_getitem_usecase, {'a': 1}, 'a')
+
+
+if __name__ == '__main__':
+    unittest.main()
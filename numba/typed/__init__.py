@@ -0,0 +1,7 @@
+"""
+Typed containers whose native storage is shared between the interpreter
+and nopython mode functions.
+"""
+from __future__ import print_function, division, absolute_import
+
+from .typedlist import List
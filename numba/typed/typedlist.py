@@ -0,0 +1,286 @@
+"""
+A typed list whose native storage lives in NRT memory.  Unlike Python
+lists, which are copied into a native list on each call of a nopython
+mode function and reflected back after it, a typed list is passed to
+compiled code as a reference to its storage.
+"""
+from __future__ import print_function, division, absolute_import
+
+try:
+    from collections.abc import MutableSequence
+except ImportError:
+    from collections import MutableSequence
+
+from numba import njit, types
+from numba.runtime.nrt import MemInfo
+from numba.typing.typeof import typeof
+
+
+class _TypedListClass(object):
+    """
+    The constructor of typed lists of a given list type, as seen by
+    compiled code.
+    """
+
+    def __init__(self, list_type):
+        self._numba_type_ = types.TypedListClass(list_type)
+
+
+_constructors = {}
+
+def _get_constructor(list_type):
+    """
+    Return a compiled function creating an empty list of *list_type*.
+    """
+    try:
+        return _constructors[list_type]
+    except KeyError:
+        cls = _TypedListClass(list_type)
+
+        @njit
+        def construct():
+            return cls()
+
+        _constructors[list_type] = construct
+        return construct
+
+
+def _from_meminfo(ptr, list_type):
+    """
+    Wrap the list at meminfo *ptr*, stealing a reference to the meminfo.
+    Used when boxing typed lists.
+    """
+    self = List.__new__(List)
+    self._numba_type_ = list_type
+    self._meminfo = MemInfo(ptr)
+    self._meminfo_ptr = ptr
+    return self
+
+
+#
+# Compiled helpers implementing the list methods
+#
+
+@njit
+def _len(lst):
+    return len(lst)
+
+@njit
+def _getitem(lst, index):
+    if index < -len(lst) or index >= len(lst):
+        raise IndexError("list index out of range")
+    return lst[index]
+
+@njit
+def _getslice(lst, slice):
+    return lst[slice]
+
+@njit
+def _setitem(lst, index, item):
+    if index < -len(lst) or index >= len(lst):
+        raise IndexError("list assignment index out of range")
+    lst[index] = item
+
+@njit
+def _setslice(lst, slice, items):
+    lst[slice] = items
+
+@njit
+def _delslice(lst, slice):
+    del lst[slice]
+
+@njit
+def _contains(lst, item):
+    return item in lst
+
+@njit
+def _eq(lst, other):
+    return lst == other
+
+@njit
+def _append(lst, item):
+    lst.append(item)
+
+@njit
+def _extend(lst, items):
+    lst.extend(items)
+
+@njit
+def _insert(lst, index, item):
+    lst.insert(index, item)
+
+@njit
+def _pop(lst, index):
+    if len(lst) == 0:
+        raise IndexError("pop from empty list")
+    if index < -len(lst) or index >= len(lst):
+        raise IndexError("pop index out of range")
+    return lst.pop(index)
+
+@njit
+def _remove(lst, item):
+    lst.remove(item)
+
+@njit
+def _index(lst, item, start, stop):
+    return lst.index(item, start, stop)
+
+@njit
+def _count(lst, item):
+    return lst.count(item)
+
+@njit
+def _reverse(lst):
+    lst.reverse()
+
+@njit
+def _sort(lst, reverse):
+    lst.sort(reverse=reverse)
+
+@njit
+def _clear(lst):
+    lst.clear()
+
+@njit
+def _copy(lst):
+    return lst.copy()
+
+@njit
+def _to_list(lst):
+    return list(lst)
+
+
+class List(MutableSequence):
+    """
+    A list of items of a single Numba type, stored natively.
+
+    Typed lists are passed to compiled functions without copying, and
+    mutations made by either side are seen by the other.  Items are
+    converted to the list's item type when inserted.  The item type
+    is given by *dtype* (a Numba type), or else inferred from the first
+    item of *iterable*.
+    """
+
+    def __init__(self, iterable=(), dtype=None):
+        if not isinstance(iterable, (list, tuple)):
+            iterable = list(iterable)
+        if dtype is None:
+            if not iterable:
+                raise TypeError("the item type of an empty typed list "
+                                "must be given")
+            dtype = typeof(iterable[0])
+        elif not isinstance(dtype, types.Type):
+            raise TypeError("expected a Numba type, got %r" % (dtype,))
+        list_type = types.TypedList(dtype)
+        other = _get_constructor(list_type)()
+        self._numba_type_ = list_type
+        self._meminfo = other._meminfo
+        self._meminfo_ptr = other._meminfo_ptr
+        if iterable:
+            _extend(self, list(iterable))
+
+    @property
+    def dtype(self):
+        """
+        The Numba type of the list items.
+        """
+        return self._numba_type_.dtype
+
+    def _check_slice_value(self, items):
+        if not isinstance(items, List) or items._numba_type_ != self._numba_type_:
+            items = List(items, dtype=self.dtype)
+        return items
+
+    def __len__(self):
+        return _len(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _getslice(self, index)
+        return _getitem(self, index)
+
+    def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            _setslice(self, index, self._check_slice_value(item))
+        else:
+            _setitem(self, index, item)
+
+    def __delitem__(self, index):
+        if not isinstance(index, slice):
+            size = len(self)
+            if index < 0:
+                index += size
+            if not 0 <= index < size:
+                raise IndexError("list assignment index out of range")
+            index = slice(index, index + 1)
+        _delslice(self, index)
+
+    def __contains__(self, item):
+        return _contains(self, item)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield _getitem(self, i)
+
+    def __eq__(self, other):
+        if isinstance(other, List):
+            return _eq(self, other)
+        if isinstance(other, list):
+            return _to_list(self) == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        if res is NotImplemented:
+            return res
+        return not res
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "List(%r, dtype=%s)" % (_to_list(self), self.dtype)
+
+    def append(self, item):
+        _append(self, item)
+
+    def extend(self, iterable):
+        if not isinstance(iterable, List):
+            iterable = list(iterable)
+            if not iterable:
+                return
+        _extend(self, iterable)
+
+    def insert(self, index, item):
+        _insert(self, index, item)
+
+    def pop(self, index=-1):
+        return _pop(self, index)
+
+    def remove(self, item):
+        _remove(self, item)
+
+    def index(self, item, start=0, stop=None):
+        if stop is None:
+            stop = len(self)
+        return _index(self, item, start, stop)
+
+    def count(self, item):
+        return _count(self, item)
+
+    def reverse(self):
+        _reverse(self)
+
+    def sort(self, reverse=False):
+        _sort(self, reverse)
+
+    def clear(self):
+        _clear(self)
+
+    def copy(self):
+        return _copy(self)
+
+    def to_list(self):
+        """
+        Return a Python list of the items.
+        """
+        return _to_list(self)
@@ -20,6 +20,7 @@ import traceback
 
 from numba import ir, types, utils, config, six
 from .errors import TypingError
+from .typing.dictdecl import _check_item_type
 
 
 class TypeVar(object):
@@ -179,6 +180,48 @@ class BuildListConstraint(object):
                 typeinfer.add_type(self.target, types.List(unified))
 
 
+class BuildMapConstraint(object):
+    def __init__(self, target, items, loc):
+        self.target = target
+        self.items = items
+        self.loc = loc
+
+    def __call__(self, typeinfer):
+        typevars = typeinfer.typevars
+        if not self.items:
+            typeinfer.add_type(self.target,
+                               types.Dict(types.undefined, types.undefined))
+        else:
+            n = len(self.items)
+            tsets = [typevars[k.name].get() for k, v in self.items]
+            tsets += [typevars[v.name].get() for k, v in self.items]
+            for typs in itertools.product(*tsets):
+                key_type = typeinfer.context.unify_types(*typs[:n])
+                value_type = typeinfer.context.unify_types(*typs[n:])
+                _check_item_type(key_type, 'dict', loc=self.loc)
+                _check_item_type(value_type, 'dict', loc=self.loc)
+                typeinfer.add_type(self.target,
+                                   types.Dict(key_type, value_type))
+
+
+class BuildSetConstraint(object):
+    def __init__(self, target, items, loc):
+        self.target = target
+        self.items = items
+        self.loc = loc
+
+    def __call__(self, typeinfer):
+        typevars = typeinfer.typevars
+        tsets = [typevars[i.name].get() for i in self.items]
+        if not tsets:
+            typeinfer.add_type(self.target, types.Set(types.undefined))
+        else:
+            for typs in itertools.product(*tsets):
+                unified = typeinfer.context.unify_types(*typs)
+                _check_item_type(unified, 'set', loc=self.loc)
+                typeinfer.add_type(self.target, types.Set(unified))
+
+
 class ExhaustIterConstraint(object):
     def __init__(self, target, count, iterator, loc):
         self.target = target
@@ -373,10 +416,15 @@ class SetItemConstraint(object):
         valtys = typevars[self.value.name].get()
 
         for ty, it, vt in itertools.product(targettys, idxtys, valtys):
-            if not typeinfer.context.resolve_setitem(target=ty,
-                                                     index=it, value=vt):
+            sig = typeinfer.context.resolve_setitem(target=ty,
+                                                    index=it, value=vt)
+            if not sig:
                 raise TypingError("Cannot resolve setitem: %s[%s] = %s" %
                                   (ty, it, vt), loc=self.loc)
+            # If the target's type was refined (e.g. the key and value
+            # types of an empty dict), propagate it.
+            if sig.recvr is not None and sig.recvr != ty:
+                typeinfer.add_type(self.target.name, sig.recvr)
 
 
 class DelItemConstraint(object):
@@ -457,6 +505,7 @@ class TypeInferer(object):
         self.intrcalls = []
         self.delitemcalls = []
         self.setitemcalls = []
+        self.storemapcalls = []
         self.setattrcalls = []
         # Target var -> constraint with refine hook
         self.refine_map = {}
@@ -614,6 +663,13 @@ class TypeInferer(object):
             signature = self.context.resolve_setitem(target, index, value)
             calltypes[inst] = signature
 
+        for inst in self.storemapcalls:
+            target = typemap[inst.dct.name]
+            index = typemap[inst.key.name]
+            value = typemap[inst.value.name]
+            signature = self.context.resolve_setitem(target, index, value)
+            calltypes[inst] = signature
+
         for inst in self.setattrcalls:
             target = typemap[inst.target.name]
             attr = inst.attr
@@ -651,6 +707,8 @@ class TypeInferer(object):
             self.typeof_assign(inst)
         elif isinstance(inst, ir.SetItem):
             self.typeof_setitem(inst)
+        elif isinstance(inst, ir.StoreMap):
+            self.typeof_storemap(inst)
         elif isinstance(inst, ir.DelItem):
             self.typeof_delitem(inst)
         elif isinstance(inst, ir.SetAttr):
@@ -668,6 +726,12 @@ class TypeInferer(object):
         self.constraints.append(constraint)
         self.setitemcalls.append(inst)
 
+    def typeof_storemap(self, inst):
+        constraint = SetItemConstraint(target=inst.dct, index=inst.key,
+                                       value=inst.value, loc=inst.loc)
+        self.constraints.append(constraint)
+        self.storemapcalls.append(inst)
+
     def typeof_delitem(self, inst):
         constraint = DelItemConstraint(target=inst.target, index=inst.index,
                                        loc=inst.loc)
@@ -806,6 +870,14 @@ class TypeInferer(object):
             constraint = BuildListConstraint(target.name, items=expr.items,
                                              loc=inst.loc)
             self.constraints.append(constraint)
+        elif expr.op == 'build_map':
+            constraint = BuildMapConstraint(target.name, items=expr.items,
+                                            loc=inst.loc)
+            self.constraints.append(constraint)
+        elif expr.op == 'build_set':
+            constraint = BuildSetConstraint(target.name, items=expr.items,
+                                            loc=inst.loc)
+            self.constraints.append(constraint)
         elif expr.op == 'cast':
             self.constraints.append(Propagate(dst=target.name,
                                               src=expr.value.name,
@@ -657,6 +657,31 @@ class UnicodeCharSeq(Type):
         return self.count
 
 
+class UnicodeType(IterableType):
+    """
+    Type class for native (immutable) unicode strings, i.e. Python 3
+    str objects.
+    """
+    mutable = False
+
+    def __init__(self, name):
+        super(UnicodeType, self).__init__(name)
+
+    @property
+    def iterator_type(self):
+        return UnicodeIteratorType(self)
+
+
+class UnicodeIteratorType(SimpleIteratorType):
+    """
+    Type class for iterators over unicode strings.
+    """
+
+    def __init__(self, dtype):
+        name = "iter_unicode"
+        super(UnicodeIteratorType, self).__init__(name, dtype)
+
+
 class Record(Type):
     """
     A Numpy structured scalar.  *descr* is the string representation
@@ -857,7 +882,9 @@ class Array(Buffer):
         """
         Convert this Array to the *other*.
         """
-        if (isinstance(other, Array) and other.ndim == self.ndim
+        # Arrays can't be converted to a more specific kind of array
+        # (e.g. a regular array to a memory-mapped array)
+        if (isinstance(self, type(other)) and other.ndim == self.ndim
             and other.dtype == self.dtype):
             if (other.layout in ('A', self.layout)
                 and (self.mutable or not other.mutable)
@@ -865,6 +892,51 @@ class Array(Buffer):
                 return Conversion.safe
 
 
+class MemMapArray(Array):
+    """
+    Type class for Numpy memory-mapped arrays (numpy.memmap instances).
+    Views of a memory-mapped array are memory-mapped arrays as well.
+    """
+
+    def __init__(self, dtype, ndim, layout, readonly=False, name=None,
+                 aligned=True):
+        if name is None:
+            type_name = "memmap"
+            if readonly:
+                type_name = "readonly " + type_name
+            if (not aligned or
+                (isinstance(dtype, Record) and not dtype.aligned)):
+                type_name = "unaligned " + type_name
+            name = "%s(%s, %sd, %s)" % (type_name, dtype, ndim, layout)
+        super(MemMapArray, self).__init__(dtype, ndim, layout,
+                                          readonly=readonly, name=name,
+                                          aligned=aligned)
+
+    def copy(self, dtype=None, ndim=None, layout=None, readonly=None):
+        if dtype is None:
+            dtype = self.dtype
+        if ndim is None:
+            ndim = self.ndim
+        if layout is None:
+            layout = self.layout
+        if readonly is None:
+            readonly = not self.mutable
+        return MemMapArray(dtype=dtype, ndim=ndim, layout=layout,
+                           readonly=readonly, aligned=self.aligned)
+
+    def unify(self, typingctx, other):
+        """
+        Unify this with the *other* array; the result is only a
+        memory-mapped array if both are.
+        """
+        res = super(MemMapArray, self).unify(typingctx, other)
+        if res is not None and isinstance(other, MemMapArray):
+            res = MemMapArray(dtype=res.dtype, ndim=res.ndim,
+                              layout=res.layout, readonly=not res.mutable,
+                              aligned=res.aligned)
+        return res
+
+
 class ArrayCTypes(Type):
     """
     This is the type for `numpy.ndarray.ctypes`.
@@ -1174,6 +1246,61 @@ class List(MutableSequence):
         return self.dtype.is_precise()
 
 
+class TypedList(List):
+    """
+    Type class for numba.typed.List objects: lists whose native storage
+    is shared with the Python object, instead of being copied from and
+    reflected into a Python list.
+    """
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.reflected = False
+        name = "typed list(%s)" % (self.dtype,)
+        super(List, self).__init__(name=name, param=True)
+
+    def copy(self, dtype=None, reflected=None):
+        if dtype is None:
+            dtype = self.dtype
+        return TypedList(dtype)
+
+    def unify(self, typingctx, other):
+        if isinstance(other, List) and not other.reflected:
+            dtype = typingctx.unify_pairs(self.dtype, other.dtype)
+            if dtype != pyobject:
+                return TypedList(dtype)
+
+    def can_convert_from(self, typingctx, other):
+        # A native list has the same representation and can be handed
+        # over, but not a list reflected into a Python list
+        if (isinstance(other, List) and not other.reflected and
+                other.dtype == self.dtype):
+            return Conversion.safe
+
+
+class TypedListClass(Callable, Opaque):
+    """
+    Type class for the constructor of numba.typed.List objects of a
+    given list type.  Calling it creates an empty list.
+    """
+
+    def __init__(self, list_type):
+        self.list_type = list_type
+        name = "class(%s)" % (list_type,)
+        super(TypedListClass, self).__init__(name, param=True)
+
+    def get_call_type(self, context, args, kws):
+        # Overriden by the __call__ constructor resolution in typing.listdecl
+        return None
+
+    def get_call_signatures(self):
+        return (), True
+
+    @property
+    def key(self):
+        return self.list_type
+
+
 class ListIter(SimpleIteratorType):
     """
     Type class for list iterators.
@@ -1212,6 +1339,268 @@ class ListPayload(Type):
         return self.list_type
 
 
+class Dict(IterableType):
+    """
+    Type class for homogenous dictionaries (hash tables).
+    """
+    mutable = True
+
+    def __init__(self, key_type, value_type, reflected=False):
+        self.key_type = key_type
+        self.value_type = value_type
+        self.reflected = reflected
+        cls_name = "reflected dict" if reflected else "dict"
+        name = "%s(%s, %s)" % (cls_name, key_type, value_type)
+        super(Dict, self).__init__(name=name, param=True)
+
+    def copy(self, key_type=None, value_type=None, reflected=None):
+        if key_type is None:
+            key_type = self.key_type
+        if value_type is None:
+            value_type = self.value_type
+        if reflected is None:
+            reflected = self.reflected
+        return Dict(key_type, value_type, reflected)
+
+    def unify(self, typingctx, other):
+        if isinstance(other, Dict):
+            key_type = typingctx.unify_pairs(self.key_type, other.key_type)
+            value_type = typingctx.unify_pairs(self.value_type,
+                                               other.value_type)
+            reflected = self.reflected or other.reflected
+            if key_type != pyobject and value_type != pyobject:
+                return Dict(key_type, value_type, reflected)
+
+    @property
+    def key(self):
+        return self.key_type, self.value_type, self.reflected
+
+    @property
+    def iterator_type(self):
+        return DictIter(self, 'keys')
+
+    def is_precise(self):
+        return self.key_type.is_precise() and self.value_type.is_precise()
+
+
+class DictIter(SimpleIteratorType):
+    """
+    Type class for dict iterators.  *kind* is one of 'keys', 'values'
+    and 'items'.
+    """
+
+    def __init__(self, dict_type, kind):
+        self.dict_type = dict_type
+        self.kind = kind
+        if kind == 'keys':
+            yield_type = dict_type.key_type
+        elif kind == 'values':
+            yield_type = dict_type.value_type
+        elif kind == 'items':
+            yield_type = BaseTuple.from_types((dict_type.key_type,
+                                               dict_type.value_type))
+        else:
+            raise ValueError("invalid dict iterator kind %r" % (kind,))
+        name = 'iter(%s.%s)' % (dict_type, kind)
+        super(DictIter, self).__init__(name, yield_type)
+
+    def unify(self, typingctx, other):
+        if isinstance(other, DictIter) and other.kind == self.kind:
+            dict_type = typingctx.unify_pairs(self.dict_type, other.dict_type)
+            if dict_type != pyobject:
+                return DictIter(dict_type, self.kind)
+
+    @property
+    def key(self):
+        return self.dict_type, self.kind
+
+
+class DictView(SimpleIterableType):
+    """
+    Type class for the views returned by dict.keys(), dict.values()
+    and dict.items().
+    """
+
+    def __init__(self, dict_type, kind):
+        self.dict_type = dict_type
+        self.kind = kind
+        name = '%s.%s()' % (dict_type, kind)
+        super(DictView, self).__init__(name, DictIter(dict_type, kind))
+
+    @property
+    def key(self):
+        return self.dict_type, self.kind
+
+
+class DictPayload(Type):
+    """
+    Internal type class for the dynamically-allocated payload of a dict.
+    """
+
+    def __init__(self, dict_type):
+        self.dict_type = dict_type
+        name = 'payload(%s)' % dict_type
+        super(DictPayload, self).__init__(name, param=True)
+
+    @property
+    def key(self):
+        return self.dict_type
+
+
+class Set(IterableType):
+    """
+    Type class for homogenous sets (hash tables without values).
+    """
+    mutable = True
+
+    def __init__(self, dtype, reflected=False):
+        self.dtype = dtype
+        self.reflected = reflected
+        cls_name = "reflected set" if reflected else "set"
+        name = "%s(%s)" % (cls_name, dtype)
+        super(Set, self).__init__(name=name, param=True)
+
+    def copy(self, dtype=None, reflected=None):
+        if dtype is None:
+            dtype = self.dtype
+        if reflected is None:
+            reflected = self.reflected
+        return Set(dtype, reflected)
+
+    def unify(self, typingctx, other):
+        if isinstance(other, Set):
+            dtype = typingctx.unify_pairs(self.dtype, other.dtype)
+            reflected = self.reflected or other.reflected
+            if dtype != pyobject:
+                return Set(dtype, reflected)
+
+    @property
+    def key(self):
+        return self.dtype, self.reflected
+
+    @property
+    def iterator_type(self):
+        return SetIter(self)
+
+    def is_precise(self):
+        return self.dtype.is_precise()
+
+
+class SetIter(SimpleIteratorType):
+    """
+    Type class for set iterators.
+    """
+
+    def __init__(self, set_type):
+        self.set_type = set_type
+        name = 'iter(%s)' % (set_type,)
+        super(SetIter, self).__init__(name, set_type.dtype)
+
+    def unify(self, typingctx, other):
+        if isinstance(other, SetIter):
+            set_type = typingctx.unify_pairs(self.set_type, other.set_type)
+            if set_type != pyobject:
+                return SetIter(set_type)
+
+    @property
+    def key(self):
+        return self.set_type
+
+
+class SetPayload(Type):
+    """
+    Internal type class for the dynamically-allocated payload of a set.
+    """
+
+    def __init__(self, set_type):
+        self.set_type = set_type
+        name = 'payload(%s)' % set_type
+        super(SetPayload, self).__init__(name, param=True)
+
+    @property
+    def key(self):
+        return self.set_type
+
+
+class ClassType(Callable, Opaque):
+    """
+    Type class for the constructor of a jitclass (see numba.jitclass).
+    Calling it creates a new instance and runs its __init__ method.
+    """
+
+    def __init__(self, class_def, struct, jitmethods, jitprops):
+        self.class_def = class_def
+        # An ordered mapping of field names to field types
+        self.struct = struct
+        # A mapping of method names to Dispatcher objects
+        self.jitmethods = jitmethods
+        # A mapping of property names to {'get': ..., 'set': ...} dicts
+        # of Dispatcher objects
+        self.jitprops = jitprops
+        name = "jitclass.%s#%x" % (class_def.__name__, id(class_def))
+        super(ClassType, self).__init__(name, param=True)
+        self.instance_type = ClassInstanceType(self)
+
+    def get_call_type(self, context, args, kws):
+        # Overriden by the __call__ constructor resolution in typing.classdecl
+        return None
+
+    def get_call_signatures(self):
+        return (), True
+
+    @property
+    def key(self):
+        return self.class_def
+
+
+class ClassInstanceType(Type):
+    """
+    Type class for jitclass instances: references to a reference-counted
+    native structure holding the fields.
+    """
+    mutable = True
+
+    def __init__(self, class_type):
+        self.class_type = class_type
+        name = "instance(%s)" % (class_type,)
+        super(ClassInstanceType, self).__init__(name, param=True)
+
+    def get_data_type(self):
+        return ClassDataType(self)
+
+    @property
+    def struct(self):
+        return self.class_type.struct
+
+    @property
+    def jitmethods(self):
+        return self.class_type.jitmethods
+
+    @property
+    def jitprops(self):
+        return self.class_type.jitprops
+
+    @property
+    def key(self):
+        return self.class_type
+
+
+class ClassDataType(Type):
+    """
+    Internal type class for the native structure holding the fields of
+    a jitclass instance.
+    """
+
+    def __init__(self, instance_type):
+        self.instance_type = instance_type
+        name = "data(%s)" % (instance_type.class_type,)
+        super(ClassDataType, self).__init__(name, param=True)
+
+    @property
+    def key(self):
+        return self.instance_type
+
+
 class MemInfoPointer(Type):
     """
     Pointer to a Numba "meminfo" (i.e. the information for a managed
@@ -1401,6 +1790,7 @@ ellipsis = EllipsisType('...')
 Any = Phantom('any')
 undefined = Undefined('undefined')
 string = Opaque('str')
+unicode_type = UnicodeType('unicode_type')
 
 # No operation is defined on voidptr
 # Can only pass it around
@@ -1429,6 +1819,7 @@ complex64 = Complex('complex64', float32)
 complex128 = Complex('complex128', float64)
 
 len_type = Phantom('len')
+hash_type = Phantom('hash')
 range_type = Phantom('range')
 slice_type = Phantom('slice')
 abs_type = Phantom('abs')
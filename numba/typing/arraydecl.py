@@ -82,8 +82,8 @@ def get_array_index_type(ary, idx):
         res = ary.dtype
 
     elif advanced:
-        # Result is a copy
-        res = ary.copy(ndim=ndim, layout='C', readonly=False)
+        # Result is a copy (a plain array even if *ary* is memory-mapped)
+        res = types.Array(ary.dtype, ndim, 'C')
 
     else:
         # Result is a view
@@ -242,7 +242,8 @@ class ArrayAttribute(AttributeTemplate):
     def resolve_copy(self, ary, args, kws):
         assert not args
         assert not kws
-        retty = ary.copy(layout="C")
+        # The copy is a plain array even if *ary* is memory-mapped
+        retty = types.Array(ary.dtype, ary.ndim, "C")
         return signature(retty)
 
     @bound_function("array.nonzero")
@@ -321,6 +322,17 @@ class NestedArrayAttribute(ArrayAttribute):
     key = types.NestedArray
 
 
+@builtin_attr
+class MemMapArrayAttribute(ArrayAttribute):
+    key = types.MemMapArray
+
+    @bound_function("array.flush")
+    def resolve_flush(self, ary, args, kws):
+        assert not args
+        assert not kws
+        return signature(types.none)
+
+
 def _expand_integer(ty):
     """
     If *ty* is an integer, expand it to a machine int (like Numpy).
@@ -397,4 +409,5 @@ class CmpOpEqArray(AbstractTemplate):
         assert not kws
         [va, vb] = args
         if isinstance(va, types.Array) and va == vb:
-            return signature(va.copy(dtype=types.boolean), va, vb)
+            retty = types.Array(types.boolean, va.ndim, va.layout)
+            return signature(retty, va, vb)
@@ -3,6 +3,7 @@ from __future__ import print_function, division, absolute_import
 import itertools
 
 from numba import types, intrinsics
+from numba.special import prange
 from numba.utils import PYVERSION, RANGE_ITER_OBJECTS, operator_map
 from numba.typing.templates import (AttributeTemplate, ConcreteTemplate,
                                     AbstractTemplate, builtin_global, builtin,
@@ -11,7 +12,9 @@ from numba.typing.templates import (AttributeTemplate, ConcreteTemplate,
 
 for obj in RANGE_ITER_OBJECTS:
     builtin_global(obj, types.range_type)
+builtin_global(prange, types.range_type)
 builtin_global(len, types.len_type)
+builtin_global(hash, types.hash_type)
 builtin_global(slice, types.slice_type)
 builtin_global(abs, types.abs_type)
 builtin_global(print, types.print_type)
@@ -33,7 +36,7 @@ class PrintOthers(AbstractTemplate):
         if ty in types.integer_domain or ty in types.real_domain:
             return True
 
-        if isinstance(ty, types.CharSeq):
+        if isinstance(ty, (types.CharSeq, types.UnicodeType)):
             return True
 
     def generic(self, args, kws):
@@ -463,6 +466,24 @@ class Len(AbstractTemplate):
             return signature(types.intp, val)
 
 
+@builtin
+class Hash(AbstractTemplate):
+    key = types.hash_type
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if isinstance(val, (types.Boolean, types.Number, types.UnicodeType)):
+            return signature(types.intp, val)
+        if isinstance(val, types.BaseTuple):
+            # Tuples are hashable if all their items are
+            for ty in val:
+                if self.context.resolve_function_type(self.key, (ty,),
+                                                      {}) is None:
+                    return
+            return signature(types.intp, val)
+
+
 @builtin
 class TupleBool(AbstractTemplate):
     key = "is_true"
@@ -0,0 +1,106 @@
+"""
+Typing declarations for jitclass constructors and instances
+(see numba.jitclass).
+"""
+from __future__ import absolute_import, print_function
+
+from .. import types
+from .templates import (AttributeTemplate, FunctionTemplate, Registry,
+                        signature)
+
+
+registry = Registry()
+builtin = registry.register
+builtin_global = registry.register_global
+builtin_attr = registry.register_attr
+
+
+def _type_method_call(context, method, this, args, kws):
+    """
+    Resolve the signature of a call to the jitted *method* with *this*
+    as its first argument.  The returned signature doesn't include
+    *this*, so that it matches the explicit arguments of the call.
+    """
+    disp_type = types.Dispatcher(method)
+    sig = disp_type.get_call_type(context, (this,) + tuple(args), kws)
+    if sig is None:
+        return
+    out = signature(sig.return_type, *sig.args[1:])
+    pysig = sig.pysig
+    if pysig is not None:
+        # Lowering folds the explicit arguments against the signature
+        parameters = list(pysig.parameters.values())[1:]
+        out.pysig = pysig.replace(parameters=parameters)
+    return out
+
+
+class _ConstructorTemplate(FunctionTemplate):
+    """
+    Typing of a jitclass constructor call, based on the class' __init__.
+    """
+
+    def apply(self, args, kws):
+        instance_type = self.key.instance_type
+        init = instance_type.jitmethods.get('__init__')
+        if init is None:
+            if args or kws:
+                return
+            return signature(instance_type)
+        sig = _type_method_call(self.context, init, instance_type, args, kws)
+        if sig is not None:
+            if sig.return_type != types.none:
+                raise TypeError("__init__() should return None, not %s"
+                                % (sig.return_type,))
+            out = signature(instance_type, *sig.args)
+            out.pysig = sig.pysig
+            return out
+
+
+@builtin_attr
+class ClassTypeAttribute(AttributeTemplate):
+    key = types.ClassType
+
+    def resolve___call__(self, classty):
+        """
+        Resolve a jitclass constructor, creating a new instance
+        """
+        template = type("Constructor(%s)" % (classty,),
+                        (_ConstructorTemplate,), dict(key=classty))
+        return types.Function(template)
+
+
+class _MethodTemplate(FunctionTemplate):
+    """
+    Typing of a jitclass method call.  The template key is used by
+    the target to look up the method's implementation.
+    """
+
+    def apply(self, args, kws):
+        instance_type = self.this
+        method = instance_type.jitmethods[self.key[1]]
+        sig = _type_method_call(self.context, method, instance_type,
+                                args, kws)
+        if sig is not None:
+            sig.recvr = instance_type
+            return sig
+
+
+@builtin_attr
+class ClassInstanceAttribute(AttributeTemplate):
+    key = types.ClassInstanceType
+
+    def generic_resolve(self, instance, attr):
+        if attr in instance.struct:
+            return instance.struct[attr]
+
+        elif attr in instance.jitmethods:
+            template = type("Method(%s.%s)" % (instance.class_type, attr),
+                            (_MethodTemplate,),
+                            dict(key=(types.ClassInstanceType, attr)))
+            return types.BoundFunction(template, instance)
+
+        elif attr in instance.jitprops:
+            getter = instance.jitprops[attr]['get']
+            sig = _type_method_call(self.context, getter, instance, (), {})
+            if sig is not None:
+                return sig.return_type
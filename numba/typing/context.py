@@ -11,8 +11,8 @@ from .typeof import typeof, Purpose
 
 # Initialize declarations
 from . import (
-    builtins, arraydecl, cmathdecl, listdecl, mathdecl, npdatetime, npydecl,
-    operatordecl, randomdecl)
+    builtins, arraydecl, classdecl, cmathdecl, dictdecl, listdecl, mathdecl,
+    npdatetime, npydecl, operatordecl, randomdecl, setdecl, unicodedecl)
 from numba import utils
 from . import ctypes_utils, cffi_utils, bufproto
 
@@ -143,6 +143,20 @@ class BaseContext(object):
             if self.can_convert(value, expectedty) is not None:
                 return templates.signature(types.void, target, value)
 
+        if isinstance(target, types.ClassInstanceType):
+            if attr in target.struct:
+                expectedty = target.struct[attr]
+                if self.can_convert(value, expectedty) is not None:
+                    return templates.signature(types.void, target, expectedty)
+            elif attr in target.jitprops:
+                setter = target.jitprops[attr].get('set')
+                if setter is not None:
+                    sig = classdecl._type_method_call(self, setter, target,
+                                                      (value,), {})
+                    if sig is not None:
+                        return templates.signature(types.void, target,
+                                                   *sig.args)
+
     def resolve_setitem(self, target, index, value):
         args = target, index, value
         kws = ()
@@ -438,11 +452,15 @@ class BaseContext(object):
 
 class Context(BaseContext):
     def init(self):
+        self.install(classdecl.registry)
         self.install(cmathdecl.registry)
+        self.install(dictdecl.registry)
         self.install(listdecl.registry)
         self.install(mathdecl.registry)
         self.install(npydecl.registry)
         self.install(operatordecl.registry)
         self.install(randomdecl.registry)
+        self.install(setdecl.registry)
+        self.install(unicodedecl.registry)
         self.install(cffi_utils.registry)
 
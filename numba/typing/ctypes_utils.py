@@ -38,7 +38,10 @@ def convert_ctypes(ctypeobj):
     try:
         return CTYPES_MAP[ctypeobj]
     except KeyError:
-        raise TypeError("unhandled ctypes type: %s" % ctypeobj)
+        pass
+    if isinstance(ctypeobj, type) and issubclass(ctypeobj, ctypes._Pointer):
+        return types.CPointer(convert_ctypes(ctypeobj._type_))
+    raise TypeError("unhandled ctypes type: %s" % ctypeobj)
 
 
 def is_ctypes_funcptr(obj):
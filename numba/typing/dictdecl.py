@@ -0,0 +1,243 @@
+from __future__ import absolute_import, print_function
+
+from .. import datamodel, types
+from ..errors import TypingError
+from .templates import (AbstractTemplate, AttributeTemplate, Registry,
+                        signature, bound_function)
+
+
+registry = Registry()
+builtin = registry.register
+builtin_global = registry.register_global
+builtin_attr = registry.register_attr
+
+
+def _is_hashable(context, ty):
+    return context.resolve_function_type(types.hash_type, (ty,), {}) is not None
+
+
+def _check_item_type(ty, container, loc=None):
+    """
+    Raise a TypingError if values of type *ty* hold NRT references, as
+    native dicts and sets don't own references to their items.
+    """
+    if not ty.is_precise():
+        return
+    dmm = datamodel.default_manager
+    try:
+        model = dmm[ty]
+    except KeyError:
+        return
+    if any(dmm[t].has_nrt_meminfo() for t in model.traverse_types()):
+        raise TypingError("cannot store items of type %s in a %s"
+                          % (ty, container), loc=loc)
+
+
+def _refine_dict(context, dct, key_type, value_type):
+    """
+    Return the dict type able to store keys of *key_type* and values of
+    *value_type* in addition to the contents of *dct*, or None.
+    """
+    key_type = context.unify_pairs(dct.key_type, key_type)
+    value_type = context.unify_pairs(dct.value_type, value_type)
+    if key_type == types.pyobject or value_type == types.pyobject:
+        return
+    _check_item_type(key_type, 'dict')
+    _check_item_type(value_type, 'dict')
+    if key_type.is_precise() and not _is_hashable(context, key_type):
+        return
+    return dct.copy(key_type=key_type, value_type=value_type)
+
+
+class DictBuiltin(AbstractTemplate):
+    key = dict
+
+    def generic(self, args, kws):
+        assert not kws
+        if not args:
+            return signature(types.Dict(types.undefined, types.undefined))
+        if len(args) == 1:
+            dct, = args
+            if isinstance(dct, types.Dict):
+                _check_item_type(dct.key_type, 'dict')
+                _check_item_type(dct.value_type, 'dict')
+                return signature(dct.copy(reflected=False), dct)
+
+builtin_global(dict, types.Function(DictBuiltin))
+
+
+@builtin
+class DictLen(AbstractTemplate):
+    key = types.len_type
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if isinstance(val, types.Dict):
+            return signature(types.intp, val)
+
+
+@builtin
+class DictBool(AbstractTemplate):
+    key = "is_true"
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if isinstance(val, types.Dict):
+            return signature(types.boolean, val)
+
+
+@builtin
+class GetItemDict(AbstractTemplate):
+    key = "getitem"
+
+    def generic(self, args, kws):
+        dct, key = args
+        if (isinstance(dct, types.Dict) and dct.is_precise() and
+                self.context.can_convert(key, dct.key_type) is not None):
+            return signature(dct.value_type, dct, dct.key_type)
+
+
+@builtin
+class SetItemDict(AbstractTemplate):
+    key = "setitem"
+
+    def generic(self, args, kws):
+        dct, key, value = args
+        if isinstance(dct, types.Dict):
+            refined = _refine_dict(self.context, dct, key, value)
+            if refined is None:
+                return
+            sig = signature(types.none, dct, refined.key_type,
+                            refined.value_type)
+            if refined != dct:
+                # Let type inference refine the dict's type (e.g. if
+                # it was created empty)
+                sig.recvr = refined
+            return sig
+
+
+@builtin
+class DelItemDict(AbstractTemplate):
+    key = "delitem"
+
+    def generic(self, args, kws):
+        dct, key = args
+        if (isinstance(dct, types.Dict) and dct.is_precise() and
+                self.context.can_convert(key, dct.key_type) is not None):
+            return signature(types.none, dct, dct.key_type)
+
+
+@builtin
+class InDict(AbstractTemplate):
+    key = "in"
+
+    def generic(self, args, kws):
+        key, dct = args
+        if (isinstance(dct, types.Dict) and dct.is_precise() and
+                self.context.can_convert(key, dct.key_type) is not None):
+            return signature(types.boolean, dct.key_type, dct)
+
+
+@builtin_attr
+class DictAttribute(AttributeTemplate):
+    key = types.Dict
+
+    @bound_function("dict.clear")
+    def resolve_clear(self, dct, args, kws):
+        assert not args
+        assert not kws
+        return signature(types.none)
+
+    @bound_function("dict.copy")
+    def resolve_copy(self, dct, args, kws):
+        assert not args
+        assert not kws
+        return signature(dct)
+
+    @bound_function("dict.get")
+    def resolve_get(self, dct, args, kws):
+        assert not kws
+        if len(args) == 1:
+            key, = args
+            default = types.none
+        else:
+            key, default = args
+        if self.context.can_convert(key, dct.key_type) is None:
+            return
+        restype = self.context.unify_pairs(dct.value_type, default)
+        if restype == types.pyobject:
+            return
+        if len(args) == 1:
+            return signature(restype, dct.key_type)
+        else:
+            return signature(restype, dct.key_type, default)
+
+    @bound_function("dict.pop")
+    def resolve_pop(self, dct, args, kws):
+        assert not kws
+        if self.context.can_convert(args[0], dct.key_type) is None:
+            return
+        if len(args) == 1:
+            return signature(dct.value_type, dct.key_type)
+        elif len(args) == 2:
+            default = args[1]
+            restype = self.context.unify_pairs(dct.value_type, default)
+            if restype != types.pyobject:
+                return signature(restype, dct.key_type, default)
+
+    @bound_function("dict.setdefault")
+    def resolve_setdefault(self, dct, args, kws):
+        key, default = args
+        assert not kws
+        refined = _refine_dict(self.context, dct, key, default)
+        if refined is None:
+            return
+        sig = signature(refined.value_type, refined.key_type,
+                        refined.value_type)
+        sig.recvr = refined
+        return sig
+
+    @bound_function("dict.update")
+    def resolve_update(self, dct, args, kws):
+        other, = args
+        assert not kws
+        if not isinstance(other, types.Dict):
+            return
+        refined = _refine_dict(self.context, dct, other.key_type,
+                               other.value_type)
+        if refined is None:
+            return
+        sig = signature(types.none, other)
+        sig.recvr = refined
+        return sig
+
+    @bound_function("dict.keys")
+    def resolve_keys(self, dct, args, kws):
+        assert not args
+        assert not kws
+        return signature(types.DictView(dct, 'keys'))
+
+    @bound_function("dict.values")
+    def resolve_values(self, dct, args, kws):
+        assert not args
+        assert not kws
+        return signature(types.DictView(dct, 'values'))
+
+    @bound_function("dict.items")
+    def resolve_items(self, dct, args, kws):
+        assert not args
+        assert not kws
+        return signature(types.DictView(dct, 'items'))
+
+
+@builtin
+class DictViewLen(AbstractTemplate):
+    key = types.len_type
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if isinstance(val, types.DictView):
+            return signature(types.intp, val)
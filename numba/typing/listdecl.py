@@ -154,6 +154,22 @@ class ListAttribute(AttributeTemplate):
                                    list)
 
 
+@builtin_attr
+class TypedListClassAttribute(AttributeTemplate):
+    key = types.TypedListClass
+
+    def resolve___call__(self, classty):
+        """
+        Resolve a typed list constructor (creating an empty list)
+        """
+        ty = classty.list_type
+
+        def typer():
+            return ty
+
+        return types.Function(make_callable_template(key=ty, typer=typer))
+
+
 @builtin
 class AddList(AbstractTemplate):
     key = "+"
@@ -7,7 +7,7 @@ from .templates import (AttributeTemplate, AbstractTemplate, CallableTemplate,
 
 from ..numpy_support import (ufunc_find_matching_loop,
                              supported_ufunc_loop, as_dtype,
-                             from_dtype)
+                             from_dtype, carray, farray, madvise)
 from ..numpy_support import version as numpy_version
 
 from ..errors import TypingError
@@ -142,7 +142,8 @@ class UnaryPositiveArray(AbstractTemplate):
         assert not kws
         if len(args) == 1 and isinstance(args[0], types.Array):
             arg_ty = args[0]
-            return arg_ty.copy()(arg_ty)
+            retty = types.Array(arg_ty.dtype, arg_ty.ndim, arg_ty.layout)
+            return signature(retty, arg_ty)
 
 
 class NumpyRulesArrayOperator(Numpy_rules_ufunc):
@@ -434,7 +435,7 @@ class NdConstructorLike(CallableTemplate):
             else:
                 nb_dtype = _parse_dtype(dtype)
             if nb_dtype is not None:
-                return arr.copy(dtype=nb_dtype)
+                return types.Array(nb_dtype, arr.ndim, arr.layout)
 
         return typer
 
@@ -508,7 +509,7 @@ if numpy_version >= (1, 8):
                 else:
                     nb_dtype = _parse_dtype(dtype)
                 if nb_dtype is not None:
-                    return arr.copy(dtype=nb_dtype)
+                    return types.Array(nb_dtype, arr.ndim, arr.layout)
 
             return typer
 
@@ -637,6 +638,72 @@ class NdFromBuffer(CallableTemplate):
 builtin_global(numpy.frombuffer, types.Function(NdFromBuffer))
 
 
+class _CFArray(CallableTemplate):
+    """
+    Typing template for numba.carray() and numba.farray().
+    """
+    layout = None
+
+    def generic(self):
+        def typer(ptr, shape, dtype=None, owner=None):
+            if isinstance(ptr, types.CPointer):
+                ptr_dtype = ptr.dtype
+            elif ptr == types.voidptr or isinstance(ptr, types.Integer):
+                ptr_dtype = None
+            else:
+                return
+            if dtype is None or dtype == types.none:
+                nb_dtype = ptr_dtype
+            else:
+                nb_dtype = _parse_dtype(dtype)
+                if ptr_dtype is not None and nb_dtype != ptr_dtype:
+                    raise TypeError("mismatching dtype '%s' for pointer "
+                                    "type '%s'" % (nb_dtype, ptr))
+            if nb_dtype is None:
+                return
+            if owner is not None and owner != types.none:
+                if not isinstance(owner, types.Array):
+                    return
+
+            ndim = _parse_shape(shape)
+            if ndim is not None:
+                return types.Array(dtype=nb_dtype, ndim=ndim,
+                                   layout=self.layout)
+
+        return typer
+
+
+@builtin
+class CArray(_CFArray):
+    key = carray
+    layout = 'C'
+
+
+@builtin
+class FArray(_CFArray):
+    key = farray
+    layout = 'F'
+
+builtin_global(carray, types.Function(CArray))
+builtin_global(farray, types.Function(FArray))
+
+
+@builtin
+class MAdvise(AbstractTemplate):
+    key = madvise
+
+    def generic(self, args, kws):
+        assert not kws
+        if len(args) != 2:
+            return
+        ary, advice = args
+        if (isinstance(ary, types.MemMapArray) and
+            isinstance(advice, types.Integer)):
+            return signature(types.none, ary, types.intc)
+
+builtin_global(madvise, types.Function(MAdvise))
+
+
 @builtin
 class NdSort(CallableTemplate):
     key = numpy.sort
@@ -0,0 +1,271 @@
+from __future__ import absolute_import, print_function
+
+from .. import types
+from .templates import (AbstractTemplate, AttributeTemplate, Registry,
+                        signature, bound_function)
+from .dictdecl import _check_item_type, _is_hashable
+
+
+registry = Registry()
+builtin = registry.register
+builtin_global = registry.register_global
+builtin_attr = registry.register_attr
+
+
+def _refine_set(context, st, dtype):
+    """
+    Return the set type able to store items of *dtype* in addition to
+    the contents of *st*, or None.
+    """
+    dtype = context.unify_pairs(st.dtype, dtype)
+    if dtype == types.pyobject:
+        return
+    _check_item_type(dtype, 'set')
+    if dtype.is_precise() and not _is_hashable(context, dtype):
+        return
+    return st.copy(dtype=dtype)
+
+
+class SetBuiltin(AbstractTemplate):
+    key = set
+
+    def generic(self, args, kws):
+        assert not kws
+        if not args:
+            return signature(types.Set(types.undefined))
+        if len(args) == 1:
+            iterable, = args
+            if isinstance(iterable, types.Set):
+                _check_item_type(iterable.dtype, 'set')
+                return signature(iterable.copy(reflected=False), iterable)
+            if isinstance(iterable, types.IterableType):
+                dtype = iterable.iterator_type.yield_type
+                _check_item_type(dtype, 'set')
+                if _is_hashable(self.context, dtype):
+                    return signature(types.Set(dtype), iterable)
+
+builtin_global(set, types.Function(SetBuiltin))
+
+
+@builtin
+class SetLen(AbstractTemplate):
+    key = types.len_type
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if isinstance(val, types.Set):
+            return signature(types.intp, val)
+
+
+@builtin
+class SetBool(AbstractTemplate):
+    key = "is_true"
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if isinstance(val, types.Set):
+            return signature(types.boolean, val)
+
+
+@builtin
+class InSet(AbstractTemplate):
+    key = "in"
+
+    def generic(self, args, kws):
+        item, st = args
+        if (isinstance(st, types.Set) and st.is_precise() and
+                self.context.can_convert(item, st.dtype) is not None):
+            return signature(types.boolean, st.dtype, st)
+
+
+def _same_dtype_sets(a, b):
+    return (isinstance(a, types.Set) and isinstance(b, types.Set) and
+            a.dtype == b.dtype)
+
+
+@builtin_attr
+class SetAttribute(AttributeTemplate):
+    key = types.Set
+
+    @bound_function("set.add")
+    def resolve_add(self, st, args, kws):
+        item, = args
+        assert not kws
+        refined = _refine_set(self.context, st, item)
+        if refined is None:
+            return
+        sig = signature(types.none, refined.dtype)
+        sig.recvr = refined
+        return sig
+
+    @bound_function("set.clear")
+    def resolve_clear(self, st, args, kws):
+        assert not args
+        assert not kws
+        return signature(types.none)
+
+    @bound_function("set.copy")
+    def resolve_copy(self, st, args, kws):
+        assert not args
+        assert not kws
+        return signature(st)
+
+    @bound_function("set.discard")
+    def resolve_discard(self, st, args, kws):
+        item, = args
+        assert not kws
+        if self.context.can_convert(item, st.dtype) is not None:
+            return signature(types.none, st.dtype)
+
+    @bound_function("set.remove")
+    def resolve_remove(self, st, args, kws):
+        item, = args
+        assert not kws
+        if self.context.can_convert(item, st.dtype) is not None:
+            return signature(types.none, st.dtype)
+
+    @bound_function("set.pop")
+    def resolve_pop(self, st, args, kws):
+        assert not args
+        assert not kws
+        return signature(st.dtype)
+
+    @bound_function("set.update")
+    def resolve_update(self, st, args, kws):
+        iterable, = args
+        assert not kws
+        if not isinstance(iterable, types.IterableType):
+            return
+        dtype = iterable.iterator_type.yield_type
+        refined = _refine_set(self.context, st, dtype)
+        if refined is None:
+            return
+        sig = signature(types.none, iterable)
+        sig.recvr = refined
+        return sig
+
+    def _resolve_operator(self, st, args, kws):
+        other, = args
+        assert not kws
+        if _same_dtype_sets(st, other):
+            return signature(st.copy(reflected=False), other)
+
+    def _resolve_inplace_operator(self, st, args, kws):
+        other, = args
+        assert not kws
+        if _same_dtype_sets(st, other):
+            return signature(types.none, other)
+
+    def _resolve_comparator(self, st, args, kws):
+        other, = args
+        assert not kws
+        if _same_dtype_sets(st, other):
+            return signature(types.boolean, other)
+
+    resolve_union = bound_function("set.union")(_resolve_operator)
+    resolve_intersection = bound_function("set.intersection")(
+        _resolve_operator)
+    resolve_difference = bound_function("set.difference")(_resolve_operator)
+    resolve_symmetric_difference = bound_function(
+        "set.symmetric_difference")(_resolve_operator)
+
+    resolve_intersection_update = bound_function("set.intersection_update")(
+        _resolve_inplace_operator)
+    resolve_difference_update = bound_function("set.difference_update")(
+        _resolve_inplace_operator)
+    resolve_symmetric_difference_update = bound_function(
+        "set.symmetric_difference_update")(_resolve_inplace_operator)
+
+    resolve_isdisjoint = bound_function("set.isdisjoint")(_resolve_comparator)
+    resolve_issubset = bound_function("set.issubset")(_resolve_comparator)
+    resolve_issuperset = bound_function("set.issuperset")(_resolve_comparator)
+
+
+class SetOperator(AbstractTemplate):
+
+    def generic(self, args, kws):
+        if len(args) != 2:
+            return
+        a, b = args
+        if _same_dtype_sets(a, b):
+            return signature(a.copy(reflected=False), a, b)
+
+
+class InplaceSetOperator(AbstractTemplate):
+
+    def generic(self, args, kws):
+        if len(args) != 2:
+            return
+        a, b = args
+        if _same_dtype_sets(a, b):
+            return signature(a, a, b)
+
+
+class SetComparison(AbstractTemplate):
+
+    def generic(self, args, kws):
+        if len(args) != 2:
+            return
+        a, b = args
+        if _same_dtype_sets(a, b):
+            return signature(types.boolean, a, b)
+
+
+@builtin
+class SetUnion(SetOperator):
+    key = "|"
+
+@builtin
+class InplaceSetUnion(InplaceSetOperator):
+    key = "|="
+
+@builtin
+class SetIntersection(SetOperator):
+    key = "&"
+
+@builtin
+class InplaceSetIntersection(InplaceSetOperator):
+    key = "&="
+
+@builtin
+class SetDifference(SetOperator):
+    key = "-"
+
+@builtin
+class InplaceSetDifference(InplaceSetOperator):
+    key = "-="
+
+@builtin
+class SetSymmetricDifference(SetOperator):
+    key = "^"
+
+@builtin
+class InplaceSetSymmetricDifference(InplaceSetOperator):
+    key = "^="
+
+@builtin
+class SetEq(SetComparison):
+    key = "=="
+
+@builtin
+class SetNe(SetComparison):
+    key = "!="
+
+@builtin
+class SetLt(SetComparison):
+    key = "<"
+
+@builtin
+class SetLe(SetComparison):
+    key = "<="
+
+@builtin
+class SetGt(SetComparison):
+    key = ">"
+
+@builtin
+class SetGe(SetComparison):
+    key = ">="
+
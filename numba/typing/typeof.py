@@ -9,6 +9,7 @@ import numpy as np
 
 from numba import numpy_support, types, utils
 from . import bufproto, cffi_utils
+from .dictdecl import _check_item_type
 
 
 class Purpose(enum.Enum):
@@ -103,6 +104,8 @@ def _typeof_numpy_scalar(val, c):
 
 @typeof_impl.register(str)
 def _typeof_str(val, c):
+    if utils.IS_PY3:
+        return types.unicode_type
     return types.string
 
 @typeof_impl.register(type(None))
@@ -127,6 +130,30 @@ def _typeof_list(val, c):
     ty = typeof_impl(val[0], c)
     return types.List(ty, reflected=True)
 
+@typeof_impl.register(dict)
+def _typeof_dict(val, c):
+    if len(val) == 0:
+        raise ValueError("Cannot type empty dict")
+    key, value = next(iter(val.items()))
+    kt = typeof_impl(key, c)
+    vt = typeof_impl(value, c)
+    if kt is None or vt is None:
+        return
+    _check_item_type(kt, 'dict')
+    _check_item_type(vt, 'dict')
+    return types.Dict(kt, vt, reflected=True)
+
+@typeof_impl.register(set)
+def _typeof_set(val, c):
+    if len(val) == 0:
+        raise ValueError("Cannot type empty set")
+    item = next(iter(val))
+    ty = typeof_impl(item, c)
+    if ty is None:
+        return
+    _check_item_type(ty, 'set')
+    return types.Set(ty, reflected=True)
+
 @typeof_impl.register(slice)
 def _typeof_slice(val, c):
     return types.slice3_type
@@ -145,3 +172,10 @@ def _typeof_ndarray(val, c):
     layout = numpy_support.map_layout(val)
     readonly = not val.flags.writeable
     return types.Array(dtype, val.ndim, layout, readonly=readonly)
+
+@typeof_impl.register(np.memmap)
+def _typeof_memmap(val, c):
+    arrty = _typeof_ndarray(val, c)
+    if arrty is not None:
+        return types.MemMapArray(arrty.dtype, arrty.ndim, arrty.layout,
+                                 readonly=not arrty.mutable)
@@ -0,0 +1,168 @@
+from __future__ import absolute_import, print_function
+
+from .. import types
+from .builtins import normalize_1d_index
+from .templates import (AbstractTemplate, AttributeTemplate, Registry,
+                        signature, bound_function)
+
+
+registry = Registry()
+builtin = registry.register
+builtin_global = registry.register_global
+builtin_attr = registry.register_attr
+
+
+def _is_unicode(*tys):
+    return all(isinstance(ty, types.UnicodeType) for ty in tys)
+
+
+@builtin
+class UnicodeLen(AbstractTemplate):
+    key = types.len_type
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if _is_unicode(val):
+            return signature(types.intp, val)
+
+
+@builtin
+class UnicodeBool(AbstractTemplate):
+    key = "is_true"
+
+    def generic(self, args, kws):
+        assert not kws
+        (val,) = args
+        if _is_unicode(val):
+            return signature(types.boolean, val)
+
+
+@builtin
+class GetItemUnicode(AbstractTemplate):
+    key = "getitem"
+
+    def generic(self, args, kws):
+        s, idx = args
+        if not _is_unicode(s):
+            return
+        idx = normalize_1d_index(idx)
+        if idx == types.slice3_type or idx == types.intp:
+            return signature(s, s, idx)
+
+
+@builtin
+class InUnicode(AbstractTemplate):
+    key = "in"
+
+    def generic(self, args, kws):
+        sub, s = args
+        if _is_unicode(sub, s):
+            return signature(types.boolean, sub, s)
+
+
+@builtin
+class UnicodeConcat(AbstractTemplate):
+    key = "+"
+
+    def generic(self, args, kws):
+        if len(args) != 2:
+            return
+        a, b = args
+        if _is_unicode(a, b):
+            return signature(a, a, b)
+
+
+@builtin
+class UnicodeRepeat(AbstractTemplate):
+    key = "*"
+
+    def generic(self, args, kws):
+        if len(args) != 2:
+            return
+        a, b = args
+        if _is_unicode(a) and isinstance(b, types.Integer):
+            return signature(a, a, types.intp)
+        if isinstance(a, types.Integer) and _is_unicode(b):
+            return signature(b, types.intp, b)
+
+
+class UnicodeComparison(AbstractTemplate):
+
+    def generic(self, args, kws):
+        if len(args) != 2:
+            return
+        a, b = args
+        if _is_unicode(a, b):
+            return signature(types.boolean, a, b)
+
+
+@builtin
+class UnicodeEq(UnicodeComparison):
+    key = "=="
+
+@builtin
+class UnicodeNe(UnicodeComparison):
+    key = "!="
+
+@builtin
+class UnicodeLt(UnicodeComparison):
+    key = "<"
+
+@builtin
+class UnicodeLe(UnicodeComparison):
+    key = "<="
+
+@builtin
+class UnicodeGt(UnicodeComparison):
+    key = ">"
+
+@builtin
+class UnicodeGe(UnicodeComparison):
+    key = ">="
+
+
+@builtin_attr
+class UnicodeAttribute(AttributeTemplate):
+    key = types.UnicodeType
+
+    def _resolve_search(self, s, args, kws):
+        assert not kws
+        if not 1 <= len(args) <= 3:
+            return
+        sub = args[0]
+        bounds = args[1:]
+        if not _is_unicode(sub):
+            return
+        if not all(isinstance(b, types.Integer) for b in bounds):
+            return
+        return sub, (types.intp,) * len(bounds)
+
+    @bound_function("unicode.find")
+    def resolve_find(self, s, args, kws):
+        res = self._resolve_search(s, args, kws)
+        if res is not None:
+            sub, bounds = res
+            return signature(types.intp, sub, *bounds)
+
+    @bound_function("unicode.startswith")
+    def resolve_startswith(self, s, args, kws):
+        res = self._resolve_search(s, args, kws)
+        if res is not None:
+            prefix, bounds = res
+            return signature(types.boolean, prefix, *bounds)
+
+    @bound_function("unicode.endswith")
+    def resolve_endswith(self, s, args, kws):
+        res = self._resolve_search(s, args, kws)
+        if res is not None:
+            suffix, bounds = res
+            return signature(types.boolean, suffix, *bounds)
+
+    @bound_function("unicode.split")
+    def resolve_split(self, s, args, kws):
+        assert not kws
+        if not args:
+            return signature(types.List(s))
+        if len(args) == 1 and _is_unicode(args[0]):
+            return signature(types.List(s), args[0])
@@ -160,6 +160,7 @@ setup(name='numba',
         "numba.cuda.tests.cudadrv.data": ["*.ptx"],
         "numba.annotations": ["*.html"],
         "numba.hsa.tests.hsadrv": ["*.brig"],
+        "numba.pycc": ["*.c"],
       },
       scripts=["numba/pycc/pycc", "bin/numba"],
       author="Continuum Analytics, Inc.",